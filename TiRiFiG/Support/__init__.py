@@ -0,0 +1,6 @@
+# -*- coding: UTF-8 -*-
+"""Binding independent support code for TiRiFiG.
+
+Nothing in this package imports a Qt binding so that it can be shared by the
+different launchers and used from the command line.
+"""
@@ -0,0 +1,107 @@
+# -*- coding: UTF-8 -*-
+"""Autosave of the edits for recovery after an unexpected exit.
+
+A snapshot of the window state is taken on the GUI thread, which only copies
+the arrays, and written as a session file (see session.py) beside the .def
+file by a single worker thread. When a snapshot is taken while the previous
+one is still being written only the newest waiting snapshot is kept. The
+recovery file holds the hash of the .def file it belongs to, so it is only
+offered as long as that file was not changed since.
+
+classes:
+    Autosaver:  decides when to take a snapshot and writes it in the background.
+
+functions:
+    recovery_path:  the recovery file belonging to a .def file.
+    read_recovery:  the recovery snapshot of a .def file if it is current.
+"""
+
+import logging
+import os
+import time
+
+import numpy as np
+
+from TiRiFiG.Support.save_pipeline import CoalescingWorker
+from TiRiFiG.Support.session import read_session, write_session
+
+logger = logging.getLogger(__name__)
+
+
+def recovery_path(def_file):
+    return f'{os.path.splitext(def_file)[0]}_TiRiFiG_recovery.npz'
+
+
+def read_recovery(def_file):
+    """The recovery snapshot of def_file, None if there is none or it is stale"""
+    return read_session(def_file, path=recovery_path(def_file))
+
+
+class Autosaver():
+    """Writes recovery snapshots on a worker thread
+
+    Instance variables:
+        interval    (float):  seconds after which edits are saved, 0 never.
+        edits       (int):    number of edits after which they are saved, 0 never.
+        last_saved  (float):  time.time() of the last completed snapshot.
+        error       (string): the error of the last failed snapshot, else None.
+    """
+
+    def __init__(self, interval=60., edits=20):
+        self.interval = interval
+        self.edits = edits
+        self.pending_edits = 0
+        self.last_saved = None
+        self.error = None
+        self._last_snapshot = time.monotonic()
+        self._worker = CoalescingWorker(self._write, done=self._written)
+
+    @property
+    def dirty(self):
+        return self.pending_edits > 0
+
+    def edited(self):
+        """Count an edit, True when enough edits were made to save them now"""
+        self.pending_edits += 1
+        return self.edits > 0 and self.pending_edits >= self.edits
+
+    def due(self):
+        """True when there are edits and the interval has passed"""
+        return self.dirty and self.interval > 0 and \
+            time.monotonic() - self._last_snapshot >= self.interval
+
+    def submit(self, def_file, arrays):
+        """Copy the arrays and write them to the recovery file in the background"""
+        snapshot = {key: np.array(value, copy=True) for key, value in arrays.items()}
+        self.pending_edits = 0
+        self._last_snapshot = time.monotonic()
+        self._worker.submit(def_file, snapshot)
+
+    @staticmethod
+    def _write(def_file, snapshot):
+        return write_session(def_file, snapshot, path=recovery_path(def_file))
+
+    def _written(self, args, path, error):
+        if error is None:
+            self.last_saved = time.time()
+            self.error = None
+        else:
+            self.error = str(error)
+            logger.warning('The autosave of %s failed: %s', args[0], error)
+
+    def discard(self, def_file):
+        """Remove the recovery file, after the writes that are already running"""
+        self._worker.cancel_waiting()
+        self.pending_edits = 0
+        self._worker.after(self._remove, recovery_path(def_file))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        """Wait for the writes that are running or waiting"""
+        self._worker.close()
@@ -0,0 +1,32 @@
+# -*- coding: UTF-8 -*-
+"""The choice of the Qt binding, without importing one.
+
+Shared by the launcher, which picks the GUI to start, and by qt_binding, which
+imports the chosen binding for the GUI.
+
+functions:
+    find_binding:  the binding to use, without importing any.
+
+variables:
+    bindings:      the supported bindings, in order of preference.
+"""
+
+import importlib.util
+import os
+
+bindings = ['PyQt6', 'PyQt5']
+
+
+def find_binding():
+    """The name of the binding to use, None if none is installed
+
+    QT_API is used when it names an installed binding.
+    """
+    requested = os.environ.get('QT_API', '').lower()
+    for name in bindings:
+        if name.lower() == requested and importlib.util.find_spec(name) is not None:
+            return name
+    for name in bindings:
+        if importlib.util.find_spec(name) is not None:
+            return name
+    return None
@@ -0,0 +1,277 @@
+# -*- coding: UTF-8 -*-
+"""Convergence of a running TiRiFiC fit, followed in its progress log.
+
+TiRiFiC appends a line to PROGRESSLOG for every iteration, of the form
+'L:2/4 P:VROT CH:1.23456E+04 ...', and a line starting with 'finish' at the
+end. The log is followed by reading only the bytes appended since the last
+read, so a poll costs the same after ten or after a million iterations. The
+chi-square of every iteration is kept in a ring buffer of fixed size, and the
+series is checked for a stall, the best chi-square no longer improving, and
+for divergence, the chi-square growing away from the best one.
+
+classes:
+    RingBuffer:          the last values of a few series in fixed arrays.
+    LogFollower:         the lines appended to a growing file.
+    ConvergenceMonitor:  the chi-square series of a run and its diagnosis.
+
+functions:
+    parse_progress_line: the loop, parameter and chi-square of a log line.
+"""
+
+import os
+
+import numpy as np
+
+# keys under which the chi-square and the parameter may be written
+chisq_keys = ['CH', 'CHI', 'CHISQ', 'CHI2', 'C']
+parameter_keys = ['P', 'PA', 'PN', 'PAR']
+
+
+class RingBuffer():
+    """The last capacity rows of a few float series
+
+    Instance variables:
+        names     (list):  names of the series.
+        capacity  (int):   number of rows that are kept.
+        total     (int):   number of rows appended so far.
+    """
+
+    def __init__(self, names, capacity=4096):
+        self.names = list(names)
+        self.capacity = int(capacity)
+        self._data = np.full((len(self.names), self.capacity), np.nan)
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def extend(self, rows):
+        """Append rows, an array of shape (n, len(names))"""
+        rows = np.asarray(rows, dtype=float).reshape(-1, len(self.names))
+        kept = rows[-self.capacity:]
+        # the rows that do not fit are appended and overwritten at once
+        dropped = len(rows) - len(kept)
+        positions = (self.total + dropped + np.arange(len(kept))) % self.capacity
+        self._data[:, positions] = kept.T
+        self.total += len(rows)
+
+    def series(self, name):
+        """The kept values of a series, oldest first"""
+        row = self._data[self.names.index(name)]
+        if self.total <= self.capacity:
+            return row[:self.total].copy()
+        start = self.total % self.capacity
+        return np.concatenate((row[start:], row[:start]))
+
+    def clear(self):
+        self._data[:] = np.nan
+        self.total = 0
+
+
+class LogFollower():
+    """The complete lines appended to a file since the last read
+
+    The file need not exist yet. When it is truncated or replaced, as when a
+    new run starts, it is read again from the start.
+
+    Instance variables:
+        path     (string):  the followed file.
+        offset   (int):     the number of bytes read so far.
+        restarts (int):     the number of times the file was read again from
+                            the start.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.restarts = 0
+        self._partial = b''
+        self._inode = None
+
+    def read(self):
+        """The lines appended since the last call, without line ends"""
+        try:
+            status = os.stat(self.path)
+        except OSError:
+            return []
+        if status.st_ino != self._inode or status.st_size < self.offset:
+            if self._inode is not None:
+                self.restarts += 1
+            self._inode = status.st_ino
+            self.offset = 0
+            self._partial = b''
+        if status.st_size == self.offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            appended = f.read(status.st_size - self.offset)
+        self.offset += len(appended)
+        lines = (self._partial + appended).split(b'\n')
+        # the last line is completed by the next write
+        self._partial = lines.pop()
+        return [line.decode('ascii', errors='replace').rstrip('\r') for line in lines]
+
+
+def parse_progress_line(line):
+    """The progress in one line of the progress log
+
+    Keyword arguments:
+    line (string)--  e.g. 'L:2/4 P:VROT CH:1.23456E+04'
+
+    Returns:
+    dict with loop, loops, parameter and chisq, of which the ones that are
+    not in the line are None, and finished; None when it is no progress line
+    """
+    stripped = line.strip()
+    if stripped.lower().startswith('finish'):
+        return {'loop': None, 'loops': None, 'parameter': None, 'chisq': None,
+                'finished': True}
+    fields = {}
+    for token in stripped.split():
+        key, separator, value = token.partition(':')
+        if separator and key and value:
+            fields.setdefault(key.upper(), value)
+    if 'L' not in fields:
+        return None
+    progress = {'loop': None, 'loops': None, 'parameter': None, 'chisq': None,
+                'finished': False}
+    loop, _, loops = fields['L'].partition('/')
+    try:
+        progress['loop'] = int(float(loop))
+        progress['loops'] = int(float(loops)) if loops else None
+    except ValueError:
+        pass
+    for key in chisq_keys:
+        try:
+            progress['chisq'] = float(fields[key].replace('D', 'E'))
+            break
+        except (KeyError, ValueError):
+            continue
+    for key in parameter_keys:
+        if key in fields:
+            progress['parameter'] = fields[key]
+            break
+    return progress
+
+
+class ConvergenceMonitor():
+    """The chi-square series of a run and whether it converges
+
+    Instance variables:
+        follower      (LogFollower):  the progress log.
+        buffer        (RingBuffer):   iteration, loop and chi-square series.
+        loops         (int):          total number of loops, once known.
+        parameter     (string):       the parameter fitted last.
+        best          (float):        lowest chi-square so far.
+        best_iteration(int):          iteration of the lowest chi-square.
+        finished      (bool):         TiRiFiC wrote its finish line.
+        stall_iterations (int):       iterations without an improvement of
+                                      stall_tolerance after which the run
+                                      counts as stalled.
+        stall_tolerance  (float):     relative improvement of the best
+                                      chi-square that counts.
+        divergence_factor (float):    the run diverges when the chi-square of
+                                      divergence_iterations iterations in a row
+                                      is this factor above the best one.
+    """
+
+    series = ['iteration', 'loop', 'chisq']
+
+    def __init__(self, progress_log, capacity=4096, stall_iterations=200, stall_tolerance=1e-4,
+                 divergence_factor=1.5, divergence_iterations=20):
+        self.follower = LogFollower(progress_log)
+        self.buffer = RingBuffer(self.series, capacity)
+        self.stall_iterations = stall_iterations
+        self.stall_tolerance = stall_tolerance
+        self.divergence_factor = divergence_factor
+        self.divergence_iterations = divergence_iterations
+        self.reset()
+
+    def reset(self):
+        self.buffer.clear()
+        self.loops = None
+        self.loop = None
+        self.parameter = None
+        self.best = np.inf
+        self.best_iteration = 0
+        self._above_best = 0
+        self._non_finite = False
+        self.finished = False
+
+    def update(self):
+        """Read the appended lines of the log
+
+        Returns:
+        the number of new iterations
+        """
+        restarts = self.follower.restarts
+        lines = self.follower.read()
+        if self.follower.restarts != restarts:
+            # a new run started writing the log
+            self.reset()
+        rows = []
+        for line in lines:
+            progress = parse_progress_line(line)
+            if progress is None:
+                continue
+            if progress['finished']:
+                self.finished = True
+                continue
+            if progress['loops'] is not None:
+                self.loops = progress['loops']
+            if progress['loop'] is not None:
+                self.loop = progress['loop']
+            if progress['parameter'] is not None:
+                self.parameter = progress['parameter']
+            if progress['chisq'] is None:
+                continue
+            iteration = self.buffer.total + len(rows) + 1
+            chisq = progress['chisq']
+            if not np.isfinite(chisq):
+                self._non_finite = True
+            elif chisq < self.best * (1. - self.stall_tolerance):
+                self.best = chisq
+                self.best_iteration = iteration
+            if np.isfinite(chisq) and chisq > self.best * self.divergence_factor:
+                self._above_best += 1
+            else:
+                self._above_best = 0
+            rows.append((iteration, np.nan if self.loop is None else self.loop, chisq))
+        if rows:
+            self.buffer.extend(rows)
+        return len(rows)
+
+    @property
+    def iterations(self):
+        return self.buffer.total
+
+    def state(self):
+        """'waiting', 'running', 'stalled', 'diverging' or 'finished'"""
+        if self.finished:
+            return 'finished'
+        if self.iterations == 0:
+            return 'waiting'
+        if self._non_finite or self._above_best >= self.divergence_iterations:
+            return 'diverging'
+        if self.iterations - self.best_iteration >= self.stall_iterations:
+            return 'stalled'
+        return 'running'
+
+    def diagnosis(self):
+        """The state of the run as a sentence"""
+        state = self.state()
+        loop = '' if self.loop is None else \
+            f'loop {self.loop}{"" if self.loops is None else f"/{self.loops}"}, '
+        if state == 'waiting':
+            return 'Waiting for the first iteration.'
+        if state == 'finished':
+            return f'Finished after {self.iterations} iterations, best chi-square {self.best:.6g}.'
+        if state == 'diverging':
+            return (f'Diverging: {loop}the chi-square is no longer finite or far above the '
+                    f'best {self.best:.6g}. Consider stopping the run.')
+        if state == 'stalled':
+            return (f'Stalled: {loop}no improvement in '
+                    f'{self.iterations - self.best_iteration} iterations, best chi-square '
+                    f'{self.best:.6g}. Consider stopping the run.')
+        return (f'Running: {loop}{self.parameter or ""} iteration {self.iterations}, '
+                f'best chi-square {self.best:.6g}.')
@@ -0,0 +1,327 @@
+# -*- coding: UTF-8 -*-
+"""Lazy access to the INSET data cube.
+
+The FITS header is read card by card and the data are memory-mapped from the
+offset that follows from the header, so a cube is never loaded in full.
+Moment maps and position-velocity slices are computed in chunks of channels
+and cached in .npz files next to the cube.
+
+classes:
+    FitsCube:  memory-mapped FITS cube with lazily computed, cached products.
+
+functions:
+    read_fits_header:  the cards of the primary header and the data offset.
+"""
+
+import os
+
+import numpy as np
+
+FITS_BLOCK = 2880
+FITS_CARD = 80
+bitpix_dtypes = {8: '>u1', 16: '>i2', 32: '>i4', 64: '>i8', -32: '>f4', -64: '>f8'}
+# CTYPE3 of the velocity axes, and the frequency units in Hz
+velocity_types = ['VELO', 'VRAD', 'VOPT', 'FELO']
+frequency_units = {'hz': 1., 'khz': 1e3, 'mhz': 1e6, 'ghz': 1e9}
+speed_of_light = 299792.458  # km/s
+
+
+class CubeError(Exception):
+    pass
+
+
+def _card_value(text):
+    """Convert the value part of a header card to a python type"""
+    text = text.strip()
+    if text.startswith("'"):
+        end = text.find("'", 1)
+        while end != -1 and text[end+1:end+2] == "'":
+            end = text.find("'", end+2)
+        return text[1:end].replace("''", "'").rstrip()
+    text = text.split('/')[0].strip()
+    if text == 'T':
+        return True
+    if text == 'F':
+        return False
+    for convert in (int, float):
+        try:
+            return convert(text.replace('D', 'E'))
+        except ValueError:
+            pass
+    return text
+
+
+def read_fits_header(filename):
+    """Read the primary header of a FITS file
+
+    Keyword arguments:
+    filename (string)--  path to the FITS file
+
+    Returns:
+    header:dict, offset:int
+    The header keywords and the byte offset at which the data start
+    """
+    header = {}
+    blocks = 0
+    with open(filename, 'rb') as f:
+        while True:
+            block = f.read(FITS_BLOCK)
+            if len(block) < FITS_BLOCK:
+                raise CubeError(f'{filename} ends before the END card of the header')
+            blocks += 1
+            for i in range(0, FITS_BLOCK, FITS_CARD):
+                card = block[i:i+FITS_CARD].decode('ascii', errors='replace')
+                key = card[:8].strip()
+                if key == 'END':
+                    return header, blocks * FITS_BLOCK
+                if card[8:10] == '= ' and key not in header:
+                    header[key] = _card_value(card[10:])
+
+
+class FitsCube():
+    """Memory-mapped FITS data cube
+
+    Instance variables:
+        filename   (string):      path to the cube.
+        header     (dict):        the primary header.
+        data       (np.memmap):   the raw data, shape (channels, y, x).
+        chunk_bytes(int):         memory that a chunk of channels may use.
+    """
+    chunk_bytes = 64 * 1024**2
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.header, offset = read_fits_header(filename)
+        naxis = self.header.get('NAXIS', 0)
+        if naxis < 3:
+            raise CubeError(f'{filename} is not a cube (NAXIS = {naxis})')
+        shape = [int(self.header[f'NAXIS{i}']) for i in range(naxis, 0, -1)]
+        if any(n != 1 for n in shape[:-3]):
+            raise CubeError(f'{filename} has more than one non-degenerate 4th axis')
+        bitpix = int(self.header['BITPIX'])
+        if bitpix not in bitpix_dtypes:
+            raise CubeError(f'{filename} has an unknown BITPIX = {bitpix}')
+        self.data = np.memmap(filename, dtype=bitpix_dtypes[bitpix], mode='r',
+                              offset=offset, shape=tuple(shape[-3:]))
+        self.bscale = float(self.header.get('BSCALE', 1.))
+        self.bzero = float(self.header.get('BZERO', 0.))
+        # the spectral axis is checked here, where a CubeError is expected
+        self.channel_velocities()
+        stat = os.stat(filename)
+        # products are only reused for the very same file
+        self.identity = f'{stat.st_size}-{int(stat.st_mtime)}'
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def channel_velocities(self):
+        """Velocity of every channel in km/s
+
+        A frequency axis is converted with the radio convention,
+        v = c (1 - f / f0), with f0 the rest frequency of the header.
+
+        Raises:
+        CubeError when the spectral axis is neither a velocity nor a frequency
+        axis, or a frequency axis has no rest frequency
+        """
+        channels = np.arange(self.shape[0], dtype=float)
+        values = self.header.get('CRVAL3', 0.) + \
+            (channels + 1 - self.header.get('CRPIX3', 1.)) * self.header.get('CDELT3', 1.)
+        ctype = str(self.header.get('CTYPE3', '')).strip().upper()
+        unit = str(self.header.get('CUNIT3', '')).strip().lower()
+        if ctype.startswith('FREQ'):
+            rest = self.header.get('RESTFRQ', self.header.get('RESTFREQ'))
+            if not isinstance(rest, (int, float)) or rest <= 0:
+                raise CubeError(f'{self.filename} has a frequency axis but no rest frequency '
+                                '(RESTFRQ)')
+            values = values * frequency_units.get(unit, 1.)
+            return speed_of_light * (1. - values / float(rest))
+        if ctype != '' and ctype[:4] not in velocity_types:
+            raise CubeError(f'{self.filename} has a spectral axis of type {ctype}, '
+                            'only velocity and frequency axes are supported')
+        if unit == 'm/s' or (unit == '' and abs(self.header.get('CDELT3', 1.)) > 100.):
+            values = values / 1000.
+        return values
+
+    def channels(self, start, stop):
+        """Scaled float32 copy of the channels start to stop, blanks set to NaN"""
+        block = np.asarray(self.data[start:stop], dtype=np.float32)
+        if self.bscale != 1. or self.bzero != 0.:
+            block = block * self.bscale + self.bzero
+        if 'BLANK' in self.header and self.data.dtype.kind in 'iu':
+            block[np.asarray(self.data[start:stop]) == self.header['BLANK']] = np.nan
+        return block
+
+    def channel_chunks(self):
+        """(start, stop) ranges of channels that fit in chunk_bytes"""
+        per_channel = self.shape[1] * self.shape[2] * 4
+        step = max(1, int(self.chunk_bytes // per_channel))
+        return [(start, min(start + step, self.shape[0]))
+                for start in range(0, self.shape[0], step)]
+
+    def pixel_scale(self):
+        """Size of a pixel in arcsec"""
+        return abs(float(self.header.get('CDELT2', self.header.get('CDELT1', 1.)))) * 3600.
+
+    def world_to_pixel(self, ra, dec):
+        """0-based pixel position of (RA, DEC) in degrees (flat sky approximation)"""
+        ra = np.asarray(ra, dtype=float)
+        dec = np.asarray(dec, dtype=float)
+        dec0 = np.radians(self.header.get('CRVAL2', 0.))
+        # templates may give RA in [-180, 180)
+        delta_ra = (ra - self.header.get('CRVAL1', 0.) + 180.) % 360. - 180.
+        x = self.header.get('CRPIX1', 1.) - 1 + \
+            delta_ra * np.cos(dec0) / self.header.get('CDELT1', 1.)
+        y = self.header.get('CRPIX2', 1.) - 1 + \
+            (dec - self.header.get('CRVAL2', 0.)) / self.header.get('CDELT2', 1.)
+        return x, y
+
+    def _cache_path(self, product):
+        root = os.path.splitext(self.filename)[0]
+        return f'{root}_TiRiFiG_{product}.npz'
+
+    def _cached(self, product, key):
+        path = self._cache_path(product)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with np.load(path) as cached:
+                if str(cached['key']) != key:
+                    return None
+                return {name: cached[name] for name in cached.files if name != 'key'}
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _store(self, product, key, **arrays):
+        path = self._cache_path(product)
+        tmp_path = f'{path}.tmp.npz'
+        try:
+            np.savez(tmp_path, key=key, **arrays)
+            os.replace(tmp_path, path)
+        except OSError:
+            # a read-only data directory only means we recompute next time
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+    def moment_maps(self, clip=None, progress=None):
+        """Moment 0 and moment 1 maps
+
+        Keyword arguments:
+        clip (float)--          only pixels above this value contribute
+        progress (function)--   called with the fraction of channels done
+
+        Returns:
+        mom0:np.ndarray, mom1:np.ndarray
+        The integrated intensity (units * km/s) and the intensity weighted
+        velocity (km/s) maps, computed chunk by chunk over the channels.
+        """
+        key = f'{self.identity}-{clip}'
+        cached = self._cached('moments', key)
+        if cached is not None:
+            return cached['mom0'], cached['mom1']
+        velocities = self.channel_velocities()
+        mom0 = np.zeros(self.shape[1:], dtype=np.float64)
+        weighted = np.zeros(self.shape[1:], dtype=np.float64)
+        chunks = self.channel_chunks()
+        for i, (start, stop) in enumerate(chunks):
+            block = np.nan_to_num(self.channels(start, stop))
+            if clip is not None:
+                block[block < clip] = 0.
+            mom0 += block.sum(axis=0)
+            weighted += np.tensordot(velocities[start:stop], block, axes=1)
+            if progress is not None:
+                progress((i + 1) / len(chunks))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mom1 = np.where(mom0 > 0., weighted / mom0, np.nan)
+        if len(velocities) > 1:
+            mom0 *= abs(velocities[1] - velocities[0])
+        self._store('moments', key, mom0=mom0, mom1=mom1)
+        return mom0, mom1
+
+    def pv_slice(self, x_center, y_center, pa, progress=None):
+        """Position-velocity slice along a line through the cube
+
+        Keyword arguments:
+        x_center, y_center (float)--  0-based pixel position of the center
+        pa (float)--                  position angle of the slice (degrees,
+                                      north through east)
+        progress (function)--         called with the fraction of channels done
+
+        Returns:
+        offsets:np.ndarray, pv:np.ndarray
+        The offsets along the slice in arcsec and the (channels, offsets)
+        slice, sampled at the nearest pixels.
+        """
+        key = f'{self.identity}-{x_center:.3f}-{y_center:.3f}-{pa:.3f}'
+        cached = self._cached('pv', key)
+        if cached is not None:
+            return cached['offsets'], cached['pv']
+        ny, nx = self.shape[1:]
+        half_length = np.hypot(nx, ny) / 2.
+        steps = np.arange(-half_length, half_length + 1.)
+        # east is towards negative x when CDELT1 < 0
+        east = -1. if self.header.get('CDELT1', -1.) < 0 else 1.
+        x = x_center + steps * np.sin(np.radians(pa)) * east
+        y = y_center + steps * np.cos(np.radians(pa))
+        ix = np.rint(x).astype(np.int64)
+        iy = np.rint(y).astype(np.int64)
+        inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        pv = np.full((self.shape[0], len(steps)), np.nan, dtype=np.float32)
+        chunks = self.channel_chunks()
+        for i, (start, stop) in enumerate(chunks):
+            block = self.channels(start, stop)
+            pv[start:stop, inside] = block[:, iy[inside], ix[inside]]
+            if progress is not None:
+                progress((i + 1) / len(chunks))
+        offsets = steps * self.pixel_scale()
+        self._store('pv', key, offsets=offsets, pv=pv)
+        return offsets, pv
+
+    def binned(self, factor, step, progress=None):
+        """The cube averaged over blocks of factor x factor pixels and step channels
+
+        Blanks count as zero. Incomplete blocks at the edges are dropped, as
+        model_preview.SkyGrid.from_cube does.
+        """
+        key = f'{self.identity}-{factor}-{step}'
+        cached = self._cached(f'binned{factor}x{step}', key)
+        if cached is not None:
+            return cached['data']
+        channels, ny, nx = self.shape[0] // step, self.shape[1] // factor, self.shape[2] // factor
+        binned = np.zeros((channels, ny, nx), dtype=np.float32)
+        # chunks of a whole number of binned channels
+        chunk = max(1, self.channel_chunks()[0][1] // step) * step
+        for start in range(0, channels * step, chunk):
+            stop = min(start + chunk, channels * step)
+            block = np.nan_to_num(self.channels(start, stop))[:, :ny * factor, :nx * factor]
+            binned[start // step:stop // step] = block.reshape(
+                (stop - start) // step, step, ny, factor, nx, factor).mean(axis=(1, 3, 5))
+            if progress is not None:
+                progress(stop / (channels * step))
+        self._store(f'binned{factor}x{step}', key, data=binned)
+        return binned
+
+    def ring_ellipses(self, radii, xpos, ypos, pa, incl, points=64):
+        """Outline of the tilted rings projected on the sky
+
+        Keyword arguments:
+        radii (array-like)--    ring radii in arcsec
+        xpos, ypos (array)--    ring centers in degrees
+        pa, incl (array)--      position angle and inclination in degrees
+
+        Returns:
+        x:np.ndarray, y:np.ndarray
+        The 0-based pixel coordinates, shape (rings, points)
+        """
+        radii = np.asarray(radii, dtype=float)[:, None] / self.pixel_scale()
+        x0, y0 = self.world_to_pixel(xpos, ypos)
+        pa = np.radians(np.asarray(pa, dtype=float))[:, None]
+        cos_incl = np.cos(np.radians(np.asarray(incl, dtype=float)))[:, None]
+        t = np.linspace(0., 2. * np.pi, points)[None, :]
+        east = -1. if self.header.get('CDELT1', -1.) < 0 else 1.
+        along = radii * np.cos(t)
+        across = radii * cos_incl * np.sin(t)
+        x = np.asarray(x0)[:, None] + east * (along * np.sin(pa) - across * np.cos(pa))
+        y = np.asarray(y0)[:, None] + along * np.cos(pa) + across * np.sin(pa)
+        return x, y
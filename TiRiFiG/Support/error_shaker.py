@@ -0,0 +1,166 @@
+# -*- coding: UTF-8 -*-
+"""Error estimation with the TRM_errors tirshaker, run as parallel TiRiFiC processes.
+
+tirshaker varies the fitted parameters of a template within their expected
+errors, refits every variation with TiRiFiC and takes the spread of the fitted
+values as the error. Every iteration is independent, so here they are started
+in a pool of concurrent tirific processes, each in its own directory, and the
+errors are recomputed after every finished iteration.
+
+classes:
+    ErrorShaker:  prepares the template and runs the iterations in a pool.
+
+functions:
+    clipped_std:  standard deviation within 3 MAD of the median, per ring.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import copy
+import logging
+import os
+import shutil
+
+import numpy as np
+import TRM_errors.tirshaker.tirshaker as fit_functions
+
+logger = logging.getLogger(__name__)
+
+# output of tirific that an iteration does not need
+suppressed_outputs = ['OUTSET', 'PROGRESSLOG', 'TEXTLOG', 'TIRSMO', 'COOLGAL',
+                      'TILT', 'BIGTILT']
+
+
+def clipped_std(values):
+    """Per ring standard deviation of the iterations (rows) after rejecting
+    values further than 3 median absolute deviations from the median, as the
+    'mad' mode of tirshaker does. NaN with fewer than two iterations."""
+    values = np.asarray(values, dtype=float)
+    if values.shape[0] < 2:
+        return np.full(values.shape[1:], np.nan)
+    median = np.median(values, axis=0)
+    mad = np.median(np.abs(values - median), axis=0)
+    keep = np.abs(values - median) <= 3. * mad
+    # with a zero MAD the plain spread is the better estimate
+    keep[:, mad == 0.] = True
+    count = keep.sum(axis=0)
+    mean = np.where(keep, values, 0.).sum(axis=0) / count
+    variance = np.where(keep, (values - mean)**2, 0.).sum(axis=0) / np.maximum(count - 1, 1)
+    return np.where(count > 1, np.sqrt(variance), 0.)
+
+
+class ErrorShaker():
+    """Runs tirshaker iterations of a template in parallel
+
+    Instance variables:
+        template     (dict):   the template prepared for the iterations.
+        fit_groups   (dict):   tirshaker groups, with TO_COLLECT and COLLECTED.
+        directory    (string): directory in which the iterations are run.
+        workers      (int):    number of concurrent tirific processes.
+        tirific_call (string): the tirific executable.
+        failed       (int):    number of iterations that failed.
+    """
+
+    def __init__(self, Tirific_Template, def_directory, workers=None,
+                 directory='Error_Shaker', loops=None, tirific_call='tirific'):
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.tirific_call = tirific_call
+        self.directory = os.path.join(def_directory, directory)
+        os.makedirs(self.directory, exist_ok=True)
+        template = copy.deepcopy(Tirific_Template)
+        self.fit_groups = fit_functions.get_fitted_groups(template, verbose=False)
+        # every iteration runs one directory deeper than the .def file
+        template['INSET'] = os.path.abspath(os.path.join(def_directory, template['INSET']))
+        for key in suppressed_outputs:
+            template[key] = ''
+        template['RESTARTNAME'] = 'restart_Error_Shaker.txt'
+        template['LOGNAME'] = 'Error_Shaker.log'
+        template['TIRDEF'] = 'Error_Shaker_Out.def'
+        if 'GR_CONT' not in template:
+            template['GR_CONT'] = ' '
+        if 'RESTARTID' not in template:
+            template['RESTARTID'] = '0'
+        if loops is not None:
+            template['LOOPS'] = f'{int(loops)}'
+        # share the cores between the concurrent processes
+        template['NCORES'] = f'{max(1, (os.cpu_count() or 1) // self.workers)}'
+        template['INIMODE'] = '0'
+        self.template = template
+        self.fit_groups['TO_COLLECT'] = []
+        self.fit_groups['COLLECTED'] = {}
+        for group in list(self.fit_groups):
+            if group in ['COLLECTED', 'TO_COLLECT']:
+                continue
+            for disk in self.fit_groups[group]['DISKS']:
+                par = group.split('_')[0]
+                if disk != 1:
+                    par = f'{par}_{disk}'
+                if par not in self.fit_groups['TO_COLLECT']:
+                    self.fit_groups['TO_COLLECT'].append(par)
+                self.fit_groups['COLLECTED'][par] = []
+        self.cancelled = False
+        self.failed = 0
+
+    @property
+    def parameters(self):
+        return list(self.fit_groups['TO_COLLECT'])
+
+    def errors(self):
+        """Errors per collected parameter from the iterations finished so far"""
+        return {par: clipped_std(values) for par, values in
+                self.fit_groups['COLLECTED'].items() if len(values) > 0}
+
+    def _iteration(self, i):
+        iteration_directory = os.path.join(self.directory, f'iteration_{i:03d}')
+        os.makedirs(iteration_directory, exist_ok=True)
+        try:
+            settings = fit_functions.set_individual_iteration(
+                self.template, i, self.fit_groups, iteration_directory,
+                self.tirific_call, log=False, verbose=False)
+            return fit_functions.run_individual_iteration(settings, log=False)
+        finally:
+            shutil.rmtree(iteration_directory, ignore_errors=True)
+
+    def run(self, iterations, callback=None):
+        """Run the iterations in a pool of workers
+
+        Keyword arguments:
+        iterations (int)--     number of varied templates to fit
+        callback (function)--  called after every finished iteration with
+                               the number of finished iterations and the
+                               current errors per parameter
+
+        Returns:
+        dict with the final errors per parameter
+        """
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # the threads only wait for their tirific process
+            futures = [pool.submit(self._iteration, i) for i in range(int(iterations))]
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                nur = int(float(self.template['NUR']))
+                try:
+                    output = future.result()
+                    collected = {}
+                    for par in self.fit_groups['TO_COLLECT']:
+                        values = np.asarray(output[par], dtype=float).ravel()
+                        # tirific drops trailing rings that equal the last one
+                        if values.size < nur:
+                            values = np.append(values, np.full(nur - values.size, values[-1]))
+                        collected[par] = values[:nur]
+                except Exception as e:
+                    # the other iterations still give the errors
+                    self.failed += 1
+                    logger.warning('An error shaker iteration failed: %s', e)
+                    continue
+                for par, values in collected.items():
+                    self.fit_groups['COLLECTED'][par].append(values)
+                done += 1
+                if callback is not None:
+                    callback(done, self.errors())
+                if self.cancelled:
+                    # the iterations that are running are still collected
+                    for waiting in futures:
+                        waiting.cancel()
+        return self.errors()
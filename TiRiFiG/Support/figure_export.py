@@ -0,0 +1,346 @@
+# -*- coding: UTF-8 -*-
+"""Figures of the ring parameters, rendered with Agg in a pool of processes.
+
+A Panel holds the arrays of one parameter graph. The GUI builds the Panels of
+the open template from the values it already has, the command line builds
+them from templates parsed once in the worker that renders them. Figures are
+drawn with the Agg canvas on plain matplotlib Figures, never through pyplot,
+with the colours and markers of the graph widgets, and the templates (or
+groups of panels of one template) are spread over a process pool.
+
+classes:
+    Panel:             the arrays of one parameter graph.
+
+functions:
+    template_panels:   Panels of every ring parameter of a parsed template.
+    draw_panel:        draw a Panel on a matplotlib Axes.
+    panel_figure:      Figure of one Panel.
+    sheet_figure:      Figure with the Panels of a template in a grid.
+    write_figures:     write the figures of the Panels of one template.
+    export_template:   parse a .def file and write its figures.
+    export_panels:     write_figures with the Panels spread over a process pool.
+    export_templates:  export_template of many .def files in a process pool.
+    find_templates:    the .def files given on the command line.
+    main:              command line export.
+
+variables:
+    export_formats:    the file formats that can be written.
+    export_style:      matplotlib style of the figures, as in the GUI.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import math
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+from matplotlib import style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from TiRiFiG.Support.plot_support import error_segments, parameter_units, state_styles
+
+export_formats = ['png', 'pdf', 'svg']
+export_style = 'seaborn-v0_8'
+# size (inches) of one panel, also of one cell of a sheet
+panel_size = (6.4, 4.0)
+# fixed margins (inches) around the axes of a panel; a layout engine would
+# measure every tick label first, which takes as long as drawing the figure
+panel_margins = {'left': 0.9, 'right': 0.2, 'bottom': 0.6, 'top': 0.2}
+
+
+class Panel():
+    """The arrays of one parameter graph
+
+    Instance variables:
+        parameter  (string):      the parameter, e.g. VROT or PA_2.
+        unit       (string):      its unit of measurement.
+        radii      (np.ndarray):  RADI.
+        values     (np.ndarray):  the values per ring.
+        errors     (np.ndarray):  the errors per ring, NaN when unknown.
+        original   (np.ndarray):  the values in the .def file when they were
+                                  edited since, otherwise None.
+        states     (dict):        the masks of the fit states as given by
+                                  ParameterFitSettings.state_masks, None when
+                                  the parameter is not fitted.
+    """
+
+    def __init__(self, parameter, radii, values, errors=None, original=None, states=None,
+                 unit=None):
+        self.parameter = parameter
+        self.unit = parameter_units.get(parameter.split('_')[0], '') if unit is None else unit
+        self.radii = np.array(radii, dtype=float)
+        self.values = np.array(values, dtype=float)
+        self.errors = np.full(len(self.values), np.nan) if errors is None else \
+            np.array(errors, dtype=float)
+        self.original = None
+        if original is not None and not np.array_equal(original, self.values):
+            self.original = np.array(original, dtype=float)
+        self.states = states
+
+
+def template_panels(parsed, fit_groups=None):
+    """Panels of every ring parameter of a ParsedTemplate
+
+    Keyword arguments:
+    parsed (ParsedTemplate)--  the template
+    fit_groups (dict)--        the VARY blocks as read by tirshaker's
+                               get_fitted_groups, for the fit states
+
+    Returns:
+    list of Panels, ordered on parameter and disk
+    """
+    # imported here so that the workers of the GUI, which get ready made
+    # Panels, do not have to import pyFAT
+    from TiRiFiG.Support.fit_settings import template_fit_settings
+    from TiRiFiG.Support.template_diff import split_disk
+
+    errors = {}
+    for key, value in parsed.template.items():
+        if '_ERR' in key:
+            parts = value.split()
+            if len(parts) == parsed.no_rings:
+                errors[key[1:].replace('_ERR', '').strip()] = np.array(parts, dtype=float)
+    settings = {} if fit_groups is None else \
+        template_fit_settings(parsed.template, fit_groups, parsed.no_rings)
+    panels = []
+    for key in sorted(parsed.values, key=split_disk):
+        states = settings[key].state_masks() if key in settings else None
+        panels.append(Panel(key, parsed.radii, parsed.values[key], errors=errors.get(key),
+                            states=states))
+    return panels
+
+
+def draw_panel(ax, panel):
+    """Draw a Panel on ax the way the graph widgets show it"""
+    ax.plot(panel.radii, panel.values, '--', color=state_styles['FIT'][0], linewidth=1, zorder=3)
+    states = panel.states
+    if states is None:
+        states = {'NOFIT': np.ones(len(panel.values), dtype=bool)}
+    for state, mask in states.items():
+        color, marker = state_styles[state]
+        ax.scatter(panel.radii[mask], panel.values[mask], c=color, marker=marker, s=50,
+                   zorder=4, edgecolors='black', linewidths=0.5)
+    if panel.original is not None:
+        ax.plot(panel.radii, panel.original, '--ro', alpha=0.2, zorder=2)
+    ax.add_collection(LineCollection(error_segments(panel.radii, panel.values, panel.errors),
+                                     colors='r', alpha=0.2, zorder=2), autolim=False)
+    ax.margins(x=0.1, y=0.1)
+    ax.set_xlabel("RADI (arcsec)")
+    ax.set_ylabel(panel.parameter + "( " + panel.unit + " )")
+
+
+def _grid_figure(nrows, ncols, title=None):
+    """Figure with room for nrows x ncols panels and an optional title"""
+    title_height = 0.4 if title else 0.
+    width = panel_size[0] * ncols
+    height = panel_size[1] * nrows + title_height
+    figure = Figure(figsize=(width, height))
+    FigureCanvasAgg(figure)
+    figure.subplots_adjust(left=panel_margins['left'] / panel_size[0],
+                           right=1. - panel_margins['right'] / panel_size[0],
+                           bottom=panel_margins['bottom'] / height,
+                           top=1. - (panel_margins['top'] + title_height) / height,
+                           wspace=(panel_margins['left'] + panel_margins['right']) /
+                           (panel_size[0] - panel_margins['left'] - panel_margins['right']),
+                           hspace=(panel_margins['bottom'] + panel_margins['top']) /
+                           (panel_size[1] - panel_margins['bottom'] - panel_margins['top']))
+    if title:
+        figure.suptitle(title, y=1. - 0.1 / height, va='top')
+    return figure
+
+
+def panel_figure(panel):
+    """Figure of one Panel, attached to an Agg canvas"""
+    figure = _grid_figure(1, 1)
+    draw_panel(figure.add_subplot(), panel)
+    return figure
+
+
+def sheet_figure(panels, title, ncols=3):
+    """Figure with the Panels in a grid of ncols columns, titled title"""
+    ncols = max(1, min(ncols, len(panels)))
+    nrows = max(1, math.ceil(len(panels) / ncols))
+    figure = _grid_figure(nrows, ncols, title=title)
+    for i, panel in enumerate(panels):
+        draw_panel(figure.add_subplot(nrows, ncols, i + 1), panel)
+    return figure
+
+
+def write_figures(panels, directory, stem, formats=('png',), sheet=False, dpi=150):
+    """Write the figures of the Panels of one template
+
+    Keyword arguments:
+    panels (list)--      the Panels
+    directory (string)-- where the figures are written
+    stem (string)--      file names start with it, e.g. the template name
+    formats (list)--     extensions out of export_formats
+    sheet (bool)--       one figure with all Panels, named stem.<format>,
+                         rather than one figure per Panel, named
+                         stem_<parameter>.<format>
+    dpi (int)--          resolution of the PNG files
+
+    Returns:
+    list with the paths of the written files
+    """
+    written = []
+    with style.context(export_style):
+        if sheet:
+            figures = [(stem, sheet_figure(panels, stem))]
+        else:
+            figures = ((f'{stem}_{panel.parameter}', panel_figure(panel)) for panel in panels)
+        for name, figure in figures:
+            for extension in formats:
+                path = os.path.join(directory, f'{name}.{extension}')
+                figure.savefig(path, dpi=dpi)
+                written.append(path)
+    return written
+
+
+def export_template(def_file, directory, stem, formats=('png',), sheet=False, dpi=150):
+    """Parse a .def file and write_figures of its parameters
+
+    The fit states are read from VARY and VARINDX as the GUI does.
+    """
+    import TRM_errors.tirshaker.tirshaker as fit_functions
+    from TiRiFiG.Support.workspace import template_cache
+
+    parsed = template_cache.get(def_file)
+    try:
+        fit_groups = fit_functions.get_fitted_groups(parsed.template, log=True, verbose=False)
+    except (KeyError, ValueError, IndexError):
+        fit_groups = None
+    return write_figures(template_panels(parsed, fit_groups), directory, stem, formats=formats,
+                         sheet=sheet, dpi=dpi)
+
+
+def _run_pool(function, tasks, workers=None, start_method=None, progress=None):
+    """Run function(*args) for every (label, args) of tasks in a process pool
+
+    Returns:
+    the concatenated results of the tasks and a list of (label, error) of
+    the tasks that failed
+    """
+    written = []
+    failed = []
+    if len(tasks) == 0:
+        return written, failed
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(function, *args): label for label, args in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                written.extend(future.result())
+            except Exception as e:
+                failed.append((futures[future], str(e)))
+            if progress is not None:
+                progress(done, len(tasks))
+    return written, failed
+
+
+def export_panels(panels, directory, stem, formats=('png',), sheet=False, dpi=150, workers=None,
+                  start_method=None, progress=None):
+    """write_figures with the Panels split over a pool of processes
+
+    A sheet is a single figure and is written by a single process. The GUI
+    passes 'spawn' as start_method, forking a process that runs Qt threads
+    is not safe. progress(done, total) is called after every finished group.
+
+    Returns:
+    the written paths and a list of (parameters, error) of the groups that failed
+    """
+    if sheet:
+        groups = [panels]
+    else:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(panels)))
+        groups = [group for group in np.array_split(np.array(panels, dtype=object), workers)
+                  if len(group) > 0]
+    tasks = [(', '.join(panel.parameter for panel in group),
+              (list(group), directory, stem, formats, sheet, dpi)) for group in groups]
+    return _run_pool(write_figures, tasks, workers=workers, start_method=start_method,
+                     progress=progress)
+
+
+def export_templates(templates, directory=None, formats=('png',), sheet=False, dpi=150,
+                     workers=None, start_method=None, progress=None):
+    """export_template of many .def files in a pool of processes
+
+    Keyword arguments:
+    templates (list)--   (path, stem) of the .def files
+    directory (string)-- where the figures are written, None for next to
+                         every .def file
+
+    Returns:
+    the written paths and a list of (path, error) of the templates that failed
+    """
+    tasks = [(path, (path, directory or os.path.dirname(os.path.abspath(path)), stem, formats,
+                     sheet, dpi)) for path, stem in templates]
+    return _run_pool(export_template, tasks, workers=workers, start_method=start_method,
+                     progress=progress)
+
+
+def find_templates(paths, pattern='*.def', flatten=False):
+    """(path, stem) of the .def files among paths, directories are searched
+    recursively for pattern
+
+    With flatten the stem of a file found in a directory is its path relative
+    to that directory with the separators replaced by '_', so that figures of
+    equally named templates can be written to one directory.
+    """
+    templates = []
+    for path in paths:
+        if os.path.isdir(path):
+            for found in sorted(glob.glob(os.path.join(path, '**', pattern), recursive=True)):
+                stem = os.path.splitext(os.path.basename(found))[0]
+                if flatten:
+                    stem = os.path.splitext(os.path.relpath(found, path))[0].replace(os.sep, '_')
+                templates.append((found, stem))
+        else:
+            templates.append((path, os.path.splitext(os.path.basename(path))[0]))
+    return templates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Write figures of the ring parameters of TiRiFiC templates.')
+    parser.add_argument('templates', nargs='+',
+                        help='.def files, or directories that are searched for them')
+    parser.add_argument('-o', '--output',
+                        help='directory for the figures, by default next to every .def file')
+    parser.add_argument('-f', '--format', action='append', choices=export_formats,
+                        help='file format, can be repeated (default png)')
+    parser.add_argument('--sheet', action='store_true',
+                        help='one figure with all parameters per template')
+    parser.add_argument('--pattern', default='*.def',
+                        help='file name pattern of the templates in directories')
+    parser.add_argument('--dpi', type=int, default=150, help='resolution of PNG files')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of processes (default: number of cores)')
+    args = parser.parse_args(argv)
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    templates = find_templates(args.templates, pattern=args.pattern,
+                               flatten=args.output is not None)
+    if len(templates) == 0:
+        print('No templates found.')
+        return 1
+
+    def report(done, total):
+        print(f'\r{done}/{total} templates', end='', flush=True)
+
+    written, failed = export_templates(templates, directory=args.output,
+                                       formats=args.format or ['png'], sheet=args.sheet,
+                                       dpi=args.dpi, workers=args.workers, progress=report)
+    print(f'\nWrote {len(written)} figures.')
+    for path, error in failed:
+        print(f'Could not export {path}: {error}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
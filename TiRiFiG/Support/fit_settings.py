@@ -0,0 +1,334 @@
+# -*- coding: UTF-8 -*-
+"""Array backed fitting settings of the tilted-ring parameters.
+
+Every parameter that TiRiFiC can vary gets one ParameterFitSettings object.
+The per ring state (fitted, interpolated, block fitted and the group a ring
+belongs to) is held in NumPy arrays of length NUR, the per ring values of the
+fitting columns (PARMAX, PARMIN, ...) in float arrays where NaN means that the
+parameter wide default is used.
+
+Ring numbers are 1-based throughout, as they are in the .def file.
+"""
+
+import numpy as np
+
+fitting_parameters = ['VARY', 'VARINDX', 'PARMAX', 'PARMIN',
+                      'MODERATE', 'DELEND', 'DELSTART',
+                      'MINDELTA', 'SATDELT', 'ITESTART', 'ITEEND']
+# the fitting keys that have one column per VARY block
+fit_columns = [key for key in fitting_parameters if key not in ['VARY', 'VARINDX']]
+integer_columns = ['ITESTART', 'ITEEND', 'MODERATE']
+
+
+class ParameterFitSettings():
+    """Fitting settings of a single tilted-ring parameter.
+
+    Instance variables:
+        parameter      (string):       the tilted-ring parameter, e.g. VROT or PA_2.
+        no_rings       (int):          the number of rings (NUR).
+        fitted         (bool):         whether the parameter appears in VARY at all.
+        to_fit         (np.ndarray):   bool, ring is varied by TiRiFiC.
+        interpolation  (np.ndarray):   bool, ring is interpolated (VARINDX).
+        block_fit      (np.ndarray):   bool, ring is varied as part of a block.
+        group_start    (np.ndarray):   int, first ring of the group of the ring.
+        group_end      (np.ndarray):   int, last ring of the group of the ring.
+        columns        (dict):         per ring float arrays for the fit_columns.
+        defaults       (dict):         parameter wide values for the fit_columns.
+    """
+
+    def __init__(self, parameter, no_rings):
+        self.parameter = parameter
+        self.no_rings = int(no_rings)
+        self.fitted = False
+        self.to_fit = np.zeros(self.no_rings, dtype=bool)
+        self.interpolation = np.zeros(self.no_rings, dtype=bool)
+        self.block_fit = np.zeros(self.no_rings, dtype=bool)
+        self.group_start = np.arange(1, self.no_rings+1, dtype=np.int64)
+        self.group_end = self.group_start.copy()
+        self.columns = {key: np.full(self.no_rings, np.nan) for key in fit_columns}
+        self.defaults = {key: None for key in fit_columns}
+        self._group_index = None
+
+    @property
+    def ring_numbers(self):
+        return np.arange(1, self.no_rings+1, dtype=np.int64)
+
+    @property
+    def group_index(self):
+        """Range index of the groups.
+
+        Returns:
+        np.ndarray (ngroups, 2) with the first and last ring of every group
+        sorted by ring. Groups never overlap so this is cached until a group
+        changes.
+        """
+        if self._group_index is None:
+            heads = np.flatnonzero(self.group_start == self.ring_numbers)
+            self._group_index = np.column_stack((self.group_start[heads],
+                                                 self.group_end[heads]))
+        return self._group_index
+
+    def group_of(self, rings):
+        """Index in group_index of the group(s) that the ring(s) belong to"""
+        return np.searchsorted(self.group_index[:, 0], rings, side='right') - 1
+
+    def group(self, ring):
+        """First and last ring of the group a ring belongs to"""
+        return [int(self.group_start[ring-1]), int(self.group_end[ring-1])]
+
+    def set_group(self, first, last, block):
+        """Combine the rings first to last (inclusive) in one group.
+
+        Groups that overlap with the new one are cut back so that the groups
+        keep tiling the rings without overlap.
+        """
+        first, last = sorted([int(first), int(last)])
+        rings = self.ring_numbers
+        inside = (rings >= first) & (rings <= last)
+        before = (rings < first) & (self.group_end >= first)
+        after = (rings > last) & (self.group_start <= last)
+        self.group_end[before] = first - 1
+        self.group_start[after] = last + 1
+        self.group_start[inside] = first
+        self.group_end[inside] = last
+        self.block_fit[inside] = bool(block) and first != last
+        self.block_fit[self.group_start == self.group_end] = False
+        self._group_index = None
+
+    def locked(self, rings):
+        """Mask of the ring(s) that are part of a multi-ring block fit"""
+        index = np.asarray(rings) - 1
+        return self.block_fit[index] & \
+            (self.group_start[index] != self.group_end[index])
+
+    def state_masks(self):
+        """Boolean masks of the plotted point states.
+
+        Returns:
+        dict with the masks for FIT (fitted), INT (fitted but interpolated)
+        and NOFIT (not fitted).
+        """
+        if not self.fitted:
+            return {'FIT': np.zeros(self.no_rings, dtype=bool),
+                    'INT': np.zeros(self.no_rings, dtype=bool),
+                    'NOFIT': np.ones(self.no_rings, dtype=bool)}
+        return {'FIT': self.to_fit & ~self.interpolation,
+                'INT': self.to_fit & self.interpolation,
+                'NOFIT': ~self.to_fit}
+
+    def set_column(self, key, first, last, value):
+        """Set the value of a fitting column for the rings first to last"""
+        self.columns[key][first-1:last] = value
+        if self.defaults[key] is None:
+            self.defaults[key] = value
+
+    def column_value(self, key, ring):
+        """The value of a fitting column for a ring, the default when not set"""
+        value = self.columns[key][ring-1]
+        if np.isnan(value):
+            return self.defaults[key]
+        if key in integer_columns:
+            return int(value)
+        return float(value)
+
+    def column_table(self, rings):
+        """The fitting column values of rings as a (len(rings), len(fit_columns))
+        float array with the defaults filled in, NaN where neither is set"""
+        index = np.asarray(rings) - 1
+        table = np.empty((len(index), len(fit_columns)))
+        for i, key in enumerate(fit_columns):
+            default = np.nan if self.defaults[key] is None else self.defaults[key]
+            column = self.columns[key][index]
+            table[:, i] = np.where(np.isnan(column), default, column)
+        return table
+
+    def fit_blocks(self):
+        """The VARY blocks of this parameter in a single pass over the groups.
+
+        Every group is written as a block of its own, so that the groups read
+        back from the template are the groups that were written.
+
+        Yields:
+        dict with the parameter string (prefixed with ! for groups that are
+        fitted ring by ring), the first and last ring of the block and the
+        fitting column values, taken from the first fitted ring of the group.
+        """
+        if not self.fitted:
+            return
+        fitted_rings = self.ring_numbers[self.to_fit]
+        groups, first_fitted = np.unique(self.group_of(fitted_rings), return_index=True)
+        heads = fitted_rings[first_fitted]
+        firsts = self.group_index[groups, 0]
+        lasts = self.group_index[groups, 1]
+        table = self.column_table(heads)
+        for i in range(len(heads)):
+            first, last = int(firsts[i]), int(lasts[i])
+            block = {'Parameter': self.parameter, 'RINGS': [first, last]}
+            if first != last and not self.block_fit[heads[i]-1]:
+                block['Parameter'] = f'!{self.parameter}'
+            for key, value in zip(fit_columns, table[i]):
+                if np.isnan(value):
+                    block[key] = None
+                elif key in integer_columns:
+                    block[key] = int(value)
+                else:
+                    block[key] = float(value)
+            yield block
+
+    def interpolated_rings(self):
+        """The ring numbers that are fitted and interpolated (VARINDX)"""
+        return self.ring_numbers[self.to_fit & self.interpolation]
+
+
+def compact_rings(rings):
+    """Write ring numbers in the compact VARINDX notation.
+
+    Keyword arguments:
+    rings (array-like)--  sorted ring numbers
+
+    Returns:
+    list of strings where runs of three or more rings with a constant step
+    are written as first:last:step, two consecutive rings as first:last and
+    any other ring on its own. This is the notation parse_varindx reads.
+    """
+    rings = np.asarray(rings, dtype=np.int64)
+    tokens = []
+    start = 0
+    n = len(rings)
+    if n == 0:
+        return tokens
+    steps = np.diff(rings)
+    while start < n:
+        if start == n - 1:
+            tokens.append(f'{rings[start]}')
+            break
+        step = steps[start]
+        end = start + 1
+        while end < n - 1 and steps[end] == step:
+            end += 1
+        if end - start >= 2 and step > 0:
+            if step == 1:
+                tokens.append(f'{rings[start]}:{rings[end]}')
+            else:
+                tokens.append(f'{rings[start]}:{rings[end]}:{step}')
+            start = end + 1
+        elif step == 1:
+            tokens.append(f'{rings[start]}:{rings[end]}')
+            start = end + 1
+        else:
+            tokens.append(f'{rings[start]}')
+            start += 1
+    return tokens
+
+
+def parse_varindx(varindx_line):
+    """Read the VARINDX line into the interpolated rings per parameter.
+
+    Keyword arguments:
+    varindx_line (string)--  the value of VARINDX in the .def file
+
+    Returns:
+    dict with a list of ring numbers per parameter. Ranges are given as
+    first:last or first:last:step and may be descending.
+    """
+    varindex = {}
+    current_parameter = None
+    for part in varindx_line.split():
+        try:
+            value = int(float(part))
+        except ValueError:
+            if ':' in part:
+                numbers = [int(float(x)) for x in part.split(':')]
+                step = abs(numbers[2]) if len(numbers) > 2 else 1
+                if numbers[0] > numbers[1]:
+                    step = -step
+                varindex[current_parameter].extend(
+                    range(numbers[0], numbers[1] + np.sign(step), step))
+            else:
+                current_parameter = part
+                if current_parameter not in varindex:
+                    varindex[current_parameter] = []
+        else:
+            varindex[current_parameter].append(value)
+    return varindex
+
+
+def template_fit_settings(template, fit_groups, no_rings):
+    """The fitting settings of the parameters varied in a template.
+
+    Keyword arguments:
+    template (dict)--    the Tirific_Template
+    fit_groups (dict)--  the VARY blocks as read by tirshaker's get_fitted_groups
+    no_rings (int)--     NUR
+
+    Returns:
+    dict with the ParameterFitSettings of every parameter in VARY.
+    """
+    settings = {}
+    varindex = parse_varindx(template['VARINDX'])
+    template_values = {key: template[key].split() for key in fit_columns}
+    for group in fit_groups:
+        basename_group = group.split('_')[0]
+        for i in fit_groups[group]['DISKS']:
+            basename = basename_group if i == 1 else f"{basename_group}_{i}"
+            if basename not in settings:
+                settings[basename] = ParameterFitSettings(basename, no_rings)
+            parameter_settings = settings[basename]
+            parameter_settings.fitted = True
+            first, last = sorted(int(x) for x in fit_groups[group]['RINGS'][f'{i}'])
+            last = min(last, no_rings)
+            parameter_settings.to_fit[first-1:last] = True
+            parameter_settings.set_group(first, last, fit_groups[group]['BLOCK'])
+            if basename in varindex:
+                rings = np.array(varindex[basename], dtype=int)
+                rings = rings[(rings >= first) & (rings <= last)]
+                parameter_settings.interpolation[rings-1] = True
+            for key in fit_columns:
+                template_value = template_values[key]
+                if len(template_value) == len(fit_groups):
+                    if key in integer_columns:
+                        put_value = int(float(template_value[fit_groups[group]['COLUMN_ID']]))
+                    else:
+                        put_value = float(template_value[fit_groups[group]['COLUMN_ID']])
+                    parameter_settings.set_column(key, first, last, put_value)
+    return settings
+
+
+def format_fit_settings(settings, precisions):
+    """Serialise the fitting settings into the template fitting keys.
+
+    Keyword arguments:
+    settings (dict)--    ParameterFitSettings per parameter
+    precisions (dict)--  [decimals, 'f' or 'E'] per parameter, used to write
+                         the float columns
+
+    Returns:
+    dict with the string for every key in fitting_parameters. Each key is
+    joined once from the blocks generated per parameter.
+    """
+    vary = []
+    varindx = []
+    columns = {key: [] for key in fit_columns}
+    for parameter, parameter_settings in settings.items():
+        if not parameter_settings.fitted:
+            continue
+        decimals, notation = precisions[parameter]
+        precision = f'.{decimals}{notation.lower()}'
+        for block in parameter_settings.fit_blocks():
+            first, last = block['RINGS']
+            rings = f'{first}' if first == last else f'{last}:{first}'
+            vary.append(f'{block["Parameter"]} {rings}')
+            for key in fit_columns:
+                if block[key] is None:
+                    columns[key].append('')
+                elif key in integer_columns:
+                    columns[key].append(f'{int(block[key])}')
+                else:
+                    columns[key].append(f'{block[key]:{precision}}')
+        interpolated = parameter_settings.interpolated_rings()
+        if len(interpolated) > 0:
+            varindx.append(' '.join([parameter] + compact_rings(interpolated)))
+    lines = {'VARY': ', '.join(vary), 'VARINDX': ' '.join(varindx)}
+    for key in fit_columns:
+        lines[key] = ' '.join(columns[key])
+    return lines
@@ -0,0 +1,49 @@
+# -*- coding: UTF-8 -*-
+"""Tinted variants of the button icons.
+
+The tints work on the pixels of an icon as an (height, width, 4) uint8 RGBA
+array (straight alpha) and are computed for the whole image at once, so a
+variant costs about as much as a copy of the image. The launchers turn the
+image buffer of a QImage into such an array and keep the resulting icons in a
+cache shared by all buttons.
+
+functions:
+    grayscale:   luminance of the pixels as gray, alpha kept.
+    red_glow:    pixels shifted to red, alpha kept.
+    tint:        the variant of a state of an RGBA array.
+
+variables:
+    icon_tints:  the tint function of every icon state other than 'normal'.
+"""
+
+import numpy as np
+
+# weights of red, green and blue in the luminance
+luminance_weights = np.array([0.299, 0.587, 0.114])
+
+
+def grayscale(rgba):
+    """RGBA array with red, green and blue replaced by their luminance"""
+    tinted = rgba.copy()
+    gray = rgba[..., :3] @ luminance_weights
+    tinted[..., :3] = gray.astype(np.uint8)[..., np.newaxis]
+    return tinted
+
+
+def red_glow(rgba):
+    """RGBA array with 100 added to red and green and blue halved"""
+    tinted = rgba.copy()
+    tinted[..., 0] = np.minimum(rgba[..., 0].astype(np.int16) + 100, 255)
+    tinted[..., 1:3] = rgba[..., 1:3] // 2
+    return tinted
+
+
+icon_tints = {'grayscale': grayscale, 'red_glow': red_glow}
+
+
+def tint(rgba, state):
+    """The variant of an (height, width, 4) uint8 RGBA array for state,
+    the array itself for 'normal'"""
+    if state == 'normal':
+        return rgba
+    return icon_tints[state](rgba)
@@ -0,0 +1,102 @@
+# -*- coding: UTF-8 -*-
+"""Logging of TiRiFiG through a queue that is written by a listener thread.
+
+Every module logs to its own logger, logging.getLogger(__name__), below the
+'TiRiFiG' logger. setup_logging gives that logger a single QueueHandler, so a
+log call in the GUI thread only puts the record in a queue; a QueueListener
+thread writes it to a rotating log file and to the terminal. Records below
+the level are dropped before they are formatted, so debug messages in loops
+cost a method call unless verbose logging is on.
+
+functions:
+    log_level:      the level requested through TIRIFIG_LOG_LEVEL.
+    setup_logging:  start the listener thread, once per process.
+    stop_logging:   write the queued records and stop the listener.
+
+variables:
+    log_file:       default log file, in the working directory.
+    file_format:    format of the records in the log file.
+    console_format: format of the records in the terminal.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+log_file = 'TiRiFiG.log'
+file_format = '%(asctime)s %(name)s %(levelname)s %(message)s'
+console_format = '%(levelname)s %(name)s: %(message)s'
+date_format = '%m/%d/%Y %I:%M:%S %p'
+
+_listener = None
+
+
+def log_level(default=logging.INFO):
+    """The level named by the TIRIFIG_LOG_LEVEL environment variable (e.g.
+    DEBUG), default when it is not set or not a level"""
+    level = logging.getLevelName(os.environ.get('TIRIFIG_LOG_LEVEL', '').upper())
+    return level if isinstance(level, int) else default
+
+
+def setup_logging(level=None, filename=log_file, max_bytes=2**20, backups=3):
+    """Send the records of the TiRiFiG loggers and of warnings through a queue
+    to a writer thread
+
+    Keyword arguments:
+    level (int)--        lowest level that is logged, log_level() if None
+    filename (string)--  the log file, None to log to the terminal only
+    max_bytes (int)--    size at which the log file is rotated
+    backups (int)--      number of rotated log files that are kept
+
+    Returns:
+    the QueueListener; when it is already running the level is updated and
+    the running listener is returned
+    """
+    global _listener
+    level = log_level() if level is None else level
+    logger = logging.getLogger('TiRiFiG')
+    logger.setLevel(level)
+    if _listener is not None:
+        return _listener
+    handlers = []
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(console_format))
+    handlers.append(console)
+    if filename:
+        try:
+            file_handler = logging.handlers.RotatingFileHandler(
+                filename, maxBytes=max_bytes, backupCount=backups)
+        except OSError as e:
+            logger.warning('Cannot write the log file %s: %s', filename, e)
+        else:
+            file_handler.setFormatter(logging.Formatter(file_format, datefmt=date_format))
+            handlers.append(file_handler)
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+    logging.captureWarnings(True)
+    logging.getLogger('py.warnings').addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(records, *handlers)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Write the records that are still queued and stop the listener thread"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    for name in ['TiRiFiG', 'py.warnings']:
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                logger.removeHandler(handler)
+    logging.getLogger('TiRiFiG').propagate = True
+    _listener = None
@@ -0,0 +1,245 @@
+# -*- coding: UTF-8 -*-
+"""Quick projection of the tilted-ring model for a visual check.
+
+The rings are sampled with points, as TiRiFiC does, with the parameters
+linearly interpolated between the rings. The points are projected on a
+(coarse) sky grid and binned into a velocity field and a model cube. This is
+not a replacement for a TiRiFiC run: there is no beam smoothing and the
+vertical structure is sampled with a few layers only.
+
+classes:
+    SkyGrid:       pixel grid and channels the model is projected on.
+
+functions:
+    sample_rings:     points of the model with their sky position and velocity.
+    velocity_field:   intensity weighted velocity per pixel.
+    model_cube:       the model cube, computed per block of channels.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import numpy as np
+
+preview_parameters = ['RADI', 'VROT', 'INCL', 'PA', 'XPOS', 'YPOS',
+                      'VSYS', 'SBR', 'SDIS', 'Z0']
+# vertical layers (in units of Z0) and their sech^2 weights
+z_layers = np.array([-1.5, -0.5, 0.5, 1.5])
+z_weights = 1. / np.cosh(z_layers)**2
+z_weights = z_weights / z_weights.sum()
+
+
+class SkyGrid():
+    """Pixel grid and channels on which the model is projected
+
+    Instance variables:
+        nx, ny       (int):          size of the grid in pixels.
+        pixel_scale  (float):        size of a pixel in arcsec.
+        velocities   (np.ndarray):   channel velocities in km/s.
+        east         (float):        -1 when x decreases towards the east.
+        reference    (list):         RA, DEC (degrees) of pixel center.
+        center       (list):         0-based pixel position of the reference.
+        binning      (list):         pixels and channels of the cube binned
+                                     into one grid pixel and channel.
+    """
+
+    def __init__(self, nx, ny, pixel_scale, velocities, reference,
+                 center=None, east=-1., binning=None):
+        self.nx = int(nx)
+        self.ny = int(ny)
+        self.pixel_scale = float(pixel_scale)
+        self.velocities = np.asarray(velocities, dtype=float)
+        self.reference = [float(reference[0]), float(reference[1])]
+        if center is None:
+            center = [(self.nx - 1) / 2., (self.ny - 1) / 2.]
+        self.center = [float(center[0]), float(center[1])]
+        self.east = east
+        self.binning = binning
+
+    @classmethod
+    def from_cube(cls, cube, max_size=128, max_channels=64):
+        """Coarse grid covering a FitsCube
+
+        The pixels are binned so that the grid is at most max_size pixels on a
+        side and the channels so that there are at most max_channels.
+        """
+        channels, ny, nx = cube.shape
+        factor = int(np.ceil(max(nx, ny) / max_size))
+        step = int(np.ceil(channels / max_channels))
+        header = cube.header
+        velocities = cube.channel_velocities()
+        # average the velocities of the binned channels
+        n_binned = channels // step
+        velocities = velocities[:n_binned * step].reshape(n_binned, step).mean(axis=1)
+        center = [(header.get('CRPIX1', 1.) - 0.5) / factor - 0.5,
+                  (header.get('CRPIX2', 1.) - 0.5) / factor - 0.5]
+        return cls(nx // factor, ny // factor, cube.pixel_scale() * factor, velocities,
+                   [header.get('CRVAL1', 0.), header.get('CRVAL2', 0.)], center=center,
+                   east=-1. if header.get('CDELT1', -1.) < 0 else 1., binning=[factor, step])
+
+    @classmethod
+    def from_rings(cls, rings, size=128, channels=64):
+        """Grid centered on the rings when there is no data cube"""
+        extent = 2.2 * max(float(np.max(rings['RADI'])), 1.)
+        vsys = float(rings['VSYS'][0]) if 'VSYS' in rings else 0.
+        vmax = float(np.max(np.abs(rings['VROT']))) + 3. * float(np.max(rings.get('SDIS', [0.]))) + 10.
+        return cls(size, size, extent / size,
+                   np.linspace(vsys - vmax, vsys + vmax, channels),
+                   [float(rings['XPOS'][0]), float(rings['YPOS'][0])])
+
+    def world_to_pixel(self, ra, dec):
+        """0-based pixel position of (RA, DEC) in degrees (flat sky approximation)"""
+        delta_ra = (np.asarray(ra, dtype=float) - self.reference[0] + 180.) % 360. - 180.
+        x = self.center[0] + self.east * delta_ra * np.cos(np.radians(self.reference[1])) \
+            * 3600. / self.pixel_scale
+        y = self.center[1] + (np.asarray(dec, dtype=float) - self.reference[1]) * 3600. \
+            / self.pixel_scale
+        return x, y
+
+    def cutout(self, x_range, y_range):
+        """The grid of the pixels x_range[0]:x_range[1], y_range[0]:y_range[1]"""
+        return SkyGrid(x_range[1] - x_range[0], y_range[1] - y_range[0], self.pixel_scale,
+                       self.velocities, self.reference,
+                       center=[self.center[0] - x_range[0], self.center[1] - y_range[0]],
+                       east=self.east, binning=self.binning)
+
+    @property
+    def channel_width(self):
+        if len(self.velocities) < 2:
+            return 1.
+        return float(abs(self.velocities[1] - self.velocities[0]))
+
+
+def sample_rings(rings, grid):
+    """Sample the ring model with points
+
+    Keyword arguments:
+    rings (dict)--      arrays of the preview_parameters (XPOS, YPOS in degrees,
+                        angles in degrees, RADI and Z0 in arcsec); missing
+                        VSYS, SBR, SDIS and Z0 default to 0, 1, 0 and 0.
+    grid (SkyGrid)--    the grid the points are projected on
+
+    Returns:
+    dict with per point: 'pixel' (flat pixel index, -1 outside the grid),
+    'velocity', 'sigma' (line width in km/s), 'flux' and 'ring' (index of the
+    ring at or inside the radius of the point).
+    """
+    radii = np.asarray(rings['RADI'], dtype=float)
+    no_rings = len(radii)
+
+    def profile(par, default):
+        if par in rings:
+            return np.asarray(rings[par], dtype=float)
+        return np.full(no_rings, default)
+
+    # points about half a pixel apart
+    spacing = grid.pixel_scale / 2.
+    radius = np.arange(radii.min() + spacing / 2., radii.max(), spacing)
+    if len(radius) == 0:
+        radius = radii[:1].copy()
+    n_azimuth = np.maximum(8, np.ceil(2. * np.pi * radius / spacing)).astype(np.int64)
+    owner = np.repeat(np.arange(len(radius)), n_azimuth)
+    starts = np.repeat(np.cumsum(n_azimuth) - n_azimuth, n_azimuth)
+    theta = 2. * np.pi * (np.arange(len(owner)) - starts + 0.5 * (owner % 2)) \
+        / n_azimuth[owner]
+    r = radius[owner]
+    values = {par: np.interp(radius, radii, profile(par, default))[owner]
+              for par, default in [('VROT', 0.), ('INCL', 0.), ('PA', 0.),
+                                   ('XPOS', grid.reference[0]),
+                                   ('YPOS', grid.reference[1]),
+                                   ('VSYS', 0.), ('SBR', 1.), ('SDIS', 0.),
+                                   ('Z0', 0.)]}
+    incl = np.radians(values['INCL'])
+    pa = np.radians(values['PA'])
+    # offsets along the projected major and minor axis, in arcsec
+    along = r * np.cos(theta)
+    across = r * np.sin(theta) * np.cos(incl)
+    # area of the point times the surface brightness
+    flux = values['SBR'] * r * (2. * np.pi / n_azimuth[owner]) * spacing
+    velocity = values['VSYS'] + values['VROT'] * np.cos(theta) * np.sin(incl)
+    x0, y0 = grid.world_to_pixel(values['XPOS'], values['YPOS'])
+    thick = np.any(values['Z0'] > 0.)
+    layers = z_layers if thick else np.zeros(1)
+    weights = z_weights if thick else np.ones(1)
+    # a height above the plane moves a point along the minor axis
+    across = across[None, :] + layers[:, None] * values['Z0'][None, :] * np.sin(incl)[None, :]
+    along = np.broadcast_to(along, across.shape)
+    east = along * np.sin(pa) - across * np.cos(pa)
+    north = along * np.cos(pa) + across * np.sin(pa)
+    x = np.rint(x0 + grid.east * east / grid.pixel_scale).astype(np.int64)
+    y = np.rint(y0 + north / grid.pixel_scale).astype(np.int64)
+    pixel = np.where((x >= 0) & (x < grid.nx) & (y >= 0) & (y < grid.ny),
+                     y * grid.nx + x, -1)
+    ring = np.clip(np.searchsorted(radii, r, side='right') - 1, 0, no_rings - 1)
+    n_layers = len(layers)
+    return {'pixel': pixel.ravel(),
+            'velocity': np.tile(velocity, n_layers),
+            'sigma': np.tile(np.hypot(values['SDIS'], grid.channel_width / 2.), n_layers),
+            'flux': (weights[:, None] * flux[None, :]).ravel(),
+            'ring': np.tile(ring, n_layers)}
+
+
+def velocity_field(points, grid):
+    """Intensity weighted velocity of every pixel, NaN where there is no emission"""
+    inside = points['pixel'] >= 0
+    pixel = points['pixel'][inside]
+    flux = points['flux'][inside]
+    size = grid.nx * grid.ny
+    total = np.bincount(pixel, weights=flux, minlength=size)
+    weighted = np.bincount(pixel, weights=flux * points['velocity'][inside], minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        field = np.where(total > 0., weighted / total, np.nan)
+    return field.reshape(grid.ny, grid.nx)
+
+
+def _channel_block(pixel, flux, velocity, sigma, channel_velocities, size):
+    """Sum the Gaussian line profiles of the points in a block of channels"""
+    n_channels = len(channel_velocities)
+    profile = np.exp(-0.5 * ((channel_velocities[None, :] - velocity[:, None]) / sigma[:, None])**2)
+    profile *= (flux / (np.sqrt(2. * np.pi) * sigma))[:, None]
+    index = (np.arange(n_channels)[None, :] * size + pixel[:, None]).ravel()
+    return np.bincount(index, weights=profile.ravel(), minlength=n_channels * size)
+
+
+def model_cube(points, grid, block_size=8, workers=None, channels=None):
+    """The model cube of the sampled points
+
+    Keyword arguments:
+    points (dict)--      output of sample_rings
+    grid (SkyGrid)--     the grid of the points
+    block_size (int)--   number of channels handed to a worker at once
+    workers (int)--      size of the thread pool, default the number of cpus
+    channels (array)--   only compute these channel indices (default all)
+
+    Returns:
+    np.ndarray (channels, ny, nx). NumPy releases the GIL in the heavy
+    operations, so the blocks of channels are computed in parallel threads.
+    """
+    inside = points['pixel'] >= 0
+    pixel = points['pixel'][inside]
+    flux = points['flux'][inside]
+    velocity = points['velocity'][inside]
+    sigma = points['sigma'][inside]
+    size = grid.nx * grid.ny
+    if channels is None:
+        channels = np.arange(len(grid.velocities))
+    channels = np.asarray(channels, dtype=np.int64)
+    blocks = [channels[i:i + block_size] for i in range(0, len(channels), block_size)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def compute(block):
+        # points further than 4 sigma from every channel of the block do not contribute
+        block_velocities = grid.velocities[block]
+        near = (velocity + 4. * sigma >= block_velocities.min()) & \
+            (velocity - 4. * sigma <= block_velocities.max())
+        return _channel_block(pixel[near], flux[near], velocity[near], sigma[near],
+                              block_velocities, size)
+
+    cube = np.zeros((len(channels), grid.ny, grid.nx))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(blocks)))) as pool:
+        position = 0
+        for block, result in zip(blocks, pool.map(compute, blocks)):
+            cube[position:position + len(block)] = result.reshape(len(block), grid.ny, grid.nx)
+            position += len(block)
+    return cube
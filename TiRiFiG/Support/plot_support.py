@@ -0,0 +1,174 @@
+# -*- coding: UTF-8 -*-
+"""Plotting helpers for the parameter graph widgets that do not depend on Qt.
+
+classes:
+    RingIndex:  sorted index of the ring radii in pixel space for hit-testing.
+    LRUCache:   small least-recently-used cache, e.g. for rendered views.
+
+functions:
+    rectangle_mask:   boolean mask of the points inside a rectangle.
+    minmax_decimate:  indices of the points to draw when rings share pixel columns.
+    error_segments:   vertical error bar segments for a LineCollection.
+
+variables:
+    state_styles:     colour and marker of the rings in each fit state.
+    parameter_units:  unit of measurement of the tilted-ring parameters.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+# FIT: fitted, INT: fitted but interpolated, NOFIT: not fitted; shared by the
+# graph widgets and the exported figures
+state_styles = {'FIT': ('mediumseagreen', 'o'),
+                'INT': ('violet', 'v'),
+                'NOFIT': ('red', 'X')}
+
+parameter_units = {'VROT': 'km s-1',
+                   'SBR': 'Jy km s-1 arcsec-2',
+                   'INCL': 'degrees',
+                   'PA': 'degrees',
+                   'RADI': 'arcsec',
+                   'Z0': 'arcsec',
+                   'SDIS': 'km s-1',
+                   'XPOS': 'degrees',
+                   'YPOS': 'degrees',
+                   'VSYS': 'km s-1',
+                   'DVRO': 'km s-1 arcsec-1',
+                   'DVRA': 'km s-1 arcsec-1',
+                   'VRAD': 'km s-1'}
+
+
+class RingIndex():
+    """Sorted radius index of the rings plotted in one graph widget.
+
+    The radii are kept sorted in display (pixel) coordinates so that finding
+    the ring under the mouse is a binary search and the hit threshold does not
+    depend on the radial range or the resolution of the plot.
+
+    Instance variables:
+        order    (np.ndarray):  ring indices that sort the radii.
+        pixels   (np.ndarray):  sorted x positions of the rings in pixels.
+    """
+
+    def __init__(self, radii, to_pixels=None):
+        radii = np.asarray(radii, dtype=float)
+        self.order = np.argsort(radii, kind='stable')
+        self.radii = radii[self.order]
+        self.pixels = self.radii.copy()
+        if to_pixels is not None:
+            self.update(to_pixels)
+
+    def update(self, to_pixels):
+        """Recompute the pixel positions after the view or canvas changed.
+
+        Keyword arguments:
+        to_pixels (function)--  maps an array of radii to display x positions,
+                                e.g. built from ax.transData
+        """
+        self.pixels = np.asarray(to_pixels(self.radii), dtype=float)
+
+    def nearest(self, x_pixel, threshold):
+        """Index of the ring closest to x_pixel, None if further than threshold
+        pixels away"""
+        if len(self.pixels) == 0 or x_pixel is None:
+            return None
+        position = int(np.searchsorted(self.pixels, x_pixel))
+        candidates = [i for i in (position-1, position) if 0 <= i < len(self.pixels)]
+        closest = min(candidates, key=lambda i: abs(self.pixels[i] - x_pixel))
+        if abs(self.pixels[closest] - x_pixel) > threshold:
+            return None
+        return int(self.order[closest])
+
+
+class LRUCache():
+    """Least-recently-used cache holding at most maxsize items"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self._items.pop(key, default)
+
+    def clear(self):
+        self._items.clear()
+
+
+def rectangle_mask(x, y, x_limits, y_limits):
+    """Mask of the points (x, y) inside the rectangle spanned by the limits.
+
+    The limits can be given in any order.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x_min, x_max = sorted(x_limits)
+    y_min, y_max = sorted(y_limits)
+    return (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+
+
+def minmax_decimate(x, y, x_limits, n_columns):
+    """Indices of the points to draw when many points share a pixel column.
+
+    Keyword arguments:
+    x, y (array-like)--     the points, in data coordinates
+    x_limits (list)--       the x range of the view
+    n_columns (int)--       the width of the view in pixels
+
+    Returns:
+    np.ndarray with the sorted indices of the points to keep. In every pixel
+    column the first, last, lowest and highest point are kept so that the
+    drawn line and markers look the same as with all points. Points outside
+    the view are collected in one column on either side so lines still run
+    off the edges.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) == 0:
+        return np.arange(0)
+    lower, upper = sorted(x_limits)
+    span = max(upper - lower, np.finfo(float).tiny)
+    columns = np.clip(np.floor((x - lower) / span * n_columns), -1, n_columns).astype(np.int64)
+    order = np.argsort(x, kind='stable')
+    columns = columns[order]
+    starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+    ends = np.r_[starts[1:], len(order)] - 1
+    run = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    # sort by y within every run; the first of a run is its minimum, the last its maximum
+    by_value = np.lexsort((y[order], run))
+    keep = np.concatenate((order[starts], order[ends],
+                           order[by_value[starts]], order[by_value[ends]]))
+    return np.unique(keep)
+
+
+def error_segments(x, y, errors):
+    """Vertical error bars as an (N, 2, 2) array of line segments.
+
+    Points without a finite error are left out.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    errors = np.asarray(errors, dtype=float)
+    valid = np.isfinite(errors) & np.isfinite(y)
+    x, y, errors = x[valid], y[valid], errors[valid]
+    return np.stack((np.column_stack((x, y - errors)),
+                     np.column_stack((x, y + errors))), axis=1)
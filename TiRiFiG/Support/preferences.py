@@ -0,0 +1,51 @@
+# -*- coding: UTF-8 -*-
+"""Preferences of the GUI that are kept between sessions.
+
+The preferences are a small JSON object in the same directory as the recorded
+run timings and the run history. A file that is missing or cannot be read
+gives no preferences, so the defaults of the GUI are used.
+
+functions:
+    read_preferences:   the stored preferences.
+    write_preferences:  store preferences, keeping the other ones.
+
+variables:
+    preferences_file:   default file of the preferences.
+"""
+
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+preferences_file = os.path.join(os.path.expanduser('~'), '.TiRiFiG', 'preferences.json')
+
+
+def read_preferences(path=None):
+    """The stored preferences as a dict, empty when there are none"""
+    path = path or preferences_file
+    try:
+        with open(path) as f:
+            preferences = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return preferences if isinstance(preferences, dict) else {}
+
+
+def write_preferences(path=None, **values):
+    """Store the given preferences, keeping the other stored ones
+
+    The file is replaced only when the new one is complete.
+    """
+    path = path or preferences_file
+    preferences = read_preferences(path)
+    preferences.update(values)
+    tmp_path = f'{path}.tmp'
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(preferences, f, indent=1)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning('Cannot store the preferences in %s: %s', path, e)
@@ -0,0 +1,199 @@
+# -*- coding: UTF-8 -*-
+"""Residuals between the data cube and the model.
+
+ResidualCube compares the binned INSET cube with the quick projection of
+model_preview. After an edit only the rings that changed are looked at: the
+points of those rings, before and after the edit, give the pixels and channels
+whose model can differ. Only that region is projected again, smoothed with the
+beam and subtracted, and chi-square is corrected for the region alone.
+
+For a TiRiFiC OUTSET cube, which does not change with the edits, residual_maps
+goes through both cubes once, chunk by chunk over the channels.
+
+classes:
+    ResidualCube:  data - model on the preview grid, updated incrementally.
+
+functions:
+    changed_rings:  indices of the rings whose parameters differ.
+    smooth:         Gaussian smoothing of the channel maps.
+    residual_maps:  blockwise residuals of the data and a model FitsCube.
+"""
+
+import numpy as np
+
+from TiRiFiG.Support.cube import CubeError
+from TiRiFiG.Support.model_preview import model_cube
+
+# a line profile or beam is cut off at this many sigma
+truncation = 4.
+
+
+def changed_rings(old, new):
+    """Indices of the rings whose parameters differ between two ring dicts
+
+    Returns None when the rings themselves (RADI or the parameters present)
+    changed, which means everything has to be recomputed.
+    """
+    if old is None or set(old) != set(new) or \
+            not np.array_equal(old['RADI'], new['RADI']):
+        return None
+    changed = np.zeros(len(new['RADI']), dtype=bool)
+    for par in new:
+        changed |= np.asarray(old[par]) != np.asarray(new[par])
+    return np.flatnonzero(changed)
+
+
+def smooth(cube, sigma):
+    """Smooth the channel maps (last two axes) with a circular Gaussian of sigma
+    pixels, by multiplication in the Fourier domain"""
+    if sigma <= 0.:
+        return cube
+    ny, nx = cube.shape[-2:]
+    ky = np.fft.fftfreq(ny)[:, None]
+    kx = np.fft.rfftfreq(nx)[None, :]
+    transfer = np.exp(-2. * np.pi**2 * sigma**2 * (kx**2 + ky**2))
+    return np.fft.irfft2(np.fft.rfft2(cube) * transfer, s=(ny, nx))
+
+
+class ResidualCube():
+    """Data - model on the preview grid
+
+    Instance variables:
+        data       (np.ndarray):   the binned data, (channels, ny, nx).
+        model      (np.ndarray):   the projected model in the units of the data.
+        residual   (np.ndarray):   data - model.
+        noise      (float):        noise of a binned data point.
+        chi2       (float):        sum of (residual / noise)**2.
+        scale      (float):        converts the projected flux per pixel to
+                                   the units of the data (Jy/beam).
+        beam_sigma (float):        sigma of the beam in grid pixels.
+    """
+
+    def __init__(self, data, grid, noise, beam=None):
+        self.data = np.asarray(data, dtype=np.float64)
+        self.grid = grid
+        self.noise = float(noise) if noise else 1.
+        self.model = np.zeros_like(self.data)
+        self.residual = self.data.copy()
+        self.chi2 = float(np.sum(self.residual**2)) / self.noise**2
+        self.scale = 1.
+        self.beam_sigma = 0.
+        if beam is not None and beam[0] > 0. and beam[1] > 0.:
+            # flux per pixel to Jy/beam, beam in arcsec FWHM
+            beam_area = np.pi / (4. * np.log(2.)) * beam[0] * beam[1]
+            self.scale = beam_area / grid.pixel_scale**2
+            self.beam_sigma = np.sqrt(beam[0] * beam[1]) / (2. * np.sqrt(2. * np.log(2.))) \
+                / grid.pixel_scale
+        self.rings = None
+        self.points = None
+
+    @property
+    def reduced_chi2(self):
+        return self.chi2 / self.data.size
+
+    def _region(self, points, rings):
+        """Channels and pixels whose model can differ after the edit, None if
+        nothing changed"""
+        changed = changed_rings(self.rings, rings)
+        if changed is None:
+            return slice(0, self.data.shape[0]), slice(0, self.grid.ny), slice(0, self.grid.nx)
+        if len(changed) == 0:
+            return None
+        # a ring is interpolated with its neighbours, so the points from the
+        # previous ring up to the next one can change
+        intervals = np.unique(np.clip(np.concatenate((changed - 1, changed)),
+                                      0, len(rings['RADI']) - 1))
+        pixels, low, high = [], [], []
+        for sampled in (self.points, points):
+            affected = np.isin(sampled['ring'], intervals) & (sampled['pixel'] >= 0)
+            pixels.append(sampled['pixel'][affected])
+            width = truncation * sampled['sigma'][affected]
+            low.append(sampled['velocity'][affected] - width)
+            high.append(sampled['velocity'][affected] + width)
+        pixels = np.concatenate(pixels)
+        if len(pixels) == 0:
+            return None
+        pad = int(np.ceil(truncation * self.beam_sigma))
+        x, y = pixels % self.grid.nx, pixels // self.grid.nx
+        in_range = np.flatnonzero((self.grid.velocities >= np.concatenate(low).min()) &
+                                  (self.grid.velocities <= np.concatenate(high).max()))
+        if len(in_range) == 0:
+            return None
+        return (slice(int(in_range.min()), int(in_range.max()) + 1),
+                slice(max(0, int(y.min()) - pad), min(self.grid.ny, int(y.max()) + pad + 1)),
+                slice(max(0, int(x.min()) - pad), min(self.grid.nx, int(x.max()) + pad + 1)))
+
+    def update(self, points, rings):
+        """Bring the model in line with new points of the rings
+
+        Keyword arguments:
+        points (dict)--   model_preview.sample_rings of the rings on the grid
+        rings (dict)--    the ring parameters the points were sampled from
+
+        Returns:
+        The (channels, y, x) slices that were recomputed, None if the edit
+        did not change the model.
+        """
+        region = self._region(points, rings)
+        self.rings = {par: np.array(values, dtype=float) for par, values in rings.items()}
+        self.points = points
+        if region is None:
+            return None
+        channels, ys, xs = region
+        pad = int(np.ceil(truncation * self.beam_sigma))
+        # the points up to a beam away contribute to the region after smoothing
+        outer_y = [max(0, ys.start - pad), min(self.grid.ny, ys.stop + pad)]
+        outer_x = [max(0, xs.start - pad), min(self.grid.nx, xs.stop + pad)]
+        x, y = points['pixel'] % self.grid.nx, points['pixel'] // self.grid.nx
+        inside = (points['pixel'] >= 0) & (x >= outer_x[0]) & (x < outer_x[1]) & \
+            (y >= outer_y[0]) & (y < outer_y[1])
+        cutout = self.grid.cutout(outer_x, outer_y)
+        local = {key: values[inside] for key, values in points.items()}
+        local['pixel'] = (y[inside] - outer_y[0]) * cutout.nx + (x[inside] - outer_x[0])
+        model = smooth(model_cube(local, cutout, channels=np.arange(channels.start, channels.stop))
+                       * self.scale, self.beam_sigma)
+        inner = (slice(None), slice(ys.start - outer_y[0], ys.stop - outer_y[0]),
+                 slice(xs.start - outer_x[0], xs.stop - outer_x[0]))
+        self.chi2 -= float(np.sum(self.residual[region]**2)) / self.noise**2
+        self.model[region] = model[inner]
+        self.residual[region] = self.data[region] - self.model[region]
+        self.chi2 += float(np.sum(self.residual[region]**2)) / self.noise**2
+        return region
+
+
+def residual_maps(data, model, noise, progress=None):
+    """Residuals of a data and a model FitsCube, chunk by chunk over the channels
+
+    Keyword arguments:
+    data, model (FitsCube)--   the INSET and OUTSET cubes, on the same grid
+    noise (float)--            the noise in the data
+    progress (function)--      called with the fraction of channels done
+
+    Returns:
+    dict with the summed residual ('sum', units * km/s), the summed absolute
+    residual ('absolute') and the reduced chi-square ('chi2')
+    """
+    if data.shape != model.shape:
+        raise CubeError(f'The model cube {model.shape} does not match the data {data.shape}')
+    key = f'{data.identity}-{model.identity}-{noise}'
+    cached = data._cached('residuals', key)
+    if cached is not None:
+        return {name: cached[name] for name in ['sum', 'absolute', 'chi2']}
+    velocities = data.channel_velocities()
+    channel_width = abs(velocities[1] - velocities[0]) if len(velocities) > 1 else 1.
+    summed = np.zeros(data.shape[1:])
+    absolute = np.zeros(data.shape[1:])
+    chi2 = 0.
+    chunks = data.channel_chunks()
+    for i, (start, stop) in enumerate(chunks):
+        residual = np.nan_to_num(data.channels(start, stop)) - \
+            np.nan_to_num(model.channels(start, stop))
+        summed += residual.sum(axis=0)
+        absolute += np.abs(residual).sum(axis=0)
+        chi2 += float(np.sum(residual.astype(np.float64)**2))
+        if progress is not None:
+            progress((i + 1) / len(chunks))
+    maps = {'sum': summed * channel_width, 'absolute': absolute * channel_width,
+            'chi2': np.array(chi2 / (noise if noise else 1.)**2 / np.prod(data.shape))}
+    data._store('residuals', key, **maps)
+    return maps
@@ -0,0 +1,331 @@
+# -*- coding: UTF-8 -*-
+"""Estimates of the wall time and memory of a TiRiFiC run.
+
+The cost of a run follows from the size of the INSET cube (read from its
+header only), the number of rings and disks, the number of loops, the
+iterations of the VARY blocks and the number of cores. These are combined in
+one work measure and the wall time is a power law of that work, fitted to the
+runs that were timed on this machine before. Every run started through
+start_timed_run is timed, with its peak memory, and appended to a JSON lines
+file, so the estimates get better the more TiRiFiC is used.
+
+classes:
+    RunEstimate:     estimated wall time and memory of a run.
+
+functions:
+    run_features:    the quantities of a template that set the cost of a run.
+    read_timings:    the recorded runs.
+    record_run:      append a finished run to the timings file.
+    estimate_run:    estimate the wall time and memory of a template.
+    order_runs:      .def files with their estimates, shortest run first.
+    start_timed_run: start TiRiFiC and record its timing when it finishes.
+    format_duration: a number of seconds as e.g. '1 h 12 min'.
+
+variables:
+    timings_file:    default file of the recorded runs.
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from TiRiFiG.Support.cube import read_fits_header
+
+logger = logging.getLogger(__name__)
+
+timings_file = os.path.join(os.path.expanduser('~'), '.TiRiFiG', 'run_timings.jsonl')
+# seconds per unit of work and the uncertainty factor before any run is recorded
+default_rate = 2e-9
+default_spread = 3.
+# TiRiFiC keeps the data, the model and a model per core in single precision
+bytes_per_voxel = 4
+
+
+def _number(template, key, default):
+    try:
+        return float(template[key].split()[0])
+    except (KeyError, IndexError, ValueError):
+        return default
+
+
+def run_features(template, def_directory):
+    """The quantities of a template that set the cost of a TiRiFiC run
+
+    Keyword arguments:
+    template (dict)--         the Tirific_Template
+    def_directory (string)--  directory of the .def file, to find INSET
+
+    Returns:
+    dict with voxels, rings (NUR times NDISKS), loops, blocks (VARY blocks),
+    iterations (per loop, summed over the blocks), inimode, ncores and the
+    combined work
+
+    Raises:
+    OSError or CubeError when the header of the INSET cube cannot be read,
+    ValueError when ITESTART or ITEEND are not numbers
+    """
+    header, _ = read_fits_header(os.path.join(def_directory, template.get('INSET', '').strip()))
+    voxels = int(np.prod([int(header.get(f'NAXIS{i}', 1)) for i in
+                          range(1, int(header.get('NAXIS', 0)) + 1)]))
+    rings = int(_number(template, 'NUR', 1)) * max(1, int(_number(template, 'NDISKS', 1)))
+    loops = max(0, int(_number(template, 'LOOPS', 1)))
+    blocks = len([block for block in template.get('VARY', '').split(',') if block.strip()])
+    start = np.array(template.get('ITESTART', '').split()[:blocks], dtype=float)
+    end = np.array(template.get('ITEEND', '').split()[:blocks], dtype=float)
+    if len(start) != len(end):
+        end = start if len(end) == 0 else np.resize(end, len(start))
+    iterations = float(np.sum((start + end) / 2.)) if blocks else 0.
+    inimode = max(0, int(_number(template, 'INIMODE', 0)))
+    ncores = max(1, int(_number(template, 'NCORES', os.cpu_count() or 1)))
+    # model evaluations: the first model, the initial search of INIMODE per
+    # block and the iterations of every loop
+    evaluations = 1. + inimode * blocks + loops * max(iterations, float(blocks))
+    return {'voxels': voxels, 'rings': rings, 'loops': loops, 'blocks': blocks,
+            'iterations': iterations, 'inimode': inimode, 'ncores': ncores,
+            'work': voxels * rings * evaluations / ncores}
+
+
+def read_timings(path=None):
+    """The recorded runs, oldest first; lines that cannot be read are skipped"""
+    path = path or timings_file
+    records = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def record_run(features, seconds, memory, returncode, def_file='', path=None):
+    """Append a finished run to the timings file
+
+    Keyword arguments:
+    features (dict)--   run_features of the template that was run
+    seconds (float)--   wall time of the run
+    memory (int)--      peak resident memory in bytes, None if unknown
+    returncode (int)--  exit status of tirific; only successful runs are used
+    def_file (string)-- the .def file that was run
+    path (string)--     the timings file, timings_file if None
+    """
+    path = path or timings_file
+    record = dict(features, seconds=seconds, memory=memory, returncode=returncode,
+                  def_file=def_file, time=time.time())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    except OSError as e:
+        logger.warning('Cannot record the run in %s: %s', path, e)
+
+
+class RunEstimate():
+    """Estimated wall time and memory of a run
+
+    Instance variables:
+        seconds  (float):  most likely wall time.
+        low      (float):  shortest likely wall time.
+        high     (float):  longest likely wall time.
+        memory   (float):  peak memory in bytes.
+        runs     (int):    number of recorded runs the estimate is based on.
+        features (dict):   the run_features it was made from.
+    """
+
+    def __init__(self, seconds, spread, memory, runs, features):
+        self.seconds = seconds
+        self.low = seconds / spread
+        self.high = seconds * spread
+        self.memory = memory
+        self.runs = runs
+        self.features = features
+
+    def __str__(self):
+        basis = f'{self.runs} recorded run(s)' if self.runs else 'no recorded runs yet'
+        return (f'{format_duration(self.seconds)} ({format_duration(self.low)} to '
+                f'{format_duration(self.high)}), {self.memory / 2**20:.0f} MiB, '
+                f'based on {basis}')
+
+
+def _model_cubes(features):
+    return bytes_per_voxel * features['voxels'] * (2 + features['ncores'])
+
+
+def estimate_run(features, records=None):
+    """Estimate the wall time and memory of a run
+
+    Keyword arguments:
+    features (dict)--  run_features of the template
+    records (list)--   recorded runs, read_timings() if None
+
+    Returns:
+    RunEstimate
+    """
+    records = read_timings() if records is None else records
+    runs = [r for r in records if r.get('returncode') == 0 and
+            r.get('work', 0) > 0 and r.get('seconds', 0) > 0]
+    work = max(features['work'], 1.)
+    if len(runs) == 0:
+        seconds, spread = default_rate * work, default_spread
+    else:
+        log_work = np.log([r['work'] for r in runs])
+        log_seconds = np.log([r['seconds'] for r in runs])
+        if len(runs) >= 3 and np.ptp(log_work) > 1.:
+            slope, offset = np.polyfit(log_work, log_seconds, 1)
+            # few or clustered runs can give any slope, keep it physical
+            slope = float(np.clip(slope, 0.5, 1.5))
+            offset = float(np.median(log_seconds - slope * log_work))
+        else:
+            slope, offset = 1., float(np.median(log_seconds - log_work))
+        residuals = log_seconds - (offset + slope * log_work)
+        seconds = float(np.exp(offset + slope * np.log(work)))
+        spread = max(1.25, float(np.exp(2. * np.std(residuals))) if len(runs) >= 3 else 2.)
+    memory_runs = [r for r in runs if r.get('memory')]
+    ratio = float(np.median([r['memory'] / max(_model_cubes(r), 1) for r in memory_runs])) \
+        if memory_runs else 1.
+    return RunEstimate(seconds, spread, ratio * _model_cubes(features), len(runs), features)
+
+
+def order_runs(def_files, records=None):
+    """The .def files with their estimates, shortest run first
+
+    Keyword arguments:
+    def_files (list)--  paths of .def files
+    records (list)--    recorded runs, read_timings() if None
+
+    Returns:
+    list of (path, RunEstimate); files that cannot be estimated come last
+    with None
+    """
+    from TiRiFiG.Support.workspace import template_cache
+    records = read_timings() if records is None else records
+    estimated, unknown = [], []
+    for path in def_files:
+        try:
+            template = template_cache.get(path).template
+            features = run_features(template, os.path.dirname(os.path.abspath(path)))
+        except Exception as e:
+            logger.warning('Cannot estimate the run of %s: %s', path, e)
+            unknown.append((path, None))
+            continue
+        estimated.append((path, estimate_run(features, records)))
+    estimated.sort(key=lambda item: item[1].seconds)
+    return estimated + unknown
+
+
+def _wait(process):
+    """Wait for process; returns the peak memory of it in bytes if known"""
+    if not hasattr(os, 'wait4'):
+        process.wait()
+        return None
+    try:
+        _, status, usage = os.wait4(process.pid, 0)
+    except ChildProcessError:
+        process.wait()
+        return None
+    process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) \
+        else -os.WTERMSIG(status)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+
+def start_timed_run(def_file, features=None, tirific_call='tirific', path=None, done=None):
+    """Start TiRiFiC on a .def file and record its timing when it finishes
+
+    Keyword arguments:
+    def_file (string)--    the .def file, run in its own directory
+    features (dict)--      run_features of the template, nothing is recorded
+                           if None
+    tirific_call (string)--the tirific executable
+    path (string)--        the timings file, timings_file if None
+    done (function)--      called from the waiting thread with the returncode
+                           and the wall time when the run finished
+
+    Returns:
+    the subprocess.Popen of the run
+
+    Raises:
+    OSError when tirific cannot be started
+    """
+    directory, name = os.path.split(os.path.abspath(def_file))
+    start = time.monotonic()
+    process = subprocess.Popen([tirific_call, f'deffile={name}'], cwd=directory)
+
+    def wait():
+        memory = _wait(process)
+        seconds = time.monotonic() - start
+        logger.info('TiRiFiC finished %s in %s with status %s', name, format_duration(seconds),
+                    process.returncode)
+        if features is not None:
+            record_run(features, seconds, memory, process.returncode, def_file, path)
+        if done is not None:
+            done(process.returncode, seconds)
+
+    threading.Thread(target=wait, daemon=True).start()
+    return process
+
+
+def format_duration(seconds):
+    """A number of seconds as e.g. '45 s', '12 min' or '1 h 12 min'"""
+    if seconds < 10.:
+        return f'{seconds:.1f} s'
+    if seconds < 60.:
+        return f'{seconds:.0f} s'
+    if seconds < 3600.:
+        return f'{seconds / 60.:.0f} min'
+    if seconds < 86400.:
+        return f'{int(seconds // 3600)} h {int(seconds % 3600 // 60)} min'
+    return f'{seconds / 86400.:.1f} d'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Estimate the wall time and memory of TiRiFiC runs, shortest run first.')
+    parser.add_argument('templates', nargs='+', help='.def files to estimate')
+    parser.add_argument('--timings', default=None,
+                        help=f'file of the recorded runs (default {timings_file})')
+    parser.add_argument('--names', action='store_true',
+                        help='only print the .def files in order, e.g. to feed a batch script')
+    parser.add_argument('--run', action='store_true',
+                        help='run the templates one after the other, shortest first, and '
+                             'record their timings')
+    parser.add_argument('--tirific', default='tirific', help='the tirific executable')
+    args = parser.parse_args(argv)
+    ordered = order_runs(args.templates, read_timings(args.timings))
+    for path, estimate in ordered:
+        if args.names:
+            print(path)
+        else:
+            print(f'{path}: {estimate if estimate is not None else "cannot be estimated"}')
+    if not args.run:
+        return 0 if all(estimate is not None for _, estimate in ordered) else 1
+    returncodes = []
+    for path, estimate in ordered:
+        finished = threading.Event()
+
+        def done(returncode, seconds):
+            returncodes.append(returncode)
+            finished.set()
+
+        try:
+            start_timed_run(path, estimate.features if estimate is not None else None,
+                            tirific_call=args.tirific, path=args.timings, done=done)
+        except OSError as e:
+            print(f'Cannot start {args.tirific}: {e}')
+            return 1
+        finished.wait()
+    return 0 if all(returncode == 0 for returncode in returncodes) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
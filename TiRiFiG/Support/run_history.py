@@ -0,0 +1,292 @@
+# -*- coding: UTF-8 -*-
+"""Local history of the TiRiFiC runs in an SQLite database.
+
+Every run started from the GUI is stored with the hash of the .def file that
+was run, the session arrays of the window at the start (see session.py) as one
+compressed blob, the wall time, the exit status and the parameters that
+TiRiFiC wrote to TIRDEF. The input and final values of every parameter, and
+whether it was fitted, are also kept per parameter in a table of their own,
+indexed so that e.g. all runs of a galaxy in which INCL was not fitted are
+found without reading a blob. A past run is restored from its blob, so the
+.def files are not parsed again, nor do they need to exist any more.
+
+classes:
+    RunRecord:    one run of the history.
+    RunHistory:   the database with the runs.
+
+functions:
+    galaxy_name:  the name under which the runs of a template are stored.
+
+variables:
+    history_file: default database, next to the recorded timings.
+"""
+
+import io
+import logging
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pyFAT_astro.Support.support_functions as FAT_sup
+
+from TiRiFiG.Support.session import def_hash
+from TiRiFiG.Support.template_check import parse_vary
+
+logger = logging.getLogger(__name__)
+
+history_file = os.path.join(os.path.expanduser('~'), '.TiRiFiG', 'run_history.sqlite')
+
+schema = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    galaxy TEXT NOT NULL,
+    def_file TEXT NOT NULL,
+    template_hash TEXT NOT NULL,
+    tirdef TEXT,
+    started REAL NOT NULL,
+    seconds REAL,
+    returncode INTEGER,
+    status TEXT NOT NULL,
+    session BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    parameter TEXT NOT NULL,
+    fitted INTEGER NOT NULL,
+    input BLOB NOT NULL,
+    final BLOB,
+    PRIMARY KEY (run_id, parameter)
+);
+CREATE INDEX IF NOT EXISTS runs_galaxy ON runs (galaxy, started);
+CREATE INDEX IF NOT EXISTS runs_hash ON runs (template_hash);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (status, started);
+CREATE INDEX IF NOT EXISTS parameters_fitted ON parameters (parameter, fitted, run_id);
+"""
+
+
+def galaxy_name(template):
+    """The stem of INSET in lower case, e.g. n5204 for n5204.fits"""
+    inset = os.path.basename(template.get('INSET', '').strip())
+    return os.path.splitext(inset)[0].lower() or 'unknown'
+
+
+def _pack(arrays):
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _values(blob):
+    return None if blob is None else np.frombuffer(blob, dtype=np.float64)
+
+
+class RunRecord():
+    """One run of the history
+
+    Instance variables:
+        id            (int):     key of the run.
+        galaxy        (string):  see galaxy_name.
+        def_file      (string):  the .def file that was run.
+        template_hash (string):  def_hash of that file when it was run.
+        tirdef        (string):  the .def file TiRiFiC wrote the fit to.
+        started       (float):   time.time() at the start.
+        seconds       (float):   wall time, None while running.
+        returncode    (int):     exit status of tirific, None while running.
+        status        (string):  'running', 'finished' or 'failed'.
+    """
+
+    columns = ['id', 'galaxy', 'def_file', 'template_hash', 'tirdef', 'started',
+               'seconds', 'returncode', 'status']
+
+    def __init__(self, row):
+        for name, value in zip(self.columns, row):
+            setattr(self, name, value)
+
+
+class RunHistory():
+    """The database with the runs
+
+    Every method opens its own connection, so the history can be written from
+    the thread that waits for a run while the GUI reads it.
+
+    Instance variables:
+        path  (string):  the SQLite file.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or history_file
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(schema)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30.)
+        connection.execute('PRAGMA foreign_keys = ON')
+        connection.execute('PRAGMA journal_mode = WAL')
+        return connection
+
+    def start_run(self, def_file, template, session_arrays):
+        """Store a run that is about to start
+
+        Keyword arguments:
+        def_file (string)--       the .def file, as it will be run
+        template (dict)--         the Tirific_Template written to def_file
+        session_arrays (dict)--   the session arrays of the window
+
+        Returns:
+        the id of the run
+        """
+        directory = os.path.dirname(os.path.abspath(def_file))
+        tirdef = template.get('TIRDEF', '').strip()
+        fitted = {parameter for block in parse_vary(template.get('VARY', ''))
+                  for parameter, rings in block}
+        names = [str(name) for name in session_arrays['par_names']]
+        with self._connect() as connection:
+            cursor = connection.execute(
+                'INSERT INTO runs (galaxy, def_file, template_hash, tirdef, started, status, '
+                'session) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (galaxy_name(template), os.path.abspath(def_file), def_hash(def_file),
+                 os.path.join(directory, tirdef) if tirdef else None, time.time(), 'running',
+                 _pack(session_arrays)))
+            run_id = cursor.lastrowid
+            connection.executemany(
+                'INSERT INTO parameters (run_id, parameter, fitted, input) VALUES (?, ?, ?, ?)',
+                [(run_id, name, int(name in fitted),
+                  np.asarray(values, dtype=np.float64).tobytes())
+                 for name, values in zip(names, session_arrays['values'])])
+        connection.close()
+        return run_id
+
+    def finish_run(self, run_id, returncode, seconds):
+        """Store the outcome of a run and the parameters it wrote to TIRDEF"""
+        with self._connect() as connection:
+            tirdef, = connection.execute('SELECT tirdef FROM runs WHERE id = ?',
+                                         (run_id,)).fetchone()
+            final = {}
+            if returncode == 0 and tirdef:
+                # parsed here rather than through the workspace cache, as this
+                # runs on the thread that waited for tirific
+                try:
+                    final = FAT_sup.tirific_template(tirdef)
+                except (OSError, KeyError, ValueError) as e:
+                    logger.warning('Cannot read the fit of run %s from %s: %s', run_id, tirdef, e)
+            rows = connection.execute('SELECT parameter, input FROM parameters WHERE run_id = ?',
+                                      (run_id,)).fetchall()
+            updates = []
+            for parameter, input_blob in rows:
+                try:
+                    values = np.array(final[parameter].split(), dtype=np.float64)
+                except (KeyError, ValueError):
+                    continue
+                no_rings = len(_values(input_blob))
+                # tirific drops trailing rings that equal the last one
+                if 0 < len(values) < no_rings:
+                    values = np.append(values, np.full(no_rings - len(values), values[-1]))
+                updates.append((values[:no_rings].tobytes(), run_id, parameter))
+            connection.executemany('UPDATE parameters SET final = ? WHERE run_id = ? AND '
+                                   'parameter = ?', updates)
+            connection.execute('UPDATE runs SET seconds = ?, returncode = ?, status = ? '
+                               'WHERE id = ?',
+                               (seconds, returncode, 'finished' if returncode == 0 else 'failed',
+                                run_id))
+        connection.close()
+
+    def query(self, galaxy=None, parameter=None, fitted=None, status=None,
+              template_hash=None, limit=500):
+        """The runs that match all given criteria, newest first
+
+        Keyword arguments:
+        galaxy (string)--         galaxy name, or the start of it
+        parameter (string)--      a parameter that was in the template, e.g. INCL
+        fitted (bool)--           with parameter: whether it was fitted
+        status (string)--         'running', 'finished' or 'failed'
+        template_hash (string)--  the def_hash of the .def file that was run
+        limit (int)--             the maximum number of runs
+
+        Returns:
+        list of RunRecords
+        """
+        where, arguments = [], []
+        if galaxy:
+            # a range rather than LIKE, so the index on galaxy is used
+            where.append('runs.galaxy >= ? AND runs.galaxy < ?')
+            arguments += [galaxy.lower(), galaxy.lower() + '\uffff']
+        if parameter:
+            condition = 'parameters.parameter = ? AND parameters.run_id = runs.id'
+            arguments.append(parameter.upper())
+            if fitted is not None:
+                condition += ' AND parameters.fitted = ?'
+                arguments.append(int(fitted))
+            where.append(f'EXISTS (SELECT 1 FROM parameters WHERE {condition})')
+        if status:
+            where.append('runs.status = ?')
+            arguments.append(status)
+        if template_hash:
+            where.append('runs.template_hash = ?')
+            arguments.append(template_hash)
+        sql = f'SELECT {", ".join(RunRecord.columns)} FROM runs'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY runs.started DESC LIMIT ?'
+        with self._connect() as connection:
+            rows = connection.execute(sql, arguments + [int(limit)]).fetchall()
+        connection.close()
+        return [RunRecord(row) for row in rows]
+
+    def galaxies(self):
+        with self._connect() as connection:
+            rows = connection.execute('SELECT DISTINCT galaxy FROM runs ORDER BY galaxy').fetchall()
+        connection.close()
+        return [row[0] for row in rows]
+
+    def parameters(self, run_id):
+        """{parameter: (fitted, input values, final values or None)} of a run"""
+        with self._connect() as connection:
+            rows = connection.execute('SELECT parameter, fitted, input, final FROM parameters '
+                                      'WHERE run_id = ?', (run_id,)).fetchall()
+        connection.close()
+        return {parameter: (bool(fitted), _values(input_blob), _values(final_blob))
+                for parameter, fitted, input_blob, final_blob in rows}
+
+    def session(self, run_id, results=False):
+        """The session arrays of a run, to restore it as a session
+
+        Keyword arguments:
+        run_id (int)--    the run
+        results (bool)--  give the parameters the values TiRiFiC fitted; the
+                          undo history is left out as it belongs to the input
+
+        Returns:
+        np.lib.npyio.NpzFile, or a dict when results is True
+        """
+        with self._connect() as connection:
+            blob, = connection.execute('SELECT session FROM runs WHERE id = ?',
+                                       (run_id,)).fetchone()
+        connection.close()
+        session = np.load(io.BytesIO(blob), allow_pickle=False)
+        if not results:
+            return session
+        arrays = {key: session[key] for key in session.files
+                  if not key.startswith(('history_', 'original_'))}
+        session.close()
+        values = np.array(arrays['values'], dtype=np.float64)
+        parameters = self.parameters(run_id)
+        for i, name in enumerate(arrays['par_names']):
+            final = parameters.get(str(name), (None, None, None))[2]
+            if final is not None and len(final) == values.shape[1]:
+                values[i] = final
+        arrays['values'] = values
+        return _ArraySession(arrays)
+
+    def delete(self, run_id):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM runs WHERE id = ?', (run_id,))
+        connection.close()
+
+
+class _ArraySession(dict):
+    """Session arrays in a dict that can be closed like an NpzFile"""
+
+    def close(self):
+        pass
@@ -0,0 +1,186 @@
+# -*- coding: UTF-8 -*-
+"""Saving templates off the GUI thread.
+
+A SaveSnapshot holds copies of everything that goes into the .def file: the
+template, the values, errors and precision of every parameter and the
+fitting settings. Taking it costs no more than copying the arrays. Putting
+the values and fitting settings in the template, formatting and writing the
+file is done from the snapshot by a CoalescingWorker: a single worker thread
+that, when new work arrives while it is busy, only keeps the newest request.
+
+classes:
+    CoalescingWorker:  runs a function on one worker thread, coalescing requests.
+    SaveSnapshot:      the state that is written to the .def file.
+
+functions:
+    build_template:    the template of a snapshot with the values and settings.
+    write_template:    write a template to a .def file atomically.
+    save_snapshot:     build and write a snapshot, and its session file.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import os
+import threading
+
+import numpy as np
+from pyFAT_astro.Support.modify_template import update_disk_angles
+
+from TiRiFiG.Support.fit_settings import fitting_parameters, format_fit_settings
+from TiRiFiG.Support.session import write_session
+from TiRiFiG.Support.workspace import copy_template
+
+# update_disk_angles needs the angles of both disks
+disk_angles = ['PA', 'INCL', 'PA_2', 'INCL_2']
+
+
+class CoalescingWorker():
+    """Runs function on one worker thread
+
+    When submit is called while the worker is busy the arguments are kept and
+    run afterwards; a later submit replaces them, so only the newest waiting
+    request is run.
+
+    Instance variables:
+        function  (function):  called with the submitted arguments.
+        done      (function):  called on the worker thread with the arguments,
+                               the result and the exception (None if it
+                               succeeded) of every run.
+    """
+
+    def __init__(self, function, done=None):
+        self.function = function
+        self.done = done
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._busy = False
+        self._waiting = None
+
+    @property
+    def busy(self):
+        return self._busy
+
+    def submit(self, *args):
+        with self._lock:
+            if self._busy:
+                self._waiting = args
+                return
+            self._busy = True
+            self._idle.clear()
+        self._pool.submit(self._run, args)
+
+    def _run(self, args):
+        while True:
+            result, error = None, None
+            try:
+                result = self.function(*args)
+            except Exception as e:
+                error = e
+            if self.done is not None:
+                self.done(args, result, error)
+            with self._lock:
+                if self._waiting is None:
+                    self._busy = False
+                    self._idle.set()
+                    return
+                args = self._waiting
+                self._waiting = None
+
+    def cancel_waiting(self):
+        """Drop the request that is waiting, the running one is finished"""
+        with self._lock:
+            self._waiting = None
+
+    def after(self, function, *args):
+        """Run function on the worker thread after the requests before it"""
+        return self._pool.submit(function, *args)
+
+    def wait(self):
+        """Block until the running and waiting requests are done"""
+        self._idle.wait()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+class SaveSnapshot():
+    """Copies of the state that is written to the .def file
+
+    Instance variables:
+        fileName      (string):  the .def file.
+        template      (dict):    copy of the Tirific_Template.
+        parameters    (list):    (key, values, errors, precision) to put in the
+                                 template, RADI first.
+        settings      (dict):    copies of the ParameterFitSettings to write.
+        precisions    (dict):    [decimals, notation] per parameter.
+        configuration (dict):    the pyFAT configuration.
+        session       (dict):    arrays of the session file, None for none.
+    """
+
+    def __init__(self, fileName, template, parameters, settings, precisions,
+                 configuration, session=None):
+        self.fileName = fileName
+        self.template = copy_template(template)
+        self.parameters = [(key, np.array(values, dtype=float), np.array(errors, dtype=float),
+                            list(precision)) for key, values, errors, precision in parameters]
+        self.settings = copy.deepcopy(settings)
+        self.precisions = {key: list(value) for key, value in precisions.items()}
+        self.configuration = configuration
+        self.session = None if session is None else \
+            {key: np.array(value, copy=True) for key, value in session.items()}
+
+
+def _format(values, precision):
+    return ' '.join([f'{val:{precision}}' for val in values])
+
+
+def build_template(snapshot):
+    """Put the values, errors and fitting settings of the snapshot in its template
+
+    Returns:
+    the template of the snapshot
+    """
+    template = snapshot.template
+    for key, values, errors, numPrecision in snapshot.parameters:
+        precision = f'.{numPrecision[0]}{numPrecision[1].lower()}'
+        template[key] = _format(values, precision)
+        if not np.all(np.isnan(errors)):
+            template[f'# {key}_ERR'] = _format(errors, precision)
+    for fit_key in fitting_parameters:
+        template[fit_key] = ''
+    template.update(format_fit_settings(snapshot.settings, snapshot.precisions))
+    if all(angle in template for angle in disk_angles):
+        update_disk_angles(snapshot.configuration, template)
+    return template
+
+
+def write_template(template, fileName):
+    """Write a template as a .def file, replacing the old file only when the
+    new one is complete"""
+    tmp_fileName = f'{fileName}.tmp'
+    with open(tmp_fileName, 'w') as file:
+        for key in template:
+            if key[0:5] == 'EMPTY':
+                file.write('\n')
+            else:
+                file.write((f"{key}= {template[key]} \n"))
+    os.replace(tmp_fileName, fileName)
+
+
+def save_snapshot(snapshot):
+    """Build and write the template of a snapshot, then its session file
+
+    Returns:
+    the template as written
+    """
+    template = build_template(snapshot)
+    write_template(template, snapshot.fileName)
+    if snapshot.session is not None:
+        session = dict(snapshot.session)
+        session['template_keys'] = np.array(list(template.keys()), dtype=str)
+        session['template_values'] = np.array([str(value) for value in template.values()],
+                                              dtype=str)
+        write_session(snapshot.fileName, session)
+    return template
@@ -0,0 +1,148 @@
+# -*- coding: UTF-8 -*-
+"""Binary session files.
+
+A session is an uncompressed .npz next to the .def file holding everything
+that is otherwise rebuilt from the template when a file is opened: the
+template itself, the ring-parameter values and errors, the fitting settings
+arrays, the undo history of every graph widget, the layout and the scales.
+The arrays are only read when they are accessed, so opening a session does
+not depend on the size of the template. The hash of the .def file is stored
+so a session is only used when the .def file has not changed since.
+
+functions:
+    session_path:          the session file belonging to a .def file.
+    def_hash:              hash of the contents of a .def file.
+    encode_history:        undo history as a base plus changed values.
+    decode_history:        the undo history back from its deltas.
+    pack_fit_settings:     the ParameterFitSettings as stacked arrays.
+    unpack_fit_settings:   ParameterFitSettings from the stacked arrays.
+    write_session:         write a session atomically.
+    read_session:          open the session of a .def file if it is current.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from TiRiFiG.Support.fit_settings import ParameterFitSettings, fit_columns, integer_columns
+
+session_version = 1
+
+
+def session_path(def_file):
+    return f'{os.path.splitext(def_file)[0]}_TiRiFiG_session.npz'
+
+
+def def_hash(def_file):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(def_file, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def encode_history(history):
+    """Store a list of value arrays as the first one plus what changed
+
+    Returns:
+    base:np.ndarray, entries:np.ndarray, indices:np.ndarray, values:np.ndarray
+    The first array, and for every change the number of the history entry,
+    the ring index and the new value.
+    """
+    history = [np.asarray(entry, dtype=float) for entry in history]
+    base = history[0]
+    entries, indices, values = [], [], []
+    for number in range(1, len(history)):
+        changed = np.flatnonzero(history[number] != history[number-1])
+        entries.append(np.full(len(changed), number))
+        indices.append(changed)
+        values.append(history[number][changed])
+    if len(entries) == 0:
+        return base, np.arange(0), np.arange(0), np.zeros(0)
+    return base, np.concatenate(entries), np.concatenate(indices), np.concatenate(values)
+
+
+def decode_history(base, length, entries, indices, values):
+    """The list of length value arrays back from encode_history"""
+    history = [np.array(base, dtype=float)]
+    bounds = np.searchsorted(entries, np.arange(1, length + 1))
+    for number in range(1, length):
+        current = history[-1].copy()
+        current[indices[bounds[number-1]:bounds[number]]] = values[bounds[number-1]:bounds[number]]
+        history.append(current)
+    return history
+
+
+def pack_fit_settings(settings):
+    """The fitting settings of all parameters as arrays stacked per parameter"""
+    names = list(settings)
+    arrays = {'fit_names': np.array(names, dtype=str)}
+    if len(names) == 0:
+        return arrays
+    for attribute in ['to_fit', 'interpolation', 'block_fit', 'group_start', 'group_end']:
+        arrays[f'fit_{attribute}'] = np.stack([getattr(settings[name], attribute)
+                                               for name in names])
+    arrays['fit_fitted'] = np.array([settings[name].fitted for name in names])
+    arrays['fit_columns'] = np.stack([np.stack([settings[name].columns[key]
+                                                for key in fit_columns]) for name in names])
+    arrays['fit_defaults'] = np.array([[np.nan if settings[name].defaults[key] is None
+                                        else settings[name].defaults[key]
+                                        for key in fit_columns] for name in names], dtype=float)
+    return arrays
+
+
+def unpack_fit_settings(arrays, no_rings):
+    """The ParameterFitSettings per parameter back from pack_fit_settings"""
+    settings = {}
+    names = [str(name) for name in arrays['fit_names']]
+    if len(names) == 0:
+        return settings
+    stacked = {attribute: arrays[f'fit_{attribute}'] for attribute in
+               ['to_fit', 'interpolation', 'block_fit', 'group_start', 'group_end',
+                'fitted', 'columns', 'defaults']}
+    for i, name in enumerate(names):
+        parameter = ParameterFitSettings(name, no_rings)
+        for attribute in ['to_fit', 'interpolation', 'block_fit', 'group_start', 'group_end']:
+            setattr(parameter, attribute, np.array(stacked[attribute][i]))
+        parameter.fitted = bool(stacked['fitted'][i])
+        for j, key in enumerate(fit_columns):
+            parameter.columns[key] = np.array(stacked['columns'][i, j], dtype=float)
+            default = stacked['defaults'][i, j]
+            parameter.defaults[key] = None if np.isnan(default) else \
+                (int(default) if key in integer_columns else float(default))
+        settings[name] = parameter
+    return settings
+
+
+def write_session(def_file, arrays, path=None):
+    """Write the arrays as the session of def_file, replacing an older one
+    only when the new one is complete. path defaults to session_path."""
+    if path is None:
+        path = session_path(def_file)
+    tmp_path = f'{path}.tmp.npz'
+    np.savez(tmp_path, session_version=session_version, def_hash=def_hash(def_file),
+             **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_session(def_file, path=None):
+    """The session of def_file, None if there is none or the .def file changed
+
+    Returns:
+    np.lib.npyio.NpzFile, the arrays are read when they are accessed
+    """
+    if path is None:
+        path = session_path(def_file)
+    if not os.path.isfile(path):
+        return None
+    try:
+        session = np.load(path, allow_pickle=False)
+        if int(session['session_version']) != session_version or \
+                str(session['def_hash']) != def_hash(def_file):
+            session.close()
+            return None
+    except (OSError, KeyError, ValueError):
+        return None
+    return session
@@ -0,0 +1,297 @@
+# -*- coding: UTF-8 -*-
+"""Pre-flight checks of a template before it is run by TiRiFiC or saved.
+
+Every ring row, every fitting column and every VARY block is turned into a
+NumPy array once and checked as a whole, so a template of any size is
+checked in milliseconds. The problems are returned as TemplateIssues that
+name the key, and the rings or VARY blocks, that are wrong.
+
+classes:
+    TemplateIssue:   one problem found in a template.
+
+functions:
+    parse_vary:      the parameters and rings of every VARY block.
+    check_template:  all problems of a template.
+    format_issues:   the problems as text, errors first.
+
+variables:
+    ring_parameters: the tilted-ring parameters that have a value per ring.
+    global_parameters: the fitted parameters that have a single value.
+"""
+
+import os
+
+import numpy as np
+
+from TiRiFiG.Support.cube import CubeError, FitsCube
+from TiRiFiG.Support.fit_settings import fit_columns, parse_varindx
+from TiRiFiG.Support.plot_support import parameter_units
+from TiRiFiG.Support.template_diff import ring_ranges, split_disk
+
+ring_parameters = sorted(set(parameter_units) | {'VVER', 'DVVE', 'DVRA', 'ZDRA', 'ZDRO'})
+# parameters that TiRiFiC fits with a single value for all rings
+global_parameters = ['CONDISP']
+# parameters outside these ranges make no sense to TiRiFiC, (minimum, maximum)
+physical_ranges = {'INCL': (0., 180.), 'SBR': (0., np.inf), 'SDIS': (0., np.inf),
+                   'Z0': (0., np.inf), 'RADI': (0., np.inf)}
+
+
+class TemplateIssue():
+    """One problem found in a template
+
+    Instance variables:
+        severity  (string):      'error' when TiRiFiC would fail or fit
+                                 nonsense, 'warning' when it is suspicious.
+        key       (string):      the template key, e.g. PARMIN or VROT_2.
+        message   (string):      what is wrong.
+        rings     (np.ndarray):  the 1-based rings concerned, empty when the
+                                 problem is not ring specific.
+    """
+
+    def __init__(self, severity, key, message, rings=()):
+        self.severity = severity
+        self.key = key
+        self.message = message
+        self.rings = np.asarray(rings, dtype=np.int64)
+
+    def __str__(self):
+        where = f' ring {ring_ranges(self.rings - 1)}' if len(self.rings) > 0 else ''
+        return f'{self.key}{where}: {self.message}'
+
+
+def _numbers(text):
+    """The space separated values of text as floats, NaN where not a number,
+    and whether they all were numbers"""
+    parts = text.split()
+    try:
+        return np.array(parts, dtype=float), True
+    except ValueError:
+        values = np.full(len(parts), np.nan)
+        for i, part in enumerate(parts):
+            try:
+                values[i] = float(part)
+            except ValueError:
+                pass
+        return values, False
+
+
+def parse_vary(vary):
+    """The parameters and rings of every block of a VARY line
+
+    Keyword arguments:
+    vary (string)--  the value of VARY, e.g. '!PA 1:12, VROT 2:12 VROT_2 2:12'
+
+    Returns:
+    list with per block a list of (parameter, rings) with the rings as an
+    array of 1-based ring numbers; a parameter without rings gets none
+    """
+    blocks = []
+    for block in vary.split(','):
+        entries = []
+        for token in block.replace('!', ' ').split():
+            if token[0].isalpha():
+                entries.append((token.upper(), []))
+            elif entries:
+                bounds = [int(float(x)) for x in token.split(':')[:2]]
+                first, last = min(bounds), max(bounds)
+                entries[-1][1].extend(range(first, last + 1))
+        if entries:
+            blocks.append([(parameter, np.array(rings, dtype=np.int64))
+                           for parameter, rings in entries])
+    return blocks
+
+
+def _check_rows(template, no_rings, ndisks, issues):
+    """Length, numbers and ranges of the ring rows; returns the rows"""
+    rows = {}
+    for key, value in template.items():
+        name, disk = split_disk(key)
+        if name not in ring_parameters:
+            continue
+        values, numeric = _numbers(value)
+        rows[key] = values
+        if not numeric:
+            issues.append(TemplateIssue('error', key, 'is not a number',
+                                        np.flatnonzero(np.isnan(values)) + 1))
+        elif len(values) > 0 and not np.all(np.isfinite(values)):
+            issues.append(TemplateIssue('error', key, 'is not finite',
+                                        np.flatnonzero(~np.isfinite(values)) + 1))
+        if len(values) > no_rings:
+            issues.append(TemplateIssue('error', key,
+                                        f'has {len(values)} values but NUR is {no_rings}'))
+        elif 0 < len(values) < no_rings:
+            issues.append(TemplateIssue('warning', key,
+                                        f'has {len(values)} values for NUR = {no_rings}, '
+                                        'TiRiFiC repeats the last one'))
+        if disk > ndisks:
+            issues.append(TemplateIssue('warning', key, f'is disk {disk} but NDISKS is {ndisks}'))
+        if name in physical_ranges:
+            minimum, maximum = physical_ranges[name]
+            with np.errstate(invalid='ignore'):
+                outside = (values < minimum) | (values > maximum)
+            if np.any(outside):
+                issues.append(TemplateIssue('error' if name == 'RADI' else 'warning', key,
+                                            f'is outside [{minimum:g}, {maximum:g}]',
+                                            np.flatnonzero(outside) + 1))
+    radii = rows.get('RADI')
+    if radii is None or len(radii) == 0:
+        issues.append(TemplateIssue('error', 'RADI', 'is missing'))
+    elif np.any(np.diff(radii) <= 0.):
+        issues.append(TemplateIssue('error', 'RADI', 'does not increase',
+                                    np.flatnonzero(np.diff(radii) <= 0.) + 2))
+    return rows
+
+
+def _check_fitting(template, no_rings, rows, issues):
+    """VARY, VARINDX and the fitting columns"""
+    blocks = parse_vary(template.get('VARY', ''))
+    for i, block in enumerate(blocks):
+        for parameter, rings in block:
+            if parameter not in template:
+                issues.append(TemplateIssue('error', 'VARY',
+                                            f'block {i + 1} fits {parameter}, which is not '
+                                            'in the template'))
+            if parameter in global_parameters:
+                continue
+            if len(rings) == 0:
+                issues.append(TemplateIssue('error', 'VARY',
+                                            f'block {i + 1} gives no rings for {parameter}'))
+            outside = rings[(rings < 1) | (rings > no_rings)]
+            if len(outside) > 0:
+                issues.append(TemplateIssue('error', 'VARY',
+                                            f'block {i + 1} fits {parameter} beyond NUR = '
+                                            f'{no_rings}', outside))
+    varied = {parameter for block in blocks for parameter, rings in block}
+    for parameter, rings in parse_varindx(template.get('VARINDX', '')).items():
+        rings = np.asarray(rings, dtype=np.int64)
+        outside = rings[(rings < 1) | (rings > no_rings)]
+        if len(outside) > 0:
+            issues.append(TemplateIssue('error', 'VARINDX',
+                                        f'{parameter} interpolates beyond NUR = {no_rings}',
+                                        outside))
+        if parameter not in varied:
+            issues.append(TemplateIssue('warning', 'VARINDX',
+                                        f'{parameter} is interpolated but not in VARY'))
+
+    columns = {}
+    for key in fit_columns:
+        values, numeric = _numbers(template.get(key, ''))
+        if not numeric:
+            issues.append(TemplateIssue('error', key,
+                                        f'block {", ".join(str(i + 1) for i in np.flatnonzero(np.isnan(values)))}'
+                                        ' is not a number'))
+        if len(values) != len(blocks):
+            issues.append(TemplateIssue('error', key,
+                                        f'has {len(values)} columns for {len(blocks)} VARY blocks'))
+        else:
+            columns[key] = values
+    if 'PARMIN' in columns and 'PARMAX' in columns:
+        for i in np.flatnonzero(columns['PARMIN'] > columns['PARMAX']):
+            issues.append(TemplateIssue('error', 'PARMIN',
+                                        f'is above PARMAX in block {i + 1} '
+                                        f'({", ".join(p for p, r in blocks[i])})'))
+        # fitted rings that start outside the allowed range
+        for i, block in enumerate(blocks):
+            if columns['PARMIN'][i] > columns['PARMAX'][i]:
+                continue
+            for parameter, rings in block:
+                values = rows.get(parameter)
+                if values is None:
+                    continue
+                rings = rings[(rings >= 1) & (rings <= len(values))]
+                ring_values = values[rings - 1]
+                outside = rings[(ring_values < columns['PARMIN'][i]) |
+                                (ring_values > columns['PARMAX'][i])]
+                if len(outside) > 0:
+                    issues.append(TemplateIssue(
+                        'warning', parameter, f'is outside PARMIN/PARMAX of VARY block {i + 1} '
+                        f'[{columns["PARMIN"][i]:g}, {columns["PARMAX"][i]:g}]', outside))
+    for key in ['DELSTART', 'DELEND']:
+        if key in columns:
+            for i in np.flatnonzero(columns[key] <= 0.):
+                issues.append(TemplateIssue('error', key, f'is not positive in block {i + 1}'))
+    if 'DELSTART' in columns and 'DELEND' in columns:
+        for i in np.flatnonzero(columns['DELEND'] > columns['DELSTART']):
+            issues.append(TemplateIssue('warning', 'DELEND',
+                                        f'is above DELSTART in block {i + 1}'))
+
+
+def _check_cube(template, def_directory, rows, issues):
+    """INSET exists, is a cube and matches the beam and position of the template"""
+    inset = template.get('INSET', '').strip()
+    if not inset:
+        issues.append(TemplateIssue('error', 'INSET', 'no data cube is given'))
+        return
+    path = os.path.join(def_directory, inset)
+    if not os.path.isfile(path):
+        issues.append(TemplateIssue('error', 'INSET', f'{path} does not exist'))
+        return
+    try:
+        cube = FitsCube(path)
+    except (CubeError, OSError, KeyError, ValueError) as e:
+        issues.append(TemplateIssue('error', 'INSET', str(e)))
+        return
+    header = cube.header
+    for key in ['BMAJ', 'BMIN']:
+        if key not in header or key not in template:
+            continue
+        values, numeric = _numbers(template[key])
+        cube_beam = float(header[key]) * 3600.
+        if numeric and len(values) > 0 and not np.isclose(values[0], cube_beam, rtol=0.01):
+            issues.append(TemplateIssue('warning', key,
+                                        f'is {values[0]:g} arcsec, the cube has {cube_beam:g}'))
+    for disk_suffix in {key[len('XPOS'):] for key in rows if key.startswith('XPOS')}:
+        xpos = rows.get(f'XPOS{disk_suffix}')
+        ypos = rows.get(f'YPOS{disk_suffix}')
+        if xpos is None or ypos is None or len(xpos) != len(ypos):
+            continue
+        x, y = cube.world_to_pixel(xpos, ypos)
+        outside = (x < 0) | (x > cube.shape[2] - 1) | (y < 0) | (y > cube.shape[1] - 1)
+        if np.any(outside):
+            issues.append(TemplateIssue('warning', f'XPOS{disk_suffix}',
+                                        f'and YPOS{disk_suffix} are outside the cube',
+                                        np.flatnonzero(outside) + 1))
+    velocities = cube.channel_velocities()
+    for key in [key for key in rows if split_disk(key)[0] == 'VSYS']:
+        outside = (rows[key] < velocities.min()) | (rows[key] > velocities.max())
+        if np.any(outside):
+            issues.append(TemplateIssue('warning', key,
+                                        f'is outside the velocities of the cube '
+                                        f'[{velocities.min():g}, {velocities.max():g}] km/s',
+                                        np.flatnonzero(outside) + 1))
+
+
+def check_template(template, def_directory=None):
+    """All problems of a template
+
+    Keyword arguments:
+    template (dict)--         the Tirific_Template, as it is written
+    def_directory (string)--  directory of the .def file, to find INSET; the
+                              cube is not checked when None
+
+    Returns:
+    list of TemplateIssues, empty when nothing is wrong
+    """
+    issues = []
+    try:
+        no_rings = int(float(template['NUR']))
+    except (KeyError, ValueError):
+        return [TemplateIssue('error', 'NUR', 'is missing or not a number')]
+    if no_rings < 1:
+        return [TemplateIssue('error', 'NUR', f'is {no_rings}')]
+    try:
+        ndisks = int(float(template.get('NDISKS', 1)))
+    except ValueError:
+        issues.append(TemplateIssue('error', 'NDISKS', 'is not a number'))
+        ndisks = 1
+    rows = _check_rows(template, no_rings, ndisks, issues)
+    _check_fitting(template, no_rings, rows, issues)
+    if def_directory is not None:
+        _check_cube(template, def_directory, rows, issues)
+    return issues
+
+
+def format_issues(issues):
+    """The issues as text, one per line, errors before warnings"""
+    ordered = sorted(issues, key=lambda issue: issue.severity != 'error')
+    return '\n'.join(f'{issue.severity.capitalize()}: {issue}' for issue in ordered)
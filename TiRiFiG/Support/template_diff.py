@@ -0,0 +1,178 @@
+# -*- coding: UTF-8 -*-
+"""Ring by ring differences between two templates.
+
+The parameters of both templates are aligned on their name and disk (VROT and
+VROT_2 are disk 1 and 2 of VROT), stacked into one (parameters, rings) array
+per template, padded with NaN where a template has fewer rings, and the
+absolute and relative deltas of all parameters are computed in one pass.
+
+classes:
+    TemplateDiff:  the aligned values and deltas of two templates.
+
+functions:
+    split_disk:       parameter name and disk number of a template key.
+    ring_ranges:      ring numbers written as ranges.
+    diff_values:      TemplateDiff of two dicts of ring values.
+    diff_templates:   TemplateDiff of two .def files.
+    main:             command line comparison of output .def files.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from TiRiFiG.Support.workspace import template_cache
+
+
+def split_disk(key):
+    """('VROT', 2) for VROT_2, ('VROT', 1) for VROT"""
+    name, _, disk = key.rpartition('_')
+    if name and disk.isdigit():
+        return name, int(disk)
+    return key, 1
+
+
+def _stack(values, keys, no_rings):
+    stacked = np.full((len(keys), no_rings), np.nan)
+    for i, key in enumerate(keys):
+        if key in values:
+            row = np.asarray(values[key], dtype=float)[:no_rings]
+            stacked[i, :len(row)] = row
+    return stacked
+
+
+class TemplateDiff():
+    """Aligned values and per ring deltas of two templates
+
+    Instance variables:
+        keys       (list):        template keys, sorted on parameter and disk.
+        radii      (np.ndarray):  RADI of the new template (of the old one
+                                  where the new one has fewer rings).
+        old, new   (np.ndarray):  (parameters, rings) values, NaN when absent.
+        delta      (np.ndarray):  new - old.
+        relative   (np.ndarray):  delta / |old|, NaN where old is 0.
+        added      (list):        keys only in the new template.
+        removed    (list):        keys only in the old template.
+    """
+
+    def __init__(self, old, new, old_radii, new_radii):
+        common = set(old) & set(new)
+        self.keys = sorted(common, key=split_disk)
+        self.added = sorted(set(new) - common, key=split_disk)
+        self.removed = sorted(set(old) - common, key=split_disk)
+        no_rings = max(len(old_radii), len(new_radii))
+        radii = _stack({'new': new_radii, 'old': old_radii}, ['new', 'old'], no_rings)
+        self.radii = np.where(np.isnan(radii[0]), radii[1], radii[0])
+        self.old = _stack(old, self.keys, no_rings)
+        self.new = _stack(new, self.keys, no_rings)
+        self.delta = self.new - self.old
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.relative = np.where(self.old != 0., self.delta / np.abs(self.old), np.nan)
+
+    def changed(self, atol=0., rtol=0.):
+        """(parameters, rings) mask of the rings that changed more than the
+        tolerances, or that exist in one template only"""
+        with np.errstate(invalid='ignore'):
+            beyond = np.abs(self.delta) > atol + rtol * np.abs(self.old)
+        return beyond | (np.isnan(self.old) != np.isnan(self.new))
+
+    def parameter(self, key):
+        """radii, old, new and delta of one template key"""
+        i = self.keys.index(key)
+        return self.radii, self.old[i], self.new[i], self.delta[i]
+
+    def summary(self, atol=0., rtol=0.):
+        """One row per parameter with changed rings
+
+        Returns:
+        list of dicts with 'key', 'rings' (indices of the changed rings),
+        'max_delta' (largest absolute delta) and 'max_relative'
+        """
+        changed = self.changed(atol=atol, rtol=rtol)
+        absolute = np.where(changed, np.abs(self.delta), np.nan)
+        relative = np.where(changed, np.abs(self.relative), np.nan)
+        rows = []
+        for i in np.flatnonzero(changed.any(axis=1)):
+            with np.errstate(invalid='ignore'):
+                max_delta = np.nanmax(absolute[i]) if np.any(np.isfinite(absolute[i])) else np.nan
+                max_relative = np.nanmax(relative[i]) if np.any(np.isfinite(relative[i])) else np.nan
+            rows.append({'key': self.keys[i], 'rings': np.flatnonzero(changed[i]),
+                         'max_delta': max_delta, 'max_relative': max_relative})
+        return rows
+
+    def format_table(self, atol=0., rtol=0., rings=False):
+        """The summary as text, with the delta of every changed ring if rings"""
+        lines = [f"{'Parameter':<12}{'Rings':>7}{'Max delta':>14}{'Max rel.':>11}  Changed rings"]
+        for row in self.summary(atol=atol, rtol=rtol):
+            lines.append(f"{row['key']:<12}{len(row['rings']):>7}{row['max_delta']:>14.5g}"
+                         f"{row['max_relative']:>11.3%}  {ring_ranges(row['rings'])}")
+            if rings:
+                i = self.keys.index(row['key'])
+                for ring in row['rings']:
+                    lines.append(f"    ring {ring + 1:>4} RADI={self.radii[ring]:<10.5g}"
+                                 f"{self.old[i, ring]:>14.6g} -> {self.new[i, ring]:<14.6g}"
+                                 f"({self.delta[i, ring]:+.5g})")
+        if self.added:
+            lines.append(f"Only in the new template: {', '.join(self.added)}")
+        if self.removed:
+            lines.append(f"Only in the old template: {', '.join(self.removed)}")
+        return '\n'.join(lines)
+
+
+def ring_ranges(rings):
+    """1-based ring numbers as ranges, e.g. '1-3 7'"""
+    if len(rings) == 0:
+        return ''
+    rings = np.asarray(rings) + 1
+    breaks = np.flatnonzero(np.diff(rings) != 1) + 1
+    ranges = []
+    for block in np.split(rings, breaks):
+        ranges.append(f'{block[0]}' if len(block) == 1 else f'{block[0]}-{block[-1]}')
+    return ' '.join(ranges)
+
+
+def diff_values(old, new):
+    """TemplateDiff of two dicts of ring values that both contain RADI"""
+    old = dict(old)
+    new = dict(new)
+    old_radii = np.asarray(old.pop('RADI'), dtype=float)
+    new_radii = np.asarray(new.pop('RADI'), dtype=float)
+    return TemplateDiff(old, new, old_radii, new_radii)
+
+
+def diff_templates(old_file, new_file):
+    """TemplateDiff of two .def files, parsed through the template cache"""
+    old = template_cache.get(old_file)
+    new = template_cache.get(new_file)
+    return TemplateDiff(old.values, new.values, old.radii, new.radii)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Show which parameters and rings changed between TiRiFiC templates.')
+    parser.add_argument('reference', help='the .def file to compare against')
+    parser.add_argument('templates', nargs='+', help='.def files compared with the reference')
+    parser.add_argument('--atol', type=float, default=0.,
+                        help='ignore absolute changes up to this value')
+    parser.add_argument('--rtol', type=float, default=0.,
+                        help='ignore relative changes up to this fraction')
+    parser.add_argument('--rings', action='store_true',
+                        help='list the old and new value of every changed ring')
+    args = parser.parse_args(argv)
+    status = 0
+    for template in args.templates:
+        print(f'=== {os.path.basename(args.reference)} -> {template}')
+        try:
+            diff = diff_templates(args.reference, template)
+        except (OSError, KeyError, ValueError) as e:
+            print(f'Could not compare: {e}')
+            status = 1
+            continue
+        print(diff.format_table(atol=args.atol, rtol=args.rtol, rings=args.rings))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
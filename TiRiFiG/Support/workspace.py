@@ -0,0 +1,168 @@
+# -*- coding: UTF-8 -*-
+"""Several templates open at once.
+
+Parsed templates are kept in one LRU cache for the whole process, keyed on the
+path and modification time of the .def file, so every file is read and parsed
+once and switching between the templates of a workspace does not touch the
+disk again until a file changes.
+
+classes:
+    ParsedTemplate:  a template with its ring parameters as arrays.
+    TemplateCache:   LRU cache of ParsedTemplates keyed on path and mtime.
+    Workspace:       the ordered templates of a workspace.
+
+functions:
+    copy_template:   a copy of a template that can be modified.
+
+variables:
+    template_cache:  the cache shared by all windows.
+"""
+
+from collections import OrderedDict
+import os
+
+import numpy as np
+import pyFAT_astro.Support.support_functions as FAT_sup
+
+from TiRiFiG.Support.fit_settings import fitting_parameters
+from TiRiFiG.Support.plot_support import LRUCache
+
+
+def copy_template(template):
+    """A copy of a template; the values are strings so a shallow copy is enough
+
+    The items are set through OrderedDict, as the Proper_Dictionary check for
+    new keys inspects the stack and costs more than the copy itself.
+    """
+    copied = template.__class__()
+    for key, value in template.items():
+        OrderedDict.__setitem__(copied, key, value)
+    return copied
+
+
+class ParsedTemplate():
+    """A parsed .def file
+
+    Instance variables:
+        path       (string):   absolute path of the .def file.
+        mtime      (int):      modification time (ns) when it was parsed.
+        template   (dict):     the Tirific_Template, not to be modified.
+        no_rings   (int):      NUR.
+        radii      (np.ndarray): RADI.
+        values     (dict):     float arrays of the parameters with NUR values.
+    """
+
+    def __init__(self, path, mtime, template):
+        self.path = path
+        self.mtime = mtime
+        self.template = template
+        self.no_rings = int(float(template['NUR']))
+        self.values = {}
+        self.radii = np.zeros(0)
+        for key, value in template.items():
+            if key in fitting_parameters or key.startswith('EMPTY'):
+                continue
+            parts = value.split()
+            if len(parts) != self.no_rings:
+                continue
+            try:
+                array = np.array(parts, dtype=float)
+            except ValueError:
+                continue
+            if key == 'RADI':
+                self.radii = array
+            elif '_ERR' not in key:
+                self.values[key] = array
+
+    @property
+    def label(self):
+        return os.path.basename(self.path)
+
+    def copy_template(self):
+        """A copy of the template that the caller may modify"""
+        return copy_template(self.template)
+
+
+class TemplateCache():
+    """LRU cache of parsed templates keyed on (path, mtime)"""
+
+    def __init__(self, maxsize=16, parser=FAT_sup.tirific_template):
+        self.parser = parser
+        self._cache = LRUCache(maxsize)
+
+    def get(self, path):
+        """The ParsedTemplate of path, parsed again only when the file changed"""
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        key = (path, mtime)
+        parsed = self._cache.get(key)
+        if parsed is None:
+            parsed = ParsedTemplate(path, mtime, self.parser(path))
+            self._cache.put(key, parsed)
+        return parsed
+
+    def template(self, path):
+        """A modifiable copy of the template of path"""
+        return self.get(path).copy_template()
+
+    def clear(self):
+        self._cache.clear()
+
+
+template_cache = TemplateCache()
+
+
+class Workspace():
+    """The templates of a workspace, in the order they were added
+
+    Instance variables:
+        paths    (list):   absolute paths of the .def files.
+        cache    (TemplateCache): where the parsed templates are kept.
+    """
+
+    def __init__(self, cache=template_cache):
+        self.paths = []
+        self.cache = cache
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, path):
+        return os.path.abspath(path) in self.paths
+
+    def add(self, path):
+        """Add a template, parsing it now so that switching to it is instant"""
+        path = os.path.abspath(path)
+        parsed = self.cache.get(path)
+        if path not in self.paths:
+            self.paths.append(path)
+        return parsed
+
+    def remove(self, path):
+        path = os.path.abspath(path)
+        if path in self.paths:
+            self.paths.remove(path)
+
+    def templates(self):
+        """The ParsedTemplates of the workspace, skipping files that disappeared"""
+        parsed = []
+        for path in self.paths:
+            try:
+                parsed.append(self.cache.get(path))
+            except (OSError, KeyError, ValueError):
+                continue
+        return parsed
+
+    def overlays(self, parameter, exclude=None):
+        """(label, radii, values) of parameter in every template that has it
+
+        Keyword arguments:
+        parameter (string)--  the parameter, e.g. VROT
+        exclude (string)--    path of a template to leave out, e.g. the one
+                              being edited
+        """
+        exclude = os.path.abspath(exclude) if exclude else None
+        return [(parsed.label, parsed.radii, parsed.values[parameter])
+                for parsed in self.templates()
+                if parsed.path != exclude and parameter in parsed.values
+                and len(parsed.radii) == len(parsed.values[parameter])]
@@ -1,37 +1,39 @@
+import argparse
+import importlib.util
+import logging
+import os
+
+from TiRiFiG.Support.binding import find_binding
+from TiRiFiG.Support.log import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
 def main():
-    print("Welcome to TiRiFiG Launcher!")
-    # Additional launcher code would go here
-    executed = False
-    try:
-        from PyQt6 import QtWidgets, QtCore
-        print("PyQt6 is available. Launching GUI...")
-        executed = True
-        from TiRiFiG.qt6_launcher import main as main_qt6
-        main_qt6()
-        # Code to launch the GUI would go here
-    except ImportError:
-        pass
+    parser = argparse.ArgumentParser(description='Start the TiRiFiG GUI.')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='log debug messages, also of pyFAT (or set TIRIFIG_LOG_LEVEL)')
+    # the other arguments are left for Qt
+    args, _ = parser.parse_known_args()
+    if args.verbose:
+        os.environ['TIRIFIG_LOG_LEVEL'] = 'DEBUG'
+    setup_logging()
+    logger.info("Welcome to TiRiFiG Launcher!")
+    # look the bindings up without importing them, only the one used is imported
+    binding = find_binding()
+    if binding is None:
+        if importlib.util.find_spec('PyQt4') is not None:
+            logger.error("PyQt4 is available. but the launcher is not up to date")
+        else:
+            logger.error("No compatible PyQt version found. Please install PyQt6 or PyQt5.")
+        return
+    logger.info("%s is available. Launching GUI...", binding)
+    if binding == 'PyQt6':
+        from TiRiFiG.qt6_launcher import main as main_qt
+    else:
+        from TiRiFiG.qt5_launcher import main as main_qt
+    main_qt()
+
 
-    try:
-        from PyQt5 import QtWidgets, QtCore
-        print("PyQt5 is available. Launching GUI...")
-        executed = True
-        from TiRiFiG.qt5_launcher import main as main_qt5
-        main_qt5()
-        # Code to launch the GUI would go here
-    except ImportError:
-        pass
-    if not executed:    
-        try:
-            from PyQt4 import QtGui, QtCore
-            print("PyQt4 is available. but the launcher is not up to date")
-            executed = True
-            #from TiRiFiG.qt4_launcher import main as main_qt4
-            #main_qt4()
-            # Code to launch the GUI would go here
-        except ImportError:
-            pass
-    if not executed:
-        print("No compatible PyQt version found. Please install PyQt5.")
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,5338 @@
+# -*- coding: UTF-8 -*-
+#########################################################################################
+# Author: Samuel (samueltwum1@gmail.com) with MSc supervisors                           #
+# Copyright 2018 Samuel N. Twum                                                         #
+#                                                                                       #
+# GPL license - see LICENSE.txt for details                                             #
+#########################################################################################
+
+"""This script here is the GUI implementation of TiRiFiG which allows users of
+TiRiFiC to model tilted-ring parameters before fitting. Instructions on how TiRiFiC works
+and everything you need to know about it can be found on the github pages:
+http://gigjozsa.github.io/tirific/
+The GUI runs on PyQt6 or PyQt5, Qt is imported from TiRiFiG.qt_binding. The work that
+does not need Qt lives in TiRiFiG.Support. qt6_launcher and qt5_launcher start it with
+their binding.
+
+variables:
+    fit_par:  unit of measurement of the tilted-ring parameters
+    logger:   logger of the GUI, written by the listener of TiRiFiG.Support.log
+
+functions:
+    main  : gets the whole thing started
+    _center: centering application windows
+
+classes:
+    Timer:
+        Class variables:  none
+
+        Instance variables:
+            t          (int):              the time(ms) when thread begins.
+            hFunction  (function):         function to be executed by thread.
+            thread     (function):         initialises and start the thread.
+
+        Functions:
+            __init__:                      initialises my instance variables.
+            handle_function:               calls the function which the thread is run on.
+            start:                         starts the thread.
+            cancel:                        stops the thread.
+
+    GraphWidget:
+        Instance variables:
+            redo           (list):         the state of some parameters before undo
+                                           action.
+            mPress         (list):         x-y values of mouse click.
+            mRelease       (list):         x-y values of mouse release.
+            mMotion        (list):         x-y values of mouse motion.
+            mDblPress      (list):         x-y values of mouse double click.
+            xScale         (list):         upper and lower limit of x-axis.
+            yScale         (list):         upper and lower limit of y-axis.
+            unitMeas       (string):       the unit measurement for the parameter.
+            par            (string):       a specific tilted-ring parameter.
+            parVals        (list):         the values of  variable par (y-values on
+                                           graph).
+            parValRADI     (list):         the values of RADI (x-values on graph).
+            historyList    (list):         the values of parVals for each time a point is
+                                           shifted.
+            key            (bool):         determines whether or not undo/redo key
+                                           combination is pressed.
+            numPrecisionX  (int):          the precision point to which a x-values are
+                                           saved in.
+            numPrecisionY  (int):          the precision point to which a y-values are
+                                           saved in.
+            canvas         (FigureCanvas): figure canvas where the subplots are made.
+            btnAddParam    (QPushButton):  add a new plotted parameter to viewgraph.
+            btnEditParam   (QPushButton):  change the parameter plotted to another
+                                           parameter.
+            btnCloseParam  (QPushButton):  close the parameter selection dialog.
+
+        Functions:
+            __init__:                      initialises instance variables and starts
+                                           graphWidget.
+            changeGlobal:                  make the parameter this graphWidget is
+                                           plotting the current parameter (currPar) of
+                                           its main window.
+            getClick:                      assigns x-y value captured from mouse
+                                           left-click to mPress list or x-y value of.
+                                           captured double click to mDblPress.
+            getRelease:                    assigns x-y value captured from mouse release
+                                           to mRelease list.
+            getMotion:                     assigns x-y value captured from mouse motion
+                                           to mMotion list.
+            undoKey:                       sends the viewgraph back in history .
+            redoKey:                       sends the viewgraph forward in history after
+                                           an undo action.
+            showInformation:               display information to say history list is
+                                           exhausted when too many undo/redo actions are
+                                           performed.
+            firstPlot:                     produces plot of tilted-ring parameter(s) in
+                                           viewgraph after .def file is opened.
+            plotFunc:                      produces plot of tilted-ring parameter(s) in
+                                           viewgraph when interacting with data points.
+
+    SMWindow:
+        Class Variables:  none
+
+        Instance Variables:
+            xMinVal        (int):          the value of the min x value of the parameter
+                                           in focus.
+            xMaxVal        (int):          the value of the max x value of the parameter
+                                           in focus.
+            par            (list):         list of all tilted-ring parameters
+            gwDict         (dictionary):   filtered dictionary with only y-scale
+            prevParVal     (string):       previous parameter value.
+            parameter      (QComboBox):    drop down of all parameters retrieved from the
+                                           variable <par>.
+            xLabel         (QLabel):       label for RADI.
+            xMin           (QLineEdit):    textbox for entering minimum value for RADI.
+            xMax           (QLineEdit):    textbox for entering maximum value for RADI.
+            yMin           (QLineEdit):    textbox for entering minimum value for
+                                           selected parameter.
+            yMax           (QLineEdit):    textbox for entering maximum value for
+                                           selected parameter.
+            btnUpdate      (QPushButton):  update variables with new values and close
+                                           window.
+            btnCancel      (QPushButton):  cancel changes and close window.
+
+        Functions:
+            __init__:                      initialises instance variables
+            onChangeEvent:                 changes values of variables if the current
+                                           index of the variable <parameter> changes.
+
+    ParamSpec:
+        Class Variables:  none
+
+        Instance Variables:
+            par             (list):        list of all tilted-ring parameters from .def
+                                           file.
+            parameterLabel  (QLabel):      label Parameter
+            parameter       (QComboBox):   drop down of all tilted-ring parameters
+                                           retrieved from the variable <par>.
+            uMeasLabel      (QLabel):      label unit measurement
+            unitMeasurement (QLineEdit):   textbox for entering unit measurement for
+                                           parameter.
+            btnOK           (QPushButton): updates the current parameter plotted to
+                                           the new parameter specified.
+            btnCancel       (QPushButton): close window
+
+        Functions:
+            __init__:                      initialises instance variables
+
+    MainWindow:
+        Class Variables:
+            key             (string):      determines whether or not undo/redo key has
+                                           been pressed.
+            ncols           (int):         the number of columns in grid layout where
+                                           viewgraphs are created.
+            nrows           (int):         the number of rows in grid layout where
+                                           viewgraphs are created.
+            INSET           (string):      name of data cube retrieved from .def file.
+            unitMeas        (list):        list of unit measurement for respective
+                                           parameters in par list.
+            tmpDeffile      (string):      path to temp file which is used to sync entry
+                                           of data in text editor to viewgraph.
+            t               (int):         thread which runs a separate process
+                                           (open a text editor).
+            scrollWidth     (int):         width of the scroll area.
+            scrollHeight    (int):         height of the scroll area.
+            before          (int):         time in milliseconds.
+            NUR             (int):         number of rings as indicated in .def file.
+            windows         (list):        the open main windows, shared by all of them.
+
+        Instance Variables:
+            par             (list):        list of tilted-ring parameters which have
+                                           their plots displayed in the viewgraph
+            currPar         (string):      tilted-ring parameter whose graph widget has
+                                           focus.
+            gwObjects       (list):        list of graph widget objects each representing
+                                           a tilted-ring parameter.
+            numPrecisionY   (dictionary):  precision in terms of number of decimal points
+                                           to which values of parameter are handled.
+            numPrecisionX   (list):        precision in terms of number of decimal points
+                                           to which values of RADI are handled.
+            data            (list):        stream of text from .def file.
+            parVals         (dictionary):  values of tilted-ring parameters.
+            historyList     (dictionary):  values of tilted-ring parameters which have
+                                           their values changed.
+            xScale          (list):        upper and lower limit values of RADI axis
+            yScale          (dictionary):  upper and lower limit values of parameter axis
+            cWidget        (QWidget):      central widget (main window).
+            btnOpen        (QPushButton):  opens an open dialog box for user to choose
+                                           the parameter file.
+            scrollArea     (QScrollArea):  scroll area where graph widgets will be
+                                           populated.
+            mainMenu       (QMenu):        Menu bar with file menu, preference menu and
+                                           run menu with each menu having different
+                                           actions.
+
+        Functions:
+            __init__:                      creates the main window frame and calls the
+                                           initUI function.
+            initUI:                        initialises instance variables and creates
+                                           menus with their actions.
+            quitApp:                       closes this TiRiFiG window.
+            newWindow:                     opens another main window in the same
+                                           process.
+            cleaunUp:                      initialises class variables.
+            getData:                       opens .def file and gets data from the file.
+            strType:                       determines the data type of a variable.
+            numPrecision:                  determines the floating point precision
+                                           currently in .def file and sets it.
+            getParameter:                  fetches the data points for the various
+                                           tilted-ring parameters.
+            openDef:                       calls getData and getParameter and creates the
+                                           graph widgets for the default parameters
+                                           (VROT, SBR, PA, INCL).
+            undoCommand:                   undo last action for the current parameter in
+                                           focus.
+            redoCommand:                   redo last action for the current parameter in
+                                           focus.
+            setRowCol:                     specify the number of rows and columns in the
+                                           grid layout.
+            saveFile:                      save changes to file for one parameter.
+            saveAll:                       snapshots all parameters and writes them to
+                                           file on the save worker thread.
+            saveAs:                        save changes to a new file for one parameter.
+            saveAsMessage:                 display information that save as was
+                                           successful.
+            saveAsAll:                     calls saveAs function to save changes for all
+                                           parameters to a new file.
+            slotChangeData:                change current viewgraph after making changes
+                                           to .def file in text editor.
+            animate:                       synchronise actions in text file to viewgraph
+                                           with calls to slotChangeData function.
+            openEditor:                    open preferred text editor.
+            SMobj:                         instantiates the scale manager window and pops
+                                           it.
+            updateScale:                   updates the values in graph widget from what
+                                           was entered in the scale manager window.
+            updateMessage:                 displays information to say update was
+                                           successful.
+            add_parameter_dialog:          instantiates the parameter specfication class and
+                                           connects btnOK to paramDef function for GW to be added
+            insert_parameter_dialog:       instantiates the parameter specfication class and
+                                           connects btnOK to paramDef function for GW to be inserted
+            editParaObj:                   instantiates the parameter specfication class and
+                                           connects btnOK to editParamDef function.
+            paramDef:                      adds specified paramater viewgraph to layout.
+            editParamDef:                  changes the parameter plotted in viewgraph to
+                                           the specified parameter.
+            tirificMessage:                displays information about input data cube not
+                                           available in current working directory.
+            startTiriFiC:                  starts TiRiFiC from terminal.
+            showRunCost:                   shows the estimated wall time and memory of the
+                                           runs of the workspace, shortest first.
+            recordRun:                     stores the run being started in the run history.
+            showRunHistory:                opens the browser of the past runs.
+            restoreRun:                    restores the input or the fit of a past run.
+            showConvergence:               opens the live convergence panel of a run.
+"""
+
+# libraries
+import os, sys, threading, time, logging,pickle
+import shutil
+import sqlite3
+from subprocess import Popen as run
+from math import ceil
+from decimal import Decimal
+import numpy as np
+import copy
+from collections import OrderedDict
+from TiRiFiG.qt_binding import QtCore, QtWidgets, QtGui, QAction
+import matplotlib
+matplotlib.use("qtagg")
+from matplotlib.backends.backend_qtagg import FigureCanvas
+#from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+# from matplotlib.backends.backend_qt4agg import NavigationToolbar2QT as NavigationToolbar
+import matplotlib.pyplot as plt
+from matplotlib import style
+from matplotlib.widgets import RectangleSelector
+from matplotlib.collections import LineCollection
+from matplotlib import ticker
+import matplotlib.markers as mmarkers
+  
+style.use("seaborn-v0_8")
+import pyFAT_astro.Support.support_functions as FAT_sup
+import TRM_errors.tirshaker.tirshaker as fit_functions
+from pyFAT_astro.Support.modify_template import fit_polynomial
+from TiRiFiG.native_plot import RingPlotView
+from TiRiFiG.Support.fit_settings import ParameterFitSettings, fitting_parameters,\
+    fit_columns, integer_columns, template_fit_settings
+from TiRiFiG.Support.cube import FitsCube, CubeError
+from TiRiFiG.Support.model_preview import SkyGrid, preview_parameters, sample_rings,\
+    velocity_field, model_cube
+from TiRiFiG.Support.residuals import ResidualCube, residual_maps
+from TiRiFiG.Support.error_shaker import ErrorShaker
+from TiRiFiG.Support.session import read_session, write_session, encode_history,\
+    decode_history, pack_fit_settings, unpack_fit_settings
+from TiRiFiG.Support.workspace import Workspace, template_cache
+from TiRiFiG.Support.template_diff import diff_values, ring_ranges, split_disk
+from TiRiFiG.Support.figure_export import Panel, export_formats, export_panels, export_templates
+from TiRiFiG.Support.template_check import check_template, format_issues
+from TiRiFiG.Support.run_cost import estimate_run, order_runs, read_timings, run_features,\
+    start_timed_run, format_duration
+from TiRiFiG.Support.run_history import RunHistory
+from TiRiFiG.Support.convergence import ConvergenceMonitor
+from TiRiFiG.Support.log import setup_logging
+from TiRiFiG.Support.autosave import Autosaver, read_recovery, recovery_path
+from TiRiFiG.Support.preferences import read_preferences, write_preferences
+from TiRiFiG.Support.icons import tint
+from TiRiFiG.Support.save_pipeline import CoalescingWorker, SaveSnapshot, build_template,\
+    save_snapshot
+from TiRiFiG.Support.plot_support import RingIndex, LRUCache, rectangle_mask,\
+    minmax_decimate, error_segments, state_styles, parameter_units
+
+# --- Modern theme (QSS) -------------------------------------------------------
+def apply_modern_style(app: QtWidgets.QApplication, background_image_path: str | None = None) -> None:
+    """Apply a sleek, modern style across the app. Optional background image.
+
+    Args:
+        app: QApplication instance
+        background_image_path: Optional path to a background image for central areas
+    """
+    QtWidgets.QApplication.setStyle("Fusion")
+
+    # Dark palette baseline
+    palette = QtGui.QPalette()
+    base = QtGui.QColor(37, 37, 38)
+    panel = QtGui.QColor(45, 45, 48)
+    text = QtGui.QColor(220, 220, 220)
+    highlight = QtGui.QColor(14, 122, 254)
+    disabled = QtGui.QColor(127, 127, 127)
+
+    palette.setColor(QtGui.QPalette.ColorRole.Window, panel)
+    palette.setColor(QtGui.QPalette.ColorRole.WindowText, text)
+    palette.setColor(QtGui.QPalette.ColorRole.Base, base)
+    palette.setColor(QtGui.QPalette.ColorRole.AlternateBase, panel)
+    palette.setColor(QtGui.QPalette.ColorRole.ToolTipBase, panel)
+    palette.setColor(QtGui.QPalette.ColorRole.ToolTipText, text)
+    palette.setColor(QtGui.QPalette.ColorRole.Text, text)
+    palette.setColor(QtGui.QPalette.ColorRole.Button, panel)
+    palette.setColor(QtGui.QPalette.ColorRole.ButtonText, text)
+    palette.setColor(QtGui.QPalette.ColorRole.Highlight, highlight)
+    palette.setColor(QtGui.QPalette.ColorRole.HighlightedText, QtGui.QColor(255, 255, 255))
+    # Disabled
+    palette.setColor(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.Text, disabled)
+    palette.setColor(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.ButtonText, disabled)
+    app.setPalette(palette)
+
+    # Core QSS
+    bg_image_rule = (
+        f"border-image: url('{background_image_path}') 0 0 0 0 stretch stretch;"
+        if background_image_path else ""
+    )
+    popup_image_rule = (
+        f"background-image: url('{background_image_path}');"
+        f"background-position: center;"
+        f"background-attachment: fixed;"
+        if background_image_path else "background-image: none;"
+    )
+    qss = f"""
+    QMainWindow {{
+        background-color: {panel.name()};
+        color: {text.name()};
+    }}
+    QWidget {{
+        background-color: {panel.name()};
+        color: {text.name()};
+    }}
+    #centralWidget {{ 
+        {bg_image_rule}
+        background-color: {panel.name()};
+    }}
+
+    /* Apply background image to dialogs/popups as well */
+    QDialog, QMessageBox, QProgressDialog {{
+        {popup_image_rule}
+        background-color: {panel.name()};
+        color: {text.name()};
+    }}
+
+    /* Custom popup widgets tagged with popupBg=true */
+    QWidget[popupBg="true"] {{
+        {popup_image_rule}
+        background-color: {panel.name()};
+        color: {panel.name()};
+    }}
+    QLabel{{
+        background-color: transparent;
+        color: {panel.name()};
+    }}
+
+    QMenuBar {{ background-color: {panel.name()}; border: none; }}
+    QMenuBar::item {{ padding: 6px 10px; background: transparent; }}
+    QMenuBar::item:selected {{ background: rgba(255,255,255,0.06); border-radius: 4px; }}
+
+    QMenu {{ background-color: {panel.name()}; border: 1px solid rgba(255,255,255,0.08); }}
+    QMenu::item {{ padding: 6px 12px; }}
+    QMenu::item:selected {{ background: rgba(255,255,255,0.08); }}
+
+    QScrollArea {{ border: none; background: transparent; }}
+    QScrollArea > QWidget > QWidget {{ background: transparent; }}
+    QScrollBar:vertical {{ background: transparent; width: 10px; }}
+    QScrollBar::handle:vertical {{ background: rgba(255,255,255,0.18); border-radius: 5px; min-height: 40px; }}
+    QScrollBar::handle:vertical:hover {{ background: rgba(255,255,255,0.28); }}
+    QScrollBar:horizontal {{ background: transparent; height: 10px; }}
+    QScrollBar::handle:horizontal {{ background: rgba(255,255,255,0.18); border-radius: 5px; min-width: 40px; }}
+    
+    QCheckBox {{ background: transparent; 
+        color: {panel.name()};
+        }}
+    
+
+    QCheckBox::indicator:unchecked {{
+        background: transparent;
+        background-color: transparent;
+        color: white;
+        border: 1px solid #5A5A5A;
+    }}
+    
+    
+   
+    QPushButton {{
+        background-color: rgba(255,255,255,0.06);
+        border: 0px solid rgba(255,255,255,0.08);
+        border-radius: 0px;
+        padding: 6px 10px;
+        color: {panel.name()};
+    }}
+    QPushButton:hover {{ background-color: rgba(255,255,255,0.12); }}
+    QPushButton:pressed {{ background-color: rgba(255,255,255,0.18); }}
+    QPushButton:disabled {{ color: {disabled.name()}; border-color: rgba(255,255,255,0.04); }}
+
+    QLineEdit, QComboBox, QTextEdit {{
+        background-color: {text.name()};
+        border: 1px solid rgba(255,255,255,0.10);
+        border-radius: 8px;
+        padding: 6px 8px;
+        color: {panel.name()};
+        selection-background-color: {highlight.name()};
+    }}
+    QComboBox QAbstractItemView {{
+        background-color: {panel.name()};
+        border: 1px solid rgba(255,255,255,0.08);
+        selection-background-color: rgba(255,255,255,0.10);
+    }}
+
+    QToolTip {{
+        background: {text.name()};
+        background-color: {text.name()};
+        color: {panel.name()};
+        border: 3px solid rgba(255,255,255,0.12);
+        padding: 2px 2px;
+        opacity: 230;
+    }}
+    """
+    app.setStyleSheet(qss)
+
+try:
+    from importlib.resources import files as import_pack_files
+except ImportError:
+    # Try backported to PY<37 `importlib_resources`.
+    # For Py<3.9 files is not available
+    from importlib_resources import files as import_pack_files
+    
+logger = logging.getLogger(__name__)
+
+fit_par = dict(parameter_units)
+icons_location = import_pack_files('TiRiFiG.utilities.icons')
+example_location = import_pack_files('TiRiFiG.utilities.example')
+def _center(self):
+    """Centers the window
+
+    Keyword arguments:
+    self --         main window being displayed i.e. the current instance of the
+                    mainWindow class
+
+    Returns:
+    None
+
+    With information from the user's desktop, the screen resolution is  gotten
+    and the center point is figured out for which the window is placed.
+    """
+    qr = self.frameGeometry()
+    cp = QtWidgets.QApplication.primaryScreen().availableGeometry().center()
+    qr.moveCenter(cp)
+    self.move(qr.topLeft())
+
+class TimerThread():
+    def __init__(self, t, hFunction):
+        self.t = t
+        self.hFunction = hFunction
+        self.thread = threading.Timer(self.t, self.handle_function)
+
+    def handle_function(self):
+        self.hFunction()
+        self.thread = threading.Timer(self.t, self.handle_function)
+        self.thread.start()
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.thread.cancel()
+
+class GraphWidget(QtWidgets.QWidget):
+    # emitted with the parameter name when an edit of the values is finished
+    valuesChanged = QtCore.pyqtSignal(str)
+    # emitted with the parameter when a button or edit makes this widget the
+    # current one, with None when it stops being the current one
+    currentChanged = QtCore.pyqtSignal(object)
+    last_value = 0
+    is_dragging = False
+    drag_index = None
+    _fit_thread = None
+    _fit_worker = None
+    _progress = None
+    # distance in pixels within which a click selects a ring
+    hit_radius = 10
+    # above this number of rings in view the ticks are placed automatically
+    tick_threshold = 30
+    # above this number of rings the markers are decimated per pixel column
+    lod_threshold = 200
+    # change of the axes range per wheel step
+    zoom_factor = 1.25
+    # ms without wheel or pan events after which a view is rendered in full
+    settle_time = 200
+    # number of rendered views whose backgrounds are kept
+    view_cache_size = 8
+    # colors of the second, third and fourth disk in a linked view
+    disk_colors = ['royalblue', 'darkorange', 'orchid']
+
+    def __init__(self, xScale, yScale, unitMeas, par, parVals,parValsErr, parValRADI,
+            key, numPrecisionX, numPrecisionY,pyFAT_Configuration,Tirific_Template,
+            paramenterFittingSetting):
+        super(GraphWidget, self).__init__()
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.setStyleSheet("background-color: transparent;")
+        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding,
+                           QtWidgets.QSizePolicy.Policy.Expanding)
+        self.xScale = xScale
+        self.yScale = yScale
+        self.pyFAT_Configuration = pyFAT_Configuration
+        self.Tirific_Template = Tirific_Template
+        self.unitMeas = unitMeas
+        self.par = par
+        self.parVals = parVals
+        self.originalparVals = copy.deepcopy(parVals)
+        self.parValsErr = parValsErr
+        self.parValRADI = parValRADI
+        #at initialsation this is the same as parVals
+        self.historyList = [copy.deepcopy(parVals)]
+        self.key = key
+        self.numPrecisionX = numPrecisionX
+        self.numPrecisionY = numPrecisionY
+        self.parameterFitSetting = paramenterFittingSetting
+        self.redo = []
+        self.mPress = [None, None]
+        self.mRelease = [None, None]
+        self.mMotion = [None]
+        self.mDblPress = [None, None]
+        # (label, radii, values) of this parameter in other templates
+        self.overlays = []
+        # (radii, values) of a compared template, drawn with the deltas
+        self.delta_reference = None
+        # graph widgets of the other disks of this parameter drawn in this axes
+        self.linked = []
+        self.linked_lines = []
+        # add the change of a ring to the same ring of the other disks
+        self.propagate = False
+        # the widget whose values are being dragged, self or a linked disk
+        self.drag_disk = None
+        #self.setFixedSize(initial_width, initial_height)
+        # Grid Layout
+        grid = QtWidgets.QGridLayout()
+        #grid.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        #grid.setStyleSheet("border: 3px solid blue; background-color: rgba(255,0,0,0.1);")
+     
+        self.setLayout(grid)
+        # Canvas and Toolbar
+        self._create_canvas()
+        self.canvas.mpl_connect('button_press_event', self.getClick)
+        self.canvas.mpl_connect('button_release_event', self.getRelease)
+        self.canvas.mpl_connect('motion_notify_event', self.getMotion)
+        self.canvas.mpl_connect('scroll_event', self.getScroll)
+        # self.canvas.mpl_connect('key_press_event', self.keyPressed)
+
+        # Persistent artists for fast updates
+        self.line_current = None
+        self.line_connecting = None
+        self.line_original = None
+        self.err_container = None
+        self.background = None  # For blitting
+        self.ring_index = None  # sorted RADI in pixels for hit-testing
+        self.lod = np.arange(len(parValRADI))  # indices of the rings that are drawn
+        # zoom/pan view ([xlim, ylim]), None shows xScale/yScale
+        self.navigation_view = None
+        self._pan_start = None
+        self._figure_background = None
+        self._view_cache = LRUCache(self.view_cache_size)
+        self._settle_timer = QtCore.QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(self.settle_time)
+        self._settle_timer.timeout.connect(self._settle_view)
+
+        # button to add another tilted-ring parameter to plot
+        #self.btnAddParam = QtWidgets.QPushButton('&Add',self)
+        #self.btnAddParam.setFixedSize(50, 30)
+        #self.btnAddParam.setFlat(True)
+        # FIX ME: use icon instead of text
+        # self.btnAddParam.setIcon(QtGui.QIcon('utilities/icons/plus.png'))
+        #self.btnAddParam.setToolTip('Add Parameter')
+
+        # modify plotted parameter
+      
+        self.btnEditParam = IconButton(icons_location/'edit.png', self)
+        
+        
+        self.btnFitPoly = IconButton(icons_location/'fitpoly.png', self)
+        self.btnFitPoly.clicked.connect(self.changeGlobal)
+        self.btnFitPoly.clicked.connect(self.smoothParameter) 
+        
+        self.btnGroupSelect = IconButton(icons_location/'group.png', self, 
+            start_grayscale=True,support_three_states=True, extra_icon_path=icons_location/'group_individual.png') 
+        self.btnGroupSelect.clicked.connect(self.changeGlobal)
+        self.btnGroupSelect.clicked.connect(self.selectGroups)
+        self.group_selection_mode = 0
+        self.rectangle_selector = None
+        self.blue_selector = None
+        self.green_selector = None
+        
+
+        self.btnInterRings = IconButton(icons_location/'interpolate.png', self, start_grayscale=True)
+        self.btnInterRings.clicked.connect(self.changeGlobal)
+        self.btnInterRings.clicked.connect(self.selectInterRings)
+        self.interpolation_mode = False 
+
+        self.btnFitOnOff = IconButton(icons_location/'fit_on.png', self, start_grayscale=True,
+                        support_three_states=True, extra_icon_path=icons_location/'fit_off.png')   
+        self.btnFitOnOff.clicked.connect(self.changeGlobal)
+        self.btnFitOnOff.clicked.connect(self.toggleFitRings)
+        self.fit_toggle_mode = 0     
+        #self.btnEditParam.setToolTip('Modify plotted parameter')
+
+        self.btnCloseParam = IconButton(icons_location/'close.png', self)
+        
+        # FIX ME: use icon instead of text
+        # self.btnEditParam.setIcon(QtGui.QIcon('utilities/icons/edit.png'))
+        self.btnEditParam.setToolTip('Modify plotted parameter')
+        self.btnFitPoly.setToolTip('Fit polynomial to data')
+        self.btnGroupSelect.setToolTip('Select groups of rings to Fit')
+        self.btnInterRings.setToolTip('Select rings to fit while interpolating over the rest')
+        self.btnFitOnOff.setToolTip('Select or Toggle Fit Rings On/Off')
+        self.btnCloseParam.setToolTip('Close Window')
+
+        # Rounded, icon-like buttons
+        ctrl_qss = """
+        QPushButton {
+            background-color: rgba(255,255,255,0.06);
+            border: 1px solid rgba(255,255,255,0.10);
+            border-radius: 16px;
+            padding: 6px 10px;
+        }
+        QPushButton:hover { background-color: rgba(255,255,255,0.14); }
+        QPushButton:pressed { background-color: rgba(255,255,255,0.22); }
+        """
+        #self.btnEditParam.setStyleSheet(ctrl_qss)
+        #self.btnFitPoly.setStyleSheet(ctrl_qss)
+        #self.btnGroupSelect.setStyleSheet(ctrl_qss)
+        #self.btnInterRings.setStyleSheet(ctrl_qss)
+        #self.btnCloseParam.setStyleSheet(ctrl_qss)
+        hbox = QtWidgets.QHBoxLayout()
+        hbox.setContentsMargins(0, 0, 0, 0)
+        hbox.setSpacing(0)
+        hbox_right = QtWidgets.QHBoxLayout()
+        hbox_right.setContentsMargins(0, 0, 0, 0)
+        hbox_right.setSpacing(0)
+        
+        # Add empty spacer widget to align buttons with plot area
+        self.spacer_widget = QtWidgets.QWidget()
+        hbox.addWidget(self.spacer_widget)
+        
+        #hbox.addWidget(self.btnAddParam)
+        hbox.addWidget(self.btnEditParam)
+        hbox.addWidget(self.btnFitPoly)
+        hbox.addWidget(self.btnGroupSelect)
+        hbox.addWidget(self.btnInterRings)
+        hbox.addWidget(self.btnFitOnOff)
+        hbox.addStretch()
+    
+        hbox_right.addStretch()
+        hbox_right.addWidget(self.btnCloseParam)
+        grid.addLayout(hbox, 0, 0)
+        grid.addLayout(hbox_right, 0, 1)
+        grid.addWidget(self.canvas, 1, 0, 1, 2)
+
+        self.firstPlot()
+
+    def _create_canvas(self):
+        """Create the matplotlib figure, canvas and axes of the graph"""
+        self.figure = plt.figure()
+        self.figure.patch.set_facecolor('none')
+       
+        self.figure.patch.set_alpha(0.0)
+
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setStyleSheet("background: transparent;")
+        # self.canvas.setFocusPolicy( QtCore.Qt.ClickFocus )
+        # self.canvas.setFocusPolicy( QtCore.Qt.WheelFocus )
+        self.canvas.setFocus()
+        self.figure.subplots_adjust(left=0.15, right=1.0, top=1.0, bottom=0.15)
+        self.ax = self.figure.add_subplot(111)
+        self.ax.patch.set_facecolor('none')
+        self.ax.patch.set_alpha(0.0)
+        # Setup blitting: cache background when figure is drawn
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def resizeEvent(self, event):
+        """Update spacer widget width to 15% of cell width"""
+        super().resizeEvent(event)
+        if hasattr(self, 'spacer_widget'):
+            self.spacer_widget.setFixedWidth(int(self.width() * 0.15))
+
+    def smoothParameter(self):
+        #First we get the desired input
+        self.create_polyfit_dialog()
+    def toggleFitRings(self):
+        """Cycle through fit rings selection modes"""
+        self.fit_toggle_mode = (self.fit_toggle_mode + 1) % 3
+        self.btnFitOnOff.cycle_state()
+        self.set_selector(mode = self.fit_toggle_mode)
+        if self.fit_toggle_mode == 0:
+            logger.debug("Fit rings mode OFF")
+            self.rectangle_selector.set_active(False)
+        elif self.fit_toggle_mode == 1:
+            logger.debug("Fit rings mode: %d - Fit selected rings only", self.fit_toggle_mode)
+            self.parameterFitSetting.fitted = True
+
+            self.rectangle_selector.set_active(True)
+        elif self.fit_toggle_mode == 2:
+            logger.debug("Fit rings mode: %d - Fit all except selected rings", self.fit_toggle_mode)
+            self.rectangle_selector.set_active(True)
+
+    def set_selector(self, mode):
+        """Set up rectangle selectors for group selection modes"""
+        if mode > 0:
+            if self.rectangle_selector is None:
+                self.rectangle_selector = RectangleSelector(
+                    self.ax,
+                    self._on_group_select,
+                    useblit=True,
+                    button=[1],
+                    minspanx=5, minspany=5,
+                    spancoords='pixels',
+                    interactive=False,
+                    props=dict(facecolor='cyan', edgecolor='blue', 
+                          alpha=0.3, fill=True, linewidth=2)
+                )
+            self.rectangle_selector.set_active(True)      
+        else:
+            self.rectangle_selector.set_active(False)
+                  
+    def selectGroups(self):
+        """Cycle through group selection modes"""
+        self.group_selection_mode = (self.group_selection_mode + 1) % 3
+        self.btnGroupSelect.cycle_state()
+        self.set_selector(mode = self.group_selection_mode)
+        if self.group_selection_mode > 0:
+            if self.group_selection_mode == 1:
+                logger.debug("Group selection mode: %d - Set GROUP to be fitted as block",
+                             self.group_selection_mode)
+            elif self.group_selection_mode == 2:
+                logger.debug("Group selection mode: %d - Set GROUP to be fitted as individual",
+                             self.group_selection_mode)
+        else:
+            # Disable rectangle selector
+            logger.debug("Group selection mode OFF")
+
+    def _on_group_select(self, eclick, erelease):
+        """Handle rectangle selection - update TO_FIT and INTERPOLATION for selected points"""
+        try:
+            # Get rectangle bounds
+            x1, y1 = eclick.xdata, eclick.ydata
+            x2, y2 = erelease.xdata, erelease.ydata
+            
+            if x1 is None or x2 is None or y1 is None or y2 is None:
+                return
+            
+            # Find points within rectangle
+            rings = np.flatnonzero(rectangle_mask(self.parValRADI, self.parVals,
+                                                  [x1, x2], [y1, y2])) + 1
+                        
+            if len(rings) > 0:
+               
+
+                if self.group_selection_mode > 0:                    
+                    minring = int(rings[0])
+                    maxring = int(rings[-1])
+                    #print(f"Updated {len(rings)} ring(s): Groups={[minring,maxring]}")
+                    self.parameterFitSetting.set_group(minring, maxring,
+                        self.group_selection_mode == 1)
+                if self.fit_toggle_mode > 0:
+                    #print(f'These {rings}')
+                    if self.fit_toggle_mode == 1:
+                        self.parameterFitSetting.to_fit[rings-1] = True
+                    elif self.fit_toggle_mode == 2:
+                        locked = self.parameterFitSetting.locked(rings)
+                        self.parameterFitSetting.to_fit[rings[~locked]-1] = False
+                        if np.any(locked):
+                            ring = int(rings[locked][0])
+                            ring1,ring2 = self.parameterFitSetting.group(ring)
+                            QtWidgets.QMessageBox.information(self, "Information",
+                                f"Cannot disable fitting of ring {ring} as it is part of a block fit group ({ring1}-{ring2}).\n"
+                                "Please modify the group first to disable block fitting.")
+                # Update the plot to show new colors
+                self.yScale = set_plotScale(self.parVals)
+                self.key = "Yes"
+                self.plotFunc()
+            else:
+                logger.debug("No points selected in rectangle")
+                
+        except Exception as e:
+            logger.exception("Error in group selection: %s", e)
+    
+    def selectInterRings(self):
+        """Toggle interpolation mode - when active, clicking points toggles INTERPOLATION"""
+        self.interpolation_mode = not self.interpolation_mode
+        self.btnInterRings.toggle_grayscale()
+        
+        if self.interpolation_mode:
+            # Show status message
+            logger.debug("Interpolation mode ON - click points to toggle INTERPOLATION status")
+        else:
+            logger.debug("Interpolation mode OFF")
+
+    def fitPolynomial(self):
+        mindegree = int(float(self.inp.minDegree.currentText()))
+        maxdegree = int(float(self.inp.maxDegree.currentText()))
+        limits = [0., 0.]
+        if self.inp.lowerBoundary.text() != '':
+            limits[0] = float(self.inp.lowerBoundary.text())
+        if self.inp.upperBoundary.text() != '':
+            limits[1] = float(self.inp.upperBoundary.text())
+        values = np.array(self.parVals,float)
+        errors = np.array(self.parValsErr,float)
+        radii = np.array(self.parValRADI,float)
+        key = self.par.split('_')[0]
+        inner_flatrings = 4
+        if key not in ['VROT']:
+            if self.inp.innerFlatrings.text() != '':
+                inner_flatrings = int(float(self.inp.innerFlatrings.text()))
+        
+    
+
+        if key in ['INCL','PA']:
+            if self.inp.warped.isChecked():
+                #We have to fit the angular momentum function
+                logger.warning('Fitting a warp to %s is not yet working', key)
+                return
+        self.inp.close()
+        zero_point = None
+       
+        # Show a modal busy dialog
+        self._progress = QtWidgets.QProgressDialog("Fitting polynomial…", None, 0, 0, self)
+        self._progress.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
+        self._progress.setAutoClose(False)
+        self._progress.setAutoReset(False)
+        self._progress.setCancelButton(None)
+        self._progress.setMinimumDuration(0)
+        self._progress.show()
+
+        # Start worker thread to keep UI responsive
+        self._fit_thread = QtCore.QThread(self)
+
+        class FitWorker(QtCore.QObject):
+            finished = QtCore.pyqtSignal(object, object)
+            errored = QtCore.pyqtSignal(str)
+
+            def __init__(self, Configuration, radii, values, errors, key, par, Tirific_Template, inner_fix, zero_point, limits, allowed_order):
+                super().__init__()
+                self.Configuration = Configuration
+                self.radii = radii
+                self.values = values
+                self.errors = errors
+                self.key = key
+                self.par = par
+                self.Tirific_Template = Tirific_Template
+                self.inner_fix = inner_fix
+                self.zero_point = zero_point
+                self.limits = limits
+                self.allowed_order = allowed_order
+
+            @QtCore.pyqtSlot()
+            def run(self):
+                try:
+                   
+                    fitted_values, final_poly = fit_polynomial(
+                        self.Configuration,
+                        self.radii,
+                        self.values,
+                        self.errors,
+                        self.key,
+                        self.Tirific_Template,
+                        inner_fix=self.inner_fix,
+                        zero_point=self.zero_point,
+                        boundary_limits=self.limits,
+                        allowed_order=self.allowed_order,
+                        return_order=True,
+                    )
+                    self.finished.emit(fitted_values, final_poly)
+                except Exception as e:
+                    self.errored.emit(str(e))
+
+        self._fit_worker = FitWorker(self.pyFAT_Configuration, radii, 
+            values, errors, key, self.par, self.Tirific_Template, 
+            inner_flatrings, zero_point, limits, [mindegree, maxdegree])
+        self._fit_worker.moveToThread(self._fit_thread)
+        self._fit_thread.started.connect(self._fit_worker.run)
+
+        def _done(fitted_values, final_poly):
+            try:
+                logger.info('We fitted %s with polynomial order %s', self.par, final_poly)
+                logger.debug('We got these values %s', fitted_values)
+                if self.propagate and self.linked:
+                    self.propagateDelta(self, np.asarray(fitted_values, dtype=float) -
+                                        np.asarray(self.parVals, dtype=float))
+                self.parVals = fitted_values
+                self.yScale = set_plotScale(fitted_values)
+                self.key = "Yes"
+                self.plotFunc()
+                self.valuesChanged.emit(self.par)
+                if self.propagate:
+                    for disk in self.linked:
+                        self.valuesChanged.emit(disk.par)
+            finally:
+                if self._progress is not None:
+                    self._progress.reset()
+                    self._progress.hide()
+                    self._progress = None
+
+        def _error(msg: str):
+            try:
+                QtWidgets.QMessageBox.critical(self, "Fit Error", msg)
+            finally:
+                if self._progress is not None:
+                    self._progress.reset()
+                    self._progress.hide()
+                    self._progress = None
+
+        self._fit_worker.finished.connect(_done)
+        self._fit_worker.errored.connect(_error)
+        self._fit_worker.finished.connect(self._fit_thread.quit)
+        self._fit_worker.errored.connect(self._fit_thread.quit)
+        self._fit_thread.finished.connect(self._fit_worker.deleteLater)
+        self._fit_thread.finished.connect(self._fit_thread.deleteLater)
+
+        self._fit_thread.start()
+        return
+      
+    def create_polyfit_dialog(self):
+        self.inp = PolyFitWindow(self.par)
+        self.inp.show()
+        self.inp.btnOK.clicked.connect(self.fitPolynomial)
+        self.inp.btnCancel.clicked.connect(self.inp.close)
+        return
+
+    def _update_ring_index(self, rebuild=False):
+        """Update the pixel positions of the rings in the hit-test index.
+
+        Keyword arguments:
+        rebuild --      re-sort the radii as well, needed when RADI changed
+
+        Called after every full draw as the view or the canvas size may have
+        changed.
+        """
+        def to_pixels(radii):
+            points = np.column_stack((radii, np.zeros(len(radii))))
+            return self.ax.transData.transform(points)[:, 0]
+        if rebuild or self.ring_index is None:
+            self.ring_index = RingIndex(self.parValRADI, to_pixels)
+        else:
+            self.ring_index.update(to_pixels)
+
+    def _ring_at(self, event):
+        """Index of the ring within hit_radius pixels of the mouse event, else None"""
+        if self.ring_index is None:
+            self._update_ring_index(rebuild=True)
+        return self.ring_index.nearest(event.x, self.hit_radius)
+
+    def on_draw(self, event):
+        """Cache a clean background and re-blit the animated line.
+
+        Ensures `line_current` isn't baked into the cached background after any
+        full draw (e.g., initial show/resize or axis changes), keeping blit
+        updates correct and visible.
+        """
+        if self.ax is None or self.canvas is None:
+            return
+        self._update_ring_index()
+
+        # Temporarily hide the current line to capture a clean background
+        if self.line_current is not None:
+            artists = self._animated_artists()
+            was_visible = [artist.get_visible() for artist in artists]
+            for artist in artists:
+                artist.set_visible(False)
+            self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self._figure_background = self.canvas.copy_from_bbox(self.figure.bbox)
+            # Restore visibility
+            for artist, visible in zip(artists, was_visible):
+                artist.set_visible(visible)
+
+            # Immediately re-blit the current line so it appears after full draws
+            for artist in artists:
+                self.ax.draw_artist(artist)
+            self.canvas.blit(self.ax.bbox)
+        else:
+            # No animated line yet; just cache the background
+            self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self._figure_background = self.canvas.copy_from_bbox(self.figure.bbox)
+      
+        #self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+    def _animated_artists(self):
+        """The artists that are redrawn over the cached background, with the
+        lines of the linked disks below the points of this parameter"""
+        if self.line_current is None:
+            return []
+        artists = list(self.linked_lines)
+        if self.line_connecting is not None:
+            artists.append(self.line_connecting)
+        return artists + [self.line_current[state] for state in self.states]
+
+    def _disk_at(self, event, ring):
+        """The widget, self or a linked disk, whose value of ring is closest
+        to the mouse event in pixels"""
+        disks = [self] + self.linked
+        values = np.array([float(disk.parVals[ring]) if ring < len(disk.parVals) else np.nan
+                           for disk in disks])
+        radius = float(self.parValRADI[ring])
+        pixels = self.ax.transData.transform(np.column_stack((np.full(len(values), radius),
+                                                              values)))[:, 1]
+        return disks[int(np.nanargmin(np.abs(pixels - event.y)))]
+
+    def propagateDelta(self, source, delta):
+        """Add the per ring change of the values of source to every other disk
+
+        Keyword arguments:
+        source (GraphWidget)--  the disk that was edited
+        delta (np.ndarray)--    change per ring
+
+        The values of the other disks are changed as one stacked array.
+        """
+        others = [disk for disk in [self] + self.linked if disk is not source]
+        if len(others) == 0:
+            return []
+        no_rings = min(len(delta), min(len(disk.parVals) for disk in others))
+        stacked = np.vstack([np.asarray(disk.parVals, dtype=float)[:no_rings] for disk in others])
+        stacked += np.asarray(delta, dtype=float)[None, :no_rings]
+        for disk, values in zip(others, stacked):
+            disk.parVals[:no_rings] = values
+        return others
+
+    def changeGlobal(self, val=None):
+        if val == None:
+            self.currentChanged.emit(None)
+        else:
+            self.currentChanged.emit(self.par)
+
+    def _almost_equal(self, a, b, rel_tol=5e-2, abs_tol=0.0):
+        '''Takes two values return true if they are almost equal'''
+        diff = abs(b - a)
+        return (diff <= abs(rel_tol * b)) or (diff <= abs_tol)
+    
+    def _over_and_above(self, a, b, switch):
+        '''Takes two values return true if they are far apart'''
+        # if input values are the same sign
+        if (np.sign(a) == np.sign(b)):
+            if switch == 'min':
+                return a <= b
+            else:
+                return a >= b
+        else:
+            # case1: max +ve and top -ve
+            # case2: min -ve and bottom +ve 
+            return ((a > 0 and b < 0) or (a < 0 and b > 0))
+
+    def getClick(self, event):
+        """Left mouse button is clicked
+
+        Keyword arguments:
+        self --         main window being displayed i.e. the current instance of the
+                        mainWindow class
+        event --        event type
+
+        Returns:
+        None
+
+        The xData is captured when the left mouse button is clicked on the canvas
+        """
+        # on left click in figure canvas, captures mouse press and assign None to
+        # mouse release
+
+       
+        if event.button == 3 and not event.xdata is None:
+            if event.dblclick:
+                # back to the scale set in the scale manager
+                self.navigation_view = None
+                self.firstPlot(keep_views=True)
+            else:
+                self._pan_start = [event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim()]
+            return
+
+        if event.button == 1 and not event.xdata is None:
+            # Disable rectangle selector during interpolation mode
+            if self.interpolation_mode and self.rectangle_selector is not None:
+                self.rectangle_selector.set_active(False)
+            
+            # Check if we're in interpolation mode
+           
+            
+        
+            
+            self.mPress[0] = event.xdata
+            self.mPress[1] = event.ydata
+            self.mRelease[0] = None
+            self.mRelease[1] = None
+            self.is_dragging = True
+           
+            if (self.fit_toggle_mode > 0 or self.group_selection_mode > 0):
+                if self.rectangle_selector is not None:
+                    self.rectangle_selector.set_active(True)
+                return
+             #No dragging when various modes are on
+            if self.interpolation_mode:
+                return
+            # identify closest point to drag
+            self.drag_index = self._ring_at(event)
+            self.drag_disk = self
+            if self.drag_index is not None and self.linked:
+                self.drag_disk = self._disk_at(event, self.drag_index)
+            # a decimated ring has to be drawn while it is dragged
+            if self.drag_index is not None and self.drag_index not in self.lod:
+                self.lod = np.union1d(self.lod, [self.drag_index])
+
+        if event.dblclick and not event.xdata is None:
+            self.mDblPress[0] = event.xdata
+            self.mDblPress[1] = event.ydata
+
+            text, ok = QtWidgets.QInputDialog.getText(self, 'Input Dialog',
+                                                  'Enter new node value:')
+            if ok:
+                if text:
+                    newVal = float(str(text))
+                    j = self._ring_at(event)
+                    if j is not None:
+                        self.parVals[j] = newVal
+                        self._showEnteredValue()
+
+                    # append the new point to the history if the last item in history differs
+                    # from the new point
+                    if not np.array_equal(self.historyList[len(self.historyList)-1], self.parVals):
+                        self.historyList.append(self.parVals.copy())
+
+            self.mPress[0] = None
+            self.mPress[1] = None
+
+    def _newLimits(self):
+        """y limits that keep the values in view after a value was typed in"""
+        bottom, top = self.ax.get_ylim()
+        max_yvalue = max(self.parVals)
+        min_yvalue = min(self.parVals)
+
+        if self._over_and_above(min_yvalue, bottom, 'min'):
+            bottom = min_yvalue - (0.1*(max_yvalue-min_yvalue))
+            # this line is optional, only bottom scale should change
+            top = max_yvalue + (0.1*(max_yvalue-min_yvalue))
+        elif self._over_and_above(max_yvalue, top, 'max'):
+            top = max_yvalue + (0.1*(max_yvalue-min_yvalue))
+            # this line is optional, only top scale should change
+            bottom = min_yvalue - (0.1*(max_yvalue-min_yvalue))
+        elif self._almost_equal(min_yvalue, bottom, rel_tol=1e-2):
+            bottom = min_yvalue - (0.1*(max_yvalue-min_yvalue))
+            # this line is optional, only bottom scale should change
+            top = max_yvalue + (0.1*(max_yvalue-min_yvalue))
+        elif self._almost_equal(max_yvalue, top, rel_tol=1e-2):
+            top = max_yvalue + (0.1*(max_yvalue-min_yvalue))
+            # this line is optional, only top scale should change
+            bottom = min_yvalue - (0.1*(max_yvalue-min_yvalue))
+        return bottom, top
+
+    def _showEnteredValue(self):
+        """Redraw after a value was typed in on a double click"""
+        bottom, top = self._newLimits()
+        self.ax.clear()
+        self.ax.set_xlim(self.xScale[0], self.xScale[1])
+        self.ax.set_ylim(bottom, top)
+        self.ax.set_xlabel("RADI (arcsec)")
+        self.ax.set_ylabel(self.par + "( "+self.unitMeas+ " )")
+        self.ax.plot(self.parValRADI, self.parVals, '--bo')
+        self._set_radius_ticks()
+        self.canvas.draw()
+        self.key = "No"
+
+    def getRelease(self, event):
+        """Left mouse button is released
+
+        Keyword arguments:
+        self --         main window being displayed i.e. the current instance of the
+                        mainWindow class
+        event --        event type
+
+        Returns:
+        None
+
+        The xData is captured when the left mouse button is released on the canvas.
+        The new data point is added to the history and mouse pressed is assigned None
+        """
+        # re-look at this logic --seems to be a flaw somewhere
+        if self._pan_start is not None:
+            if event.button == 3:
+                self._pan_start = None
+            return
+
+        if not event.ydata is None:
+            self.mRelease[0] = event.xdata
+            self.mRelease[1] = event.ydata
+            self.changeGlobal()
+            self.redo = []
+
+
+                # Toggle INTERPOLATION for the clicked point
+        if self.interpolation_mode or self.fit_toggle_mode > 0:        
+            try:
+                mouse_change = [0.,0.]
+                for i in [0,1]:
+                    mouse_change[i] = abs(self.mRelease[i] - self.mPress[i])
+                if mouse_change[0] > 0.1 or mouse_change[1] > 0.1:
+                    # Significant mouse movement - not a click
+                    pass
+                else:
+                    j = self._ring_at(event)
+                    if j is not None:
+                        # Toggle interpolation for this ring
+                        if self.interpolation_mode: 
+                            self.parameterFitSetting.interpolation[j] = \
+                                not self.parameterFitSetting.interpolation[j]
+                        elif self.fit_toggle_mode == 1:
+                            self.parameterFitSetting.to_fit[j] = True
+                        elif self.fit_toggle_mode == 2:
+                            if self.parameterFitSetting.locked(j+1):
+                                QtWidgets.QMessageBox.information(self, "Information",
+                                    f"Cannot disable fitting of ring {j+1} as it is part of a block fit group.\n"
+                                    "Please modify the group first to disable block fitting.")
+                                return     
+                            self.parameterFitSetting.to_fit[j] = False
+                        self.key = "Yes"
+                        self.yScale = set_plotScale(self.parVals)
+                        self.plotFunc()
+            except Exception as e:
+                logger.exception("Error processing click in current mode: %s", e)
+       
+
+
+        # append the new point to the history if the last item in history differs
+        # from the new point
+        if not np.array_equal(self.historyList[len(self.historyList)-1], self.parVals):
+            self.historyList.append(self.parVals.copy())
+        for disk in self.linked:
+            if not np.array_equal(disk.historyList[-1], disk.parVals):
+                disk.historyList.append(disk.parVals.copy())
+
+        self.mPress[0] = None
+        self.mPress[1] = None
+        dragged = self.is_dragging
+        if self.is_dragging:
+            self.valuesChanged.emit(self.par)
+            for disk in self.linked:
+                if disk is self.drag_disk or self.propagate:
+                    self.valuesChanged.emit(disk.par)
+        self.is_dragging = False
+        self.drag_index = None
+        self.drag_disk = None
+        if dragged and self.delta_reference is not None:
+            # the deltas are in the background, still to the values before the drag
+            self.firstPlot()
+
+    def getMotion(self, event):
+        """Mouse is in motion
+
+        Keyword arguments:
+        self --         main window being displayed i.e. the current instance of the
+                        mainWindow class
+        event --        event type
+
+        Returns:
+        None
+        """
+        # whilst the left mouse button is being clicked
+        # capture the VROT (y-value) during mouse
+        # movement and call re-draw graph
+        if self._pan_start is not None:
+            x0, y0, xlim, ylim = self._pan_start
+            dx = (event.x - x0) * (xlim[1] - xlim[0]) / self.ax.bbox.width
+            dy = (event.y - y0) * (ylim[1] - ylim[0]) / self.ax.bbox.height
+            self._set_view([xlim[0] - dx, xlim[1] - dx], [ylim[0] - dy, ylim[1] - dy])
+        elif self.is_dragging:
+            # if the mouse pointer moves out of the figure canvas use
+            # the last value to redraw the graph
+            if event.ydata is None:
+        
+                bottom,top = self.ax.get_ylim()
+                plotrange = top - bottom
+                if abs(top-self.last_value) < abs(bottom - self.last_value):
+                    self.last_value += 0.1 * abs(plotrange)
+                else:
+                    self.last_value -= 0.1 * abs(plotrange)
+                self.mMotion[0] = self.last_value
+              
+            else:
+               
+                self.last_value = event.ydata
+                self.mMotion[0] = event.ydata
+            self.plotFunc()
+
+    def getScroll(self, event):
+        """Mouse wheel is turned
+
+        Keyword arguments:
+        self --         graph widget the wheel is turned over
+        event --        event type
+
+        Returns:
+        None
+
+        Zooms both axes in (wheel up) or out (wheel down) around the mouse position
+        """
+        if event.inaxes is not self.ax or event.xdata is None:
+            return
+        factor = self.zoom_factor ** (-event.step)
+        xlim = [event.xdata + (x - event.xdata) * factor for x in self.ax.get_xlim()]
+        ylim = [event.ydata + (y - event.ydata) * factor for y in self.ax.get_ylim()]
+        self._set_view(xlim, ylim)
+
+    def _view_key(self):
+        """Key of the current view in the background cache"""
+        limits = tuple(float(f'{x:.8g}') for x in (*self.ax.get_xlim(), *self.ax.get_ylim()))
+        return limits + (int(self.figure.bbox.width), int(self.figure.bbox.height))
+
+    def _set_view(self, xlim, ylim):
+        """Move the axes to a new view while zooming or panning.
+
+        A view that was rendered recently is restored from the cache without
+        redrawing; any other view is drawn quickly now and rendered in full
+        once the navigation settles.
+        """
+        self.navigation_view = [list(xlim), list(ylim)]
+        self.ax.set_xlim(*xlim)
+        self.ax.set_ylim(*ylim)
+        if self._restore_view():
+            self._settle_timer.stop()
+        else:
+            self.canvas.draw_idle()
+            self._settle_timer.start()
+
+    def _settle_view(self):
+        """Render the settled view in full and keep its background"""
+        self.firstPlot(keep_views=True)
+        if self._figure_background is not None:
+            self._view_cache.put(self._view_key(), (self._figure_background, self.lod.copy()))
+
+    def _restore_view(self):
+        """Show the current view from the background cache, False if not cached"""
+        cached = self._view_cache.get(self._view_key())
+        if cached is None or self.line_current is None:
+            return False
+        self._figure_background, lod = cached
+        self.lod = lod.copy()
+        self._set_radius_ticks()
+        self._update_animated()
+        self.canvas.restore_region(self._figure_background)
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._blit_animated(self.figure.bbox)
+        self._update_ring_index()
+        return True
+
+    def _update_animated(self):
+        """Push the current values into the animated artists"""
+        points_to_set = self._get_points()
+        for state in self.states:
+            offsets = np.column_stack((points_to_set[state]['RADI'], points_to_set[state]['VALS']))
+            self.line_current[state].set_offsets(offsets)
+        if self.line_connecting is not None:
+            self.line_connecting.set_data(
+                np.asarray(self.parValRADI, dtype=float)[self.lod],
+                np.asarray(self.parVals, dtype=float)[self.lod])
+        for disk, line in zip(self.linked, self.linked_lines):
+            line.set_data(disk.parValRADI, disk.parVals)
+
+    def _blit_animated(self, bbox):
+        """Draw the animated artists over the restored background and blit"""
+        for artist in self._animated_artists():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(bbox)
+        self.canvas.flush_events()
+
+    def undoKey(self):
+        """Key is pressed
+
+        Keyword arguments:
+        self --         main window being displayed i.e. the current instance of the
+                        mainWindow class
+        event --        event type
+
+        Returns:
+        None
+
+        Deletes the last item in the history list when "Ctrl+z" is pressed and
+        re-draws graph
+        """
+        if len(self.historyList) > 1:
+            self.redo.append([self.numPrecisionY, self.parVals[:],
+                              self.historyList[-1], self.yScale[:]])
+            self.historyList.pop()
+            self.parVals = self.historyList[-1].copy()
+            self.key = "Yes"
+            self.plotFunc()
+            self.valuesChanged.emit(self.par)
+        else:
+            self.showInformation()
+
+    def redoKey(self):
+        """Key is pressed
+
+        Keyword arguments:
+        self --         main window being displayed i.e. the current instance of the
+                        mainWindow class
+        event --        event type
+
+        Returns:
+        None
+
+        Deletes the last item in the history list when "Ctrl+z" is pressed and
+        re-draws graph
+        """
+
+        if len(self.redo) > 0:
+            self.numPrecisionY = self.redo[-1][2]
+            self.parVals = self.redo[-1][3][:]
+            self.historyList.append(self.redo[-1][4][:])
+            self.yScale = self.redo[-1][5][:]
+            self.redo.pop()
+            self.key = "Yes"
+            self.plotFunc()
+            self.valuesChanged.emit(self.par)
+        else:
+            self.showInformation()
+
+
+    def _get_points(self):
+        """Get colors for each point based on TO_FIT and INTERPOLATION status.
+        
+        Returns:
+            dict: RADI and VALS of the points in each state (FIT, INT, NOFIT)
+        """
+        radii = np.asarray(self.parValRADI, dtype=float)
+        values = np.asarray(self.parVals, dtype=float)
+        drawn = np.zeros(len(radii), dtype=bool)
+        drawn[self.lod] = True
+        points_to_set = {}
+        # Red: not fitted, Blue: fitted but interpolated, Green: fitted and not interpolated
+        for state, mask in self.parameterFitSetting.state_masks().items():
+            mask = mask & drawn
+            points_to_set[state] = {'RADI': radii[mask], 'VALS': values[mask]}
+        return points_to_set
+
+    def _level_of_detail(self):
+        """Select the rings that are drawn in the current view.
+
+        Above lod_threshold rings only the rings that keep the first, last,
+        lowest and highest value of every pixel column are drawn. Zooming in
+        until the rings no longer share pixel columns brings back all rings.
+        """
+        n_rings = len(self.parValRADI)
+        width = int(self.ax.bbox.width)
+        if n_rings > self.lod_threshold and width > 0:
+            limits = self.ax.get_xlim()
+            self.lod = np.union1d(
+                minmax_decimate(self.parValRADI, self.parVals, limits, width),
+                minmax_decimate(self.parValRADI, self.originalparVals, limits, width))
+        else:
+            self.lod = np.arange(n_rings)
+
+    def _set_radius_ticks(self):
+        """One tick per ring when few rings are in view, automatic ticks otherwise"""
+        radii = np.asarray(self.parValRADI, dtype=float)
+        lower, upper = sorted(self.ax.get_xlim())
+        in_view = radii[(radii >= lower) & (radii <= upper)]
+        if len(in_view) <= self.tick_threshold:
+            self.ax.set_xticks(in_view)
+        else:
+            self.ax.xaxis.set_major_locator(ticker.AutoLocator())
+
+    def showInformation(self):
+        """Show the information message
+
+        Keyword arguments:
+        self --         main window being displayed i.e. the current instance of the
+        mainWindow class
+
+        Returns:
+        None
+
+        Displays a messagebox that informs user there's no previous action to be undone
+        """
+        QtWidgets.QMessageBox.information(self, "Information", "History list is exhausted")
+
+
+    def firstPlot(self, keep_views=False):
+        """Plots data from file
+
+        Keyword arguments:
+        self --         main window being displayed i.e. the current instance of the
+        mainWindow class
+        keep_views --   keep the cached backgrounds of zoomed/panned views, only
+                        when nothing but the view changed
+
+        Returns:
+        None
+
+        Produces view graph from historyList
+        """
+      
+        if not keep_views:
+            self._view_cache.clear()
+        xlimits, ylimits = (self.xScale, self.yScale) if self.navigation_view is None \
+            else self.navigation_view
+        self.ax.clear()
+        self.ax.set_xlim(xlimits[0], xlimits[1])
+        self.ax.set_ylim(ylimits[0], ylimits[1])
+        self.ax.set_xlabel("RADI (arcsec)")
+        self.ax.set_ylabel(self.par + "( "+self.unitMeas+ " )")
+        self.ring_index = None
+
+        # Create persistent artists once, then update data
+        # Get colors for each point based on fitting status
+        self._level_of_detail()
+        radii = np.asarray(self.parValRADI, dtype=float)[self.lod]
+        original = np.asarray(self.originalparVals, dtype=float)[self.lod]
+        errors = np.asarray(self.parValsErr, dtype=float)[self.lod]
+        points_to_set = self._get_points()
+        self.states = list(state_styles)
+        self.line_current = {}
+        # Use scatter plot for individual point colors
+        for state, (color, marker) in state_styles.items():
+            self.line_current[state] = self.ax.scatter(points_to_set[state]['RADI'], 
+                                                points_to_set[state]['VALS'], 
+                                           c=color, marker=marker, s=50, zorder=4, 
+                                          animated=True, edgecolors='black', linewidths=0.5)
+        
+        
+        # Add connecting lines in grey
+        self.line_connecting, = self.ax.plot(radii, np.asarray(self.parVals, dtype=float)[self.lod], '--', 
+                                            color='mediumseagreen', alpha=1., zorder=3, 
+                                            animated=True, linewidth=1)
+        self.linked_lines = []
+        for i, disk in enumerate(self.linked):
+            line, = self.ax.plot(disk.parValRADI, disk.parVals, '--s', ms=5, zorder=3,
+                                 color=self.disk_colors[i % len(self.disk_colors)],
+                                 animated=True, linewidth=1, label=disk.par)
+            self.linked_lines.append(line)
+        if self.linked:
+            self.ax.legend(handles=[self.line_connecting] + self.linked_lines,
+                           labels=[self.par] + [disk.par for disk in self.linked],
+                           loc='best', fontsize='small', frameon=False)
+            if self.navigation_view is None:
+                # every disk has to be in view
+                lower = min([ylimits[0]] + [float(np.min(disk.parVals)) for disk in self.linked])
+                upper = max([ylimits[1]] + [float(np.max(disk.parVals)) for disk in self.linked])
+                self.ax.set_ylim(lower, upper)
+   
+       
+        self.ax.plot(radii, original, '--ro', alpha=0.2, zorder=2)
+        self.ax.plot(radii, original, '-', c='r', alpha=0.2, zorder=2)
+        # all error bars in one collection rather than one artist per ring
+        self.err_container = LineCollection(error_segments(radii, original, errors),
+                                            colors='r', alpha=0.2, zorder=2)
+        self.ax.add_collection(self.err_container, autolim=False)
+        for i, (label, overlay_radii, overlay_values) in enumerate(self.overlays):
+            self.ax.plot(overlay_radii, overlay_values, '-', marker='.', color=f'C{i % 10}',
+                         alpha=0.6, zorder=1, linewidth=1, label=label)
+        if self.overlays:
+            self.ax.legend(loc='best', fontsize='small', frameon=False)
+        if self.delta_reference is not None:
+            reference_radii, reference = self.delta_reference
+            self.ax.plot(reference_radii, reference, ':', color='grey', zorder=1, linewidth=1)
+            current = np.asarray(self.parVals, dtype=float)
+            rings = min(len(reference), len(current))
+            ring_radii = np.asarray(self.parValRADI, dtype=float)[:rings]
+            self.ax.add_collection(LineCollection(
+                np.stack((np.column_stack((ring_radii, reference[:rings])),
+                          np.column_stack((ring_radii, current[:rings]))), axis=1),
+                colors='grey', linewidths=2, alpha=0.6, zorder=1), autolim=False)
+       
+        self._set_radius_ticks()
+        #Make sure to catch the current line in the limits
+        for artist in self._animated_artists():
+            artist.set_visible(True)
+        self.canvas.draw()
+        ylimits = self.ax.get_ylim()
+        # Hide the animated line before the full draw to keep background clean
+        for artist in self._animated_artists():
+            artist.set_visible(False)
+        # Full draw for non-animated artists (axes, error bars, originals)
+        self.ax.set_ylim(ylimits[0], ylimits[1])
+        self.canvas.draw()
+        # Cache clean background and then re-blit the current line
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for artist in self._animated_artists():
+            artist.set_visible(True)
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+        self.canvas.flush_events()
+        self.key = "No"
+
+    def plotFunc(self):
+        """Plots data from file
+
+        Keyword arguments:
+        self --         main window being displayed i.e. the current instance of the
+                        mainWindow class
+
+        Returns:
+        None
+
+        Produces view graph from historyList or parVals
+        """
+
+        if self.key == "Yes":
+          
+            self.firstPlot()
+
+        # this re-plots the graph as long as the mouse is in motion and the right data
+        # point is clicked
+        else:
+            # Fast path: update only the dragged point and line data
+            if self.is_dragging and self.drag_index is not None and self.mMotion[0] is not None:
+                j = self.drag_index
+                disk = self.drag_disk if self.drag_disk is not None else self
+                # set the y-value directly to current mouse y
+                new_y = self.mMotion[0]
+                if new_y is not None:
+                    if self.propagate and self.linked:
+                        delta = np.zeros(len(disk.parVals))
+                        delta[j] = new_y - float(disk.parVals[j])
+                        self.propagateDelta(disk, delta)
+                    disk.parVals[j] = new_y
+
+                    # Update current line data only
+                    self._update_animated()
+
+                    # Adjust limits only if new point is outside current view
+                    bottom, top = self.ax.get_ylim()
+                    if new_y < bottom or new_y > top:
+                        max_yvalue = float(np.max(disk.parVals))
+                        min_yvalue = float(np.min(disk.parVals))
+                        span = max(1e-9, (max_yvalue - min_yvalue))
+                      
+                        bottom = min_yvalue - 0.1 * span
+                        top = max_yvalue + 0.1 * span
+                      
+                        self.ax.set_ylim(bottom, top)
+                        if self.navigation_view is not None:
+                            self.navigation_view[1] = [bottom, top]
+                        self.background = None  # Invalidate cached background
+                       
+                        self.canvas.draw_idle()
+                    else:    
+                        # Blit-accelerated redraw (only changed region)
+                        if self.background is not None:
+                            self.canvas.restore_region(self.background)
+                            self._blit_animated(self.ax.bbox)
+                        else:
+                            self.canvas.draw_idle()
+                    self.key = "No"
+        self.check_parameter_limits()
+
+    def check_parameter_limits(self):
+        """Check if the parameter plot limits exceed the parmin and parmax values."""
+        defaults = self.parameterFitSetting.defaults
+        if defaults['PARMIN'] is None or defaults['PARMIN'] > self.yScale[0]:
+            defaults['PARMIN'] = self.yScale[0]
+        if defaults['PARMAX'] is None or self.yScale[1] > defaults['PARMAX']:
+            defaults['PARMAX'] = self.yScale[1]
+        
+     
+
+
+            # If not dragging, do nothing heavy here
+
+class NativeGraphWidget(GraphWidget):
+    """GraphWidget drawn with QPainter by a RingPlotView instead of matplotlib
+
+    The view has the part of the matplotlib axes and canvas interface that
+    GraphWidget uses, so clicking, dragging, selecting and undoing are shared
+    and only the drawing differs. The points, the connecting line and the
+    lines of linked disks are painted over a cached raster layer that holds
+    the rest of the graph.
+    """
+    # marker sizes in pixels
+    point_size = 9.
+    disk_point_size = 7.
+    original_point_size = 8.
+    overlay_point_size = 6.
+
+    def _create_canvas(self):
+        self.figure = None
+        self.canvas = RingPlotView(self)
+        self.ax = self.canvas
+        self.canvas.setFocus()
+
+    def _ring_at(self, event):
+        # the pixels of the rings move with every resize, there is no draw event
+        self._update_ring_index(rebuild=self.ring_index is None)
+        return self.ring_index.nearest(event.x, self.hit_radius)
+
+    def _set_radius_ticks(self):
+        radii = np.asarray(self.parValRADI, dtype=float)
+        lower, upper = sorted(self.ax.get_xlim())
+        in_view = radii[(radii >= lower) & (radii <= upper)]
+        self.ax.set_xticks(in_view if len(in_view) <= self.tick_threshold else None)
+
+    def set_selector(self, mode):
+        if mode > 0:
+            if self.rectangle_selector is None:
+                self.rectangle_selector = self.canvas.rectangle_selector(self._on_group_select)
+            self.rectangle_selector.set_active(True)
+        else:
+            self.rectangle_selector.set_active(False)
+
+    def _set_view(self, xlim, ylim):
+        # a view is drawn faster than a cached one is looked up
+        self.navigation_view = [list(xlim), list(ylim)]
+        self.firstPlot(keep_views=True)
+
+    def _blit_animated(self, bbox):
+        self.canvas.update()
+
+    def _showEnteredValue(self):
+        bottom, top = self._newLimits()
+        self.navigation_view = [list(self.xScale), [bottom, top]]
+        self.firstPlot(keep_views=True)
+
+    def firstPlot(self, keep_views=False):
+        """Plots data from file, as GraphWidget.firstPlot"""
+        xlimits, ylimits = (self.xScale, self.yScale) if self.navigation_view is None \
+            else self.navigation_view
+        self.ax.clear()
+        self.ax.set_xlim(xlimits[0], xlimits[1])
+        self.ax.set_ylim(ylimits[0], ylimits[1])
+        self.ax.set_xlabel("RADI (arcsec)")
+        self.ax.set_ylabel(self.par + "( "+self.unitMeas+ " )")
+        self.ring_index = None
+
+        self._level_of_detail()
+        radii = np.asarray(self.parValRADI, dtype=float)[self.lod]
+        original = np.asarray(self.originalparVals, dtype=float)[self.lod]
+        errors = np.asarray(self.parValsErr, dtype=float)[self.lod]
+        points_to_set = self._get_points()
+        self.states = list(state_styles)
+        self.line_current = {}
+        for state, (color, marker) in state_styles.items():
+            self.line_current[state] = self.ax.plot(
+                points_to_set[state]['RADI'], points_to_set[state]['VALS'], color=color,
+                marker=marker, size=self.point_size, edgecolor='black', zorder=4, animated=True)
+        self.line_connecting = self.ax.plot(radii, np.asarray(self.parVals, dtype=float)[self.lod],
+                                            color='mediumseagreen', linestyle='--', zorder=3,
+                                            animated=True, label=self.par)
+        self.linked_lines = []
+        for i, disk in enumerate(self.linked):
+            self.linked_lines.append(self.ax.plot(
+                disk.parValRADI, disk.parVals, color=self.disk_colors[i % len(self.disk_colors)],
+                linestyle='--', marker='s', size=self.disk_point_size, zorder=3, animated=True,
+                label=disk.par))
+        if self.linked and self.navigation_view is None:
+            # every disk has to be in view
+            lower = min([ylimits[0]] + [float(np.min(disk.parVals)) for disk in self.linked])
+            upper = max([ylimits[1]] + [float(np.max(disk.parVals)) for disk in self.linked])
+            self.ax.set_ylim(lower, upper)
+
+        self.ax.plot(radii, original, color='r', linestyle='--', marker='o',
+                     size=self.original_point_size, alpha=0.2, zorder=2)
+        self.err_container = self.ax.segments(error_segments(radii, original, errors),
+                                              color='r', alpha=0.2, zorder=2)
+        overlays = []
+        for i, (label, overlay_radii, overlay_values) in enumerate(self.overlays):
+            overlays.append(self.ax.plot(overlay_radii, overlay_values, color=f'C{i % 10}',
+                                         linestyle='-', marker='.', size=self.overlay_point_size,
+                                         alpha=0.6, zorder=1, label=label))
+        if self.delta_reference is not None:
+            reference_radii, reference = self.delta_reference
+            self.ax.plot(reference_radii, reference, color='grey', linestyle=':', zorder=1)
+            current = np.asarray(self.parVals, dtype=float)
+            rings = min(len(reference), len(current))
+            ring_radii = np.asarray(self.parValRADI, dtype=float)[:rings]
+            self.ax.segments(np.stack((np.column_stack((ring_radii, reference[:rings])),
+                                       np.column_stack((ring_radii, current[:rings]))), axis=1),
+                             color='grey', linewidth=2, alpha=0.6, zorder=1)
+        if overlays:
+            self.ax.set_legend(self.linked_lines + overlays)
+        elif self.linked:
+            self.ax.set_legend([self.line_connecting] + self.linked_lines)
+        self._set_radius_ticks()
+        self.canvas.update()
+        self.key = "No"
+
+
+class SMWindow(QtWidgets.QWidget):
+
+    def __init__(self, par, xVal, gwObjects):
+        # TODO SAM (26/06/2019) no need to pass 'par' to init if we have 'gwObjects'
+        # but maybe we need it because it makes things faster
+        super(SMWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        # Enable stylesheet background (needed for border-image on top-level QWidget)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.xMinVal = xVal[0]
+        self.xMaxVal = xVal[1]
+        self.gwObjects = gwObjects
+        self.par = par
+        self.prevParVal = ""
+        self.counter = 0
+
+        self.parameter = QtWidgets.QComboBox()
+        # self.parameter.setEditable(True)
+        self.parameter.addItem("Select Parameter")
+        for i in self.par:
+            self.parameter.addItem(i)
+        # self.parameter.setAutoCompletion(True) : doesn't work in PyQt5
+        self.parameter.setStyleSheet("QComboBox { combobox-popup: 0; }")
+        self.parameter.setMaxVisibleItems(5)
+        index = self.parameter.findText("Select Parameter", 
+            QtCore.Qt.MatchFlag.MatchFixedString)
+        self.parameter.setCurrentIndex(index)
+        self.parameter.currentIndexChanged.connect(self.onChangeEvent)
+        # run a for loop here to gather all they loaded parameters and populate as many text boxes
+
+        self.xLabel = QtWidgets.QLabel("RADI")
+        self.xMin = QtWidgets.QLineEdit()
+        self.xMin.setPlaceholderText("RADI min ("+str(self.xMinVal)+")")
+        self.xMax = QtWidgets.QLineEdit()
+        self.xMax.setPlaceholderText("RADI max ("+str(self.xMaxVal)+")")
+        self.xGrid = QtWidgets.QGridLayout()
+        self.xGrid.setSpacing(10)
+        self.xGrid.addWidget(self.xLabel, 1, 0)
+        self.xGrid.addWidget(self.xMin, 2, 0)
+        self.xGrid.addWidget(self.xMax, 2, 1)
+
+        self.yMin = QtWidgets.QLineEdit()
+        self.yMax = QtWidgets.QLineEdit()
+        self.yGrid = QtWidgets.QGridLayout()
+        self.yGrid.setSpacing(10)
+        self.yGrid.addWidget(self.parameter, 1, 0)
+        self.yGrid.addWidget(self.yMin, 2, 0)
+        self.yGrid.addWidget(self.yMax, 2, 1)
+
+        self.hbox = QtWidgets.QHBoxLayout()
+        self.hbox.addStretch(1)
+
+        self.hboxBtns = QtWidgets.QHBoxLayout()
+        self.hboxBtns.addStretch(1)
+        self.btnUpdate = IconButton(icons_location/'OK.png', self) 
+        self.btnUpdate.clicked.connect(self.updateScale)     
+        self.btnCancel = IconButton(icons_location/'cancel.png', self)   
+
+        self.btnCancel.clicked.connect(self.close)
+        self.hboxBtns.addWidget(self.btnUpdate)
+        self.hboxBtns.addWidget(self.btnCancel)
+
+        self.fbox = QtWidgets.QFormLayout()
+        self.fbox.addRow(self.xGrid)
+        self.fbox.addRow(self.yGrid)
+        self.fbox.addRow(self.hboxBtns)
+
+        self.setLayout(self.fbox)
+        self.setFocus()
+        self.setWindowTitle("Scale Manager")
+        self.setGeometry(300, 300, 300, 150)
+        _center(self)
+        self.setFocus()
+
+        self.gwDict = {}
+        for gwObject in self.gwObjects:
+            self.gwDict[gwObject.par] = gwObject.yScale[:]
+
+    def onChangeEvent(self):
+        if self.yMin.text():
+            self.gwDict[self.prevParVal][0] = int(float(self.yMin.text()))
+        if self.yMax.text():
+            self.gwDict[self.prevParVal][1] = int(float(self.yMax.text()))
+
+        for i in self.par:
+            if str(self.parameter.currentText()) == i:
+                self.yMin.clear()
+                self.yMin.setPlaceholderText(i+" min ("+str(self.gwDict[i][0])+")")
+                self.yMax.clear()
+                self.yMax.setPlaceholderText(i+" max ("+str(self.gwDict[i][1])+")")
+                self.prevParVal = i
+
+    def updateScale (self):
+        """Change the values of the instance variables and specific graph widget plots
+        after update button is clicked.
+        """
+        if self.xMin.text():
+            self.xMinVal = int(float(self.xMin.text()))
+
+        if self.xMax.text():
+            self.xMaxVal = int(float(self.xMax.text()))
+
+        if self.yMin.text():
+            self.gwDict[self.prevParVal][0] = int(float(self.yMin.text()))
+
+        if self.yMax.text():
+            self.gwDict[self.prevParVal][1] = int(float(self.yMax.text()))
+
+        for gwObject in self.gwObjects:
+            gwObject.yScale = self.gwDict[gwObject.par][:]
+            gwObject.xScale = [self.xMinVal, self.xMaxVal]
+            gwObject.navigation_view = None
+            gwObject.firstPlot()
+        self.close()
+        QtWidgets.QMessageBox.information(self, "Information", "Done!")
+# the QIcon of every (path, state, size), shared by all IconButtons
+_icon_variants = {}
+
+def icon_variant(image_path, state='normal', size=40):
+    """The icon of image_path in state ('normal', 'grayscale' or 'red_glow'),
+    scaled to size (in logical pixels); made once and reused afterwards"""
+    key = (str(image_path), state, size)
+    icon = _icon_variants.get(key)
+    if icon is None:
+        ratio = QtGui.QGuiApplication.instance().devicePixelRatio()
+        image = QtGui.QImage(str(image_path))
+        if not image.isNull():
+            image = image.scaled(int(size*ratio), int(size*ratio),
+                                 QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+                                 QtCore.Qt.TransformationMode.SmoothTransformation)
+            image = image.convertToFormat(QtGui.QImage.Format.Format_RGBA8888)
+            if state != 'normal':
+                width, height = image.width(), image.height()
+                buffer = image.constBits()
+                buffer.setsize(image.sizeInBytes())
+                rgba = np.frombuffer(buffer, dtype=np.uint8).reshape(
+                    height, image.bytesPerLine())[:, :width*4].reshape(height, width, 4)
+                tinted = np.ascontiguousarray(tint(rgba, state))
+                image = QtGui.QImage(tinted.data, width, height, width*4,
+                                     QtGui.QImage.Format.Format_RGBA8888).copy()
+            image.setDevicePixelRatio(ratio)
+        icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
+        _icon_variants[key] = icon
+    return icon
+
+class IconButton(QtWidgets.QPushButton):
+    def __init__(self,image_path, parent=None, start_grayscale=False, support_three_states=False, extra_icon_path=None):
+        super(IconButton, self).__init__('', parent)
+        self.setFixedSize(40, 40)
+        self.image_path = image_path
+        self.extra_icon_path = extra_icon_path
+        self.is_grayscale = start_grayscale
+        self.support_three_states = support_three_states
+        self.state = 0 if start_grayscale else 1
+        
+        if start_grayscale:
+            self._apply_grayscale()
+        else:
+            self.setIcon(icon_variant(self.image_path))
+        
+        self.setFlat(True)
+        self.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.setIconSize(QtCore.QSize(40,40))
+    
+    def _apply_grayscale(self):
+        """Convert icon to grayscale"""
+        self.setIcon(icon_variant(self.image_path, 'grayscale'))
+    
+    def _apply_red_glow(self):
+        """Apply red glow/overlay to icon"""
+        self.setIcon(icon_variant(self.image_path, 'red_glow'))
+    
+    def set_state(self, state):
+        """Set button state: 0=grayscale, 1=normal, 2=red glow"""
+        self.state = state
+        if state == 0:
+            self._apply_grayscale()
+        elif state == 1:
+            self.setIcon(icon_variant(self.image_path))
+        elif state == 2:
+            self.setIcon(icon_variant(self.extra_icon_path))
+    
+    def cycle_state(self):
+        """Cycle through states"""
+        if self.support_three_states:
+            self.state = (self.state + 1) % 3
+        else:
+            self.state = 1 - self.state
+        self.set_state(self.state)
+    
+    def set_grayscale(self, grayscale):
+        """Toggle between grayscale and full color"""
+        self.is_grayscale = grayscale
+        if grayscale:
+            self._apply_grayscale()
+        else:
+            self.setIcon(icon_variant(self.image_path))
+    
+    def toggle_grayscale(self):
+        """Toggle grayscale state"""
+        self.set_grayscale(not self.is_grayscale)
+      
+class PolyFitWindow(QtWidgets.QWidget):
+    
+    def __init__(self, par):
+        super(PolyFitWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        # Enable stylesheet background (needed for border-image on top-level QWidget)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.par = par
+        polys = [1,2,3,4,5,6,7,8]
+        self.minDegreeLabel = QtWidgets.QLabel("Min Degree of Polynomial")
+        self.minDegree = QtWidgets.QComboBox()
+        for degree in polys:
+            self.minDegree.addItem(str(degree))
+        self.minDegree.setStyleSheet("QComboBox { combobox-popup: 0; }")
+        self.maxDegreeLabel = QtWidgets.QLabel("Max Degree of Polynomial")
+        self.maxDegree = QtWidgets.QComboBox()
+        for degree in polys[::-1]:
+            self.maxDegree.addItem(str(degree))
+        self.maxDegree.setStyleSheet("QComboBox { combobox-popup: 0; }")
+        self.lowerBoundaryLabel = QtWidgets.QLabel("Lower Boundary Limit")
+        self.lowerBoundary = QtWidgets.QLineEdit()
+        self.upperBoundaryLabel = QtWidgets.QLabel("Upper Boundary Limit")
+        self.upperBoundary = QtWidgets.QLineEdit()
+        if self.par.split('_')[0] in ['VROT']:
+            self.flatOuterRingsLabel = QtWidgets.QLabel("Number of Outer Flat Rings")
+            self.flatOuterRings = QtWidgets.QLineEdit()
+        else:
+            self.innerFlatringsLabel = QtWidgets.QLabel("Inner Flat Rings")
+            self.innerFlatrings = QtWidgets.QLineEdit()
+        self.grid = QtWidgets.QGridLayout()
+        self.grid.setSpacing(10)
+        self.grid.addWidget(self.minDegreeLabel, 1, 0)
+        self.grid.addWidget(self.minDegree, 1, 1)
+        self.grid.addWidget(self.maxDegreeLabel, 2, 0)
+        self.grid.addWidget(self.maxDegree, 2, 1)
+        self.grid.addWidget(self.lowerBoundaryLabel, 3, 0)
+        self.grid.addWidget(self.lowerBoundary, 3, 1)
+        self.grid.addWidget(self.upperBoundaryLabel, 4, 0)
+        self.grid.addWidget(self.upperBoundary, 4, 1)
+        if self.par.split('_')[0] in ['VROT']:
+            self.flatOuterRingsLabel = QtWidgets.QLabel("Number of Outer Flat Rings")
+            self.flatOuterRings = QtWidgets.QLineEdit()
+            self.grid.addWidget(self.flatOuterRingsLabel, 5, 0)
+            self.grid.addWidget(self.flatOuterRings, 5, 1)
+        else:
+            self.innerFlatringsLabel = QtWidgets.QLabel("Inner Flat Rings")
+            self.innerFlatrings = QtWidgets.QLineEdit()
+            self.grid.addWidget(self.innerFlatringsLabel, 5, 0)
+            self.grid.addWidget(self.innerFlatrings, 5, 1)
+
+        self.btnOK = IconButton(icons_location/'OK.png', self)       
+        self.btnCancel = IconButton(icons_location/'cancel.png', self)   
+
+        self.hbox = QtWidgets.QHBoxLayout()
+        #self.hbox.addStretch(1)
+        self.hbox.addWidget(self.btnOK)
+        self.hbox.addWidget(self.btnCancel)
+
+        self.grid.addLayout(self.hbox, 6, 0,1,2)
+
+        if self.par.split('_')[0] in ['INCL','PA']:
+            self.warped = QtWidgets.QCheckBox(text="Fit Angular Momentum Vector?")
+            self.grid.addWidget(self.warped, 7, 0)
+       
+
+
+        self.setLayout(self.grid)
+
+        self.setWindowTitle("Polynomial Fit Specification")
+        self.setGeometry(300, 300, 300, 150)
+
+        _center(self)
+        self.setFocus()
+
+
+class ParamSpec(QtWidgets.QWidget):
+
+    def __init__(self, par, windowTitle,plotted_parameters = None, addLocation=False):
+        super(ParamSpec, self).__init__()
+        self.setProperty("popupBg", True)
+        # Enable stylesheet background (needed for border-image on top-level QWidget)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.par = par
+
+        self.parameterLabel = QtWidgets.QLabel("Parameter")
+        self.parameter = QtWidgets.QComboBox()
+        self.parameter.setEditable(True)
+        self.parameter.addItem("Select Parameter")
+        for i in self.par:
+            self.parameter.addItem(i)
+
+        self.parameter.setStyleSheet("QComboBox { combobox-popup: 0; }")
+        self.parameter.setMaxVisibleItems(6)
+        index = self.parameter.findText("Select Parameter", QtCore.Qt.MatchFlag.MatchFixedString)
+        self.parameter.setCurrentIndex(index)
+        self.uMeasLabel = QtWidgets.QLabel("Unit Measurement")
+        self.unitMeasurement = QtWidgets.QLineEdit()
+        # self.unitMeasurement.setPlaceholderText("Unit Measurement")
+      
+        self.grid = QtWidgets.QGridLayout()
+        self.grid.setSpacing(10)
+        self.grid.addWidget(self.parameterLabel, 1, 0)
+        self.grid.addWidget(self.parameter, 1, 1)
+        self.grid.addWidget(self.uMeasLabel, 2, 0)
+        self.grid.addWidget(self.unitMeasurement, 2, 1)
+        if addLocation:
+            self.afterLabel = QtWidgets.QLabel("Add After")
+            self.afterParameter = QtWidgets.QComboBox()
+            self.afterParameter.setEditable(True)
+            self.afterParameter.addItem("End")
+            for i in plotted_parameters:
+                self.afterParameter.addItem(i)
+            self.afterParameter.setStyleSheet("QComboBox { combobox-popup: 0; }")
+            self.afterParameter.setMaxVisibleItems(6)
+            index = self.afterParameter.findText("End", QtCore.Qt.MatchFlag.MatchFixedString)
+            self.afterParameter.setCurrentIndex(index)
+   
+            self.grid.addWidget(self.afterLabel, 3, 0)
+            self.grid.addWidget(self.afterParameter, 3, 1)
+        
+        self.btnOK = IconButton(icons_location/'OK.png', self)       
+        self.btnCancel = IconButton(icons_location/'cancel.png', self)   
+
+        self.hbox = QtWidgets.QHBoxLayout()
+        #self.hbox.addStretch(1)
+        self.hbox.addWidget(self.btnOK)
+        self.hbox.addWidget(self.btnCancel)
+
+        self.grid.addLayout(self.hbox, 4 if addLocation else 3, 0,1,2)
+        self.setLayout(self.grid)
+
+        self.setWindowTitle(windowTitle)
+        self.setGeometry(300, 300, 300, 150)
+
+        _center(self)
+        self.setFocus()
+class _FittingFillDialog(QtWidgets.QDialog):
+   
+
+    def __init__(self, parameter,fitting_parameters,fitting_settings):
+        super(_FittingFillDialog, self).__init__()
+        self.setProperty("popupBg", True)
+        # Enable stylesheet background (needed for border-image on top-level QWidget)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.parameter = parameter
+        self.infoLabel = QtWidgets.QLabel(
+            f"Specify fitting settings for parameter {self.parameter}"
+        )
+       
+        count=0
+        self.grid = QtWidgets.QGridLayout()
+        self.grid.setSpacing(10)
+        self.grid.addWidget(self.infoLabel,count,0,1,2)
+        count+=1
+        for key in fitting_parameters:
+            if key not in ['VARY','VARINDX']:
+                setattr(self, f'{key}Label', QtWidgets.QLabel(f"{key}"))
+                setattr(self, f'{key}', QtWidgets.QLineEdit())
+              
+                if fitting_settings[key] is not None:
+                    tmp = getattr(self, f'{key}')
+                    tmp.setPlaceholderText(f"{fitting_settings[key]}")
+                self.grid.addWidget(getattr(self, f'{key}Label'),count,0)
+                self.grid.addWidget(getattr(self, f'{key}'),count,1)
+                count+=1
+        #self.hbox.addStretch(1)
+        self.hbox = QtWidgets.QHBoxLayout()
+        self.btnOK = IconButton(icons_location/'OK.png', self)       
+        self.btnCancel = IconButton(icons_location/'cancel.png', self)   
+        self.hbox.addWidget(self.btnOK)
+        self.hbox.addWidget(self.btnCancel)
+        self.grid.addLayout(self.hbox,count,0,1,2)
+       
+        self.setLayout(self.grid)
+
+        self.setWindowTitle("Fitting Parameter Specification")
+        self.setGeometry(300, 300, 300, 150)
+
+        _center(self)
+        self.setFocus()
+
+class _CubeWorker(QtCore.QObject):
+    finished = QtCore.pyqtSignal(object)
+    errored = QtCore.pyqtSignal(str)
+    progress = QtCore.pyqtSignal(float)
+
+    def __init__(self, function, *args):
+        super().__init__()
+        self.function = function
+        self.args = args
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        try:
+            self.finished.emit(self.function(*self.args, progress=self.progress.emit))
+        except Exception as e:
+            self.errored.emit(str(e))
+
+
+class CubeWindow(QtWidgets.QWidget):
+    """Panel showing moment maps and a PV slice of the INSET cube with the
+    current rings drawn on top.
+
+    The products are computed on demand in a worker thread, chunk by chunk
+    over the channels of the memory-mapped cube, and cached next to it.
+    """
+    products = ['Moment 0', 'Moment 1', 'PV major axis']
+
+    def __init__(self, cube, ring_values, clip=None):
+        super(CubeWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.cube = cube
+        # function returning the current RADI and ring geometry
+        self.ring_values = ring_values
+        self.clip = clip
+        self.results = {}
+        self.failed = set()
+        self._thread = None
+
+        self.product = QtWidgets.QComboBox()
+        self.product.addItems(self.products)
+        self.showRings = QtWidgets.QCheckBox(text="Show rings")
+        self.showRings.setChecked(True)
+        self.btnRefresh = QtWidgets.QPushButton("Update rings")
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.setRange(0, 100)
+        self.figure = plt.figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+
+        hbox = QtWidgets.QHBoxLayout()
+        hbox.addWidget(self.product)
+        hbox.addWidget(self.showRings)
+        hbox.addWidget(self.btnRefresh)
+        hbox.addWidget(self.progress)
+        vbox = QtWidgets.QVBoxLayout()
+        vbox.addLayout(hbox)
+        vbox.addWidget(self.canvas)
+        self.setLayout(vbox)
+
+        self.product.currentIndexChanged.connect(self.showProduct)
+        self.showRings.stateChanged.connect(self.showProduct)
+        self.btnRefresh.clicked.connect(self.failed.clear)
+        self.btnRefresh.clicked.connect(self.showProduct)
+
+        self.setWindowTitle(f"Data cube: {os.path.basename(cube.filename)}")
+        self.setGeometry(300, 300, 700, 600)
+        _center(self)
+        self.showProduct()
+
+    def _compute(self, name):
+        """Start the computation of a product in a worker thread"""
+        if self._thread is not None:
+            return
+        if name == 'PV major axis':
+            geometry = self.ring_values()
+            x, y = self.cube.world_to_pixel(geometry['XPOS'][0], geometry['YPOS'][0])
+            function, args = self.cube.pv_slice, (float(x), float(y),
+                                                  float(geometry['PA'][0]))
+        else:
+            function, args = self.cube.moment_maps, (self.clip,)
+        self._thread = QtCore.QThread(self)
+        self._worker = _CubeWorker(function, *args)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+
+        def _done(result):
+            if name == 'PV major axis':
+                self.results[name] = (result, args)
+            else:
+                self.results['Moment 0'], self.results['Moment 1'] = result
+            self.progress.setValue(100)
+            # the rings of a closed window may belong to another template
+            if self.isVisible():
+                self.showProduct()
+
+        def _error(msg):
+            self.failed.add(name)
+            QtWidgets.QMessageBox.critical(self, "Cube Error", msg)
+
+        def _finished():
+            self._thread = None
+            if self.isVisible() and self.product.currentText() not in self.failed:
+                self.showProduct()
+
+        self._worker.progress.connect(lambda fraction: self.progress.setValue(int(fraction * 100)))
+        self._worker.finished.connect(_done)
+        self._worker.errored.connect(_error)
+        # direct, as closeEvent waits for the thread on the GUI thread
+        self._worker.finished.connect(self._thread.quit, QtCore.Qt.ConnectionType.DirectConnection)
+        self._worker.errored.connect(self._thread.quit, QtCore.Qt.ConnectionType.DirectConnection)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.finished.connect(self._thread.deleteLater)
+        self._thread.finished.connect(_finished)
+        self.progress.setValue(0)
+        self._thread.start()
+
+    def closeEvent(self, event):
+        # the window is dropped once closed, the running product is finished first
+        if self._thread is not None:
+            self._thread.wait()
+        super(CubeWindow, self).closeEvent(event)
+
+    def showProduct(self):
+        """Draw the selected product, computing it first when needed"""
+        name = self.product.currentText()
+        geometry = self.ring_values()
+        if name == 'PV major axis' and name in self.results:
+            # the slice follows the center and PA of the innermost ring
+            _, args = self.results[name]
+            x, y = self.cube.world_to_pixel(geometry['XPOS'][0], geometry['YPOS'][0])
+            if not np.allclose(args, (x, y, geometry['PA'][0])):
+                del self.results[name]
+        if name not in self.results:
+            if name not in self.failed:
+                self._compute(name)
+            return
+        self.ax.clear()
+        if name == 'PV major axis':
+            (offsets, pv), _ = self.results[name]
+            velocities = self.cube.channel_velocities()
+            self.ax.imshow(pv, origin='lower', aspect='auto', cmap='viridis',
+                           extent=[offsets[0], offsets[-1], velocities[0], velocities[-1]])
+            if self.showRings.isChecked() and 'VROT' in geometry:
+                # projected rotation curve on both sides of the center
+                vsys = geometry['VSYS'] if 'VSYS' in geometry else np.zeros(len(geometry['RADI']))
+                projected = geometry['VROT'] * np.sin(np.radians(geometry['INCL']))
+                self.ax.plot(geometry['RADI'], vsys + projected, 'r.')
+                self.ax.plot(-geometry['RADI'], vsys - projected, 'r.')
+            self.ax.set_xlabel("Offset (arcsec)")
+            self.ax.set_ylabel("Velocity (km/s)")
+        else:
+            self.ax.imshow(self.results[name], origin='lower', cmap='viridis')
+            if self.showRings.isChecked():
+                x, y = self.cube.ring_ellipses(geometry['RADI'], geometry['XPOS'],
+                                               geometry['YPOS'], geometry['PA'],
+                                               geometry['INCL'])
+                self.ax.add_collection(LineCollection(np.stack((x, y), axis=-1),
+                                                      colors='r', linewidths=0.8))
+            self.ax.set_xlabel("x (pixels)")
+            self.ax.set_ylabel("y (pixels)")
+        self.canvas.draw_idle()
+
+class ModelPreviewWindow(QtWidgets.QWidget):
+    """Quick projection of the current rings into a velocity field and a
+    coarse model cube, refreshed whenever an edit of the values is finished.
+    """
+    views = ['Velocity field', 'Model moment 0', 'Model channel']
+    # ms to wait for further edits before the model is projected again
+    refresh_delay = 50
+
+    def __init__(self, grid, ring_values):
+        super(ModelPreviewWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.grid = grid
+        self.ring_values = ring_values
+        self.points = None
+        self.cube = None
+
+        self.view = QtWidgets.QComboBox()
+        self.view.addItems(self.views)
+        self.channel = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
+        self.channel.setRange(0, len(grid.velocities) - 1)
+        self.channel.setValue(len(grid.velocities) // 2)
+        self.timingLabel = QtWidgets.QLabel("")
+        self.figure = plt.figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+
+        hbox = QtWidgets.QHBoxLayout()
+        hbox.addWidget(self.view)
+        hbox.addWidget(self.channel)
+        hbox.addWidget(self.timingLabel)
+        vbox = QtWidgets.QVBoxLayout()
+        vbox.addLayout(hbox)
+        vbox.addWidget(self.canvas)
+        self.setLayout(vbox)
+
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self.view.currentIndexChanged.connect(self.showView)
+        self.channel.valueChanged.connect(self.showView)
+
+        self.setWindowTitle("Model Preview")
+        self.setGeometry(300, 300, 700, 600)
+        _center(self)
+        self.refresh()
+
+    def scheduleRefresh(self, par=None):
+        """Project the model again once the edits have settled"""
+        if self.isVisible():
+            self._refresh_timer.start(self.refresh_delay)
+
+    def refresh(self):
+        """Sample the current rings; the model cube is only made when shown"""
+        start = time.perf_counter()
+        self.points = sample_rings(self.ring_values(), self.grid)
+        self.field = velocity_field(self.points, self.grid)
+        self.cube = None
+        self.showView()
+        self.timingLabel.setText(f"{1000. * (time.perf_counter() - start):.0f} ms")
+
+    def showView(self):
+        name = self.view.currentText()
+        self.channel.setEnabled(name == 'Model channel')
+        self.ax.clear()
+        if name == 'Velocity field':
+            self.ax.imshow(self.field, origin='lower', cmap='RdBu_r')
+            if np.any(np.isfinite(self.field)):
+                self.ax.contour(self.field, levels=10, colors='k', linewidths=0.5)
+            self.ax.set_title("Velocity (km/s)")
+        else:
+            if self.cube is None:
+                self.cube = model_cube(self.points, self.grid)
+            if name == 'Model moment 0':
+                self.ax.imshow(self.cube.sum(axis=0) * self.grid.channel_width,
+                               origin='lower', cmap='viridis')
+                self.ax.set_title("Integrated model")
+            else:
+                channel = self.channel.value()
+                self.ax.imshow(self.cube[channel], origin='lower', cmap='viridis')
+                self.ax.set_title(f"{self.grid.velocities[channel]:.1f} km/s")
+        self.ax.set_xlabel("x (pixels)")
+        self.ax.set_ylabel("y (pixels)")
+        self.canvas.draw_idle()
+
+class ResidualWindow(QtWidgets.QWidget):
+    """Residuals of the INSET cube against the quick projection of the rings,
+    updated for the changed rings only, or against the OUTSET cube.
+    """
+    sources = ['Quick projection', 'OUTSET cube']
+    refresh_delay = 50
+
+    def __init__(self, cube, grid, ring_values, noise, beam=None, outset=None):
+        super(ResidualWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.cube = cube
+        self.grid = grid
+        self.ring_values = ring_values
+        self.noise = noise
+        self.beam = beam
+        self.outset = outset
+        self.residuals = None
+        self.outset_maps = None
+        self._threads = []
+
+        self.source = QtWidgets.QComboBox()
+        self.source.addItem(self.sources[0])
+        if outset is not None:
+            self.source.addItem(self.sources[1])
+        self.chi2Label = QtWidgets.QLabel("")
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.setRange(0, 100)
+        self.figure = plt.figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+
+        hbox = QtWidgets.QHBoxLayout()
+        hbox.addWidget(self.source)
+        hbox.addWidget(self.chi2Label)
+        hbox.addWidget(self.progress)
+        vbox = QtWidgets.QVBoxLayout()
+        vbox.addLayout(hbox)
+        vbox.addWidget(self.canvas)
+        self.setLayout(vbox)
+
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self.source.currentIndexChanged.connect(self.showResiduals)
+
+        self.setWindowTitle("Residuals")
+        self.setGeometry(300, 300, 700, 600)
+        _center(self)
+        self._start(self.cube.binned, (*grid.binning,), self._binned)
+
+    def _start(self, function, args, done):
+        """Run function in a worker thread and hand the result to done"""
+        thread = QtCore.QThread(self)
+        worker = _CubeWorker(function, *args)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(lambda fraction: self.progress.setValue(int(fraction * 100)))
+        worker.finished.connect(done)
+        worker.errored.connect(lambda msg: QtWidgets.QMessageBox.critical(self, "Cube Error", msg))
+        worker.finished.connect(thread.quit)
+        worker.errored.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(lambda: self._threads.remove((thread, worker)))
+        self._threads.append((thread, worker))
+        thread.start()
+
+    def _binned(self, data):
+        # a binned point is the mean of factor x factor pixels and step channels
+        factor, step = self.grid.binning
+        noise = self.noise / np.sqrt(factor * factor * step)
+        self.residuals = ResidualCube(data, self.grid, noise, beam=self.beam)
+        self.refresh()
+
+    def _outset(self, maps):
+        self.outset_maps = maps
+        self.showResiduals()
+
+    def scheduleRefresh(self, par=None):
+        if self.isVisible():
+            self._refresh_timer.start(self.refresh_delay)
+
+    def refresh(self):
+        """Project the rings and recompute the residuals where they changed"""
+        if self.residuals is None:
+            return
+        start = time.perf_counter()
+        rings = self.ring_values()
+        region = self.residuals.update(sample_rings(rings, self.grid), rings)
+        if region is not None:
+            fraction = np.prod([s.stop - s.start for s in region]) / self.residuals.data.size
+            self.progress.setFormat(f"{100. * fraction:.0f}% recomputed in "
+                                    f"{1000. * (time.perf_counter() - start):.0f} ms")
+            self.progress.setValue(100)
+        self.showResiduals()
+
+    def showResiduals(self):
+        self.ax.clear()
+        if self.source.currentText() == 'OUTSET cube':
+            if self.outset_maps is None:
+                if not any(worker.function is residual_maps for _, worker in self._threads):
+                    self._start(residual_maps, (self.cube, self.outset, self.noise), self._outset)
+                return
+            residual = self.outset_maps['sum']
+            chi2 = float(self.outset_maps['chi2'])
+        else:
+            if self.residuals is None:
+                return
+            residual = self.residuals.residual.sum(axis=0) * self.grid.channel_width
+            chi2 = self.residuals.reduced_chi2
+        limit = np.nanmax(np.abs(residual)) if np.any(np.isfinite(residual)) else 1.
+        self.ax.imshow(residual, origin='lower', cmap='RdBu_r', vmin=-limit, vmax=limit)
+        self.ax.set_title("Data - model (summed over channels)")
+        self.ax.set_xlabel("x (pixels)")
+        self.ax.set_ylabel("y (pixels)")
+        self.chi2Label.setText(f"reduced chi2 = {chi2:.3g}")
+        self.canvas.draw_idle()
+
+class ErrorShakerWindow(QtWidgets.QWidget):
+
+    def __init__(self, workers):
+        super(ErrorShakerWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        # Enable stylesheet background (needed for border-image on top-level QWidget)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.iterationsLabel = QtWidgets.QLabel("Number of Iterations")
+        self.iterations = QtWidgets.QSpinBox()
+        self.iterations.setRange(2, 1000)
+        self.iterations.setValue(20)
+        self.workersLabel = QtWidgets.QLabel("Concurrent TiRiFiC Runs")
+        self.workers = QtWidgets.QSpinBox()
+        self.workers.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers.setValue(workers)
+        self.loopsLabel = QtWidgets.QLabel("LOOPS per Iteration (empty: template)")
+        self.loops = QtWidgets.QLineEdit()
+        self.grid = QtWidgets.QGridLayout()
+        self.grid.setSpacing(10)
+        self.grid.addWidget(self.iterationsLabel, 1, 0)
+        self.grid.addWidget(self.iterations, 1, 1)
+        self.grid.addWidget(self.workersLabel, 2, 0)
+        self.grid.addWidget(self.workers, 2, 1)
+        self.grid.addWidget(self.loopsLabel, 3, 0)
+        self.grid.addWidget(self.loops, 3, 1)
+
+        self.btnOK = IconButton(icons_location/'OK.png', self)
+        self.btnCancel = IconButton(icons_location/'cancel.png', self)
+        self.hbox = QtWidgets.QHBoxLayout()
+        self.hbox.addWidget(self.btnOK)
+        self.hbox.addWidget(self.btnCancel)
+        self.grid.addLayout(self.hbox, 4, 0, 1, 2)
+        self.setLayout(self.grid)
+
+        self.setWindowTitle("Error Estimation")
+        self.setGeometry(300, 300, 300, 150)
+
+        _center(self)
+        self.setFocus()
+
+
+class _ShakerWorker(QtCore.QObject):
+    iterationDone = QtCore.pyqtSignal(int, object)
+    finished = QtCore.pyqtSignal(object)
+    errored = QtCore.pyqtSignal(str)
+
+    def __init__(self, shaker, iterations):
+        super().__init__()
+        self.shaker = shaker
+        self.iterations = iterations
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        try:
+            self.finished.emit(self.shaker.run(self.iterations, callback=self.iterationDone.emit))
+        except Exception as e:
+            self.errored.emit(str(e))
+
+
+class TemplateDiffWindow(QtWidgets.QWidget):
+    """Summary of the rings that differ between a template and the open one"""
+
+    def __init__(self, diff, title):
+        super(TemplateDiffWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.diff = diff
+        self.tolerance = QtWidgets.QDoubleSpinBox()
+        self.tolerance.setRange(0., 100.)
+        self.tolerance.setDecimals(2)
+        self.tolerance.setSuffix(' %')
+        self.tolerance.valueChanged.connect(self.fillTable)
+        self.table = QtWidgets.QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(['Parameter', 'Rings', 'Max delta',
+                                              'Max relative', 'Changed rings'])
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        self.showDeltas = QtWidgets.QCheckBox("Show deltas in the graphs")
+        self.onlyIn = QtWidgets.QLabel()
+        self.onlyIn.setWordWrap(True)
+        self.grid = QtWidgets.QGridLayout()
+        self.grid.setSpacing(10)
+        self.grid.addWidget(QtWidgets.QLabel("Ignore relative changes up to"), 0, 0)
+        self.grid.addWidget(self.tolerance, 0, 1)
+        self.grid.addWidget(self.table, 1, 0, 1, 2)
+        self.grid.addWidget(self.onlyIn, 2, 0, 1, 2)
+        self.grid.addWidget(self.showDeltas, 3, 0, 1, 2)
+        self.setLayout(self.grid)
+        self.fillTable()
+
+        self.setWindowTitle(title)
+        self.setGeometry(300, 300, 620, 400)
+        _center(self)
+
+    def fillTable(self, *args):
+        rows = self.diff.summary(rtol=self.tolerance.value() / 100.)
+        self.table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            cells = [row['key'], f"{len(row['rings'])}", f"{row['max_delta']:.5g}",
+                     f"{row['max_relative']:.3%}", ring_ranges(row['rings'])]
+            for j, cell in enumerate(cells):
+                self.table.setItem(i, j, QtWidgets.QTableWidgetItem(cell))
+        self.table.resizeColumnsToContents()
+        only = []
+        if self.diff.added:
+            only.append(f"Only in the open template: {', '.join(self.diff.added)}")
+        if self.diff.removed:
+            only.append(f"Only in the compared template: {', '.join(self.diff.removed)}")
+        self.onlyIn.setText('\n'.join(only) if only else
+                            'Both templates have the same parameters.')
+
+
+class _SaveNotifier(QtCore.QObject):
+    # emitted from the save worker thread, delivered on the GUI thread
+    saved = QtCore.pyqtSignal(str, object, str)
+
+
+class AutosaveWindow(QtWidgets.QWidget):
+
+    def __init__(self, interval, edits):
+        super(AutosaveWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.intervalLabel = QtWidgets.QLabel("Save edits every (s, 0: never)")
+        self.interval = QtWidgets.QSpinBox()
+        self.interval.setRange(0, 3600)
+        self.interval.setValue(int(interval))
+        self.editsLabel = QtWidgets.QLabel("Save after this many edits (0: never)")
+        self.edits = QtWidgets.QSpinBox()
+        self.edits.setRange(0, 1000)
+        self.edits.setValue(int(edits))
+        self.grid = QtWidgets.QGridLayout()
+        self.grid.setSpacing(10)
+        self.grid.addWidget(self.intervalLabel, 1, 0)
+        self.grid.addWidget(self.interval, 1, 1)
+        self.grid.addWidget(self.editsLabel, 2, 0)
+        self.grid.addWidget(self.edits, 2, 1)
+
+        self.btnOK = IconButton(icons_location/'OK.png', self)
+        self.btnCancel = IconButton(icons_location/'cancel.png', self)
+        self.hbox = QtWidgets.QHBoxLayout()
+        self.hbox.addWidget(self.btnOK)
+        self.hbox.addWidget(self.btnCancel)
+        self.grid.addLayout(self.hbox, 3, 0, 1, 2)
+        self.setLayout(self.grid)
+
+        self.setWindowTitle("Autosave")
+        self.setGeometry(300, 300, 300, 120)
+
+        _center(self)
+        self.setFocus()
+
+
+class ExportWindow(QtWidgets.QWidget):
+    """Options of the figure export"""
+
+    def __init__(self, workspace_size):
+        super(ExportWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.formatLabel = QtWidgets.QLabel("File Format")
+        self.format = QtWidgets.QComboBox()
+        self.format.addItems(export_formats)
+        self.dpiLabel = QtWidgets.QLabel("Resolution of PNG files (dpi)")
+        self.dpi = QtWidgets.QSpinBox()
+        self.dpi.setRange(50, 1200)
+        self.dpi.setValue(150)
+        self.sheet = QtWidgets.QCheckBox("One figure with all parameters per template")
+        self.workspace = QtWidgets.QCheckBox(
+            f"All {workspace_size} templates of the workspace")
+        self.workspace.setEnabled(workspace_size > 1)
+        self.grid = QtWidgets.QGridLayout()
+        self.grid.setSpacing(10)
+        self.grid.addWidget(self.formatLabel, 1, 0)
+        self.grid.addWidget(self.format, 1, 1)
+        self.grid.addWidget(self.dpiLabel, 2, 0)
+        self.grid.addWidget(self.dpi, 2, 1)
+        self.grid.addWidget(self.sheet, 3, 0, 1, 2)
+        self.grid.addWidget(self.workspace, 4, 0, 1, 2)
+
+        self.btnOK = IconButton(icons_location/'OK.png', self)
+        self.btnCancel = IconButton(icons_location/'cancel.png', self)
+        self.hbox = QtWidgets.QHBoxLayout()
+        self.hbox.addWidget(self.btnOK)
+        self.hbox.addWidget(self.btnCancel)
+        self.grid.addLayout(self.hbox, 5, 0, 1, 2)
+        self.setLayout(self.grid)
+
+        self.setWindowTitle("Export Figures")
+        self.setGeometry(300, 300, 300, 150)
+
+        _center(self)
+        self.setFocus()
+
+
+class ConvergenceWindow(QtWidgets.QWidget):
+    """Live chi-square of a running TiRiFiC fit, read from its progress log
+
+    The log is polled often, which only reads the bytes appended since, but
+    the graph is redrawn at most once per redraw_interval and only when there
+    are new iterations.
+    """
+    # ms between reads of the log and the least ms between redraws
+    poll_interval = 500
+    redraw_interval = 2000
+    state_colors = {'waiting': 'gray', 'running': 'mediumseagreen', 'stalled': 'orange',
+                    'diverging': 'red', 'finished': 'steelblue'}
+
+    def __init__(self, progress_log, process, title):
+        super(ConvergenceWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.monitor = ConvergenceMonitor(progress_log)
+        self.process = process
+        self._warned = False
+        self._last_redraw = 0.
+        self._pending = False
+
+        self.figure = plt.figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_xlabel("Iteration")
+        self.ax.set_ylabel("Chi-square")
+        self.ax.set_yscale('log')
+        self.line, = self.ax.plot([], [], '-', color='mediumseagreen', lw=1.)
+        self.bestLine = self.ax.axhline(np.nan, color='gray', ls=':', lw=0.8)
+        self.loopLines = []
+        self.stateLabel = QtWidgets.QLabel(self.monitor.diagnosis())
+        self.stateLabel.setWordWrap(True)
+        self.btnStop = QtWidgets.QPushButton("Stop Run")
+        self.btnStop.setToolTip('Terminate the TiRiFiC process')
+        self.btnStop.clicked.connect(self.stopRun)
+
+        hbox = QtWidgets.QHBoxLayout()
+        hbox.addWidget(self.stateLabel, 1)
+        hbox.addWidget(self.btnStop)
+        vbox = QtWidgets.QVBoxLayout()
+        vbox.addWidget(self.canvas)
+        vbox.addLayout(hbox)
+        self.setLayout(vbox)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(self.poll_interval)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start()
+
+        self.setWindowTitle(title)
+        self.setGeometry(300, 300, 640, 420)
+        _center(self)
+
+    def poll(self):
+        # the returncode is set by the thread that waits for tirific; it is
+        # taken before the log is read so the last lines are not missed
+        returncode = self.process.returncode
+        if self.monitor.update() > 0:
+            self._pending = True
+        state = self.monitor.state()
+        done = state == 'finished' or returncode is not None
+        if done:
+            # nothing more will be written
+            self.timer.stop()
+            self.btnStop.setEnabled(False)
+        now = time.monotonic()
+        if self._pending and (done or (now - self._last_redraw) * 1000. >= self.redraw_interval):
+            self.redraw()
+            self._last_redraw = now
+        text = self.monitor.diagnosis()
+        if returncode is not None and returncode != 0:
+            text = f'TiRiFiC stopped with status {returncode}. {text}'
+        self.stateLabel.setText(text)
+        self.stateLabel.setStyleSheet(f'color: {self.state_colors[state]}')
+        if state in ['stalled', 'diverging'] and not self._warned:
+            self._warned = True
+            logger.warning('%s: %s', self.windowTitle(), text)
+
+    def redraw(self):
+        self._pending = False
+        iterations = self.monitor.buffer.series('iteration')
+        chisq = self.monitor.buffer.series('chisq')
+        loops = self.monitor.buffer.series('loop')
+        if len(iterations) == 0:
+            return
+        self.line.set_data(iterations, np.where(chisq > 0., chisq, np.nan))
+        self.line.set_color(self.state_colors[self.monitor.state()])
+        self.bestLine.set_ydata([self.monitor.best, self.monitor.best])
+        for line in self.loopLines:
+            line.remove()
+        # a dashed line where every loop starts
+        starts = iterations[1:][np.diff(loops) > 0]
+        self.loopLines = [self.ax.axvline(x, color='gray', ls='--', lw=0.6) for x in starts]
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+
+    def stopRun(self):
+        reply = QtWidgets.QMessageBox.question(
+            self, 'Stop Run', 'Terminate this TiRiFiC run?',
+            QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No,
+            QtWidgets.QMessageBox.StandardButton.No)
+        if reply == QtWidgets.QMessageBox.StandardButton.Yes and self.process.returncode is None:
+            self.process.terminate()
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        plt.close(self.figure)
+        super(ConvergenceWindow, self).closeEvent(event)
+
+
+class RunHistoryWindow(QtWidgets.QWidget):
+    """Browser of the runs in the run history, newest first"""
+
+    def __init__(self, history):
+        super(RunHistoryWindow, self).__init__()
+        self.setProperty("popupBg", True)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.history = history
+        self.galaxy = QtWidgets.QComboBox()
+        self.galaxy.setEditable(True)
+        self.parameter = QtWidgets.QLineEdit()
+        self.parameter.setPlaceholderText("e.g. INCL")
+        self.fitted = QtWidgets.QComboBox()
+        self.fitted.addItems(['fitted or fixed', 'fitted', 'fixed'])
+        self.status = QtWidgets.QComboBox()
+        self.status.addItems(['any', 'finished', 'failed', 'running'])
+        self.table = QtWidgets.QTableWidget(0, 6)
+        self.table.setHorizontalHeaderLabels(['Run', 'Galaxy', 'Started', 'Wall time',
+                                              'Status', '.def file'])
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        self.btnInput = QtWidgets.QPushButton("Restore Input")
+        self.btnInput.setToolTip('Restore the values and fitting settings the run was started with')
+        self.btnFit = QtWidgets.QPushButton("Restore Fit")
+        self.btnFit.setToolTip('Restore the run with the values TiRiFiC fitted')
+        self.btnRefresh = QtWidgets.QPushButton("Refresh")
+        self.grid = QtWidgets.QGridLayout()
+        self.grid.setSpacing(10)
+        self.grid.addWidget(QtWidgets.QLabel("Galaxy"), 0, 0)
+        self.grid.addWidget(self.galaxy, 0, 1)
+        self.grid.addWidget(QtWidgets.QLabel("Status"), 0, 2)
+        self.grid.addWidget(self.status, 0, 3)
+        self.grid.addWidget(QtWidgets.QLabel("Parameter"), 1, 0)
+        self.grid.addWidget(self.parameter, 1, 1)
+        self.grid.addWidget(self.fitted, 1, 2, 1, 2)
+        self.grid.addWidget(self.table, 2, 0, 1, 4)
+        self.hbox = QtWidgets.QHBoxLayout()
+        self.hbox.addWidget(self.btnRefresh)
+        self.hbox.addStretch(1)
+        self.hbox.addWidget(self.btnInput)
+        self.hbox.addWidget(self.btnFit)
+        self.grid.addLayout(self.hbox, 3, 0, 1, 4)
+        self.setLayout(self.grid)
+        self.galaxy.editTextChanged.connect(self.fillTable)
+        self.parameter.editingFinished.connect(self.fillTable)
+        self.fitted.currentIndexChanged.connect(self.fillTable)
+        self.status.currentIndexChanged.connect(self.fillTable)
+        self.btnRefresh.clicked.connect(self.refresh)
+        self.refresh()
+
+        self.setWindowTitle("Run History")
+        self.setGeometry(300, 300, 760, 420)
+        _center(self)
+
+    def refresh(self):
+        galaxy = self.galaxy.currentText()
+        self.galaxy.blockSignals(True)
+        self.galaxy.clear()
+        self.galaxy.addItems([''] + self.history.galaxies())
+        self.galaxy.setEditText(galaxy)
+        self.galaxy.blockSignals(False)
+        self.fillTable()
+
+    def fillTable(self, *args):
+        fitted = {1: True, 2: False}.get(self.fitted.currentIndex())
+        status = self.status.currentText()
+        try:
+            self.runs = self.history.query(galaxy=self.galaxy.currentText().strip(),
+                                           parameter=self.parameter.text().strip(),
+                                           fitted=fitted,
+                                           status=None if status == 'any' else status)
+        except sqlite3.Error as e:
+            logger.warning('Cannot read the run history: %s', e)
+            self.runs = []
+        self.table.setRowCount(len(self.runs))
+        for i, record in enumerate(self.runs):
+            cells = [f'{record.id}', record.galaxy,
+                     time.strftime('%Y-%m-%d %H:%M', time.localtime(record.started)),
+                     '' if record.seconds is None else format_duration(record.seconds),
+                     record.status if record.returncode in [None, 0] else
+                     f'{record.status} ({record.returncode})', record.def_file]
+            for j, cell in enumerate(cells):
+                self.table.setItem(i, j, QtWidgets.QTableWidgetItem(cell))
+        self.table.resizeColumnsToContents()
+
+    def selectedRun(self):
+        rows = self.table.selectionModel().selectedRows()
+        return self.runs[rows[0].row()] if rows else None
+
+
+class MainWindow(QtWidgets.QMainWindow):
+    runNo = 0
+    key = "Yes"
+    ncols = 5; nrows = 5
+    # the parameters plotted when a template is opened
+    default_par = ['VROT', 'SBR', 'INCL', 'PA']
+    tmpDeffile = os.getcwd() + "/tmpDeffile.def"
+    progressPath = ''
+    fileName = ""
+    openedfileName = ""
+    t = 0
+    scrollWidth = 0; scrollHeight = 0
+    before = 0
+    NUR = 0
+    pyFAT_conf_file = None
+    noise = 0.0
+    channel_width = 0.0
+    initial_size = 0.75
+    # the open main windows; they share the process, so the imports, the
+    # icons, the parsed templates and the style are only loaded once
+    windows = []
+    cubeWindow = None
+    previewWindow = None
+    residualWindow = None
+    _shaker = None
+    # the widgets were laid out in nrows x ncols rather than one column
+    arranged = False
+    _shaker_progress = None
+    _export_thread = None
+    historyWindow = None
+    convergenceWindow = None
+    # draw the other templates of the workspace in the graph widgets
+    overlayTemplates = False
+    diffWindow = None
+    # all disks of a parameter in one graph widget, edits added to every disk
+    linkedDisks = False
+    # draw the graph widgets with QPainter rather than matplotlib
+    nativePlots = False
+    propagateDisks = False
+    # edits are written to a recovery file after this many seconds or edits
+    autosaveInterval = 60
+    autosaveEdits = 20
+    #Fitting keys
+    fitting_parameters = fitting_parameters
+
+    def __init__(self):
+        super(MainWindow, self).__init__()
+        # everything that belongs to the open template is kept per window
+        self.par = list(self.default_par)
+        self.currPar = None
+        self.selected_option = None
+        self.gwObjects = []
+        self.numPrecisionY = {}
+        self.numPrecisionX = []
+        self.data = []
+        self.parVals = {}
+        self.parValsErr = {}
+        self.historyList = {}
+        self.beam = [0.0, 0.0, 0.0]
+        self.xScale = [0, 0]
+        self.yScale = {'VROT':[0, 0]}
+        MainWindow.windows.append(self)
+        self.workspace = Workspace()
+        self.runHistory = None
+        # the autosave settings of the last session
+        preferences = read_preferences()
+        try:
+            self.autosaveInterval = int(preferences.get('autosaveInterval', self.autosaveInterval))
+            self.autosaveEdits = int(preferences.get('autosaveEdits', self.autosaveEdits))
+        except (TypeError, ValueError):
+            logger.warning('The stored autosave settings are not numbers, the defaults are used')
+        self.autosaver = Autosaver(self.autosaveInterval, self.autosaveEdits)
+        self.autosaveTimer = QtCore.QTimer(self)
+        self.autosaveTimer.setInterval(1000)
+        self.autosaveTimer.timeout.connect(self.autosaveTick)
+        self.autosaveTimer.start()
+        self.saveNotifier = _SaveNotifier()
+        self.saveNotifier.saved.connect(self.saveFinished)
+        self.saveWorker = CoalescingWorker(save_snapshot, done=self._saveDone)
+        self.initUI()
+        
+        # monitor-based sizing was commented out; default to fixed initial dimensions
+        monitor = QtWidgets.QApplication.primaryScreen()
+        monitor_size = monitor.size()
+        self.initial_height = monitor_size.height() * self.initial_size
+        self.initial_width = monitor_size.width() * self.initial_size
+        #self.initial_height = 1024
+        #self.initial_width = 1536
+        
+        self.resize(int(self.initial_width), int(self.initial_height))
+        _center(self)
+        QtCore.QTimer.singleShot(100, self.openDef)
+    
+    def initUI(self):
+        #self.showMaximized()
+        
+        self.setWindowTitle('TiRiFiG')
+        # define a widget sitting in the main window where all other widgets will live
+        central_widget = QtWidgets.QWidget()
+        central_widget.setObjectName("centralWidget")
+        self.setCentralWidget(central_widget)
+        # make this new widget have a vertical layout
+        vertical_layout = QtWidgets.QVBoxLayout()
+        vertical_layout.setContentsMargins(0, 0, 0, 0)
+        vertical_layout.setSpacing(0)
+        central_widget.setLayout(vertical_layout)
+        # add the buttons and the scroll area which will have the graph widgets
+        # open button
+        #btnOpen = QtWidgets.QPushButton('&Open File')
+        #btnOpen.setFixedSize(80, 30)
+        #btnOpen.setToolTip('Open .def file')
+        #btnOpen.clicked.connect(self.openDef)
+        #vertical_layout.addWidget(btnOpen)
+        # scroll area
+        scroll_area = QtWidgets.QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        scroll_area.viewport().setAutoFillBackground(False)
+        scroll_area.setViewportMargins(0, 0, 0, 0)
+        # the scroll area needs a widget to be placed inside of it which will hold the content
+        # create one and let it have a grid layout
+        self.scroll_area_content = QtWidgets.QWidget()
+        self.scroll_area_content.setContentsMargins(0, 0, 0, 0)
+        self.scroll_area_content.setAutoFillBackground(False)
+        self.scroll_grid_layout = QtWidgets.QGridLayout()
+        self.scroll_grid_layout.setContentsMargins(0, 0, 0, 0)
+        #vertical_layout.setContentsMargins(0, 0, 0, 0)
+        self.scroll_grid_layout.setSpacing(0)
+        self.scroll_grid_layout.setHorizontalSpacing(0)
+        self.scroll_grid_layout.setVerticalSpacing(0)
+        
+        self.scroll_area_content.setLayout(self.scroll_grid_layout)
+        scroll_area.setWidget(self.scroll_area_content)
+        vertical_layout.addWidget(scroll_area)
+        self.createActions()
+        self.createMenus()
+
+    def createActions(self):
+        self.exitAction = QAction("&Exit", self)
+        self.exitAction.setShortcut("Ctrl+Q")
+        self.exitAction.setStatusTip('Leave the app')
+        self.exitAction.triggered.connect(self.quitApp)
+
+        self.openFile = QAction("&Open File", self)
+        self.openFile.setShortcut("Ctrl+O")
+        self.openFile.setStatusTip('Load .def file to be plotted')
+        self.openFile.triggered.connect(self.openDef)
+
+        self.newWindowAction = QAction("&New Window", self)
+        self.newWindowAction.setShortcut("Ctrl+N")
+        self.newWindowAction.setStatusTip('Open another template in a new window')
+        self.newWindowAction.triggered.connect(lambda: self.newWindow())
+
+        self.exportAction = QAction("&Export Figures...", self)
+        self.exportAction.setStatusTip('Write the graphs of all parameters to image files')
+        self.exportAction.triggered.connect(self.exportDialog)
+
+        self.saveChanges = QAction("&Save", self)
+        self.saveChanges.setStatusTip('Save changes to .def file')
+        self.saveChanges.triggered.connect(lambda: self.saveAll())
+
+        self.saveAsFile = QAction("&Save as...", self)
+        self.saveAsFile.setStatusTip('Create another .def file with current '
+                                     'paramater values')
+        self.saveAsFile.triggered.connect(lambda: self.saveAsAll())
+
+        self.saveSessionAction = QAction("Save Sessio&n", self)
+        self.saveSessionAction.setStatusTip('Save values, fitting settings, history and layout '
+                                            'for instant reopening of the .def file')
+        self.saveSessionAction.triggered.connect(self.saveSession)
+
+        self.undoAction = QAction("&Undo", self)
+        self.undoAction.setShortcut("Ctrl+Z")
+        self.undoAction.setStatusTip('Undo last action')
+        self.undoAction.triggered.connect(self.undoCommand)
+
+        self.redoAction = QAction("&Redo", self)
+        self.redoAction.setShortcut("Ctrl+Y")
+        self.redoAction.setStatusTip('Redo last action')
+        self.redoAction.triggered.connect(self.redoCommand)
+
+        self.openTextEditor = QAction("&Open Text Editor...", self)
+        self.openTextEditor.setStatusTip('View the current open .def file in '
+                                         'preferred text editor')
+        self.openTextEditor.triggered.connect(self.openEditor)
+
+        self.openDataCube = QAction("Open &Data Cube...", self)
+        self.openDataCube.setStatusTip('View moment maps and a PV slice of the INSET '
+                                       'cube with the current rings')
+        self.openDataCube.triggered.connect(self.openCube)
+
+        self.modelPreview = QAction("&Model Preview", self)
+        self.modelPreview.setStatusTip('Project the current rings into a velocity field '
+                                       'and model cube without running TiRiFiC')
+        self.modelPreview.triggered.connect(self.openPreview)
+
+        self.residualView = QAction("&Residuals", self)
+        self.residualView.setStatusTip('Compare the INSET cube with the current rings '
+                                       'or the OUTSET cube')
+        self.residualView.triggered.connect(self.openResiduals)
+
+        self.estimateErr = QAction("&Estimate Errors", self)
+        self.estimateErr.setStatusTip('Estimate the errors of the fitted parameters with '
+                                      'parallel tirshaker iterations')
+        self.estimateErr.triggered.connect(self.errorShakerDialog)
+
+        self.startTF = QAction("&Start TiriFiC", self)
+        self.startTF.setStatusTip('Starts TiRiFiC from terminal')
+        self.startTF.triggered.connect(self.startTiriFiC)
+
+        self.runCost = QAction("Estimate Run &Cost", self)
+        self.runCost.setStatusTip('Estimate the wall time and memory of TiRiFiC runs from '
+                                  'the runs timed before')
+        self.runCost.triggered.connect(self.showRunCost)
+
+        self.runHistoryAction = QAction("Run &History...", self)
+        self.runHistoryAction.setStatusTip('Browse the TiRiFiC runs started before and restore '
+                                           'their input or fit')
+        self.runHistoryAction.triggered.connect(self.showRunHistory)
+
+        self.winSpec = QAction("&Window Specification", self)
+        self.winSpec.setStatusTip('Determines the number of rows and columns in a plot')
+        self.winSpec.triggered.connect(self.setRowCol)
+
+        self.scaleMan = QAction("&Scale Manager", self)
+        self.scaleMan.setStatusTip('Manages behaviour of scale and min and max values')
+        self.scaleMan.triggered.connect(self.SMobj)
+
+        self.addTemplates = QAction("&Add Templates...", self)
+        self.addTemplates.setStatusTip('Add .def files to the workspace, e.g. other FAT '
+                                       'iterations or galaxies')
+        self.addTemplates.triggered.connect(self.addToWorkspace)
+
+        self.overlayAction = QAction("&Overlay Templates", self)
+        self.overlayAction.setStatusTip('Draw every parameter of the other workspace '
+                                        'templates in its graph')
+        self.overlayAction.setCheckable(True)
+        self.overlayAction.toggled.connect(self.toggleOverlays)
+
+        self.compareAction = QAction("&Compare with Template...", self)
+        self.compareAction.setStatusTip('Show which parameters and rings differ from '
+                                        'another .def file')
+        self.compareAction.triggered.connect(self.compareTemplate)
+
+        self.linkDisksAction = QAction("&Link Disks", self)
+        self.linkDisksAction.setStatusTip('Draw all disks of a parameter (e.g. PA and PA_2) '
+                                          'in one graph')
+        self.linkDisksAction.setCheckable(True)
+        self.linkDisksAction.toggled.connect(self.linkDisks)
+
+        self.nativePlotsAction = QAction("&Native Plots", self)
+        self.nativePlotsAction.setStatusTip('Draw the graphs with Qt instead of matplotlib '
+                                            'for faster editing')
+        self.nativePlotsAction.setCheckable(True)
+        self.nativePlotsAction.toggled.connect(self.setNativePlots)
+
+        self.propagateAction = QAction("&Propagate Disk Edits", self)
+        self.propagateAction.setStatusTip('Apply the change of a ring to the same ring of '
+                                          'the other linked disks')
+        self.propagateAction.setCheckable(True)
+        self.propagateAction.toggled.connect(self.setPropagation)
+
+        self.autosaveAction = QAction("A&utosave...", self)
+        self.autosaveAction.setStatusTip('Set how often edits are saved for recovery after '
+                                         'a crash')
+        self.autosaveAction.triggered.connect(self.autosaveDialog)
+
+        self.paraDef = QAction("&Add Parameter", self)
+        # self.paraDef.setStatusTip('Determines which parameter is plotted')
+        self.paraDef.triggered.connect(self.add_parameter_dialog)
+
+    def createMenus(self):
+        mainMenu = self.menuBar()
+
+        self.fileMenu = mainMenu.addMenu('&File')
+        self.fileMenu.addAction(self.openFile)
+        self.fileMenu.addAction(self.newWindowAction)
+        self.fileMenu.addAction(self.undoAction)
+        self.fileMenu.addAction(self.redoAction)
+        self.fileMenu.addAction(self.saveChanges)
+        self.fileMenu.addAction(self.saveAsFile)
+        self.fileMenu.addAction(self.saveSessionAction)
+        self.fileMenu.addAction(self.exportAction)
+        self.fileMenu.addAction(self.exitAction)
+
+        # editMenu = mainMenu.addMenu('&Edit')
+
+        self.runMenu = mainMenu.addMenu('&Run')
+        self.runMenu.addAction(self.openTextEditor)
+        self.runMenu.addAction(self.openDataCube)
+        self.runMenu.addAction(self.modelPreview)
+        self.runMenu.addAction(self.residualView)
+        self.runMenu.addAction(self.runCost)
+        self.runMenu.addAction(self.startTF)
+        self.runMenu.addAction(self.runHistoryAction)
+        self.runMenu.addAction(self.estimateErr)
+
+        self.workspaceMenu = mainMenu.addMenu('&Workspace')
+        self.workspaceMenu.addAction(self.addTemplates)
+        self.switchMenu = self.workspaceMenu.addMenu('&Switch Template')
+        self.switchMenu.aboutToShow.connect(self.fillWorkspaceMenu)
+        self.workspaceMenu.aboutToShow.connect(self.fillWorkspaceMenu)
+        self.workspaceMenu.addAction(self.overlayAction)
+        self.workspaceMenu.addAction(self.compareAction)
+
+        self.paramMenu = mainMenu.addMenu('&Parameters')
+        self.paramMenu.addAction(self.paraDef)
+        
+        self.prefMenu = mainMenu.addMenu('&Preferences')
+        self.prefMenu.addAction(self.scaleMan)
+        #self.prefMenu.addAction(self.paraDef)
+        self.prefMenu.addAction(self.winSpec)
+        self.prefMenu.addAction(self.linkDisksAction)
+        self.prefMenu.addAction(self.propagateAction)
+        self.prefMenu.addAction(self.nativePlotsAction)
+        self.prefMenu.addAction(self.autosaveAction)
+
+    def quitApp(self):
+        self.close()
+
+    def closeEvent(self, event):
+        if self.t != 0:
+            self.t.cancel()
+        self.autosaveTimer.stop()
+        self.autosaver.close()
+        self.saveWorker.close()
+        if self._export_thread is not None:
+            # the figures being written are finished first
+            self._export_thread.wait()
+        if self._shaker is not None:
+            # no new iterations are started, the running ones are finished first
+            self._shaker.cancelled = True
+            self._shaker_thread.wait()
+        for window in [self.cubeWindow, self.previewWindow, self.residualWindow,
+                       self.diffWindow, self.historyWindow, self.convergenceWindow]:
+            if window is not None:
+                window.close()
+        if self in MainWindow.windows:
+            MainWindow.windows.remove(self)
+        super(MainWindow, self).closeEvent(event)
+        if len(MainWindow.windows) == 0:
+            QtWidgets.QApplication.quit()
+
+    def newWindow(self):
+        """Open another main window, for another template, in this process"""
+        window = MainWindow()
+        window.show()
+        return window
+
+    def setCurrPar(self, par):
+        self.currPar = par
+    def setPFConfig(self):
+        
+        try:
+            self.pyFAT_Configuration = pickle.load(self.pyFAT_config_file)    
+        except Exception as e:
+          
+            # pyFAT prints its debug output, only wanted with verbose logging
+            self.pyFAT_Configuration = {'DEBUG': logger.isEnabledFor(logging.DEBUG),
+                         'DEBUG_FUNCTION':'ALL',
+                         'VERBOSE_LOG': False,
+                         'VERBOSE_SCREEN': False,
+                         'OUTPUTLOG': None,
+                         'TIMING': False,
+                         'NOISE': float(self.Tirific_Template['RMS']),
+                         'BEAM': [float(self.Tirific_Template['BMAJ']), 
+                                  float(self.Tirific_Template['BMIN']), 
+                                  float(self.Tirific_Template['BPA'])],
+                         'CHANNEL_WIDTH': 0.,
+                         'NO_RINGS': self.NUR,
+                         'LIMIT_MODIFIER': [1.0],
+                         'LAST_RELIABLE_RINGS': [self.NUR,self.NUR],
+                         'RC_UNRELIABLE': self.NUR,
+                        }
+          
+
+
+    def getData(self):
+        """Loads data from specified .def file in open dialog box
+
+        Keyword arguments:
+        self-- this is the main window being displayed
+            i.e. the current instance of the mainWindow class
+
+        Returns:
+        data:list
+        The text found in each line of the opened file
+
+        data will be a none type variable if the fileName is invalid or no file is chosen
+        """
+
+        # stores file path of .def to fileName variable after user selects file in open
+        # dialog box
+        # TODO (Samuel 28-11-2018): If cancel is selected then suppress the message in try/except below
+        self.fileName, _filter = QtWidgets.QFileDialog.getOpenFileName(self, "Open .def File", "~/",
+                                                                       ".def Files (*.def)")
+        self.openedfileName = copy.deepcopy(self.fileName)  
+        # assign texts of read lines to data variable if fileName is exists, else assign
+        # None
+       
+        try:
+            with open(self.fileName) as f:
+                data = f.readlines()
+        except:
+            if self.fileName == '':
+                pass
+            else:
+                QtWidgets.QMessageBox.information(self, "Information",
+                                                  "Empty/Invalid file specified")
+            return None
+        else:
+            return data
+
+  
+
+    def numPrecision(self, string_value_line):
+        """Determines and sets floating point precision
+
+        Keyword arguments:
+        self-- main window being displayed i.e. the current instance of the mainWindow
+               class
+        data (list)--  list of scientific values of type string
+                       e.g. x = ["20.00E4","55.0003E-4",...]
+
+        Returns:
+        int
+
+        Determines the highest floating point precision of data points
+        """
+
+        decPoints = []
+        # ensure values from list to are converted string
+        # FIX ME: Consider using enumerate instead of iterating with range and len
+        #for i in range(len(data)):
+        #    data[i] = str(data[i])
+        values = string_value_line.split()
+        for value in values:
+            val = value.split(".")
+            # check val has decimal & fractional part and append length of numbers of
+            # fractional part
+           
+            if len(val) == 2:
+                decPoints.append(len(val[1].split('E')[0]))
+        if 'E' in value.upper():
+            tpe = 'E'
+        else:
+            tpe = 'f'
+        # assign greatest precision in decPoints to class variables handling precision
+        if len(decPoints) == 0:
+            return [0, tpe]
+        else:
+            return [max(decPoints), tpe]
+
+    def getParameter(self):
+        """Fetches data points of specified parameter
+
+        Keyword arguments:
+        self-- main window being displayed i.e. the current instance of the
+               mainWindow class
+        data (list)--  list containing texts of each line loaded from .def file
+
+        Returns:
+        parVal:list
+        The values appearing after the '=' symbol of the parameter specified in sKey.
+        If search key isnt found, zero values are returned
+
+        The data points for the specific parameter value are located and converted
+        from string to float data types for plotting and other data manipulation
+        """
+        # search through fetched data for values of "PAR =" or "PAR = " or "PAR=" or
+        # "PAR= "
+        self.NUR = int(float(self.Tirific_Template['NUR']))
+      
+        for key in self.Tirific_Template:
+            if len(self.Tirific_Template[key].split()) == self.NUR and\
+                key not in self.fitting_parameters:
+                if not '_ERR' in key:
+                    if key == 'RADI':
+                        self.parValsRADI = np.array([float(x) for x in self.Tirific_Template[key].split()], dtype=np.float64)
+                        self.numPrecisionX = self.numPrecision(self.Tirific_Template[key])
+                      
+                    else:
+                        logger.debug("Loading parameter values for %s", key)
+                        self.parVals[key] = np.array([float(x) for x in self.Tirific_Template[key].split()], dtype=np.float64)
+                        self.numPrecisionY[key] = self.numPrecision(self.Tirific_Template[key])
+
+                else:
+                    param_name = key[1:].replace('_ERR', '').strip()
+                    self.parValsErr[param_name] = np.array([float(x) for x in self.Tirific_Template[key].split()], dtype=np.float64)
+
+      
+       
+            
+       
+        for key in self.parVals:
+            if key not in self.parValsErr:
+                self.parValsErr[key] = np.array([float('NaN')]*len(self.parVals[key]), dtype=np.float64)
+    def getFittingSettings(self):
+        """Fetches fitting settings from .def file
+
+        Keyword arguments:
+        self-- main window being displayed i.e. the current instance of the
+               mainWindow class
+        data (list)--  list containing texts of each line loaded from .def file
+
+        Returns:
+        None
+
+        The fitting settings such as number of loops and inset type are retrieved
+        from the .def file
+        """
+      
+        # Read what is in the current template and set up fitting groups   
+   
+        fit_groups= fit_functions.get_fitted_groups(self.Tirific_Template,log=True,verbose=True)  
+        self.setRingFittingValues(fit_groups)
+
+        #print(f"Fitting settings obtained. {self.parameterFittingSettings} parameters found.")
+      
+      
+    def setEmptyFittingValues(self, parameter):
+        self.parameterFittingSettings[parameter] = ParameterFitSettings(parameter, self.NUR)
+
+    def setRingFittingValues(self, fit_groups):
+        self.parameterFittingSettings = template_fit_settings(self.Tirific_Template,
+                                                              fit_groups, self.NUR)
+
+    def openDef(self):
+        """Opens data, gets parameter values, sets precision and sets scale
+
+        Keyword arguments:
+        self -- main window being displayed i.e. the current instance of the
+                mainWindow class
+
+        Returns:
+        None
+
+        Makes function calls to getData and getParameter functions, assigns
+        values to dictionaries parVals and firstPlot historyList and defines
+        the x-scale and y-scale for plotting on viewgraph
+        """
+       
+        data = self.getData()
+        if data is None and self.runNo > 0:
+            # keep the template that is open
+            return
+        self.data = data
+        self.loadDef()
+
+    def loadDef(self, session=None):
+        """Parse fileName, or restore its session, and build the graph widgets
+
+        Keyword arguments:
+        self -- main window being displayed i.e. the current instance of the
+                mainWindow class
+        session -- session arrays to restore rather than those of fileName,
+                   e.g. of a past run
+
+        Returns:
+        None
+
+        The widgets of a template that is already open are removed first. The
+        template comes from the shared template cache, so a file of the
+        workspace is only parsed again when it changed on disk.
+        """
+        if self.runNo > 0:
+            self.clearWidgets()
+        if session is None:
+            session = self.recoverEdits() if self.data is not None else None
+        if session is None and self.data is not None:
+            session = read_session(self.fileName)
+        if session is not None:
+            # the .def file did not change since the session was saved
+            self.restoreSession(session)
+            logger.info('Restored the session of %s', self.fileName)
+        else:
+            if self.data is not None:
+                self.Tirific_Template = template_cache.template(self.fileName)
+            else:
+                self.Tirific_Template = FAT_sup.tirific_template(self.fileName)
+          
+            #self.getParameter(data)
+            #try:
+            self.getParameter()
+            self.setPFConfig()
+            logger.debug('Obtained the Parameters from %s', self.fileName)
+            self.getFittingSettings()
+            logger.debug('Obtained the Fitting Settings from %s', self.fileName)
+        '''   
+        except Exception as e:
+            if self.data is None:
+                pass
+            else:
+                print(e)
+                QtWidgets.QMessageBox.information(self, "Information",
+                                                  "Tilted-ring fitting parameters not retrieved")
+                logging.info("The tilted-ring parameters could not be retrieved from the {}"
+                             .format(self.fileName))
+        else:
+        '''   
+        if self.data is not None:
+            self.workspace.add(self.fileName)
+        # defining the x scale for plotting
+        # this is the min/max + 10% of the difference between the min and max
+        self.xScale = set_plotScale(self.parValsRADI)
+
+        self.scrollWidth = self.scroll_area_content.width()
+        self.scrollHeight = self.scroll_area_content.height()
+
+        # Show a modal progress dialog while building graphs
+        total_params = len(self.parVals)
+        progress = QtWidgets.QProgressDialog("Building graph widgets…", None, 0, total_params, self)
+        progress.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
+        progress.setAutoClose(True)
+        progress.setAutoReset(False)
+        progress.setCancelButton(None)
+        progress.setMinimumDuration(0)
+        progress.show()
+        QtWidgets.QApplication.processEvents()
+
+        # make a dict to save the graph widgets to be plotted
+        # note that this approach will require another loop.
+        # Not ideal but it gets the job done for now.
+        g_w_to_plot = {}
+        # ensure there are the same points for parameters as there are for RADI as
+        # specified in NUR parameter
+        for param_idx, (key, val) in enumerate(self.parVals.items()):
+            progress.setValue(param_idx)
+            progress.setLabelText(f"Processing parameter {key}…")
+            QtWidgets.QApplication.processEvents()
+
+            diff = self.NUR - len(val)
+            if key == 'RADI': #use this implementation in other diff checkers
+                if diff == self.NUR:
+                    for j in np.arange(0.0, (int(diff) * 40.0), 40):
+                        self.parVals[key].append(j)
+                elif diff > 0 and diff < self.NUR:
+                    for j in range(int(diff)):
+                        self.parVals[key].append(self.parVals[key][-1] + 40.0)
+                continue
+            else:
+                if diff == self.NUR:
+                    for j in range(int(diff)):
+                        self.parVals[key].append(0.0)
+                elif diff > 0 and diff < self.NUR:
+                    for j in range(int(diff)):
+                        self.parVals[key].append(val[-1])
+
+            self.yScale[key] = set_plotScale(self.parVals[key])
+
+            unit = fit_par[key] if key in fit_par.keys() else ""
+            # Do we really need to create all graph widgets here?
+            if key in self.par:
+                new_widget = self.create_new_widget(key,unit)
+                self.gwObjects.append(new_widget)
+                g_w_to_plot[key] = new_widget
+                del new_widget
+
+        progress.setValue(total_params)
+
+        # retrieve the values in order and build a list of ordered key-value pairs
+        # a template of the workspace need not have every plotted parameter
+        self.par = [key for key in self.par if key in g_w_to_plot]
+        ordered_dict_items = [(key, g_w_to_plot[key]) for key in self.par]
+        for idx, items in enumerate(ordered_dict_items):
+            graph_widget = items[1] # what does 1 represent
+            self.scroll_grid_layout.addWidget(graph_widget, idx, 0)
+        del g_w_to_plot, ordered_dict_items
+
+        # Close the busy dialog
+        progress.close()
+        if session is not None:
+            self.restoreViews(session)
+            session.close()
+        self.updateOverlays()
+        if self.linkedDisks:
+            self.linkDisks(True)
+        self.setWindowTitle(f'TiRiFiG - {os.path.basename(self.fileName)}'
+                            if self.fileName else 'TiRiFiG')
+        self.runNo+=1
+
+    def recoverEdits(self):
+        """Offer the autosaved edits of fileName when they were not saved
+
+        Returns:
+        The recovery snapshot to restore as a session, None when there is none
+        or it is declined, in which case it is removed.
+        """
+        recovery = read_recovery(self.fileName)
+        if recovery is None:
+            return None
+        saved = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(
+            os.path.getmtime(recovery_path(self.fileName))))
+        reply = QtWidgets.QMessageBox.question(
+            self, 'Recover Edits',
+            f'{os.path.basename(self.fileName)} has edits from {saved} that were not saved. '
+            'Recover them?',
+            QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No,
+            QtWidgets.QMessageBox.StandardButton.Yes)
+        if reply != QtWidgets.QMessageBox.StandardButton.Yes:
+            recovery.close()
+            self.autosaver.discard(self.fileName)
+            return None
+        logger.info('Recovered the autosaved edits of %s', self.fileName)
+        return recovery
+
+    def autosave(self):
+        """Snapshot the edits and write them to the recovery file in the background"""
+        if not self.fileName or not os.path.isfile(self.fileName) or len(self.gwObjects) == 0:
+            return
+        if any(gw.is_dragging for gw in self.gwObjects):
+            # taken at the next tick, after the drag
+            return
+        self.autosaver.submit(self.fileName, self.sessionArrays())
+        self.statusBar().showMessage(f'Autosaved the edits of {os.path.basename(self.fileName)}',
+                                     3000)
+
+    def autosaveTick(self):
+        if self.autosaver.due():
+            self.autosave()
+
+    def autosaveDialog(self):
+        self.autosaveWindow = AutosaveWindow(self.autosaver.interval, self.autosaver.edits)
+        self.autosaveWindow.show()
+        self.autosaveWindow.btnOK.clicked.connect(self.setAutosave)
+        self.autosaveWindow.btnCancel.clicked.connect(self.autosaveWindow.close)
+
+    def setAutosave(self):
+        self.autosaveInterval = self.autosaveWindow.interval.value()
+        self.autosaveEdits = self.autosaveWindow.edits.value()
+        self.autosaver.interval = self.autosaveInterval
+        self.autosaver.edits = self.autosaveEdits
+        write_preferences(autosaveInterval=self.autosaveInterval,
+                          autosaveEdits=self.autosaveEdits)
+        self.autosaveWindow.close()
+
+    def exportDialog(self):
+        if not self.fileName or len(self.parVals) == 0:
+            QtWidgets.QMessageBox.information(self, "Information",
+                                              "Open a template to export its figures.")
+            return
+        if self._export_thread is not None:
+            QtWidgets.QMessageBox.information(self, "Information",
+                                              "The figures are already being exported.")
+            return
+        self.exportWindow = ExportWindow(len(self.workspace))
+        self.exportWindow.show()
+        self.exportWindow.btnOK.clicked.connect(self.exportFigures)
+        self.exportWindow.btnCancel.clicked.connect(self.exportWindow.close)
+
+    def exportPanels(self):
+        """Panels of every parameter of the open template, with the edits"""
+        widgets = {gw.par: gw for gw in self.gwObjects}
+        panels = []
+        for key in sorted(self.parVals, key=split_disk):
+            if key in widgets:
+                gw = widgets[key]
+                panels.append(Panel(key, gw.parValRADI, gw.parVals, errors=gw.parValsErr,
+                                    original=gw.originalparVals,
+                                    states=gw.parameterFitSetting.state_masks(),
+                                    unit=gw.unitMeas))
+            else:
+                settings = self.parameterFittingSettings.get(key)
+                panels.append(Panel(key, self.parValsRADI, self.parVals[key],
+                                    errors=self.parValsErr.get(key),
+                                    states=None if settings is None else settings.state_masks(),
+                                    unit=fit_par.get(key, "")))
+        return panels
+
+    def exportFigures(self):
+        """Write the graphs of all parameters to image files
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        The figures are drawn with the Agg backend in a pool of processes,
+        from the values in memory for the open template, edits included, and
+        from the .def files for the other templates of the workspace. The
+        pool is run from a worker thread and the progress is shown in the
+        status bar.
+        """
+        extension = self.exportWindow.format.currentText()
+        dpi = self.exportWindow.dpi.value()
+        sheet = self.exportWindow.sheet.isChecked()
+        workspace = self.exportWindow.workspace.isChecked()
+        self.exportWindow.close()
+        directory = QtWidgets.QFileDialog.getExistingDirectory(
+            self, "Directory for the Figures", os.path.dirname(self.fileName))
+        if not directory:
+            return
+        panels = self.exportPanels()
+        stem = os.path.splitext(os.path.basename(self.fileName))[0]
+        others = []
+        if workspace:
+            others = [(path, os.path.splitext(os.path.basename(path))[0])
+                      for path in self.workspace.paths
+                      if path != os.path.abspath(self.fileName)]
+
+        def export(progress):
+            # forking a process that runs Qt threads is not safe
+            written, failed = export_panels(
+                panels, directory, stem, formats=[extension], sheet=sheet, dpi=dpi,
+                start_method='spawn')
+            more, more_failed = export_templates(
+                others, directory=directory, formats=[extension], sheet=sheet, dpi=dpi,
+                start_method='spawn', progress=lambda done, total: progress(done / total))
+            return written + more, failed + more_failed
+
+        self._export_thread = QtCore.QThread(self)
+        self._export_worker = _CubeWorker(export)
+        self._export_worker.moveToThread(self._export_thread)
+        self._export_thread.started.connect(self._export_worker.run)
+        self._export_worker.progress.connect(self.exportProgress)
+        self._export_worker.finished.connect(
+            lambda result: self.exportDone(directory, *result))
+        self._export_worker.errored.connect(
+            lambda msg: QtWidgets.QMessageBox.critical(self, "Export Error", msg))
+        # direct, as closeEvent waits for the thread on the GUI thread
+        self._export_worker.finished.connect(self._export_thread.quit,
+                                             QtCore.Qt.ConnectionType.DirectConnection)
+        self._export_worker.errored.connect(self._export_thread.quit,
+                                            QtCore.Qt.ConnectionType.DirectConnection)
+        self._export_thread.finished.connect(self._export_worker.deleteLater)
+        self._export_thread.finished.connect(self._export_thread.deleteLater)
+        self._export_thread.finished.connect(self._exportFinished)
+        self._export_thread.start()
+        self.statusBar().showMessage(f'Exporting the figures of {stem}…')
+
+    def exportProgress(self, fraction):
+        self.statusBar().showMessage(f'Exporting the figures of the workspace: {fraction:.0%}')
+
+    def exportDone(self, directory, written, failed):
+        self.statusBar().showMessage(f'{len(written)} figures written to {directory}', 5000)
+        if failed:
+            QtWidgets.QMessageBox.warning(
+                self, "Export Error", '\n'.join(f'{label}: {error}' for label, error in failed))
+
+    def _exportFinished(self):
+        self._export_thread = None
+
+    def clearWidgets(self):
+        """Remove the graph widgets and values of the open template"""
+        for gw in self.gwObjects:
+            self.scroll_grid_layout.removeWidget(gw)
+            gw.close()
+            if gw.figure is not None:
+                plt.close(gw.figure)
+            gw.deleteLater()
+        self.scroll_grid_layout.update()
+        # the windows that follow the rings belong to the old template
+        for window in [self.cubeWindow, self.previewWindow, self.residualWindow,
+                       self.diffWindow]:
+            if window is not None:
+                window.close()
+        self.cubeWindow = None
+        self.previewWindow = None
+        self.residualWindow = None
+        self.diffWindow = None
+        self.gwObjects = []
+        self.parVals = {}
+        self.parValsErr = {}
+        self.numPrecisionY = {}
+        self.yScale = {}
+        self.historyList = {}
+        self.arranged = False
+
+    def unsavedChanges(self):
+        """True when the values in the graph widgets differ from the .def file"""
+        if not self.fileName or not os.path.isfile(self.fileName):
+            return False
+        values = template_cache.get(self.fileName).values
+        return any(gw.par not in values or
+                   not np.array_equal(np.asarray(gw.parVals, dtype=float), values[gw.par])
+                   for gw in self.gwObjects)
+
+    def addToWorkspace(self):
+        """Add .def files to the workspace
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        The files are parsed into the shared template cache right away, so
+        overlaying them or switching to them later does not read them again.
+        """
+        fileNames, _filter = QtWidgets.QFileDialog.getOpenFileNames(
+            self, "Add .def Files to Workspace",
+            os.path.split(self.fileName)[0] if self.fileName else "~/", ".def Files (*.def)")
+        for fileName in fileNames:
+            try:
+                self.workspace.add(fileName)
+            except (OSError, KeyError, ValueError) as e:
+                QtWidgets.QMessageBox.information(self, "Information",
+                    f"{fileName} could not be added to the workspace: {e}")
+        if fileNames:
+            self.updateOverlays()
+
+    def fillWorkspaceMenu(self):
+        """List the templates of the workspace in the Switch Template menu"""
+        self.switchMenu.clear()
+        current = os.path.abspath(self.fileName) if self.fileName else None
+        for path in self.workspace.paths:
+            action = self.switchMenu.addAction(os.path.basename(path))
+            action.setStatusTip(path)
+            action.setCheckable(True)
+            action.setChecked(path == current)
+            action.triggered.connect(lambda checked, path=path: self.switchTemplate(path))
+        self.switchMenu.setEnabled(len(self.workspace) > 0)
+
+    def switchTemplate(self, path):
+        """Make another template of the workspace the one being edited"""
+        if self.fileName and os.path.abspath(self.fileName) == path:
+            return
+        if self.unsavedChanges():
+            reply = QtWidgets.QMessageBox.question(
+                self, 'Switch Template',
+                f'The changes to {os.path.basename(self.fileName)} have not been saved. '
+                'Switch anyway?',
+                QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No,
+                QtWidgets.QMessageBox.StandardButton.No)
+            if reply != QtWidgets.QMessageBox.StandardButton.Yes:
+                return
+        try:
+            with open(path) as f:
+                data = f.readlines()
+        except OSError:
+            QtWidgets.QMessageBox.information(self, "Information",
+                                              f"{path} is no longer available")
+            self.workspace.remove(path)
+            return
+        self.fileName = path
+        self.openedfileName = copy.deepcopy(self.fileName)
+        self.data = data
+        self.loadDef()
+
+    def linkDisks(self, checked):
+        """Draw the disks of a parameter in the graph of the first disk
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+        checked (bool)--  link the disks, or show every disk in its own graph
+
+        Returns:
+        None
+
+        The graph widgets of the other disks are hidden rather than removed so
+        that their values are still saved. A disk without a graph widget gets
+        one, at the end of the layout.
+        """
+        self.linkedDisks = checked
+        if checked:
+            plotted = {split_disk(gw.par)[0] for gw in self.gwObjects}
+            for key in self.parVals:
+                if split_disk(key)[0] in plotted and key not in self.par:
+                    unit = fit_par[key] if key in fit_par.keys() else ""
+                    new_widget = self.create_new_widget(key, unit)
+                    self.gwObjects.append(new_widget)
+                    self.par.append(key)
+                    self.scroll_grid_layout.addWidget(new_widget,
+                                                      self.scroll_grid_layout.rowCount(), 0)
+        disks = {}
+        for gw in self.gwObjects:
+            disks.setdefault(split_disk(gw.par)[0], []).append(gw)
+        for members in disks.values():
+            members.sort(key=lambda gw: split_disk(gw.par)[1])
+            first = members[0]
+            for gw in members[1:]:
+                gw.linked = []
+                gw.setVisible(not checked)
+                if not checked:
+                    # the values may have been edited in the linked graph
+                    gw.firstPlot()
+            if len(members) > 1 or first.linked:
+                first.linked = members[1:] if checked else []
+                first.propagate = self.propagateDisks
+                first.firstPlot()
+
+    def setNativePlots(self, checked):
+        """Draw the graph widgets with QPainter (checked) or with matplotlib
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+        checked (bool)--  use NativeGraphWidgets
+
+        Returns:
+        None
+
+        The open graph widgets are replaced in place, keeping their values,
+        history and view.
+        """
+        self.nativePlots = checked
+        for i, old in enumerate(list(self.gwObjects)):
+            if isinstance(old, NativeGraphWidget) == checked:
+                continue
+            new = self.create_new_widget(old.par, old.unitMeas)
+            for attribute in ['parVals', 'parValsErr', 'originalparVals', 'historyList', 'redo',
+                              'yScale', 'numPrecisionY', 'overlays', 'delta_reference',
+                              'propagate', 'navigation_view']:
+                setattr(new, attribute, getattr(old, attribute))
+            row_number, column_number = self.get_widget_location(old)
+            self.scroll_grid_layout.removeWidget(old)
+            self.scroll_grid_layout.addWidget(new, row_number, column_number)
+            new.setVisible(old.isVisible())
+            old.close()
+            if old.figure is not None:
+                plt.close(old.figure)
+            old.deleteLater()
+            self.gwObjects[i] = new
+            new.firstPlot()
+        self.scroll_grid_layout.update()
+        if self.linkedDisks:
+            self.linkDisks(True)
+
+    def setPropagation(self, checked):
+        self.propagateDisks = checked
+        for gw in self.gwObjects:
+            gw.propagate = checked
+
+    def toggleOverlays(self, checked):
+        self.overlayTemplates = checked
+        self.updateOverlays()
+
+    def updateOverlays(self):
+        """Draw the parameters of the other workspace templates in the graph widgets"""
+        for gw in self.gwObjects:
+            overlays = self.workspace.overlays(gw.par, exclude=self.fileName) \
+                if self.overlayTemplates else []
+            if len(overlays) == 0 and len(gw.overlays) == 0:
+                continue
+            gw.overlays = overlays
+            # the overlays are in the cached backgrounds
+            gw.firstPlot()
+
+    def sessionArrays(self):
+        """The current state of the window as arrays for the session file"""
+        values = {par: self.parVals[par] for par in self.parVals}
+        errors = {par: self.parValsErr[par] for par in self.parVals}
+        for gw in self.gwObjects:
+            # undo and polynomial fits replace the arrays of the widget
+            values[gw.par] = gw.parVals
+            errors[gw.par] = gw.parValsErr
+        names = list(self.parVals)
+        arrays = {'template_keys': np.array(list(self.Tirific_Template.keys()), dtype=str),
+                  'template_values': np.array([str(value) for value in
+                                               self.Tirific_Template.values()], dtype=str),
+                  'NUR': np.array(self.NUR),
+                  'RADI': np.asarray(self.parValsRADI, dtype=float),
+                  'precision_x': np.array(self.numPrecisionX, dtype=str),
+                  'par_names': np.array(names, dtype=str),
+                  'values': np.array([np.asarray(values[par], dtype=float) for par in names]),
+                  'errors': np.array([np.asarray(errors[par], dtype=float) for par in names]),
+                  'precision_y': np.array([self.numPrecisionY[par] for par in names], dtype=str),
+                  'layout_par': np.array(self.par, dtype=str),
+                  'layout_shape': np.array([self.nrows, self.ncols, int(self.arranged)]),
+                  'xScale': np.asarray(self.xScale, dtype=float)}
+        arrays.update(pack_fit_settings(self.parameterFittingSettings))
+        for gw in self.gwObjects:
+            base, entries, indices, deltas = encode_history(gw.historyList)
+            arrays[f'history_base_{gw.par}'] = base
+            arrays[f'history_length_{gw.par}'] = np.array(len(gw.historyList))
+            arrays[f'history_entries_{gw.par}'] = entries
+            arrays[f'history_indices_{gw.par}'] = indices
+            arrays[f'history_values_{gw.par}'] = deltas
+            arrays[f'original_{gw.par}'] = np.asarray(gw.originalparVals, dtype=float)
+            arrays[f'yScale_{gw.par}'] = np.asarray(gw.yScale, dtype=float)
+        return arrays
+
+    def saveSession(self):
+        """Write the session file next to the .def file
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        The session holds the values, errors, fitting settings, undo history,
+        layout and scales so that reopening the .def file restores them
+        without parsing the template again.
+        """
+        if not self.fileName or not os.path.isfile(self.fileName):
+            return
+        try:
+            path = write_session(self.fileName, self.sessionArrays())
+        except OSError as e:
+            logger.warning('The session could not be saved: %s', e)
+        else:
+            self.statusBar().showMessage(f'Session saved to {path}', 5000)
+
+    def restoreSession(self, session):
+        """Set the template, values and fitting settings from a session"""
+        self.Tirific_Template = FAT_sup.Proper_Dictionary()
+        for key, value in zip(session['template_keys'], session['template_values']):
+            self.Tirific_Template[str(key)] = str(value)
+        self.NUR = int(session['NUR'])
+        self.parValsRADI = np.array(session['RADI'], dtype=np.float64)
+        self.numPrecisionX = [int(session['precision_x'][0]), str(session['precision_x'][1])]
+        names = [str(par) for par in session['par_names']]
+        values = session['values']
+        errors = session['errors']
+        precisions = session['precision_y']
+        for i, par in enumerate(names):
+            self.parVals[par] = np.array(values[i], dtype=np.float64)
+            self.parValsErr[par] = np.array(errors[i], dtype=np.float64)
+            self.numPrecisionY[par] = [int(precisions[i][0]), str(precisions[i][1])]
+        self.parameterFittingSettings = unpack_fit_settings(session, self.NUR)
+        self.par = [str(par) for par in session['layout_par']]
+        self.nrows, self.ncols = int(session['layout_shape'][0]), int(session['layout_shape'][1])
+        self.setPFConfig()
+
+    def restoreViews(self, session):
+        """Give the graph widgets their history, original values and scales back"""
+        for gw in self.gwObjects:
+            if f'history_base_{gw.par}' not in session:
+                continue
+            gw.historyList = decode_history(session[f'history_base_{gw.par}'],
+                                            int(session[f'history_length_{gw.par}']),
+                                            session[f'history_entries_{gw.par}'],
+                                            session[f'history_indices_{gw.par}'],
+                                            session[f'history_values_{gw.par}'])
+            gw.originalparVals = np.array(session[f'original_{gw.par}'], dtype=np.float64)
+            gw.yScale = list(session[f'yScale_{gw.par}'])
+            gw.xScale = list(session['xScale'])
+        self.xScale = list(session['xScale'])
+        if bool(session['layout_shape'][2]):
+            self.arrangeWidgets()
+        for gw in self.gwObjects:
+            gw.key = "Yes"
+            gw.firstPlot()
+        
+
+    def undoCommand(self):
+        for i in range(len(self.gwObjects)):
+            if self.gwObjects[i].par == self.currPar:
+                self.gwObjects[i].undoKey()
+                break
+
+    def redoCommand(self):
+        for i in range(len(self.gwObjects)):
+            if self.gwObjects[i].par == self.currPar:
+                self.gwObjects[i].redoKey()
+                break
+
+    def setRowCol(self):
+        text, ok = QtWidgets.QInputDialog.getText(self, "Window number Input Dialog",
+                                                  "Specify the number of rows and columns (rows,columns):")
+        if ok:
+            if text:
+                text = str(text)
+                text = text.split(",")
+                self.nrows = int(float(text[0]))
+                self.ncols = int(float(text[1]))
+                if (self.nrows * self.ncols) >= len(self.par):
+                    self.arrangeWidgets()
+                else:
+                    QtWidgets.QMessageBox.information(self, "Information",
+                                                      "Product of rows and columns should"
+                                                      " be at least the same as the current number of parameters"
+                                                      " on viewgraph")
+
+    def arrangeWidgets(self):
+        """Lay out the graph widgets of self.par in nrows x ncols, column by column"""
+        self.arranged = True
+        # clear the existing graph objects
+        item_count = self.scroll_grid_layout.count()
+        for i in range(item_count):
+            widget_to_remove = self.scroll_grid_layout.itemAt(0).widget()
+            self.scroll_grid_layout.removeWidget(widget_to_remove)
+            widget_to_remove.close()
+
+        # get only the plot widgets for the we want to plot: defined in par
+        g_w_to_plot = [gwObject for gwObject in self.gwObjects
+                       if gwObject.par in self.par]
+        # retrieve the parameter for each graph widget in the g_w_to_plot list
+        # self.par for instance contains [VROT, SBR, PA and INCL]
+        # g_w_pars will also contain a list of parameters but in the order
+        # of self.gwObjects e.g. new_par = [PA, SBR, VROT, INCL].
+        # Create a new sorted list of graph widgets based as below:
+        # loop through self.par [VROT, SBR, PA, INCL]grab the index of the 
+        # parameter in the new_par list [PA, SBR, VROT, INCL] i.e. 
+        # index(VROT) in new_par list: 2
+        # index(SBR) in new_par list: 1
+        # index(PA) in new_par list: 0
+        # index(INCL) in new_par list: 3
+        # Use these indexes to get a sorted list of graph widgets
+        # from g_w_to_plot for the plotting
+        g_w_pars = [g_w.par for g_w in g_w_to_plot]
+        sorted_g_w_to_plot = []
+        for par in self.par:
+            idx = g_w_pars.index(par)
+            sorted_g_w_to_plot.append(g_w_to_plot[idx])
+        # delete the unordered list of graph widgets
+        del g_w_to_plot
+
+        counter = 0
+        for j in range(self.ncols):
+            for i in range(self.nrows): 
+                self.scroll_grid_layout.addWidget(
+                    sorted_g_w_to_plot[counter], i, j)
+                # call the show method on the graphWidget object in order to
+                # display it
+                sorted_g_w_to_plot[counter].show()
+                # don't bother iterating to plot if all the parameters have been
+                # plotted else you'll get an error
+                if counter == len(sorted_g_w_to_plot) -1 :
+                    break
+                counter += 1
+        for j in range(self.ncols):
+            self.scroll_grid_layout.setColumnStretch(j, 1)
+            self.scroll_grid_layout.setColumnMinimumWidth(j, 0)
+        for i in range(self.nrows):
+            self.scroll_grid_layout.setRowStretch(i, 1)
+        del sorted_g_w_to_plot
+
+    def check_fitting(self):
+        # the iteration settings that other parameters already have, computed once
+        found = {}
+        for key in integer_columns:
+            values = [settings.defaults[key] for settings in
+                self.parameterFittingSettings.values() if settings.defaults[key] is not None]
+            if len(values) > 0:
+                found[key] = int(np.mean(np.array(values, dtype=int)))
+        for parameter in self.parameterFittingSettings:
+            parValsFitSetting = self.parameterFittingSettings[parameter]
+            if not parValsFitSetting.fitted:
+                continue
+            ask = False
+            for key in fit_columns:
+                if parValsFitSetting.defaults[key] is None:
+                    ring_values = parValsFitSetting.columns[key]
+                    ring_values = ring_values[np.isfinite(ring_values)]
+                    if len(ring_values) > 0:
+                        parValsFitSetting.defaults[key] = float(np.mean(ring_values))
+                    elif key in found:
+                        parValsFitSetting.defaults[key] = found[key]
+                    else:
+                        ask = True
+            if ask:
+                self.dialog = _FittingFillDialog(parameter, self.fitting_parameters,
+                                                 parValsFitSetting.defaults)
+                self.dialog.btnOK.clicked.connect(self.dialog.accept)
+                self.dialog.btnCancel.clicked.connect(self.dialog.reject)
+                result = self.dialog.exec()
+                if result == QtWidgets.QDialog.DialogCode.Accepted:
+                    self.fill_fitting_values()
+                else:
+                    return
+               
+              
+              
+    def fill_fitting_values(self):
+        parameter = self.dialog.parameter
+        for key in fit_columns:
+            value_text = getattr(self.dialog, key).text()
+            if value_text != '':
+                try:
+                    if key in integer_columns:
+                        value = int(float(value_text))
+                    else:
+                        value = float(value_text)
+                except:
+                    QtWidgets.QMessageBox.information(self, "Information",
+                                              f"Invalid value for {key}. Must be a number.")
+                    return
+                self.parameterFittingSettings[parameter].defaults[key] = value
+        self.dialog.close()
+        # Now fill in the TO_FIT rings in between
+       
+
+    def saveAll(self, wait=False):
+        """Save changes made to data point to .def file for all parameters
+
+        Keyword arguments:
+        self -- main window being displayed i.e. the current instance of
+        the mainWindow class
+        wait -- write the file before returning, for callers that use it
+                right away
+
+        Returns:
+        None
+
+        A snapshot of the current values and fitting settings is formatted
+        and written, together with the session file, on the save worker
+        thread. Saves requested while one is running are coalesced, and the
+        result is shown in the status bar.
+        """
+        if not self.fileName:
+            return
+        snapshot = self.saveSnapshot(session=True)
+        if wait:
+            self.saveWorker.wait()
+            try:
+                template = save_snapshot(snapshot)
+            except Exception as e:
+                self.saveFinished(snapshot.fileName, None, str(e))
+            else:
+                self.saveFinished(snapshot.fileName, template, '')
+            return
+        self.saveWorker.submit(snapshot)
+        self.statusBar().showMessage(f'Saving {os.path.basename(self.fileName)}…')
+
+    def saveSnapshot(self, session=False):
+        """Copy the values, errors and fitting settings that go into the template
+
+        Runs on the GUI thread as the fitting settings may have to be
+        completed through a dialog; everything else is copied only.
+        """
+        parameters = [('RADI', self.parValsRADI,
+                       np.array([float('NaN')]*len(self.parValsRADI)), self.numPrecisionX)]
+        for i in self.gwObjects:
+            parameters.append((i.par, i.parVals, i.parValsErr, i.numPrecisionY))
+            if i.parameterFitSetting.fitted:
+                if i.parameterFitSetting.defaults['PARMAX'] is None:
+                    i.parameterFitSetting.defaults['PARMAX'] = i.yScale[1]
+                if i.parameterFitSetting.defaults['PARMIN'] is None:
+                    i.parameterFitSetting.defaults['PARMIN'] = i.yScale[0]
+                self.parameterFittingSettings[i.par] = i.parameterFitSetting
+        self.check_fitting()
+        return SaveSnapshot(self.fileName, self.Tirific_Template, parameters,
+                            self.parameterFittingSettings, self.numPrecisionY,
+                            self.pyFAT_Configuration,
+                            session=self.sessionArrays() if session else None)
+
+    def _saveDone(self, args, template, error):
+        # on the save worker thread
+        self.saveNotifier.saved.emit(args[0].fileName, template,
+                                     '' if error is None else str(error))
+
+    def saveFinished(self, fileName, template, error):
+        """Show the result of a save and take over the written template"""
+        if error:
+            self.statusBar().clearMessage()
+            QtWidgets.QMessageBox.critical(self, "Save Error",
+                                           f"{fileName} could not be written: {error}")
+            return
+        if fileName == self.fileName:
+            self.setTemplate(template)
+            self.autosaver.discard(fileName)
+        logger.debug("Fitting settings updated in template.")
+        # saving is never blocked, the problems are reported before a run
+        issues = check_template(template)
+        for issue in issues:
+            logger.warning('%s: %s %s', fileName, issue.severity, issue)
+        if issues:
+            self.statusBar().showMessage(f'Changes written to {fileName}, the template has '
+                                         f'{len(issues)} problem(s), see the log', 10000)
+        else:
+            self.statusBar().showMessage(f'Changes written to {fileName}', 5000)
+
+    def setTemplate(self, template):
+        """Replace the contents of Tirific_Template, which the graph widgets share"""
+        if list(template.keys()) == list(self.Tirific_Template.keys()):
+            for key, value in template.items():
+                self.Tirific_Template[key] = value
+        else:
+            self.Tirific_Template.clear()
+            for key, value in template.items():
+                OrderedDict.__setitem__(self.Tirific_Template, key, value)
+
+    def updateTemplate(self):
+        """Put the current values, errors and fitting settings of all parameters
+        in the template without writing it to file"""
+        self.setTemplate(build_template(self.saveSnapshot()))
+
+    def saveAsAll(self,name=None, wait=False):
+        """Creates a new .def file for all parameters in current .def file opened
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        The saveAs function is called and updated with the current values being
+        held by parameters.
+        """
+        if name is None:
+            self.fileName,_filter = QtWidgets.QFileDialog.getSaveFileName(self, "Save .def file as ",
+                                                         os.getcwd(),
+                                                         ".def Files (*.def)")
+        else:
+            self.fileName = name
+        self.saveAll(wait=wait)
+
+    def slotChangeData(self, fileName):
+        global fit_par
+        with open(fileName) as f:
+            self.data = f.readlines()
+
+        self.getParameter(self.data)
+
+        # counter = 0
+        for i in fit_par.keys():
+            for j in self.gwObjects:
+                if j.par == i:
+                    j.parVals = self.parVals[i][:]
+                    j.parValRADI = self.parValsRADI[i][:]
+
+        # FIXME(Samuel 11-06-2018):
+        # the comments below will probably be important to keep/implement
+        # it's possible that the user will delete some points in the .def file
+
+        # ensure there are the same points for parameter as there are for RADI as
+        # specified in NUR parameter
+        # diff = self.NUR-len(self.parVals[self.par])
+        # lastItemIndex = len(self.parVals[self.par])-1
+        # if diff == self.NUR:
+        #    for i in range(int(diff)):
+        #        self.parVals[self.par].append(0.0)
+        # elif diff > 0 and diff < self.NUR:
+        #    for i in range(int(diff)):
+        #        self.parVals[self.par].append(self.parVals[self.par][lastItemIndex])
+
+        # defining the x and y scale for plotting
+        self.xScale = set_plotScale(self.gwObjects[0].parValRADI)
+        ''''
+        if (np.subtract(max(self.gwObjects[0].parValRADI),
+                        min(self.gwObjects[0].parValRADI)) == 0):
+            self.xScale = set_plotScale(self.gwObjects[0].parValRADI)
+        elif ((max(self.gwObjects[0].parValRADI) -
+               min(self.gwObjects[0].parValRADI)) <= 100):
+            self.xScale = [int(ceil(-2 * max(self.gwObjects[0].parValRADI))),
+                           int(ceil(2 * max(self.gwObjects[0].parValRADI)))]
+        else:
+            self.xScale = [int(ceil(min(self.gwObjects[0].parValRADI) -
+                                    0.1 * (max(self.gwObjects[0].parValRADI) -
+                                           min(self.gwObjects[0].parValRADI)))),
+                           int(ceil(max(self.gwObjects[0].parValRADI) +
+                                    0.1 * (max(self.gwObjects[0].parValRADI) -
+                                           min(self.gwObjects[0].parValRADI))))]
+        '''
+        for i in self.gwObjects:
+            if not np.array_equal(i.historyList[len(i.historyList)-1], i.parVals):
+                i.historyList.append(i.parVals.copy())
+
+            i.xScale = self.xScale
+            if np.subtract(max(i.parVals), min(i.parVals)) == 0:
+                i.yScale = [-100, 100]
+            elif (max(i.parVals)-min(i.parVals)) <= 100:
+                i.yScale = [int(ceil(-2 * max(i.parVals))),
+                            int(ceil(2 * max(i.parVals)))]
+            else:
+                i.yScale = [int(ceil(min(i.parVals) -
+                                     0.1 * (max(i.parVals) - min(i.parVals)))),
+                            int(ceil(max(i.parVals) + 0.1 * (max(i.parVals) -
+                                                             min(i.parVals))))]
+            i.firstPlot()
+
+    def animate(self):
+        if os.path.isfile(self.tmpDeffile):
+            after = os.stat(self.tmpDeffile).st_mtime
+            if self.before != after:
+                self.before = after
+                self.slotChangeData(self.tmpDeffile)
+
+    def openEditor(self):
+        text, ok = QtWidgets.QInputDialog.getText(self, "Text Editor Input Dialog",
+                                                  "Enter text editor:")
+        if ok:
+            path, name = os.path.split(self.fileName)
+            self.tmpDeffile = os.path.join(path, "TiRiFiG_temp.def")
+            self.saveAsAll(self.tmpDeffile, wait=True)
+           
+
+            if text:
+                programName = str(text)
+                try:
+                    run([programName, self.tmpDeffile])
+                except OSError:
+                    QtWidgets.QMessageBox.information(self, "Information",
+                                                      "{} is not installed or configured"
+                                                      "properly on this system.".format(programName))
+            else:
+                # assign current modified time of temporary def file to before
+                self.before = os.stat(self.tmpDeffile).st_mtime
+                self.t = TimerThread(1, self.animate)
+                self.t.start()
+
+    def inProgress(self):
+        """Displays the information about feature under development
+        """
+        QtWidgets.QMessageBox.information(self, "Information",
+                                          "This feature is under development")
+
+    def SMobj(self):
+        self.sm = SMWindow(self.par, self.xScale, self.gwObjects)
+        self.sm.show()
+  
+    def paramDef(self):
+        user_input = self.ps.parameter.currentText().upper()
+        unitMeas = str(self.ps.unitMeasurement.text())
+        after_parameter = self.ps.afterParameter.currentText().upper()
+        text_loc = ""
+        if self.parameter_in_plot(user_input) or not self.parameter_in_data(user_input):
+            return
+        if after_parameter == "End":
+            text_loc = "at the end of the current graph" 
+        else:
+            text_loc = f"after the parameter {after_parameter}"   
+       
+      
+        # check if the inputted parameter value has its plot displayed
+       
+        logger.debug("We will add the parameter %s %s", user_input, text_loc)
+
+        # the graph for the new tilted ring parameter will be inserted after the last plot
+        # We could change this by adding a plot after option in the dialog box
+        new_widget = self.obtain_widget_to_plot(user_input, unitMeas)
+
+        #get the currently displayed widgets and their positions
+        rows = []
+        columns = [] 
+        after_row = -1
+        after_column = -1
+        for i in range(self.scroll_grid_layout.count()):
+            displayed = self.scroll_grid_layout.itemAt(i).widget()
+            row_number, column_number = self.get_widget_location(displayed)
+            if after_parameter != "End":
+                if displayed.par == after_parameter:
+                    after_row = row_number+1
+                    after_column = column_number
+            rows.append(row_number)
+            columns.append(column_number)
+        if after_row == -1:
+            if after_parameter != "End":
+                logger.warning("We could not find the parameter you specified to insert after. "
+                               "Adding at the end instead.")
+            after_column = max(columns)
+            column_index = [i for i,x in enumerate(columns) if x == after_column]
+            after_row = max([rows[i] for i in column_index])+1
+        if after_row >= self.nrows:
+            after_column += 1
+            if after_column == self.ncols:
+                self.ncols += 1
+            after_row = 0
+        widgets_to_add = [{'widget': new_widget,
+                          'row': after_row,
+                          'column': after_column}]
+        remove_start_index = -1
+        for i in range(self.scroll_grid_layout.count()):
+            displayed = self.scroll_grid_layout.itemAt(i).widget()
+            row_number, column_number = self.get_widget_location(displayed)
+            if column_number < after_column or (column_number == after_column and
+                                     row_number < after_row):
+                continue
+            else:
+                if remove_start_index == -1:
+                    remove_start_index = i
+                if row_number +1 < self.nrows:
+                    row_number +=1                    
+                else:
+                    row_number = 0
+                    column_number +=1
+                    if column_number > self.ncols:
+                        self.ncols += 1
+                widgets_to_add.append({'widget': displayed,
+                                       'row': row_number,
+                                       'column': column_number})
+        if remove_start_index  > -1:        
+            for i in range(self.scroll_grid_layout.count()-1, remove_start_index-1, -1):
+                widget_to_remove = self.scroll_grid_layout.itemAt(i).widget()
+                self.scroll_grid_layout.removeWidget(widget_to_remove)
+                widget_to_remove.hide()
+                self.par.remove(widget_to_remove.par)
+        for item in widgets_to_add:
+            self.scroll_grid_layout.addWidget(item['widget'],
+                                              item['row'],
+                                              item['column'])
+            item['widget'].show() 
+            self.par.append(item['widget'].par)
+        del widgets_to_add
+        self.ps.close()
+
+        return                  
+      
+
+    def create_new_widget(self, parameter,unit):
+        if parameter not in self.parameterFittingSettings:
+            self.setEmptyFittingValues(parameter)
+        graph_class = NativeGraphWidget if self.nativePlots else GraphWidget
+        new_gwObject = graph_class(self.xScale,
+            self.yScale[parameter],
+            unit,
+            parameter,
+            self.parVals[parameter],
+            self.parValsErr[parameter],
+            self.parValsRADI,
+            "Yes",
+            self.numPrecisionX,
+            self.numPrecisionY[parameter],
+            self.pyFAT_Configuration,
+            self.Tirific_Template,
+            self.parameterFittingSettings[parameter],
+
+            )
+        
+        #new_gwObject.setMinimumSize(int(self.scrollWidth*3./4.),
+        #    int(self.scrollHeight/2.))
+        new_gwObject.setMinimumSize(750,500)
+        #new_gwObject.setFixedSize(1050,500)
+        #self.gwObjects[parIndex].btnAddParam.clicked.connect(
+        #    self.gwObjects[parIndex].changeGlobal)
+        #self.gwObjects[parIndex].btnAddParam.clicked.connect(
+        #    self.insert_parameter_dialog)
+        new_gwObject.valuesChanged.connect(self.valuesChanged)
+        new_gwObject.currentChanged.connect(self.setCurrPar)
+        new_gwObject.btnEditParam.clicked.connect(
+            new_gwObject.changeGlobal)
+        new_gwObject.btnEditParam.clicked.connect(
+            self.editParaObj)
+        new_gwObject.btnCloseParam.clicked.connect(
+            new_gwObject.changeGlobal)
+        new_gwObject.btnCloseParam.clicked.connect(
+            self.closeParaObj)         
+                
+
+        return new_gwObject
+    
+    def get_widget_location(self, widget):
+        """Get the row and column of a widget in the grid layout.
+
+        Keyword arguments:
+        self -- main window being displayed i.e. the current instance of the
+                mainWindow class
+        widget -- the widget whose location is to be found
+
+        Returns:
+        row_number -- the row number of the widget
+        column_number -- the column number of the widget
+        """
+        idx_in_layout = self.scroll_grid_layout.indexOf(widget)
+        row_number, column_number, _rowSpan, _colSpan = self.scroll_grid_layout.getItemPosition(idx_in_layout)
+        return row_number, column_number
+        
+    def parameter_in_plot(self,parameter):
+       
+        if parameter in self.par:
+            QtWidgets.QMessageBox.information(self, "Information",
+                f"The parameter {parameter} is already displayed")
+            return True
+        return False
+
+    def parameter_in_data(self,parameter):       
+        try:
+            self.parVals[parameter]
+        except KeyError:
+            QtWidgets.QMessageBox.information(self, "Information",
+                "This parameter is not defined in the .def file")
+            return False
+        return True
+    
+    def obtain_widget_to_plot(self, parameter, unitMeas): 
+        list_of_t_r_p = [gwObject.par for gwObject in self.gwObjects]
+        if unitMeas == "":
+            #if the unit measure is blank, we attempt the default
+            base_parameter = parameter.split('_')[0]
+            if base_parameter in fit_par.keys():
+                unitMeas = fit_par[base_parameter]
+        else:
+            #If the unit is not blank we want to update it in any existing graphs
+            if parameter in list_of_t_r_p:
+                for graph_widget in self.gwObjects:
+                    if graph_widget.par == parameter:
+                        graph_widget.unitMeas = unitMeas
+                        break
+        #If we do not have an existing graph we add one for the new parameter                         
+        if parameter not in list_of_t_r_p:
+            new_widget = self.create_new_widget(parameter,unitMeas)
+            self.gwObjects.append(new_widget)
+        else:
+            new_widget = None
+            for gw in self.gwObjects:
+                if gw.par == parameter:
+                    new_widget = gw
+                    break
+        return new_widget
+  
+                
+    def editParamDef(self):
+          
+        user_input = self.ps.parameter.currentText().upper()
+        unitMeas = str(self.ps.unitMeasurement.text())
+        
+        if self.parameter_in_plot(user_input) or not self.parameter_in_data(user_input):
+            return
+        logger.debug('We will replace the parameter %s with %s', self.currPar, user_input)
+        #select or create the widget to plot        
+        new_widget = self.obtain_widget_to_plot(user_input, unitMeas)  
+                             
+        # Find the actual widget object for the current parameter in the layout
+        old_widget = None
+        for i,gw in enumerate(self.gwObjects):
+            if gw.par == self.currPar:
+                old_widget = gw
+                break
+        
+
+        if old_widget is None:
+            logger.warning("Could not find existing widget for currPar; aborting edit swap")
+            return
+
+        # Determine the position of the old widget in the grid
+        row_number,column_number = self.get_widget_location(old_widget)
+
+        # Remove old widget from layout and replace gwObjects entry
+        self.scroll_grid_layout.removeWidget(old_widget)
+        # Can't say I understand it but these seem to be required for 
+        # a repetative add/remove to work properly
+        old_widget.hide()
+        new_widget.show()
+
+        self.scroll_grid_layout.addWidget(new_widget, row_number, column_number)
+        self.scroll_grid_layout.update()
+
+        # Update current parameter to the new one       
+        # update the parameter list
+        self.par[self.par.index(self.currPar)] = user_input 
+        self.currPar = user_input
+        self.ps.close()
+    
+    def create_parameter_dialog(self, opt, title,add=False):
+        self.selected_option = opt
+        val = []
+        for i in self.parVals:
+            if i in self.par:
+                continue
+            else:
+                val.append(i)    
+        self.ps = ParamSpec(val, title,plotted_parameters=self.par,addLocation=add)
+        self.ps.show()
+        self.ps.btnOK.clicked.connect(self.paramDef)
+        self.ps.btnCancel.clicked.connect(self.ps.close)
+
+    def add_parameter_dialog(self):
+        selected_option = 'add'
+        title = 'Add Parameter'
+        self.create_parameter_dialog(selected_option, title,add=True)
+
+    def insert_parameter_dialog(self):
+        selected_option = 'insert'
+        title = 'Insert Parameter'
+        self.create_parameter_dialog(selected_option, title)
+
+    def editParaObj(self):
+        val = []
+        for i in self.parVals:
+            if i in self.par:
+                continue
+            else:
+                val.append(i)
+
+        self.ps = ParamSpec(val, "Edit Parameter")
+        self.ps.show()
+        self.ps.btnOK.clicked.connect(self.editParamDef)
+        self.ps.btnCancel.clicked.connect(self.ps.close)
+
+    def closeParaObj(self):
+        #updated in changeGlobal
+        logger.debug('Removing the Graph of parameter %s', self.currPar)
+        parIndex = [self.scroll_grid_layout.itemAt(i).widget().par 
+            for i in range(self.scroll_grid_layout.count())].index(self.currPar)  
+        widget_to_remove = self.scroll_grid_layout.itemAt(parIndex).widget()
+        self.scroll_grid_layout.removeWidget(widget_to_remove)
+        self.scroll_grid_layout.update()
+        self.par.remove(self.currPar)
+        widget_to_remove.close()
+        
+       
+    def tirificMessage(self,message):
+        """Displays the information about input data cube not available
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of the
+                mainWindow class
+
+        Returns:
+        None
+
+        Displays a messagebox that informs user that changes have been successfully
+        written to the .def file
+        """
+        reply = QtWidgets.QMessageBox.warning(
+                self,'Run TiRiFiC Message',
+                message,
+                QtWidgets.QMessageBox.StandardButton.Ok | QtWidgets.QMessageBox.StandardButton.Cancel,
+                QtWidgets.QMessageBox.StandardButton.Cancel,
+            )
+        if reply == QtWidgets.QMessageBox.StandardButton.Cancel:
+                return False
+        return True
+        QtWidgets.QMessageBox.information(self, "Information",
+                                         message)
+
+    def progressBar(self, cmd):
+        progress = QtWidgets.QProgressDialog("Operation in progress...",
+                                             "Cancel", 0, 100)
+        progress.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
+        progress.setMaximum(int(float(self.Tirific_Template['LOOPS'])*1e6))
+        progress.resize(500, 100)
+        prev = 1
+        message = "Stopped"
+        completed = int(prev * 1e6) / 2
+        status = 'running'
+        progress.show()
+        time.sleep(10)
+        while cmd.poll() is None and status == 'running':
+            with open(self.progressPath, 'r') as f:
+                data = f.readlines()
+                for i in data:
+                    lin = i.split(" ")
+                    if 'L:' in lin[0].upper():
+                        count = lin[0].split(":")
+                        count = count[1].split("/")
+                        if int(float(count[0])) > prev:
+                            if int(float(count[0])) == int(float(self.Tirific_Template['LOOPS'])):
+                                completed += 0.0001
+                            else:
+                                prev = int(float(count[0]))
+                                completed = prev * 1e6
+                        else:
+                            completed += 0.0001
+                    elif "finish" in lin[0].lower():
+                        status = 'finished'
+                        progress.setValue(int(float(self.Tirific_Template['LOOPS'])) * 1e6)
+                        message = i
+                        break
+            progress.setValue(completed)
+            if progress.wasCanceled():
+                cmd.kill()
+                break
+        progress.setValue(int(float(self.Tirific_Template['LOOPS'])) * 1e6)
+        QtWidgets.QMessageBox.information(self, "Information", message)
+
+    def ring_geometry(self):
+        """The current RADI and ring parameters used to draw or project the rings"""
+        geometry = {'RADI': np.asarray(self.parValsRADI, dtype=float)}
+        for par in preview_parameters[1:]:
+            if par in self.parVals:
+                geometry[par] = np.asarray(self.parVals[par], dtype=float)
+            for gw in self.gwObjects:
+                # a graph widget may hold edits that are not in parVals yet
+                if gw.par == par:
+                    geometry[par] = np.asarray(gw.parVals, dtype=float)
+        return geometry
+
+    def currentValues(self):
+        """RADI and the values of every ring parameter, including the edits
+        that are only in the graph widgets"""
+        values = {'RADI': np.asarray(self.parValsRADI, dtype=float)}
+        for par in self.parVals:
+            values[par] = np.asarray(self.parVals[par], dtype=float)
+        for gw in self.gwObjects:
+            values[gw.par] = np.asarray(gw.parVals, dtype=float)
+        return values
+
+    def compareTemplate(self):
+        """Compare the open template with another .def file
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        Lists the parameters and rings that differ between the chosen file
+        and the current values, and optionally draws the deltas in the graphs.
+        """
+        fileName, _filter = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Compare with .def File",
+            os.path.split(self.fileName)[0] if self.fileName else "~/", ".def Files (*.def)")
+        if not fileName:
+            return
+        try:
+            reference = template_cache.get(fileName)
+        except (OSError, KeyError, ValueError) as e:
+            QtWidgets.QMessageBox.information(self, "Information",
+                                              f"{fileName} could not be read: {e}")
+            return
+        diff = diff_values(dict(reference.values, RADI=reference.radii), self.currentValues())
+        if self.diffWindow is not None:
+            self.diffWindow.close()
+        self.diffWindow = TemplateDiffWindow(
+            diff, f"{reference.label} -> {os.path.basename(self.fileName)}")
+        self.diffWindow.showDeltas.toggled.connect(
+            lambda checked: self.showDeltas(reference if checked else None))
+        self.diffWindow.show()
+
+    def showDeltas(self, reference):
+        """Draw the deltas from a ParsedTemplate in the graphs, None removes them"""
+        for gw in self.gwObjects:
+            gw.delta_reference = None
+            if reference is not None and gw.par in reference.values:
+                gw.delta_reference = (reference.radii, reference.values[gw.par])
+            # the deltas are in the cached backgrounds
+            gw.firstPlot()
+
+    def openCube(self):
+        """Open the panel showing the INSET data cube
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        The cube is memory-mapped, moment maps and PV slices are only
+        computed when they are shown.
+        """
+        fileNamePath = os.path.split(self.fileName)[0]
+        fitsfilePath = os.path.join(fileNamePath, self.Tirific_Template['INSET'])
+        if not os.path.isfile(fitsfilePath):
+            self.tirificMessage("The input data cube specified in INSET (" + self.Tirific_Template['INSET'] + ") parameter is not available.")
+            return
+        missing = [par for par in ['XPOS', 'YPOS', 'PA', 'INCL'] if par not in self.parVals]
+        if missing:
+            QtWidgets.QMessageBox.information(self, "Information",
+                f"The rings cannot be drawn without {', '.join(missing)} in the .def file.")
+            return
+        try:
+            cube = FitsCube(fitsfilePath)
+        except (CubeError, OSError, KeyError, ValueError) as e:
+            QtWidgets.QMessageBox.critical(self, "Cube Error", str(e))
+            return
+        try:
+            clip = 3. * float(self.Tirific_Template['RMS'])
+        except (KeyError, ValueError):
+            clip = None
+        self.cubeWindow = CubeWindow(cube, self.ring_geometry, clip=clip)
+        self.cubeWindow.show()
+
+    def openPreview(self):
+        """Open the quick projection of the current ring model
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        The model is projected on a coarse version of the INSET grid when the
+        cube is available and on a grid around the rings otherwise.
+        """
+        missing = [par for par in ['VROT', 'INCL', 'PA', 'XPOS', 'YPOS']
+                   if par not in self.parVals]
+        if missing:
+            QtWidgets.QMessageBox.information(self, "Information",
+                f"The model cannot be projected without {', '.join(missing)} in the .def file.")
+            return
+        fitsfilePath = os.path.join(os.path.split(self.fileName)[0],
+                                    self.Tirific_Template.get('INSET', ''))
+        try:
+            grid = SkyGrid.from_cube(FitsCube(fitsfilePath))
+        except (CubeError, OSError, KeyError, ValueError):
+            grid = SkyGrid.from_rings(self.ring_geometry())
+        self.previewWindow = ModelPreviewWindow(grid, self.ring_geometry)
+        self.previewWindow.show()
+
+    def openResiduals(self):
+        """Open the residuals of the INSET cube
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        The data are binned to the grid of the model preview. The OUTSET cube
+        is offered as model when it exists next to the .def file.
+        """
+        missing = [par for par in ['VROT', 'INCL', 'PA', 'XPOS', 'YPOS']
+                   if par not in self.parVals]
+        if missing:
+            QtWidgets.QMessageBox.information(self, "Information",
+                f"The model cannot be projected without {', '.join(missing)} in the .def file.")
+            return
+        fileNamePath = os.path.split(self.fileName)[0]
+        try:
+            cube = FitsCube(os.path.join(fileNamePath, self.Tirific_Template['INSET']))
+        except (CubeError, OSError, KeyError, ValueError) as e:
+            QtWidgets.QMessageBox.critical(self, "Cube Error", str(e))
+            return
+        outset = None
+        outsetPath = os.path.join(fileNamePath, self.Tirific_Template.get('OUTSET', '').strip())
+        if os.path.isfile(outsetPath):
+            try:
+                outset = FitsCube(outsetPath)
+            except (CubeError, OSError, KeyError, ValueError):
+                outset = None
+        try:
+            noise = float(self.Tirific_Template['RMS'])
+        except (KeyError, ValueError):
+            noise = 1.
+        try:
+            beam = [float(self.Tirific_Template['BMAJ']), float(self.Tirific_Template['BMIN'])]
+        except (KeyError, ValueError):
+            beam = None
+        self.residualWindow = ResidualWindow(cube, SkyGrid.from_cube(cube), self.ring_geometry,
+                                             noise, beam=beam, outset=outset)
+        self.residualWindow.show()
+
+    def valuesChanged(self, par):
+        """An edit of the values of par is finished in one of the graph widgets"""
+        if self.autosaver.edited():
+            self.autosave()
+        if self.previewWindow is not None:
+            self.previewWindow.scheduleRefresh(par)
+        if self.residualWindow is not None:
+            self.residualWindow.scheduleRefresh(par)
+
+    def preflightCheck(self):
+        """Check the current template before TiRiFiC is run on it
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        True when TiRiFiC may be run: there are no problems, or only warnings
+        and the user continues anyway
+        """
+        self.updateTemplate()
+        start = time.perf_counter()
+        issues = check_template(self.Tirific_Template, os.path.split(self.fileName)[0])
+        logger.debug('Template checked in %.1f ms, %d problem(s)',
+                     (time.perf_counter() - start) * 1e3, len(issues))
+        if not issues:
+            return True
+        text = format_issues(issues)
+        if any(issue.severity == 'error' for issue in issues):
+            QtWidgets.QMessageBox.critical(self, "Template Error",
+                                           "TiRiFiC is not started, the template has errors:"
+                                           f"\n\n{text}")
+            return False
+        return self.tirificMessage(f"The template has warnings:\n\n{text}\n\nRun TiRiFiC anyway?")
+
+    def startTiriFiC(self):
+        """Start TiRiFiC
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        Calls the os.system and opens terminal to start TiRiFiC
+        """
+        fileNamePath, fileName = os.path.split(self.fileName)
+        tirifigRunPath = os.getcwd()
+        if self.Tirific_Template['TIRDEF'] == fileName:
+            if not self.tirificMessage( 
+                f"This TiRiFiC run will overwrite the current .def file ({self.Tirific_Template['TIRDEF']}). Continue?"):
+                return
+        if self.fileName == self.openedfileName:
+            if not self.tirificMessage(
+                f"The current setting will overwrite the original .def file ({self.openedfileName}). Continue?"):
+                return
+              
+
+       
+        if self.preflightCheck():
+            if not self.Tirific_Template.get('PROGRESSLOG', '').strip():
+                # the convergence panel follows the progress log
+                self.Tirific_Template['PROGRESSLOG'] = \
+                    f'{os.path.splitext(fileName)[0]}_progress.txt'
+            progressLog = os.path.join(fileNamePath, self.Tirific_Template['PROGRESSLOG'].strip())
+            if os.path.isfile(progressLog):
+                # the log of an earlier run would be taken for this one
+                os.remove(progressLog)
+            self.saveAll(wait=True)
+            try:
+                features = run_features(self.Tirific_Template, fileNamePath)
+            except (OSError, CubeError, ValueError) as e:
+                logger.warning('The run of %s is not timed: %s', fileName, e)
+                features = None
+            history, run_id = self.recordRun()
+
+            def finished(returncode, seconds):
+                # on the thread that waited for tirific
+                if run_id is None:
+                    return
+                try:
+                    history.finish_run(run_id, returncode, seconds)
+                except sqlite3.Error as e:
+                    logger.warning('Cannot store the outcome of run %s: %s', run_id, e)
+
+            try:
+                cmd = start_timed_run(self.fileName, features, done=finished)
+            except OSError:
+                if run_id is not None:
+                    history.delete(run_id)
+                QtWidgets.QMessageBox.information(self, "Information",
+                                                  "TiRiFiC is not installed or configured"
+                                                  " properly on system.")
+            else:
+                if features is not None:
+                    self.statusBar().showMessage(
+                        f'TiRiFiC started, estimated {estimate_run(features)}', 10000)
+                self.showConvergence(progressLog, cmd)
+                '''
+                self.progressPath = str(self.fileName)
+                self.progressPath = self.progressPath.split('/')
+                self.progressPath[-1] = 'progress'
+                self.progressPath = '/'.join(self.progressPath)
+                self.progressBar(cmd)
+                '''
+
+    def showConvergence(self, progressLog, process):
+        """Open the live convergence panel of a run that was just started
+
+        Keyword arguments:
+        progressLog (string)--        the PROGRESSLOG of the run
+        process (subprocess.Popen)--  the tirific process, to stop the run
+
+        Returns:
+        the ConvergenceWindow
+        """
+        if self.convergenceWindow is not None:
+            # the panel of the previous run stops following its log
+            self.convergenceWindow.close()
+        self.convergenceWindow = ConvergenceWindow(
+            progressLog, process, f'Convergence - {os.path.basename(self.fileName)}')
+        self.convergenceWindow.show()
+        return self.convergenceWindow
+
+    def recordRun(self):
+        """Store the template and session arrays of the run being started
+
+        Returns:
+        (RunHistory, run id), the id is None when the history cannot be written
+        """
+        try:
+            if self.runHistory is None:
+                self.runHistory = RunHistory()
+            return self.runHistory, self.runHistory.start_run(
+                self.fileName, self.Tirific_Template, self.sessionArrays())
+        except (sqlite3.Error, OSError) as e:
+            logger.warning('The run is not stored in the run history: %s', e)
+            return self.runHistory, None
+
+    def showRunHistory(self):
+        """Open the browser of the runs in the run history"""
+        try:
+            if self.runHistory is None:
+                self.runHistory = RunHistory()
+        except (sqlite3.Error, OSError) as e:
+            QtWidgets.QMessageBox.critical(self, "Run History",
+                                           f"The run history cannot be opened: {e}")
+            return
+        if self.historyWindow is not None:
+            self.historyWindow.close()
+        self.historyWindow = RunHistoryWindow(self.runHistory)
+        self.historyWindow.btnInput.clicked.connect(lambda: self.restoreRun(results=False))
+        self.historyWindow.btnFit.clicked.connect(lambda: self.restoreRun(results=True))
+        self.historyWindow.show()
+
+    def restoreRun(self, results=False):
+        """Restore the run selected in the run history as the open template
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+        results (bool)--  restore the values TiRiFiC fitted rather than the
+                          values the run was started with
+
+        Returns:
+        None
+
+        The run is restored from the session arrays stored with it, so neither
+        the .def file nor TIRDEF is parsed. Its .def file becomes the open file,
+        as it will be written on the next save.
+        """
+        record = self.historyWindow.selectedRun()
+        if record is None:
+            return
+        if self.unsavedChanges():
+            reply = QtWidgets.QMessageBox.question(
+                self, 'Restore Run',
+                f'The changes to {os.path.basename(self.fileName)} have not been saved. '
+                'Restore the run anyway?',
+                QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No,
+                QtWidgets.QMessageBox.StandardButton.No)
+            if reply != QtWidgets.QMessageBox.StandardButton.Yes:
+                return
+        try:
+            session = self.runHistory.session(record.id, results=results)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            QtWidgets.QMessageBox.critical(self, "Run History", f"Run {record.id} cannot be read: {e}")
+            return
+        self.fileName = record.def_file
+        self.openedfileName = copy.deepcopy(self.fileName)
+        self.data = [] if os.path.isfile(record.def_file) else None
+        self.loadDef(session=session)
+        self.statusBar().showMessage(
+            f"Restored the {'fit' if results else 'input'} of run {record.id} "
+            f"({os.path.basename(record.def_file)})", 5000)
+
+    def showRunCost(self):
+        """Show the estimated wall time and memory of a TiRiFiC run of the
+        current template and of the other templates of the workspace, shortest
+        run first, as they would best be run in a batch"""
+        if not self.fileName:
+            return
+        records = read_timings()
+        # the current template as it is in the window, whether saved or not
+        try:
+            estimate = estimate_run(run_features(build_template(self.saveSnapshot()),
+                                                 os.path.dirname(os.path.abspath(self.fileName))),
+                                    records)
+        except Exception as e:
+            logger.warning('Cannot estimate the run of %s: %s', self.fileName, e)
+            estimate = None
+        ordered = order_runs([path for path in self.workspace.paths
+                              if path != os.path.abspath(self.fileName)], records)
+        if estimate is not None:
+            position = len([other for _, other in ordered
+                            if other is not None and other.seconds <= estimate.seconds])
+            ordered.insert(position, (self.fileName, estimate))
+        else:
+            ordered.append((self.fileName, None))
+        lines = []
+        for path, estimate in ordered:
+            result = str(estimate) if estimate is not None else 'cannot be estimated, see the log'
+            lines.append(f'{os.path.basename(path)}: {result}')
+        QtWidgets.QMessageBox.information(self, "Run Cost", '\n'.join(lines))
+
+    def errorShakerDialog(self):
+        """Ask for the number of iterations and concurrent runs of the error estimation"""
+        if self._shaker is not None:
+            QtWidgets.QMessageBox.information(self, "Information",
+                                              "The errors are already being estimated.")
+            return
+        try:
+            ncores = max(1, int(float(self.Tirific_Template['NCORES'])))
+        except (KeyError, ValueError):
+            ncores = 1
+        self.shakerWindow = ErrorShakerWindow(max(1, (os.cpu_count() or 1) // ncores))
+        self.shakerWindow.show()
+        self.shakerWindow.btnOK.clicked.connect(self.estimateErrors)
+        self.shakerWindow.btnCancel.clicked.connect(self.shakerWindow.close)
+
+    def estimateErrors(self):
+        """Estimate the errors with tirshaker
+
+        Keyword arguments:
+        self--  main window being displayed i.e. the current instance of
+        the mainWindow class
+
+        Returns:
+        None
+
+        The current template is varied and refitted in a pool of concurrent
+        tirific processes. After every finished iteration the errors of the
+        fitted parameters are recomputed and the error bars redrawn. The
+        errors are written to the .def file on the next save.
+        """
+        iterations = self.shakerWindow.iterations.value()
+        workers = self.shakerWindow.workers.value()
+        loops = self.shakerWindow.loops.text().strip()
+        self.shakerWindow.close()
+        if shutil.which('tirific') is None:
+            QtWidgets.QMessageBox.information(self, "Information",
+                                              "TiRiFiC is not installed or configured"
+                                              " properly on system.")
+            return
+        fileNamePath = os.path.split(self.fileName)[0]
+        if not self.preflightCheck():
+            return
+        try:
+            self._shaker = ErrorShaker(self.Tirific_Template, fileNamePath, workers=workers,
+                                       loops=int(float(loops)) if loops else None)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Error Estimation", str(e))
+            return
+
+        self._shaker_progress = QtWidgets.QProgressDialog(
+            "Estimating errors…", "Stop", 0, iterations, self)
+        self._shaker_progress.setMinimumDuration(0)
+        self._shaker_progress.canceled.connect(self.stopErrors)
+        self._shaker_progress.show()
+
+        self._shaker_thread = QtCore.QThread(self)
+        self._shaker_worker = _ShakerWorker(self._shaker, iterations)
+        self._shaker_worker.moveToThread(self._shaker_thread)
+        self._shaker_thread.started.connect(self._shaker_worker.run)
+        self._shaker_worker.iterationDone.connect(self.showErrors)
+        self._shaker_worker.finished.connect(self.errorsDone)
+        self._shaker_worker.errored.connect(
+            lambda msg: QtWidgets.QMessageBox.critical(self, "Error Estimation", msg))
+        # direct, as closeEvent waits for the thread on the GUI thread
+        self._shaker_worker.finished.connect(self._shaker_thread.quit,
+                                             QtCore.Qt.ConnectionType.DirectConnection)
+        self._shaker_worker.errored.connect(self._shaker_thread.quit,
+                                            QtCore.Qt.ConnectionType.DirectConnection)
+        self._shaker_thread.finished.connect(self._shaker_worker.deleteLater)
+        self._shaker_thread.finished.connect(self._shaker_thread.deleteLater)
+        self._shaker_thread.finished.connect(self._shakerFinished)
+        self._shaker_thread.start()
+
+    def stopErrors(self):
+        """Start no further iterations; the running ones are finished first"""
+        if self._shaker is not None:
+            self._shaker.cancelled = True
+            self.statusBar().showMessage("Stopping the error estimation after the running iterations")
+
+    def showErrors(self, done, errors):
+        """Put the errors of the iterations finished so far in the error bars"""
+        for par, values in errors.items():
+            if par in self.parValsErr and len(values) == len(self.parValsErr[par]):
+                # in place, the graph widgets share these arrays
+                self.parValsErr[par][:] = values
+        for gw in self.gwObjects:
+            if gw.par in errors:
+                # the error bars are in the cached backgrounds
+                gw.firstPlot()
+        if self._shaker_progress is not None:
+            self._shaker_progress.setValue(done)
+        self.statusBar().showMessage(f"Error estimation: {done} iterations finished")
+
+    def errorsDone(self, errors):
+        self.showErrors(len(next(iter(self._shaker.fit_groups['COLLECTED'].values()), [])),
+                        errors)
+        failed = f" {self._shaker.failed} iteration(s) failed, see the log." \
+            if self._shaker.failed else ""
+        QtWidgets.QMessageBox.information(self, "Information",
+            f"Errors estimated for {', '.join(errors)}. Save to write them to the .def file."
+            f"{failed}")
+
+    def _shakerFinished(self):
+        self._shaker = None
+        if self._shaker_progress is not None:
+            self._shaker_progress.reset()
+            self._shaker_progress.hide()
+            self._shaker_progress = None
+
+def set_plotScale(values):
+    min_max_diff = max(values) - min(values)
+    percentage_of_min_max_diff = 0.1 * min_max_diff
+    lower_bound = min(values) - percentage_of_min_max_diff
+    upper_bound = max(values) + percentage_of_min_max_diff
+    # are the min/max values the same
+    if np.subtract(max(values), min(values)) == 0:
+        scale = [lower_bound/2, upper_bound*1.5]
+    else:
+        scale = [lower_bound, upper_bound]
+    return scale
+
+def main():
+    setup_logging()
+    if os.path.isfile(os.getcwd() + "/tmpDeffile.def"):
+        os.remove(os.getcwd() + "/tmpDeffile.def")
+
+    app = QtWidgets.QApplication(sys.argv)
+    # Apply modern style (set a background image path if desired)
+    background_image_path =  str(import_pack_files('TiRiFiG.utilities.background')/'Background.png')  # e.g., "path/to/your/image.png"
+    try:
+        apply_modern_style(app,background_image_path=background_image_path)
+    except Exception as _e:
+        # Non-fatal if styling fails
+        pass
+    GUI = MainWindow()
+    GUI.show()
+    sys.exit(app.exec())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,548 @@
+# -*- coding: UTF-8 -*-
+"""Native Qt drawing of the ring parameter graphs.
+
+RingPlotView is a QPainter widget with one set of axes that draws lines,
+markers and line segments without going through matplotlib. Everything that
+only changes with the view (axes, ticks, the original values, error bars and
+overlays) is rendered once into a raster pixmap; the items that are edited
+(the points and the connecting line) are painted over that pixmap, with the
+markers copied from pre-rendered sprites. A drag step therefore costs a
+pixmap copy and a few hundred sprite copies, no GPU is needed.
+
+The view has the small part of the matplotlib Axes, canvas and MouseEvent
+interface that GraphWidget uses (get_xlim, set_ylim, transData, bbox,
+draw_idle, mouse events with xdata and ydata), so the editing code of
+GraphWidget runs unchanged on it. Export quality figures are still made
+with matplotlib.
+
+classes:
+    PlotEvent:       mouse event with the attributes of a matplotlib MouseEvent.
+    PlotItem:        a line, a set of markers or a set of segments in the view.
+    RectangleSelection:  rubber band selection reported in data coordinates.
+    RingPlotView:    the widget with the axes.
+
+functions:
+    qcolor:          QColor of a matplotlib color specification.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from matplotlib import colors as mcolors
+from matplotlib import ticker
+
+from TiRiFiG.qt_binding import QtCore, QtGui, QtWidgets
+
+Bbox = namedtuple('Bbox', ['x0', 'y0', 'width', 'height'])
+
+mouse_buttons = {QtCore.Qt.MouseButton.LeftButton: 1,
+                 QtCore.Qt.MouseButton.MiddleButton: 2,
+                 QtCore.Qt.MouseButton.RightButton: 3}
+
+dash_styles = {'-': QtCore.Qt.PenStyle.SolidLine,
+               '--': QtCore.Qt.PenStyle.DashLine,
+               ':': QtCore.Qt.PenStyle.DotLine}
+
+
+def qcolor(color, alpha=1.):
+    """QColor of a matplotlib color ('red', 'r', 'C1', '#aabbcc', ...)"""
+    red, green, blue, opacity = mcolors.to_rgba(color)
+    return QtGui.QColor.fromRgbF(red, green, blue, opacity * alpha)
+
+
+def _polygon(x, y):
+    """QPolygonF of pixel positions, filled through its buffer"""
+    polygon = QtGui.QPolygonF()
+    polygon.fill(QtCore.QPointF(), len(x))
+    if len(x) > 0:
+        buffer = polygon.data()
+        buffer.setsize(16 * len(x))
+        points = np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)
+        points[:, 0] = x
+        points[:, 1] = y
+    return polygon
+
+
+def _marker_path(marker, size):
+    """QPainterPath of a marker of size pixels centred on (0, 0)"""
+    path = QtGui.QPainterPath()
+    half = size / 2.
+    if marker == 's':
+        path.addRect(QtCore.QRectF(-half, -half, size, size))
+    elif marker == 'v':
+        path.addPolygon(QtGui.QPolygonF([QtCore.QPointF(-half, -half),
+                                         QtCore.QPointF(half, -half),
+                                         QtCore.QPointF(0., half)]))
+        path.closeSubpath()
+    elif marker == 'X':
+        arm = size / 6.
+        corners = [(-half, -half + arm), (-arm, 0.), (-half, half - arm), (-half + arm, half),
+                   (0., arm), (half - arm, half), (half, half - arm), (arm, 0.),
+                   (half, -half + arm), (half - arm, -half), (0., -arm), (-half + arm, -half)]
+        path.addPolygon(QtGui.QPolygonF([QtCore.QPointF(x, y) for x, y in corners]))
+        path.closeSubpath()
+    else:
+        path.addEllipse(QtCore.QPointF(0., 0.), half, half)
+    return path
+
+
+class PlotEvent():
+    """Mouse event in a RingPlotView
+
+    Instance variables:
+        button    (int):    1 left, 2 middle, 3 right, None for motion.
+        dblclick  (bool):   the press is the second of a double click.
+        x, y      (float):  position in pixels, y counted from the bottom.
+        xdata, ydata (float): position in data coordinates, None outside the axes.
+        inaxes    (RingPlotView): the view when in the axes, else None.
+        step      (float):  wheel steps, positive away from the user.
+    """
+
+    def __init__(self, view, x, y, button=None, dblclick=False, step=0.):
+        self.button = button
+        self.dblclick = dblclick
+        self.x = x
+        self.y = y
+        self.step = step
+        if view.in_axes(x, y):
+            self.xdata, self.ydata = view.to_data(x, y)
+            self.inaxes = view
+        else:
+            self.xdata, self.ydata = None, None
+            self.inaxes = None
+
+
+class PlotItem():
+    """A line, markers or segments drawn in a RingPlotView
+
+    Instance variables:
+        x, y        (np.ndarray):  the points of a line or markers.
+        segments    (np.ndarray):  (N, 2, 2) segments, None for a line.
+        color       (QColor):      line and marker color.
+        linestyle   (string):      '-', '--', ':' or None for no line.
+        marker      (string):      'o', 's', 'v', 'X', '.' or None.
+        size        (float):       marker size in pixels.
+        animated    (bool):        painted over the cached layer on every
+                                   update rather than rendered into it.
+    """
+
+    def __init__(self, view, x=(), y=(), color='k', linestyle=None, marker=None, size=6.,
+                 linewidth=1., alpha=1., edgecolor=None, animated=False, label=None,
+                 zorder=0, segments=None):
+        self.view = view
+        self.color = qcolor(color, alpha)
+        self.edgecolor = None if edgecolor is None else qcolor(edgecolor, alpha)
+        self.linestyle = linestyle
+        self.marker = marker
+        self.size = size
+        self.linewidth = linewidth
+        self.animated = animated
+        self.label = label
+        self.zorder = zorder
+        self.visible = True
+        self.segments = None if segments is None else np.asarray(segments, dtype=float)
+        self.set_data(x, y)
+
+    def set_data(self, x, y):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self._changed()
+
+    def set_offsets(self, offsets):
+        offsets = np.asarray(offsets, dtype=float).reshape(-1, 2)
+        self.set_data(offsets[:, 0], offsets[:, 1])
+
+    def set_visible(self, visible):
+        self.visible = visible
+        self._changed()
+
+    def get_visible(self):
+        return self.visible
+
+    def _changed(self):
+        if not self.animated:
+            self.view.invalidate()
+
+
+class RectangleSelection():
+    """Rubber band selection with the left button while active
+
+    callback is called with the press and release PlotEvents when the
+    rectangle is at least minspan pixels wide or high.
+    """
+
+    def __init__(self, view, callback, minspan=5):
+        self.view = view
+        self.callback = callback
+        self.minspan = minspan
+        self.active = False
+        self._press = None
+        self._band = QtWidgets.QRubberBand(QtWidgets.QRubberBand.Shape.Rectangle, view)
+
+    def set_active(self, active):
+        self.active = active
+        if not active:
+            self._press = None
+            self._band.hide()
+
+    def press(self, event, position):
+        if self.active and event.button == 1 and event.inaxes is not None:
+            self._press = (event, position)
+            self._band.setGeometry(QtCore.QRect(position, QtCore.QSize()))
+            self._band.show()
+
+    def move(self, position):
+        if self._press is not None:
+            self._band.setGeometry(QtCore.QRect(self._press[1], position).normalized())
+
+    def release(self, event):
+        if self._press is None:
+            return
+        press, _ = self._press
+        self._press = None
+        self._band.hide()
+        if max(abs(event.x - press.x), abs(event.y - press.y)) < self.minspan:
+            return
+        if event.xdata is None:
+            event.xdata, event.ydata = self.view.to_data(event.x, event.y, clip=True)
+        self.callback(press, event)
+
+
+class RingPlotView(QtWidgets.QWidget):
+    """QPainter drawn axes with matplotlib compatible limits and mouse events
+
+    Above dense_markers markers in one item they overlap anyway and are drawn
+    as square points in a single call rather than copied from their sprite
+    one by one.
+
+    Instance variables:
+        items       (list):    the PlotItems, drawn in order of zorder.
+        xlabel, ylabel (string): axis labels.
+        xticks      (list):    explicit x ticks, None for automatic ones.
+        legend      (list):    (label, PlotItem) entries of the legend.
+        margins     (tuple):   left, right, top, bottom fractions of the widget
+                               outside the axes, as in subplots_adjust.
+    """
+
+    dense_markers = 500
+
+    def __init__(self, parent=None, margins=(0.15, 0., 0., 0.15)):
+        super(RingPlotView, self).__init__(parent)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding,
+                           QtWidgets.QSizePolicy.Policy.Expanding)
+        self.margins = margins
+        self.items = []
+        self.legend = []
+        self.xlabel = ''
+        self.ylabel = ''
+        self.xticks = None
+        self._xlim = [0., 1.]
+        self._ylim = [0., 1.]
+        self._handlers = {}
+        self._layer = None
+        self._sprites = {}
+        self.selector = None
+
+    # --- axes -----------------------------------------------------------------
+    @property
+    def bbox(self):
+        left, right, top, bottom = self.margins
+        width, height = self.width(), self.height()
+        x0 = width * left
+        y0 = height * bottom
+        return Bbox(x0, y0, max(1., width * (1. - right) - x0 - 4.),
+                    max(1., height * (1. - top) - y0 - 4.))
+
+    @property
+    def transData(self):
+        return self
+
+    def get_xlim(self):
+        return tuple(self._xlim)
+
+    def get_ylim(self):
+        return tuple(self._ylim)
+
+    def set_xlim(self, lower, upper=None):
+        if upper is None:
+            lower, upper = lower
+        self._xlim = [float(lower), float(upper)]
+        self.invalidate()
+
+    def set_ylim(self, lower, upper=None):
+        if upper is None:
+            lower, upper = lower
+        if lower == upper:
+            lower, upper = lower - 0.5, upper + 0.5
+        self._ylim = [float(lower), float(upper)]
+        self.invalidate()
+
+    def set_xlabel(self, label):
+        self.xlabel = label
+        self.invalidate()
+
+    def set_ylabel(self, label):
+        self.ylabel = label
+        self.invalidate()
+
+    def set_xticks(self, ticks):
+        """Ticks at these radii, None for automatic ticks"""
+        self.xticks = None if ticks is None else np.asarray(ticks, dtype=float)
+        self.invalidate()
+
+    def transform(self, points):
+        """(N, 2) data coordinates to pixels with y from the bottom, as
+        matplotlib's transData"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        box = self.bbox
+        x = box.x0 + (points[:, 0] - self._xlim[0]) / (self._xlim[1] - self._xlim[0]) * box.width
+        y = box.y0 + (points[:, 1] - self._ylim[0]) / (self._ylim[1] - self._ylim[0]) * box.height
+        return np.column_stack((x, y))
+
+    def to_data(self, x, y, clip=False):
+        """Data coordinates of a pixel position with y from the bottom"""
+        box = self.bbox
+        fx = (x - box.x0) / box.width
+        fy = (y - box.y0) / box.height
+        if clip:
+            fx, fy = min(max(fx, 0.), 1.), min(max(fy, 0.), 1.)
+        return (self._xlim[0] + fx * (self._xlim[1] - self._xlim[0]),
+                self._ylim[0] + fy * (self._ylim[1] - self._ylim[0]))
+
+    def in_axes(self, x, y):
+        box = self.bbox
+        return box.x0 <= x <= box.x0 + box.width and box.y0 <= y <= box.y0 + box.height
+
+    def _pixels(self, x, y):
+        """Widget pixel positions (y from the top) of data coordinates"""
+        box = self.bbox
+        px = box.x0 + (x - self._xlim[0]) / (self._xlim[1] - self._xlim[0]) * box.width
+        py = self.height() - (box.y0 + (y - self._ylim[0]) /
+                              (self._ylim[1] - self._ylim[0]) * box.height)
+        return px, py
+
+    # --- items ----------------------------------------------------------------
+    def clear(self):
+        self.items = []
+        self.legend = []
+        self.invalidate()
+
+    def plot(self, x, y, **kwargs):
+        item = PlotItem(self, x, y, **kwargs)
+        self.items.append(item)
+        self.invalidate()
+        return item
+
+    def segments(self, segments, **kwargs):
+        item = PlotItem(self, segments=segments, linestyle='-', **kwargs)
+        self.items.append(item)
+        self.invalidate()
+        return item
+
+    def set_legend(self, items):
+        self.legend = [(item.label, item) for item in items if item.label]
+        self.invalidate()
+
+    def invalidate(self):
+        """The cached layer has to be rendered again"""
+        self._layer = None
+        self.update()
+
+    def draw_idle(self):
+        self.update()
+
+    def draw(self):
+        self.update()
+
+    # --- events ---------------------------------------------------------------
+    def mpl_connect(self, name, function):
+        """Call function with a PlotEvent on 'button_press_event',
+        'button_release_event', 'motion_notify_event' or 'scroll_event'"""
+        self._handlers.setdefault(name, []).append(function)
+
+    def rectangle_selector(self, callback, minspan=5):
+        self.selector = RectangleSelection(self, callback, minspan=minspan)
+        return self.selector
+
+    def _event(self, event, **kwargs):
+        position = event.position() if hasattr(event, 'position') else event.localPos()
+        return PlotEvent(self, position.x(), self.height() - position.y(), **kwargs), \
+            QtCore.QPoint(int(position.x()), int(position.y()))
+
+    def _emit(self, name, event):
+        for function in self._handlers.get(name, []):
+            function(event)
+
+    def mousePressEvent(self, event):
+        plot_event, position = self._event(event, button=mouse_buttons.get(event.button()))
+        self._emit('button_press_event', plot_event)
+        if self.selector is not None:
+            self.selector.press(plot_event, position)
+
+    def mouseDoubleClickEvent(self, event):
+        plot_event, _ = self._event(event, button=mouse_buttons.get(event.button()),
+                                    dblclick=True)
+        self._emit('button_press_event', plot_event)
+
+    def mouseMoveEvent(self, event):
+        plot_event, position = self._event(event)
+        self._emit('motion_notify_event', plot_event)
+        if self.selector is not None:
+            self.selector.move(position)
+
+    def mouseReleaseEvent(self, event):
+        plot_event, _ = self._event(event, button=mouse_buttons.get(event.button()))
+        self._emit('button_release_event', plot_event)
+        if self.selector is not None:
+            self.selector.release(plot_event)
+
+    def wheelEvent(self, event):
+        plot_event, _ = self._event(event, step=event.angleDelta().y() / 120.)
+        self._emit('scroll_event', plot_event)
+
+    def resizeEvent(self, event):
+        super(RingPlotView, self).resizeEvent(event)
+        self._layer = None
+
+    # --- painting -------------------------------------------------------------
+    def _sprite(self, item):
+        """Pre-rendered marker of an item, shared by all items that look alike"""
+        ratio = self.devicePixelRatioF()
+        edge = None if item.edgecolor is None else item.edgecolor.rgba()
+        key = (item.marker, item.color.rgba(), edge, item.size, ratio)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            extent = int(np.ceil(item.size + 2))
+            sprite = QtGui.QPixmap(int(extent * ratio), int(extent * ratio))
+            sprite.setDevicePixelRatio(ratio)
+            sprite.fill(QtCore.Qt.GlobalColor.transparent)
+            painter = QtGui.QPainter(sprite)
+            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+            painter.translate(extent / 2., extent / 2.)
+            size = item.size / 2. if item.marker == '.' else item.size
+            painter.setBrush(item.color)
+            if item.edgecolor is None:
+                painter.setPen(QtCore.Qt.PenStyle.NoPen)
+            else:
+                painter.setPen(QtGui.QPen(item.edgecolor, 0.5))
+            painter.drawPath(_marker_path(item.marker, size))
+            painter.end()
+            self._sprites[key] = sprite
+        return sprite
+
+    def _draw_item(self, painter, item):
+        if not item.visible:
+            return
+        if item.segments is not None:
+            if len(item.segments) == 0:
+                return
+            x0, y0 = self._pixels(item.segments[:, 0, 0], item.segments[:, 0, 1])
+            x1, y1 = self._pixels(item.segments[:, 1, 0], item.segments[:, 1, 1])
+            keep = np.isfinite(x0) & np.isfinite(y0) & np.isfinite(x1) & np.isfinite(y1)
+            painter.setPen(QtGui.QPen(item.color, item.linewidth))
+            painter.drawLines([QtCore.QLineF(*line) for line in
+                               zip(x0[keep], y0[keep], x1[keep], y1[keep])])
+            return
+        px, py = self._pixels(item.x, item.y)
+        keep = np.isfinite(px) & np.isfinite(py)
+        px, py = px[keep], py[keep]
+        if len(px) == 0:
+            return
+        if item.linestyle is not None and len(px) > 1:
+            pen = QtGui.QPen(item.color, item.linewidth)
+            pen.setStyle(dash_styles.get(item.linestyle, QtCore.Qt.PenStyle.SolidLine))
+            painter.setPen(pen)
+            painter.drawPolyline(_polygon(px, py))
+        if item.marker is not None and len(px) > self.dense_markers:
+            pen = QtGui.QPen(item.color, item.size)
+            pen.setCapStyle(QtCore.Qt.PenCapStyle.SquareCap)
+            painter.setPen(pen)
+            painter.drawPoints(_polygon(px, py))
+        elif item.marker is not None:
+            sprite = self._sprite(item)
+            half = sprite.width() / sprite.devicePixelRatio() / 2.
+            for x, y in zip(px - half, py - half):
+                painter.drawPixmap(QtCore.QPointF(x, y), sprite)
+
+    def _axes_rect(self):
+        box = self.bbox
+        return QtCore.QRectF(box.x0, self.height() - box.y0 - box.height, box.width, box.height)
+
+    def _ticks(self, lower, upper, length):
+        locator = ticker.MaxNLocator(nbins=max(2, int(length // 60)))
+        ticks = locator.tick_values(min(lower, upper), max(lower, upper))
+        return ticks[(ticks >= min(lower, upper)) & (ticks <= max(lower, upper))]
+
+    def _render_layer(self):
+        """Axes, ticks, labels, legend and the items that are not animated"""
+        ratio = self.devicePixelRatioF()
+        layer = QtGui.QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        layer.setDevicePixelRatio(ratio)
+        layer.fill(QtCore.Qt.GlobalColor.transparent)
+        painter = QtGui.QPainter(layer)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        rect = self._axes_rect()
+        text = self.palette().color(QtGui.QPalette.ColorRole.WindowText)
+        grid = QtGui.QColor(text)
+        grid.setAlphaF(0.12)
+        metrics = painter.fontMetrics()
+        xticks = self.xticks if self.xticks is not None else \
+            self._ticks(*self._xlim, rect.width())
+        yticks = self._ticks(*self._ylim, rect.height())
+        xpixels, _ = self._pixels(np.asarray(xticks, dtype=float), np.zeros(len(xticks)))
+        _, ypixels = self._pixels(np.zeros(len(yticks)), np.asarray(yticks, dtype=float))
+        painter.setPen(QtGui.QPen(grid, 1.))
+        for x in xpixels:
+            painter.drawLine(QtCore.QLineF(x, rect.top(), x, rect.bottom()))
+        for y in ypixels:
+            painter.drawLine(QtCore.QLineF(rect.left(), y, rect.right(), y))
+        painter.setPen(QtGui.QPen(text, 1.))
+        painter.drawRect(rect)
+        for value, x in zip(xticks, xpixels):
+            label = f'{value:g}'
+            painter.drawLine(QtCore.QLineF(x, rect.bottom(), x, rect.bottom() + 4))
+            painter.drawText(QtCore.QPointF(x - metrics.horizontalAdvance(label) / 2.,
+                                            rect.bottom() + 6 + metrics.ascent()), label)
+        for value, y in zip(yticks, ypixels):
+            label = f'{value:g}'
+            painter.drawLine(QtCore.QLineF(rect.left() - 4, y, rect.left(), y))
+            painter.drawText(QtCore.QPointF(rect.left() - 6 - metrics.horizontalAdvance(label),
+                                            y + metrics.ascent() / 2. - 1), label)
+        painter.drawText(QtCore.QPointF(rect.center().x() - metrics.horizontalAdvance(self.xlabel) / 2.,
+                                        rect.bottom() + 10 + 2 * metrics.height()), self.xlabel)
+        painter.save()
+        painter.translate(max(metrics.height(), rect.left() - 60), rect.center().y())
+        painter.rotate(-90)
+        painter.drawText(QtCore.QPointF(-metrics.horizontalAdvance(self.ylabel) / 2., 0.), self.ylabel)
+        painter.restore()
+        painter.setClipRect(rect)
+        for item in sorted(self.items, key=lambda item: item.zorder):
+            if not item.animated:
+                self._draw_item(painter, item)
+        if self.legend:
+            y = rect.top() + 6
+            for label, item in self.legend:
+                y += metrics.height()
+                x = rect.right() - 40 - metrics.horizontalAdvance(label)
+                pen = QtGui.QPen(item.color, item.linewidth)
+                pen.setStyle(dash_styles.get(item.linestyle or '-', QtCore.Qt.PenStyle.SolidLine))
+                painter.setPen(pen)
+                painter.drawLine(QtCore.QLineF(x, y - metrics.ascent() / 2.,
+                                               x + 24, y - metrics.ascent() / 2.))
+                painter.setPen(QtGui.QPen(text, 1.))
+                painter.drawText(QtCore.QPointF(x + 30, y), label)
+        painter.end()
+        return layer
+
+    def paintEvent(self, event):
+        if self._layer is None:
+            self._layer = self._render_layer()
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self._layer)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        painter.setClipRect(self._axes_rect())
+        for item in sorted(self.items, key=lambda item: item.zorder):
+            if item.animated:
+                self._draw_item(painter, item)
+        painter.end()
@@ -6,3216 +6,20 @@
 # GPL license - see LICENSE.txt for details                                             #
 #########################################################################################
 
-"""This script here is the GUI (PyQt4) implementation of TiRiFiG which allows users of
-TiRiFiC to model tilted-ring parameters before fitting. Instructions on how TiRiFiC works
-and everything you need to know about it can be found on the github pages:
-http://gigjozsa.github.io/tirific/
-As of now the code has been written in Python 2.7. Future considerations would be made to
-have it run on Python 3 as well.
-
-variables:
-    currPar:  tilted-ring parameter whose graph widget window has focus
+"""Starts the TiRiFiG GUI (TiRiFiG.gui) with PyQt6.
 
 functions:
     main  : gets the whole thing started
-    _center: centering application windows
-
-classes:
-    Timer:
-        Class variables:  none
-
-        Instance variables:
-            t          (int):              the time(ms) when thread begins.
-            hFunction  (function):         function to be executed by thread.
-            thread     (function):         initialises and start the thread.
-
-        Functions:
-            __init__:                      initialises my instance variables.
-            handle_function:               calls the function which the thread is run on.
-            start:                         starts the thread.
-            cancel:                        stops the thread.
-
-    GraphWidget:
-        Class variables:
-            redo           (list):         the state of some parameters before undo
-                                           action.
-            mPress         (list):         x-y values of mouse click.
-            mRelease       (list):         x-y values of mouse release.
-            mMotion        (list):         x-y values of mouse motion.
-            mDblPress      (list):         x-y values of mouse double click.
-
-        Instance variables:
-            xScale         (list):         upper and lower limit of x-axis.
-            yScale         (list):         upper and lower limit of y-axis.
-            unitMeas       (string):       the unit measurement for the parameter.
-            par            (string):       a specific tilted-ring parameter.
-            parVals        (list):         the values of  variable par (y-values on
-                                           graph).
-            parValRADI     (list):         the values of RADI (x-values on graph).
-            historyList    (list):         the values of parVals for each time a point is
-                                           shifted.
-            key            (bool):         determines whether or not undo/redo key
-                                           combination is pressed.
-            numPrecisionX  (int):          the precision point to which a x-values are
-                                           saved in.
-            numPrecisionY  (int):          the precision point to which a y-values are
-                                           saved in.
-            canvas         (FigureCanvas): figure canvas where the subplots are made.
-            btnAddParam    (QPushButton):  add a new plotted parameter to viewgraph.
-            btnEditParam   (QPushButton):  change the parameter plotted to another
-                                           parameter.
-            btnCloseParam  (QPushButton):  close the parameter selection dialog.
-
-        Functions:
-            __init__:                      initialises instance variables and starts
-                                           graphWidget.
-            changeGlobal:                  change the value of the global parameter
-                                           (currPar) to reflect the parameter graphWidget
-                                           is plotting.
-            getClick:                      assigns x-y value captured from mouse
-                                           left-click to mPress list or x-y value of.
-                                           captured double click to mDblPress.
-            getRelease:                    assigns x-y value captured from mouse release
-                                           to mRelease list.
-            getMotion:                     assigns x-y value captured from mouse motion
-                                           to mMotion list.
-            undoKey:                       sends the viewgraph back in history .
-            redoKey:                       sends the viewgraph forward in history after
-                                           an undo action.
-            showInformation:               display information to say history list is
-                                           exhausted when too many undo/redo actions are
-                                           performed.
-            firstPlot:                     produces plot of tilted-ring parameter(s) in
-                                           viewgraph after .def file is opened.
-            plotFunc:                      produces plot of tilted-ring parameter(s) in
-                                           viewgraph when interacting with data points.
-
-    SMWindow:
-        Class Variables:  none
-
-        Instance Variables:
-            xMinVal        (int):          the value of the min x value of the parameter
-                                           in focus.
-            xMaxVal        (int):          the value of the max x value of the parameter
-                                           in focus.
-            par            (list):         list of all tilted-ring parameters
-            gwDict         (dictionary):   filtered dictionary with only y-scale
-            prevParVal     (string):       previous parameter value.
-            parameter      (QComboBox):    drop down of all parameters retrieved from the
-                                           variable <par>.
-            xLabel         (QLabel):       label for RADI.
-            xMin           (QLineEdit):    textbox for entering minimum value for RADI.
-            xMax           (QLineEdit):    textbox for entering maximum value for RADI.
-            yMin           (QLineEdit):    textbox for entering minimum value for
-                                           selected parameter.
-            yMax           (QLineEdit):    textbox for entering maximum value for
-                                           selected parameter.
-            btnUpdate      (QPushButton):  update variables with new values and close
-                                           window.
-            btnCancel      (QPushButton):  cancel changes and close window.
-
-        Functions:
-            __init__:                      initialises instance variables
-            onChangeEvent:                 changes values of variables if the current
-                                           index of the variable <parameter> changes.
-
-    ParamSpec:
-        Class Variables:  none
-
-        Instance Variables:
-            par             (list):        list of all tilted-ring parameters from .def
-                                           file.
-            parameterLabel  (QLabel):      label Parameter
-            parameter       (QComboBox):   drop down of all tilted-ring parameters
-                                           retrieved from the variable <par>.
-            uMeasLabel      (QLabel):      label unit measurement
-            unitMeasurement (QLineEdit):   textbox for entering unit measurement for
-                                           parameter.
-            btnOK           (QPushButton): updates the current parameter plotted to
-                                           the new parameter specified.
-            btnCancel       (QPushButton): close window
-
-        Functions:
-            __init__:                      initialises instance variables
-
-    MainWindow:
-        Class Variables:
-            key             (string):      determines whether or not undo/redo key has
-                                           been pressed.
-            ncols           (int):         the number of columns in grid layout where
-                                           viewgraphs are created.
-            nrows           (int):         the number of rows in grid layout where
-                                           viewgraphs are created.
-            INSET           (string):      name of data cube retrieved from .def file.
-            par             (list):        list of tilted-ring parameters which have
-                                           their plots displayed in the viewgraph
-            unitMeas        (list):        list of unit measurement for respective
-                                           parameters in par list.
-            tmpDeffile      (string):      path to temp file which is used to sync entry
-                                           of data in text editor to viewgraph.
-            gwObjects       (list):        list of graph widget objects each representing
-                                           a tilted-ring parameter.
-            t               (int):         thread which runs a separate process
-                                           (open a text editor).
-            scrollWidth     (int):         width of the scroll area.
-            scrollHeight    (int):         height of the scroll area.
-            before          (int):         time in milliseconds.
-            numPrecisionY   (int):         precision in terms of number of decimal points
-                                           to which values of parameter are handled.
-            numPrecisionX   (int):         precision in terms of number of decimal points
-                                           to which values of RADI are handled.
-            NUR             (int):         number of rings as indicated in .def file.
-            data            (list):        stream of text from .def file.
-            parVals         (dictionary):  values of tilted-ring parameters.
-            historyList     (dictionary):  values of tilted-ring parameters which have
-                                           their values changed.
-            xScale          (list):        upper and lower limit values of RADI axis
-            yScale          (dictionary):  upper and lower limit values of parameter axis
-            mPress          (list):        mouse x,y values when left mouse button is
-                                           clicked.
-            mRelease        (list):        mouse x,y values when the left mouse button
-                                           is released.
-            mMotion         (list):        mouse x,y values when mouse is moved.
-
-        Instance Variables:
-            cWidget        (QWidget):      central widget (main window).
-            btnOpen        (QPushButton):  opens an open dialog box for user to choose
-                                           the parameter file.
-            scrollArea     (QScrollArea):  scroll area where graph widgets will be
-                                           populated.
-            mainMenu       (QMenu):        Menu bar with file menu, preference menu and
-                                           run menu with each menu having different
-                                           actions.
-
-        Functions:
-            __init__:                      creates the main window frame and calls the
-                                           initUI function.
-            initUI:                        initialises instance variables and creates
-                                           menus with their actions.
-            quitApp:                       closes TiRiFiG.
-            cleaunUp:                      initialises class variables.
-            getData:                       opens .def file and gets data from the file.
-            strType:                       determines the data type of a variable.
-            numPrecision:                  determines the floating point precision
-                                           currently in .def file and sets it.
-            getParameter:                  fetches the data points for the various
-                                           tilted-ring parameters.
-            openDef:                       calls getData and getParameter and creates the
-                                           graph widgets for the default parameters
-                                           (VROT, SBR, PA, INCL).
-            undoCommand:                   undo last action for the current parameter in
-                                           focus.
-            redoCommand:                   redo last action for the current parameter in
-                                           focus.
-            setRowCol:                     specify the number of rows and columns in the
-                                           grid layout.
-            saveFile:                      save changes to file for one parameter.
-            saveAll:                       calls saveFile function to save changes to
-                                           file for all parameters.
-            saveMessage:                   display information that save was successful.
-            saveAs:                        save changes to a new file for one parameter.
-            saveAsMessage:                 display information that save as was
-                                           successful.
-            saveAsAll:                     calls saveAs function to save changes for all
-                                           parameters to a new file.
-            slotChangeData:                change current viewgraph after making changes
-                                           to .def file in text editor.
-            animate:                       synchronise actions in text file to viewgraph
-                                           with calls to slotChangeData function.
-            openEditor:                    open preferred text editor.
-            SMobj:                         instantiates the scale manager window and pops
-                                           it.
-            updateScale:                   updates the values in graph widget from what
-                                           was entered in the scale manager window.
-            updateMessage:                 displays information to say update was
-                                           successful.
-            add_parameter_dialog:          instantiates the parameter specfication class and
-                                           connects btnOK to paramDef function for GW to be added
-            insert_parameter_dialog:       instantiates the parameter specfication class and
-                                           connects btnOK to paramDef function for GW to be inserted
-            editParaObj:                   instantiates the parameter specfication class and
-                                           connects btnOK to editParamDef function.
-            paramDef:                      adds specified paramater viewgraph to layout.
-            editParamDef:                  changes the parameter plotted in viewgraph to
-                                           the specified parameter.
-            tirificMessage:                displays information about input data cube not
-                                           available in current working directory.
-            startTiriFiC:                  starts TiRiFiC from terminal.
 """
 
-# libraries
-import os, sys, threading, time, logging,pickle
-os.environ["QT_API"] = "pyqt6"
-from subprocess import Popen as run
-from math import ceil
-from decimal import Decimal
-import numpy as np
-import copy
-import matplotlib
-matplotlib.use("qt5agg")
-from matplotlib.backends.backend_qtagg import FigureCanvas
-#from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-# from matplotlib.backends.backend_qt4agg import NavigationToolbar2QT as NavigationToolbar
-import matplotlib.pyplot as plt
-from matplotlib import style
-from matplotlib.widgets import RectangleSelector
-import matplotlib.markers as mmarkers
-  
-style.use("seaborn-v0_8")
-from PyQt6 import QtCore, QtWidgets,QtGui
-import pyFAT_astro.Support.support_functions as FAT_sup
-import TRM_errors.tirshaker.tirshaker as fit_functions
-from pyFAT_astro.Support.modify_template import fit_polynomial,update_disk_angles
-
-# --- Modern theme (QSS) -------------------------------------------------------
-def apply_modern_style(app: QtWidgets.QApplication, background_image_path: str | None = None) -> None:
-    """Apply a sleek, modern style across the app. Optional background image.
-
-    Args:
-        app: QApplication instance
-        background_image_path: Optional path to a background image for central areas
-    """
-    QtWidgets.QApplication.setStyle("Fusion")
-
-    # Dark palette baseline
-    palette = QtGui.QPalette()
-    base = QtGui.QColor(37, 37, 38)
-    panel = QtGui.QColor(45, 45, 48)
-    text = QtGui.QColor(220, 220, 220)
-    highlight = QtGui.QColor(14, 122, 254)
-    disabled = QtGui.QColor(127, 127, 127)
-
-    palette.setColor(QtGui.QPalette.ColorRole.Window, panel)
-    palette.setColor(QtGui.QPalette.ColorRole.WindowText, text)
-    palette.setColor(QtGui.QPalette.ColorRole.Base, base)
-    palette.setColor(QtGui.QPalette.ColorRole.AlternateBase, panel)
-    palette.setColor(QtGui.QPalette.ColorRole.ToolTipBase, panel)
-    palette.setColor(QtGui.QPalette.ColorRole.ToolTipText, text)
-    palette.setColor(QtGui.QPalette.ColorRole.Text, text)
-    palette.setColor(QtGui.QPalette.ColorRole.Button, panel)
-    palette.setColor(QtGui.QPalette.ColorRole.ButtonText, text)
-    palette.setColor(QtGui.QPalette.ColorRole.Highlight, highlight)
-    palette.setColor(QtGui.QPalette.ColorRole.HighlightedText, QtGui.QColor(255, 255, 255))
-    # Disabled
-    palette.setColor(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.Text, disabled)
-    palette.setColor(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.ButtonText, disabled)
-    app.setPalette(palette)
-
-    # Core QSS
-    bg_image_rule = (
-        f"border-image: url('{background_image_path}') 0 0 0 0 stretch stretch;"
-        if background_image_path else ""
-    )
-    popup_image_rule = (
-        f"background-image: url('{background_image_path}');"
-        f"background-position: center;"
-        f"background-attachment: fixed;"
-        if background_image_path else "background-image: none;"
-    )
-    qss = f"""
-    QMainWindow {{
-        background-color: {panel.name()};
-        color: {text.name()};
-    }}
-    QWidget {{
-        background-color: {panel.name()};
-        color: {text.name()};
-    }}
-    #centralWidget {{ 
-        {bg_image_rule}
-        background-color: {panel.name()};
-    }}
-
-    /* Apply background image to dialogs/popups as well */
-    QDialog, QMessageBox, QProgressDialog {{
-        {popup_image_rule}
-        background-color: {panel.name()};
-        color: {text.name()};
-    }}
-
-    /* Custom popup widgets tagged with popupBg=true */
-    QWidget[popupBg="true"] {{
-        {popup_image_rule}
-        background-color: {panel.name()};
-        color: {panel.name()};
-    }}
-    QLabel{{
-        background-color: transparent;
-        color: {panel.name()};
-    }}
-
-    QMenuBar {{ background-color: {panel.name()}; border: none; }}
-    QMenuBar::item {{ padding: 6px 10px; background: transparent; }}
-    QMenuBar::item:selected {{ background: rgba(255,255,255,0.06); border-radius: 4px; }}
-
-    QMenu {{ background-color: {panel.name()}; border: 1px solid rgba(255,255,255,0.08); }}
-    QMenu::item {{ padding: 6px 12px; }}
-    QMenu::item:selected {{ background: rgba(255,255,255,0.08); }}
-
-    QScrollArea {{ border: none; background: transparent; }}
-    QScrollArea > QWidget > QWidget {{ background: transparent; }}
-    QScrollBar:vertical {{ background: transparent; width: 10px; }}
-    QScrollBar::handle:vertical {{ background: rgba(255,255,255,0.18); border-radius: 5px; min-height: 40px; }}
-    QScrollBar::handle:vertical:hover {{ background: rgba(255,255,255,0.28); }}
-    QScrollBar:horizontal {{ background: transparent; height: 10px; }}
-    QScrollBar::handle:horizontal {{ background: rgba(255,255,255,0.18); border-radius: 5px; min-width: 40px; }}
-    
-    QCheckBox {{ background: transparent; 
-        color: {panel.name()};
-        }}
-    
-
-    QCheckBox::indicator:unchecked {{
-        background: transparent;
-        background-color: transparent;
-        color: white;
-        border: 1px solid #5A5A5A;
-    }}
-    
-    
-   
-    QPushButton {{
-        background-color: rgba(255,255,255,0.06);
-        border: 0px solid rgba(255,255,255,0.08);
-        border-radius: 0px;
-        padding: 6px 10px;
-        color: {panel.name()};
-    }}
-    QPushButton:hover {{ background-color: rgba(255,255,255,0.12); }}
-    QPushButton:pressed {{ background-color: rgba(255,255,255,0.18); }}
-    QPushButton:disabled {{ color: {disabled.name()}; border-color: rgba(255,255,255,0.04); }}
-
-    QLineEdit, QComboBox, QTextEdit {{
-        background-color: {text.name()};
-        border: 1px solid rgba(255,255,255,0.10);
-        border-radius: 8px;
-        padding: 6px 8px;
-        color: {panel.name()};
-        selection-background-color: {highlight.name()};
-    }}
-    QComboBox QAbstractItemView {{
-        background-color: {panel.name()};
-        border: 1px solid rgba(255,255,255,0.08);
-        selection-background-color: rgba(255,255,255,0.10);
-    }}
-
-    QToolTip {{
-        background: {text.name()};
-        background-color: {text.name()};
-        color: {panel.name()};
-        border: 3px solid rgba(255,255,255,0.12);
-        padding: 2px 2px;
-        opacity: 230;
-    }}
-    """
-    app.setStyleSheet(qss)
-
-try:
-    from importlib.resources import files as import_pack_files
-except ImportError:
-    # Try backported to PY<37 `importlib_resources`.
-    # For Py<3.9 files is not available
-    from importlib_resources import files as import_pack_files
-    
-currPar = None
-selected_option = None
-fit_par = {'VROT':'km s-1',
-           'SBR':'Jy km s-1 arcsec-2',
-           'INCL':'degrees',
-           'PA':'degrees',
-           'RADI':'arcsec', 
-           'Z0':'arcsec',
-           'SDIS':'km s-1',
-           'XPOS':'degrees',
-           'YPOS':'degrees',
-           'VSYS':'km s-1',
-           'DVRO':'km s-1 arcsec-1',
-           'DVRA':'km s-1 arcsec-1',
-           'VRAD':'km s-1'
-           
-           }
-icons_location = import_pack_files('TiRiFiG.utilities.icons')
-example_location = import_pack_files('TiRiFiG.utilities.example')
-def _center(self):
-    """Centers the window
-
-    Keyword arguments:
-    self --         main window being displayed i.e. the current instance of the
-                    mainWindow class
-
-    Returns:
-    None
-
-    With information from the user's desktop, the screen resolution is  gotten
-    and the center point is figured out for which the window is placed.
-    """
-    qr = self.frameGeometry()
-    cp = QtWidgets.QApplication.primaryScreen().availableGeometry().center()
-    qr.moveCenter(cp)
-    self.move(qr.topLeft())
-
-class TimerThread():
-    def __init__(self, t, hFunction):
-        self.t = t
-        self.hFunction = hFunction
-        self.thread = threading.Timer(self.t, self.handle_function)
-
-    def handle_function(self):
-        self.hFunction()
-        self.thread = threading.Timer(self.t, self.handle_function)
-        self.thread.start()
-
-    def start(self):
-        self.thread.start()
-
-    def cancel(self):
-        self.thread.cancel()
-
-class GraphWidget(QtWidgets.QWidget):
-    redo = []
-    mPress = [None, None]
-    mRelease = [None, None]
-    mMotion = [None]
-    mDblPress = [None, None]
-    last_value = 0
-    is_dragging = False
-    drag_index = None
-    _fit_thread = None
-    _fit_worker = None
-    _progress = None
-
-    def __init__(self, xScale, yScale, unitMeas, par, parVals,parValsErr, parValRADI,
-            key, numPrecisionX, numPrecisionY,pyFAT_Configuration,Tirific_Template,
-            paramenterFittingSetting):
-        super(GraphWidget, self).__init__()
-        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
-        self.setStyleSheet("background-color: transparent;")
-        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding,
-                           QtWidgets.QSizePolicy.Policy.Expanding)
-        self.xScale = xScale
-        self.yScale = yScale
-        self.pyFAT_Configuration = pyFAT_Configuration
-        self.Tirific_Template = Tirific_Template
-        self.unitMeas = unitMeas
-        self.par = par
-        self.parVals = parVals
-        self.originalparVals = copy.deepcopy(parVals)
-        self.parValsErr = parValsErr
-        self.parValRADI = parValRADI
-        #at initialsation this is the same as parVals
-        self.historyList = [parVals]
-        self.key = key
-        self.numPrecisionX = numPrecisionX
-        self.numPrecisionY = numPrecisionY
-        self.parameterFitSetting = paramenterFittingSetting
-        #self.setFixedSize(initial_width, initial_height)
-        # Grid Layout
-        grid = QtWidgets.QGridLayout()
-        #grid.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
-        #grid.setStyleSheet("border: 3px solid blue; background-color: rgba(255,0,0,0.1);")
-     
-        self.setLayout(grid)
-        # Canvas and Toolbar
-        self.figure = plt.figure()
-        self.figure.patch.set_facecolor('none')
-       
-        self.figure.patch.set_alpha(0.0)
-
-        self.canvas = FigureCanvas(self.figure)
-        self.canvas.setStyleSheet("background: transparent;")
-        # self.canvas.setFocusPolicy( QtCore.Qt.ClickFocus )
-        # self.canvas.setFocusPolicy( QtCore.Qt.WheelFocus )
-        self.canvas.setFocus()
-
-
-        self.canvas.mpl_connect('button_press_event', self.getClick)
-        self.canvas.mpl_connect('button_release_event', self.getRelease)
-        self.canvas.mpl_connect('motion_notify_event', self.getMotion)
-        # self.canvas.mpl_connect('key_press_event', self.keyPressed)
-        self.figure.subplots_adjust(left=0.15, right=1.0, top=1.0, bottom=0.15)
-        self.ax = self.figure.add_subplot(111)
-        self.ax.patch.set_facecolor('none')
-        self.ax.patch.set_alpha(0.0)
-
-        # Persistent artists for fast updates
-        self.line_current = None
-        self.line_connecting = None
-        self.line_original = None
-        self.err_container = None
-        self.background = None  # For blitting
-
-        # Setup blitting: cache background when figure is drawn
-        self.canvas.mpl_connect('draw_event', self.on_draw)
-
-        # button to add another tilted-ring parameter to plot
-        #self.btnAddParam = QtWidgets.QPushButton('&Add',self)
-        #self.btnAddParam.setFixedSize(50, 30)
-        #self.btnAddParam.setFlat(True)
-        # FIX ME: use icon instead of text
-        # self.btnAddParam.setIcon(QtGui.QIcon('utilities/icons/plus.png'))
-        #self.btnAddParam.setToolTip('Add Parameter')
-
-        # modify plotted parameter
-      
-        self.btnEditParam = IconButton(icons_location/'edit.png', self)
-        
-        
-        self.btnFitPoly = IconButton(icons_location/'fitpoly.png', self)
-        self.btnFitPoly.clicked.connect(self.changeGlobal)
-        self.btnFitPoly.clicked.connect(self.smoothParameter) 
-        
-        self.btnGroupSelect = IconButton(icons_location/'group.png', self, 
-            start_grayscale=True,support_three_states=True, extra_icon_path=icons_location/'group_individual.png') 
-        self.btnGroupSelect.clicked.connect(self.changeGlobal)
-        self.btnGroupSelect.clicked.connect(self.selectGroups)
-        self.group_selection_mode = 0
-        self.rectangle_selector = None
-        self.blue_selector = None
-        self.green_selector = None
-        
-
-        self.btnInterRings = IconButton(icons_location/'interpolate.png', self, start_grayscale=True)
-        self.btnInterRings.clicked.connect(self.changeGlobal)
-        self.btnInterRings.clicked.connect(self.selectInterRings)
-        self.interpolation_mode = False 
-
-        self.btnFitOnOff = IconButton(icons_location/'fit_on.png', self, start_grayscale=True,
-                        support_three_states=True, extra_icon_path=icons_location/'fit_off.png')   
-        self.btnFitOnOff.clicked.connect(self.changeGlobal)
-        self.btnFitOnOff.clicked.connect(self.toggleFitRings)
-        self.fit_toggle_mode = 0     
-        #self.btnEditParam.setToolTip('Modify plotted parameter')
-
-        self.btnCloseParam = IconButton(icons_location/'close.png', self)
-        
-        # FIX ME: use icon instead of text
-        # self.btnEditParam.setIcon(QtGui.QIcon('utilities/icons/edit.png'))
-        self.btnEditParam.setToolTip('Modify plotted parameter')
-        self.btnFitPoly.setToolTip('Fit polynomial to data')
-        self.btnGroupSelect.setToolTip('Select groups of rings to Fit')
-        self.btnInterRings.setToolTip('Select rings to fit while interpolating over the rest')
-        self.btnFitOnOff.setToolTip('Select or Toggle Fit Rings On/Off')
-        self.btnCloseParam.setToolTip('Close Window')
-
-        # Rounded, icon-like buttons
-        ctrl_qss = """
-        QPushButton {
-            background-color: rgba(255,255,255,0.06);
-            border: 1px solid rgba(255,255,255,0.10);
-            border-radius: 16px;
-            padding: 6px 10px;
-        }
-        QPushButton:hover { background-color: rgba(255,255,255,0.14); }
-        QPushButton:pressed { background-color: rgba(255,255,255,0.22); }
-        """
-        #self.btnEditParam.setStyleSheet(ctrl_qss)
-        #self.btnFitPoly.setStyleSheet(ctrl_qss)
-        #self.btnGroupSelect.setStyleSheet(ctrl_qss)
-        #self.btnInterRings.setStyleSheet(ctrl_qss)
-        #self.btnCloseParam.setStyleSheet(ctrl_qss)
-        hbox = QtWidgets.QHBoxLayout()
-        hbox.setContentsMargins(0, 0, 0, 0)
-        hbox.setSpacing(0)
-        hbox_right = QtWidgets.QHBoxLayout()
-        hbox_right.setContentsMargins(0, 0, 0, 0)
-        hbox_right.setSpacing(0)
-        
-        # Add empty spacer widget to align buttons with plot area
-        self.spacer_widget = QtWidgets.QWidget()
-        hbox.addWidget(self.spacer_widget)
-        
-        #hbox.addWidget(self.btnAddParam)
-        hbox.addWidget(self.btnEditParam)
-        hbox.addWidget(self.btnFitPoly)
-        hbox.addWidget(self.btnGroupSelect)
-        hbox.addWidget(self.btnInterRings)
-        hbox.addWidget(self.btnFitOnOff)
-        hbox.addStretch()
-    
-        hbox_right.addStretch()
-        hbox_right.addWidget(self.btnCloseParam)
-        grid.addLayout(hbox, 0, 0)
-        grid.addLayout(hbox_right, 0, 1)
-        grid.addWidget(self.canvas, 1, 0, 1, 2)
-
-        self.firstPlot()
-
-    def resizeEvent(self, event):
-        """Update spacer widget width to 15% of cell width"""
-        super().resizeEvent(event)
-        if hasattr(self, 'spacer_widget'):
-            self.spacer_widget.setFixedWidth(int(self.width() * 0.15))
-
-    def smoothParameter(self):
-        #First we get the desired input
-        self.create_polyfit_dialog()
-    def toggleFitRings(self):
-        """Cycle through fit rings selection modes"""
-        self.fit_toggle_mode = (self.fit_toggle_mode + 1) % 3
-        self.btnFitOnOff.cycle_state()
-        self.set_selector(mode = self.fit_toggle_mode)
-        if self.fit_toggle_mode == 0:
-            print(f"Fit rings mode OFF")
-            self.rectangle_selector.set_active(False)
-        elif self.fit_toggle_mode == 1:
-            print(f"Fit rings mode: {self.fit_toggle_mode} - Fit selected rings only")
-            self.parameterFitSetting['TO_FIT'] = True
-
-            self.rectangle_selector.set_active(True)
-        elif self.fit_toggle_mode == 2:
-            print(f"Fit rings mode: {self.fit_toggle_mode} - Fit all except selected rings")
-            self.rectangle_selector.set_active(True)
-
-    def set_selector(self, mode):
-        """Set up rectangle selectors for group selection modes"""
-        if mode > 0:
-            if self.rectangle_selector is None:
-                self.rectangle_selector = RectangleSelector(
-                    self.ax,
-                    self._on_group_select,
-                    useblit=True,
-                    button=[1],
-                    minspanx=5, minspany=5,
-                    spancoords='pixels',
-                    interactive=False,
-                    props=dict(facecolor='cyan', edgecolor='blue', 
-                          alpha=0.3, fill=True, linewidth=2)
-                )
-            self.rectangle_selector.set_active(True)      
-        else:
-            self.rectangle_selector.set_active(False)
-                  
-    def selectGroups(self):
-        """Cycle through group selection modes"""
-        self.group_selection_mode = (self.group_selection_mode + 1) % 3
-        self.btnGroupSelect.cycle_state()
-        self.set_selector(mode = self.group_selection_mode)
-        if self.group_selection_mode > 0:
-            if self.group_selection_mode == 1:
-                print(f"Group selection mode: {self.group_selection_mode} - Set GROUP to be fitted as block")
-            elif self.group_selection_mode == 2:
-                print(f"Group selection mode: {self.group_selection_mode} - Set GROUP to be fitted as individual")
-        else:
-            # Disable rectangle selector
-            print(f"Group selection mode OFF")
-
-    def _on_group_select(self, eclick, erelease):
-        """Handle rectangle selection - update TO_FIT and INTERPOLATION for selected points"""
-        try:
-            # Get rectangle bounds
-            x1, y1 = eclick.xdata, eclick.ydata
-            x2, y2 = erelease.xdata, erelease.ydata
-            
-            if x1 is None or x2 is None or y1 is None or y2 is None:
-                return
-            
-            # Ensure x1 < x2 and y1 < y2
-            x_min, x_max = min(x1, x2), max(x1, x2)
-            y_min, y_max = min(y1, y2), max(y1, y2)
-            
-            # Find points within rectangle
-            selected_count = 0
-            rings = []
-            for i, (x, y) in enumerate(zip(self.parValRADI, self.parVals)):
-                if x_min <= x <= x_max and y_min <= y <= y_max:
-                    rings.append(i+1)
-                        
-            if len(rings) > 0:
-               
-
-                if self.group_selection_mode > 0:                    
-                    minring = min(rings)
-                    maxring = max(rings)
-                    #print(f"Updated {len(rings)} ring(s): Groups={[minring,maxring]}")
-                    for ring in rings:
-                        self.parameterFitSetting[f"RING_{ring}"]['GROUP'] = [minring, maxring]
-                        if minring != maxring and self.group_selection_mode == 1:
-                            self.parameterFitSetting[f"RING_{ring}"]['BLOCK_FIT'] = True
-                        elif self.group_selection_mode == 2:
-                            self.parameterFitSetting[f"RING_{ring}"]['BLOCK_FIT'] = False
-                if self.fit_toggle_mode > 0:
-                    #print(f'These {rings}')
-                    for ring in rings:
-                        if self.fit_toggle_mode == 1:
-                            #print(f"Updated {len(rings)} ring(s): TO_FIT=True")
-                            self.parameterFitSetting[f"RING_{ring}"]['TO_FIT'] = True
-                        elif self.fit_toggle_mode == 2:
-                            #print(f"Updated {len(rings)} ring(s): TO_FIT=True")
-                            ring1,ring2 = self.parameterFitSetting[f"RING_{ring}"]['GROUP']
-                            if ring1 != ring2 and  self.parameterFitSetting[f"RING_{ring}"]['BLOCK_FIT'] == True:
-                                  QtWidgets.QMessageBox.information(self, "Information",
-                                    f"Cannot disable fitting of ring {ring} as it is part of a block fit group ({ring1}-{ring2}).\n"
-                                    "Please modify the group first to disable block fitting.")
-                            else:
-                                self.parameterFitSetting[f"RING_{ring}"]['TO_FIT'] = False    
-                # Update the plot to show new colors
-                self.yScale = set_plotScale(self.parVals)
-                self.key = "Yes"
-                self.plotFunc()
-            else:
-                print("No points selected in rectangle")
-                
-        except Exception as e:
-            print(f"Error in group selection: {e}")
-    
-    def selectInterRings(self):
-        """Toggle interpolation mode - when active, clicking points toggles INTERPOLATION"""
-        self.interpolation_mode = not self.interpolation_mode
-        self.btnInterRings.toggle_grayscale()
-        
-        if self.interpolation_mode:
-            # Show status message
-            print(f"Interpolation mode ON - click points to toggle INTERPOLATION status")
-        else:
-            print(f"Interpolation mode OFF")
-
-    def fitPolynomial(self):
-        mindegree = int(float(self.inp.minDegree.currentText()))
-        maxdegree = int(float(self.inp.maxDegree.currentText()))
-        limits = [0., 0.]
-        if self.inp.lowerBoundary.text() != '':
-            limits[0] = float(self.inp.lowerBoundary.text())
-        if self.inp.upperBoundary.text() != '':
-            limits[1] = float(self.inp.upperBoundary.text())
-        values = np.array(self.parVals,float)
-        errors = np.array(self.parValsErr,float)
-        radii = np.array(self.parValRADI,float)
-        key = self.par.split('_')[0]
-        inner_flatrings = 4
-        if key not in ['VROT']:
-            if self.inp.innerFlatrings.text() != '':
-                inner_flatrings = int(float(self.inp.innerFlatrings.text()))
-        
-    
-
-        if key in ['INCL','PA']:
-            if self.inp.warped.isChecked():
-                #We have to fit the angular momentum function
-                print(f'Not yet Working')
-                return
-        self.inp.close()
-        zero_point = None
-       
-        # Show a modal busy dialog
-        self._progress = QtWidgets.QProgressDialog("Fitting polynomial…", None, 0, 0, self)
-        self._progress.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
-        self._progress.setAutoClose(False)
-        self._progress.setAutoReset(False)
-        self._progress.setCancelButton(None)
-        self._progress.setMinimumDuration(0)
-        self._progress.show()
-
-        # Start worker thread to keep UI responsive
-        self._fit_thread = QtCore.QThread(self)
-
-        class FitWorker(QtCore.QObject):
-            finished = QtCore.pyqtSignal(object, object)
-            errored = QtCore.pyqtSignal(str)
-
-            def __init__(self, Configuration, radii, values, errors, key, par, Tirific_Template, inner_fix, zero_point, limits, allowed_order):
-                super().__init__()
-                self.Configuration = Configuration
-                self.radii = radii
-                self.values = values
-                self.errors = errors
-                self.key = key
-                self.par = par
-                self.Tirific_Template = Tirific_Template
-                self.inner_fix = inner_fix
-                self.zero_point = zero_point
-                self.limits = limits
-                self.allowed_order = allowed_order
-
-            @QtCore.pyqtSlot()
-            def run(self):
-                try:
-                   
-                    fitted_values, final_poly = fit_polynomial(
-                        self.Configuration,
-                        self.radii,
-                        self.values,
-                        self.errors,
-                        self.key,
-                        self.Tirific_Template,
-                        inner_fix=self.inner_fix,
-                        zero_point=self.zero_point,
-                        boundary_limits=self.limits,
-                        allowed_order=self.allowed_order,
-                        return_order=True,
-                    )
-                    self.finished.emit(fitted_values, final_poly)
-                except Exception as e:
-                    self.errored.emit(str(e))
-
-        self._fit_worker = FitWorker(self.pyFAT_Configuration, radii, 
-            values, errors, key, self.par, self.Tirific_Template, 
-            inner_flatrings, zero_point, limits, [mindegree, maxdegree])
-        self._fit_worker.moveToThread(self._fit_thread)
-        self._fit_thread.started.connect(self._fit_worker.run)
-
-        def _done(fitted_values, final_poly):
-            try:
-                print(f'We fitted {self.par} with polynomial order {final_poly}')
-                print(f'We got these values {fitted_values}')
-                self.parVals = fitted_values
-                self.yScale = set_plotScale(fitted_values)
-                self.key = "Yes"
-                self.plotFunc()
-            finally:
-                if self._progress is not None:
-                    self._progress.reset()
-                    self._progress.hide()
-                    self._progress = None
-
-        def _error(msg: str):
-            try:
-                QtWidgets.QMessageBox.critical(self, "Fit Error", msg)
-            finally:
-                if self._progress is not None:
-                    self._progress.reset()
-                    self._progress.hide()
-                    self._progress = None
-
-        self._fit_worker.finished.connect(_done)
-        self._fit_worker.errored.connect(_error)
-        self._fit_worker.finished.connect(self._fit_thread.quit)
-        self._fit_worker.errored.connect(self._fit_thread.quit)
-        self._fit_thread.finished.connect(self._fit_worker.deleteLater)
-        self._fit_thread.finished.connect(self._fit_thread.deleteLater)
-
-        self._fit_thread.start()
-        return
-      
-    def create_polyfit_dialog(self):
-        self.inp = PolyFitWindow(self.par)
-        self.inp.show()
-        self.inp.btnOK.clicked.connect(self.fitPolynomial)
-        self.inp.btnCancel.clicked.connect(self.inp.close)
-        return
-
-    def on_draw(self, event):
-        """Cache a clean background and re-blit the animated line.
-
-        Ensures `line_current` isn't baked into the cached background after any
-        full draw (e.g., initial show/resize or axis changes), keeping blit
-        updates correct and visible.
-        """
-        if self.ax is None or self.canvas is None:
-            return
-
-        # Temporarily hide the current line to capture a clean background
-        if self.line_current is not None:
-            was_visible = {}
-            for state in self.states:
-                was_visible[state] = self.line_current[state].get_visible()    
-            was_connecting_visible = False
-            for state in self.states:
-                self.line_current[state].set_visible(False)
-            if self.line_connecting is not None:
-                was_connecting_visible = self.line_connecting.get_visible()
-                self.line_connecting.set_visible(False)
-            self.background = self.canvas.copy_from_bbox(self.ax.bbox)
-            # Restore visibility
-            for state in self.states:
-                self.line_current[state].set_visible(was_visible[state])
-            if self.line_connecting is not None:
-                self.line_connecting.set_visible(was_connecting_visible)
-
-            # Immediately re-blit the current line so it appears after full draws
-            if self.line_connecting is not None:
-                self.ax.draw_artist(self.line_connecting)
-            for state in self.states:
-                self.ax.draw_artist(self.line_current[state])
-            self.canvas.blit(self.ax.bbox)
-        else:
-            # No animated line yet; just cache the background
-            self.background = self.canvas.copy_from_bbox(self.ax.bbox)
-      
-        #self.background = self.canvas.copy_from_bbox(self.ax.bbox)
-
-    def changeGlobal(self, val=None):
-        global currPar
-        if val == None:
-            currPar = None
-        else:
-            currPar = self.par
-
-    def _almost_equal(self, a, b, rel_tol=5e-2, abs_tol=0.0):
-        '''Takes two values return true if they are almost equal'''
-        diff = abs(b - a)
-        return (diff <= abs(rel_tol * b)) or (diff <= abs_tol)
-    
-    def _over_and_above(self, a, b, switch):
-        '''Takes two values return true if they are far apart'''
-        # if input values are the same sign
-        if (np.sign(a) == np.sign(b)):
-            if switch == 'min':
-                return a <= b
-            else:
-                return a >= b
-        else:
-            # case1: max +ve and top -ve
-            # case2: min -ve and bottom +ve 
-            return ((a > 0 and b < 0) or (a < 0 and b > 0))
-
-    def getClick(self, event):
-        """Left mouse button is clicked
-
-        Keyword arguments:
-        self --         main window being displayed i.e. the current instance of the
-                        mainWindow class
-        event --        event type
-
-        Returns:
-        None
-
-        The xData is captured when the left mouse button is clicked on the canvas
-        """
-        # on left click in figure canvas, captures mouse press and assign None to
-        # mouse release
-
-       
-        if event.button == 1 and not event.xdata is None:
-            # Disable rectangle selector during interpolation mode
-            if self.interpolation_mode and self.rectangle_selector is not None:
-                self.rectangle_selector.set_active(False)
-            
-            # Check if we're in interpolation mode
-           
-            
-        
-            
-            self.mPress[0] = event.xdata
-            self.mPress[1] = event.ydata
-            self.mRelease[0] = None
-            self.mRelease[1] = None
-            self.is_dragging = True
-           
-            if (self.fit_toggle_mode > 0 or self.group_selection_mode > 0):
-                if self.rectangle_selector is not None:
-                    self.rectangle_selector.set_active(True)
-                return
-             #No dragging when various modes are on
-            if self.interpolation_mode:
-                return
-            # identify closest point to drag
-            try:
-                distances = [abs(event.xdata - x) for x in self.parValRADI]
-                j = int(np.argmin(distances))
-                # require it to be within a small x-threshold (similar to previous logic)
-                if abs(event.xdata - self.parValRADI[j]) <= 3:
-                    self.drag_index = j
-                else:
-                    self.drag_index = None
-            except Exception:
-                self.drag_index = None
-
-        if event.dblclick and not event.xdata is None:
-            self.mDblPress[0] = event.xdata
-            self.mDblPress[1] = event.ydata
-
-            text, ok = QtWidgets.QInputDialog.getText(self, 'Input Dialog',
-                                                  'Enter new node value:')
-            if ok:
-                if text:
-                    newVal = float(str(text))
-                    for j in range(len(self.parValRADI)):
-                        if ((self.mDblPress[0] < (self.parValRADI[j])+3) and
-                            (self.mDblPress[0] > (self.parValRADI[j])-3)):
-
-                            self.parVals[j] = newVal
-                            bottom, top = self.ax.get_ylim()
-                            self.ax.clear()
-                            self.ax.set_xlim(self.xScale[0], self.xScale[1])
-                            max_yvalue = max(self.parVals)
-                            min_yvalue = min(self.parVals)
-
-                            if self._over_and_above(min_yvalue, bottom, 'min'):
-                                bottom = min_yvalue - (0.1*(max_yvalue-min_yvalue))
-                                # this line is optional, only bottom scale should change
-                                top = max_yvalue + (0.1*(max_yvalue-min_yvalue))
-                            elif self._over_and_above(max_yvalue, top, 'max'):
-                                top = max_yvalue + (0.1*(max_yvalue-min_yvalue))
-                                # this line is optional, only top scale should change
-                                bottom = min_yvalue - (0.1*(max_yvalue-min_yvalue))
-                            elif self._almost_equal(min_yvalue, bottom, rel_tol=1e-2):
-                                bottom = min_yvalue - (0.1*(max_yvalue-min_yvalue))
-                                # this line is optional, only bottom scale should change
-                                top = max_yvalue + (0.1*(max_yvalue-min_yvalue))
-                            elif self._almost_equal(max_yvalue, top, rel_tol=1e-2):
-                                top = max_yvalue + (0.1*(max_yvalue-min_yvalue))
-                                # this line is optional, only top scale should change
-                                bottom = min_yvalue - (0.1*(max_yvalue-min_yvalue))
-
-                            self.ax.set_ylim(bottom, top)
-                            self.ax.set_xlabel("RADI (arcsec)")
-                            self.ax.set_ylabel(self.par + "( "+self.unitMeas+ " )")
-                            self.ax.plot(self.parValRADI, self.parVals, '--bo')
-                            self.ax.set_xticks(self.parValRADI)
-                            self.canvas.draw()
-                            self.key = "No"
-                            break
-
-                    # append the new point to the history if the last item in history differs
-                    # from the new point
-                    if not self.historyList[len(self.historyList)-1] == self.parVals[:]:
-                        self.historyList.append(self.parVals[:])
-
-            self.mPress[0] = None
-            self.mPress[1] = None
-
-    def getRelease(self, event):
-        """Left mouse button is released
-
-        Keyword arguments:
-        self --         main window being displayed i.e. the current instance of the
-                        mainWindow class
-        event --        event type
-
-        Returns:
-        None
-
-        The xData is captured when the left mouse button is released on the canvas.
-        The new data point is added to the history and mouse pressed is assigned None
-        """
-        # re-look at this logic --seems to be a flaw somewhere
-
-
-        if not event.ydata is None:
-            self.mRelease[0] = event.xdata
-            self.mRelease[1] = event.ydata
-            self.changeGlobal()
-            self.redo = []
-
-
-                # Toggle INTERPOLATION for the clicked point
-        if self.interpolation_mode or self.fit_toggle_mode > 0:        
-            try:
-                mouse_change = [0.,0.]
-                for i in [0,1]:
-                    mouse_change[i] = abs(self.mRelease[i] - self.mPress[i])
-                if mouse_change[0] > 0.1 or mouse_change[1] > 0.1:
-                    # Significant mouse movement - not a click
-                    pass
-                else:
-                    distances = [abs(event.xdata - x) for x in self.parValRADI]
-                    j = int(np.argmin(distances))
-                    if abs(event.xdata - self.parValRADI[j]) <= 3:
-                        # Toggle interpolation for this ring
-                        ring_key = f"RING_{j+1}"
-                        
-                        
-                        if self.interpolation_mode: 
-                            current_interp = self.parameterFitSetting[ring_key]['INTERPOLATION']
-                            self.parameterFitSetting[ring_key]['INTERPOLATION'] = not current_interp
-                        elif self.fit_toggle_mode == 1:
-                            self.parameterFitSetting[ring_key]['TO_FIT'] = True
-                        elif self.fit_toggle_mode == 2:
-                            ring1,ring2 = self.parameterFitSetting[ring_key]['GROUP']
-                            if ring1 != ring2 and  self.parameterFitSetting[ring_key]['BLOCK_FIT'] == True:
-                                QtWidgets.QMessageBox.information(self, "Information",
-                                    f"Cannot disable fitting of ring {j+1} as it is part of a block fit group.\n"
-                                    "Please modify the group first to disable block fitting.")
-                                return     
-                            self.parameterFitSetting[ring_key]['TO_FIT'] = False
-                        self.key = "Yes"
-                        self.yScale = set_plotScale(self.parVals)
-                        self.plotFunc()
-            except Exception as e:
-                print(f"Error processeing click in current mode: {e}")
-       
-
-
-        # append the new point to the history if the last item in history differs
-        # from the new point
-        if not np.array_equal(self.historyList[len(self.historyList)-1], self.parVals[:]):
-            self.historyList.append(self.parVals[:])
-
-        self.mPress[0] = None
-        self.mPress[1] = None
-        self.is_dragging = False
-        self.drag_index = None
-
-    def getMotion(self, event):
-        """Mouse is in motion
-
-        Keyword arguments:
-        self --         main window being displayed i.e. the current instance of the
-                        mainWindow class
-        event --        event type
-
-        Returns:
-        None
-        """
-        # whilst the left mouse button is being clicked
-        # capture the VROT (y-value) during mouse
-        # movement and call re-draw graph
-        if self.is_dragging:
-            # if the mouse pointer moves out of the figure canvas use
-            # the last value to redraw the graph
-            if event.ydata is None:
-        
-                bottom,top = self.ax.get_ylim()
-                plotrange = top - bottom
-                if abs(top-self.last_value) < abs(bottom - self.last_value):
-                    self.last_value += 0.1 * abs(plotrange)
-                else:
-                    self.last_value -= 0.1 * abs(plotrange)
-                self.mMotion[0] = self.last_value
-              
-            else:
-               
-                self.last_value = event.ydata
-                self.mMotion[0] = event.ydata
-            self.plotFunc()
-
-    def undoKey(self):
-        """Key is pressed
-
-        Keyword arguments:
-        self --         main window being displayed i.e. the current instance of the
-                        mainWindow class
-        event --        event type
-
-        Returns:
-        None
-
-        Deletes the last item in the history list when "Ctrl+z" is pressed and
-        re-draws graph
-        """
-        if len(self.historyList) > 1:
-            self.redo.append([self.numPrecisionY, self.parVals[:],
-                              self.historyList[-1], self.yScale[:]])
-            self.historyList.pop()
-            self.parVals = self.historyList[-1][:]
-            self.key = "Yes"
-            self.plotFunc()
-        else:
-            self.showInformation()
-
-    def redoKey(self):
-        """Key is pressed
-
-        Keyword arguments:
-        self --         main window being displayed i.e. the current instance of the
-                        mainWindow class
-        event --        event type
-
-        Returns:
-        None
-
-        Deletes the last item in the history list when "Ctrl+z" is pressed and
-        re-draws graph
-        """
-
-        if len(self.redo) > 0:
-            self.numPrecisionY = self.redo[-1][2]
-            self.parVals = self.redo[-1][3][:]
-            self.historyList.append(self.redo[-1][4][:])
-            self.yScale = self.redo[-1][5][:]
-            self.redo.pop()
-            self.key = "Yes"
-            self.plotFunc()
-        else:
-            self.showInformation()
-
-
-    def _get_points(self):
-        """Get colors for each point based on TO_FIT and INTERPOLATION status.
-        
-        Returns:
-            list: Color for each point ('red', 'blue', or 'green')
-        """
-        points_to_set = {'FIT': {'RADI': [], 'VALS': []},
-            'INT': {'RADI': [], 'VALS': []},
-            'NOFIT': {'RADI': [], 'VALS': []}}
-       
-       
-        if not self.parameterFitSetting['TO_FIT']:
-            points_to_set['NOFIT']['RADI'] = self.parValRADI[:]
-            points_to_set['NOFIT']['VALS'] = self.parVals[:]
-        else:
-            for i in range(len(self.parVals)):
-                ring_key = f"RING_{i+1}"     
-                if not self.parameterFitSetting[ring_key]['TO_FIT']:
-                        # Red: not fitted
-                    points_to_set['NOFIT']['RADI'].append(self.parValRADI[i])
-                    points_to_set['NOFIT']['VALS'].append(self.parVals[i])
-                elif self.parameterFitSetting[ring_key]['INTERPOLATION']:
-                        # Blue: fitted but interpolated
-                    points_to_set['INT']['RADI'].append(self.parValRADI[i])
-                    points_to_set['INT']['VALS'].append(self.parVals[i])
-                else:
-                        # Green: fitted and not interpolated
-                    points_to_set['FIT']['RADI'].append(self.parValRADI[i])
-                    points_to_set['FIT']['VALS'].append(self.parVals[i])
-        
-        return points_to_set
-
-    def showInformation(self):
-        """Show the information message
-
-        Keyword arguments:
-        self --         main window being displayed i.e. the current instance of the
-        mainWindow class
-
-        Returns:
-        None
-
-        Displays a messagebox that informs user there's no previous action to be undone
-        """
-        QtWidgets.QMessageBox.information(self, "Information", "History list is exhausted")
-
-
-    def firstPlot(self):
-        """Plots data from file
-
-        Keyword arguments:
-        self --         main window being displayed i.e. the current instance of the
-        mainWindow class
-
-        Returns:
-        None
-
-        Produces view graph from historyList
-        """
-      
-        self.ax.clear()
-        self.ax.set_xlim(self.xScale[0], self.xScale[1])
-        self.ax.set_ylim(self.yScale[0], self.yScale[1])
-        self.ax.set_xlabel("RADI (arcsec)")
-        self.ax.set_ylabel(self.par + "( "+self.unitMeas+ " )")
-
-        # Create persistent artists once, then update data
-        # Get colors for each point based on fitting status
-        points_to_set = self._get_points()
-        self.states = ['FIT','INT','NOFIT']
-        colors = ['mediumseagreen','violet','red']
-        markers = ['o','v','X']
-        self.line_current = {}
-        # Use scatter plot for individual point colors
-        for state in self.states:
-            self.line_current[state] = self.ax.scatter(points_to_set[state]['RADI'], 
-                                                points_to_set[state]['VALS'], 
-                                           c=colors[self.states.index(state)], 
-                                           marker=markers[self.states.index(state)], s=50, zorder=4, 
-                                          animated=True, edgecolors='black', linewidths=0.5)
-        
-        
-        # Add connecting lines in grey
-        self.line_connecting, = self.ax.plot(self.parValRADI, self.parVals, '--', 
-                                            color='mediumseagreen', alpha=1., zorder=3, 
-                                            animated=True, linewidth=1)
-   
-       
-        self.ax.plot(self.parValRADI, self.originalparVals, '--ro', alpha=0.2, zorder=2)
-        self.ax.errorbar(
-                self.parValRADI,
-                self.originalparVals,
-                yerr=self.parValsErr,
-                c='r', linestyle='-', alpha=0.2, zorder=2
-            )
-       
-        self.ax.set_xticks(self.parValRADI)
-        #Make sure to catch the current line in the limits
-        if self.line_current is not None:
-            for state in self.states:
-                self.line_current[state].set_visible(True)
-            if self.line_connecting is not None:
-                self.line_connecting.set_visible(True)
-            self.canvas.draw()
-        ylimits = self.ax.get_ylim()
-        # Hide the animated line before the full draw to keep background clean
-        if self.line_current is not None:
-            for state in self.states:
-                self.line_current[state].set_visible(False)
-            if self.line_connecting is not None:
-                self.line_connecting.set_visible(False)
-        # Full draw for non-animated artists (axes, error bars, originals)
-        self.ax.set_ylim(ylimits[0], ylimits[1])
-        self.canvas.draw()
-        # Cache clean background and then re-blit the current line
-        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
-        #if self.line_current is not None:
-        for state in self.states:
-            self.line_current[state].set_visible(True)
-        if self.line_connecting is not None:
-            self.line_connecting.set_visible(True)
-        if self.line_connecting is not None:
-            self.ax.draw_artist(self.line_connecting)
-        for state in self.states:
-            self.ax.draw_artist(self.line_current[state])
-        self.canvas.blit(self.ax.bbox)
-        self.canvas.flush_events()
-        self.key = "No"
-
-    def plotFunc(self):
-        """Plots data from file
-
-        Keyword arguments:
-        self --         main window being displayed i.e. the current instance of the
-                        mainWindow class
-
-        Returns:
-        None
-
-        Produces view graph from historyList or parVals
-        """
-
-        if self.key == "Yes":
-          
-            self.firstPlot()
-
-        # this re-plots the graph as long as the mouse is in motion and the right data
-        # point is clicked
-        else:
-            # Fast path: update only the dragged point and line data
-            if self.is_dragging and self.drag_index is not None and self.mMotion[0] is not None:
-                j = self.drag_index
-                # set the y-value directly to current mouse y
-                new_y = self.mMotion[0]
-                if new_y is not None:
-                    self.parVals[j] = new_y
-
-                    # Update current line data only
-                    # Update scatter plot offsets
-                    points_to_set = self._get_points()
-                    for state in self.states: 
-                        if len(points_to_set[state]['RADI']) > 0: 
-                            offsets = list(zip(points_to_set[state]['RADI'], points_to_set[state]['VALS']))
-                            self.line_current[state].set_offsets(offsets)
-                  
-                    # Update connecting line
-                    if self.line_connecting is not None:
-                        self.line_connecting.set_ydata(self.parVals)
-
-                    # Adjust limits only if new point is outside current view
-                    bottom, top = self.ax.get_ylim()
-                    if new_y < bottom or new_y > top:
-                        max_yvalue = float(np.max(self.parVals))
-                        min_yvalue = float(np.min(self.parVals))
-                        span = max(1e-9, (max_yvalue - min_yvalue))
-                      
-                        bottom = min_yvalue - 0.1 * span
-                        top = max_yvalue + 0.1 * span
-                      
-                        self.ax.set_ylim(bottom, top)
-                        self.background = None  # Invalidate cached background
-                       
-                        self.canvas.draw_idle()
-                    else:    
-                        # Blit-accelerated redraw (only changed region)
-                        if self.background is not None:
-                            self.canvas.restore_region(self.background)
-                            if self.line_connecting is not None:
-                                self.ax.draw_artist(self.line_connecting)
-                            for state in self.states:      
-                                self.ax.draw_artist(self.line_current[state])
-
-                          
-                            self.canvas.blit(self.ax.bbox)
-                            self.canvas.flush_events()
-                        else:
-                            self.canvas.draw_idle()
-                    self.key = "No"
-        self.check_parameter_limits()
-
-    def check_parameter_limits(self):
-        """Check if the parameter plot limits exceed the parmin and parmax values."""
-        if self.parameterFitSetting['PARMIN'] is None\
-            or self.parameterFitSetting['PARMIN'] > self.yScale[0]:
-            self.parameterFitSetting['PARMIN'] = self.yScale[0]
-        if self.parameterFitSetting['PARMAX'] is None\
-             or self.yScale[1] > self.parameterFitSetting['PARMAX']:
-            self.parameterFitSetting['PARMAX'] = self.yScale[1]
-        
-     
-
-
-            # If not dragging, do nothing heavy here
-
-class SMWindow(QtWidgets.QWidget):
-
-    def __init__(self, par, xVal, gwObjects):
-        # TODO SAM (26/06/2019) no need to pass 'par' to init if we have 'gwObjects'
-        # but maybe we need it because it makes things faster
-        super(SMWindow, self).__init__()
-        self.setProperty("popupBg", True)
-        # Enable stylesheet background (needed for border-image on top-level QWidget)
-        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
-        self.xMinVal = xVal[0]
-        self.xMaxVal = xVal[1]
-        self.gwObjects = gwObjects
-        self.par = par
-        self.prevParVal = ""
-        self.counter = 0
-
-        self.parameter = QtWidgets.QComboBox()
-        # self.parameter.setEditable(True)
-        self.parameter.addItem("Select Parameter")
-        for i in self.par:
-            self.parameter.addItem(i)
-        # self.parameter.setAutoCompletion(True) : doesn't work in PyQt5
-        self.parameter.setStyleSheet("QComboBox { combobox-popup: 0; }")
-        self.parameter.setMaxVisibleItems(5)
-        index = self.parameter.findText("Select Parameter", 
-            QtCore.Qt.MatchFlag.MatchFixedString)
-        self.parameter.setCurrentIndex(index)
-        self.parameter.currentIndexChanged.connect(self.onChangeEvent)
-        # run a for loop here to gather all they loaded parameters and populate as many text boxes
-
-        self.xLabel = QtWidgets.QLabel("RADI")
-        self.xMin = QtWidgets.QLineEdit()
-        self.xMin.setPlaceholderText("RADI min ("+str(self.xMinVal)+")")
-        self.xMax = QtWidgets.QLineEdit()
-        self.xMax.setPlaceholderText("RADI max ("+str(self.xMaxVal)+")")
-        self.xGrid = QtWidgets.QGridLayout()
-        self.xGrid.setSpacing(10)
-        self.xGrid.addWidget(self.xLabel, 1, 0)
-        self.xGrid.addWidget(self.xMin, 2, 0)
-        self.xGrid.addWidget(self.xMax, 2, 1)
-
-        self.yMin = QtWidgets.QLineEdit()
-        self.yMax = QtWidgets.QLineEdit()
-        self.yGrid = QtWidgets.QGridLayout()
-        self.yGrid.setSpacing(10)
-        self.yGrid.addWidget(self.parameter, 1, 0)
-        self.yGrid.addWidget(self.yMin, 2, 0)
-        self.yGrid.addWidget(self.yMax, 2, 1)
-
-        self.hbox = QtWidgets.QHBoxLayout()
-        self.hbox.addStretch(1)
-
-        self.hboxBtns = QtWidgets.QHBoxLayout()
-        self.hboxBtns.addStretch(1)
-        self.btnUpdate = IconButton(icons_location/'OK.png', self) 
-        self.btnUpdate.clicked.connect(self.updateScale)     
-        self.btnCancel = IconButton(icons_location/'cancel.png', self)   
-
-        self.btnCancel.clicked.connect(self.close)
-        self.hboxBtns.addWidget(self.btnUpdate)
-        self.hboxBtns.addWidget(self.btnCancel)
-
-        self.fbox = QtWidgets.QFormLayout()
-        self.fbox.addRow(self.xGrid)
-        self.fbox.addRow(self.yGrid)
-        self.fbox.addRow(self.hboxBtns)
-
-        self.setLayout(self.fbox)
-        self.setFocus()
-        self.setWindowTitle("Scale Manager")
-        self.setGeometry(300, 300, 300, 150)
-        _center(self)
-        self.setFocus()
-
-        self.gwDict = {}
-        for gwObject in self.gwObjects:
-            self.gwDict[gwObject.par] = gwObject.yScale[:]
-
-    def onChangeEvent(self):
-        if self.yMin.text():
-            self.gwDict[self.prevParVal][0] = int(float(self.yMin.text()))
-        if self.yMax.text():
-            self.gwDict[self.prevParVal][1] = int(float(self.yMax.text()))
-
-        for i in self.par:
-            if str(self.parameter.currentText()) == i:
-                self.yMin.clear()
-                self.yMin.setPlaceholderText(i+" min ("+str(self.gwDict[i][0])+")")
-                self.yMax.clear()
-                self.yMax.setPlaceholderText(i+" max ("+str(self.gwDict[i][1])+")")
-                self.prevParVal = i
-
-    def updateScale (self):
-        """Change the values of the instance variables and specific graph widget plots
-        after update button is clicked.
-        """
-        if self.xMin.text():
-            self.xMinVal = int(float(self.xMin.text()))
-
-        if self.xMax.text():
-            self.xMaxVal = int(float(self.xMax.text()))
-
-        if self.yMin.text():
-            self.gwDict[self.prevParVal][0] = int(float(self.yMin.text()))
-
-        if self.yMax.text():
-            self.gwDict[self.prevParVal][1] = int(float(self.yMax.text()))
-
-        for gwObject in self.gwObjects:
-            gwObject.yScale = self.gwDict[gwObject.par][:]
-            gwObject.xScale = [self.xMinVal, self.xMaxVal]
-            gwObject.firstPlot()
-        self.close()
-        QtWidgets.QMessageBox.information(self, "Information", "Done!")
-class IconButton(QtWidgets.QPushButton):
-    def __init__(self,image_path, parent=None, start_grayscale=False, support_three_states=False, extra_icon_path=None):
-        super(IconButton, self).__init__('', parent)
-        self.setFixedSize(40, 40)
-        self.image_path = image_path
-        self.original_pixmap = QtGui.QPixmap(str(image_path))
-        if extra_icon_path is not None:
-            self.original_pixmap_extra = QtGui.QPixmap(str(extra_icon_path))
-        self.is_grayscale = start_grayscale
-        self.support_three_states = support_three_states
-        self.state = 0 if start_grayscale else 1
-        
-        if start_grayscale:
-            self._apply_grayscale()
-        else:
-            self.setIcon(QtGui.QIcon(self.original_pixmap))
-        
-        self.setFlat(True)
-        self.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
-        self.setIconSize(QtCore.QSize(40,40))
-    
-    def _apply_grayscale(self):
-        """Convert icon to grayscale"""
-        image = self.original_pixmap.toImage()
-        for x in range(image.width()):
-            for y in range(image.height()):
-                pixel = image.pixelColor(x, y)
-                gray = int(0.299 * pixel.red() + 0.587 * pixel.green() + 0.114 * pixel.blue())
-                image.setPixelColor(x, y, QtGui.QColor(gray, gray, gray, pixel.alpha()))
-        self.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image)))
-    
-    def _apply_red_glow(self):
-        """Apply red glow/overlay to icon"""
-        image = self.original_pixmap.toImage()
-        for x in range(image.width()):
-            for y in range(image.height()):
-                pixel = image.pixelColor(x, y)
-                red = min(255, pixel.red() + 100)
-                green = int(pixel.green() * 0.5)
-                blue = int(pixel.blue() * 0.5)
-                image.setPixelColor(x, y, QtGui.QColor(red, green, blue, pixel.alpha()))
-        self.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image)))
-    
-    def set_state(self, state):
-        """Set button state: 0=grayscale, 1=normal, 2=red glow"""
-        self.state = state
-        if state == 0:
-            self._apply_grayscale()
-        elif state == 1:
-            self.setIcon(QtGui.QIcon(self.original_pixmap))
-        elif state == 2:
-            self.setIcon(QtGui.QIcon(self.original_pixmap_extra))
-    
-    def cycle_state(self):
-        """Cycle through states"""
-        if self.support_three_states:
-            self.state = (self.state + 1) % 3
-        else:
-            self.state = 1 - self.state
-        self.set_state(self.state)
-    
-    def set_grayscale(self, grayscale):
-        """Toggle between grayscale and full color"""
-        self.is_grayscale = grayscale
-        if grayscale:
-            self._apply_grayscale()
-        else:
-            self.setIcon(QtGui.QIcon(self.original_pixmap))
-    
-    def toggle_grayscale(self):
-        """Toggle grayscale state"""
-        self.set_grayscale(not self.is_grayscale)
-      
-class PolyFitWindow(QtWidgets.QWidget):
-    
-    def __init__(self, par):
-        super(PolyFitWindow, self).__init__()
-        self.setProperty("popupBg", True)
-        # Enable stylesheet background (needed for border-image on top-level QWidget)
-        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
-        self.par = par
-        polys = [1,2,3,4,5,6,7,8]
-        self.minDegreeLabel = QtWidgets.QLabel("Min Degree of Polynomial")
-        self.minDegree = QtWidgets.QComboBox()
-        for degree in polys:
-            self.minDegree.addItem(str(degree))
-        self.minDegree.setStyleSheet("QComboBox { combobox-popup: 0; }")
-        self.maxDegreeLabel = QtWidgets.QLabel("Max Degree of Polynomial")
-        self.maxDegree = QtWidgets.QComboBox()
-        for degree in polys[::-1]:
-            self.maxDegree.addItem(str(degree))
-        self.maxDegree.setStyleSheet("QComboBox { combobox-popup: 0; }")
-        self.lowerBoundaryLabel = QtWidgets.QLabel("Lower Boundary Limit")
-        self.lowerBoundary = QtWidgets.QLineEdit()
-        self.upperBoundaryLabel = QtWidgets.QLabel("Upper Boundary Limit")
-        self.upperBoundary = QtWidgets.QLineEdit()
-        if self.par.split('_')[0] in ['VROT']:
-            self.flatOuterRingsLabel = QtWidgets.QLabel("Number of Outer Flat Rings")
-            self.flatOuterRings = QtWidgets.QLineEdit()
-        else:
-            self.innerFlatringsLabel = QtWidgets.QLabel("Inner Flat Rings")
-            self.innerFlatrings = QtWidgets.QLineEdit()
-        self.grid = QtWidgets.QGridLayout()
-        self.grid.setSpacing(10)
-        self.grid.addWidget(self.minDegreeLabel, 1, 0)
-        self.grid.addWidget(self.minDegree, 1, 1)
-        self.grid.addWidget(self.maxDegreeLabel, 2, 0)
-        self.grid.addWidget(self.maxDegree, 2, 1)
-        self.grid.addWidget(self.lowerBoundaryLabel, 3, 0)
-        self.grid.addWidget(self.lowerBoundary, 3, 1)
-        self.grid.addWidget(self.upperBoundaryLabel, 4, 0)
-        self.grid.addWidget(self.upperBoundary, 4, 1)
-        if self.par.split('_')[0] in ['VROT']:
-            self.flatOuterRingsLabel = QtWidgets.QLabel("Number of Outer Flat Rings")
-            self.flatOuterRings = QtWidgets.QLineEdit()
-            self.grid.addWidget(self.flatOuterRingsLabel, 5, 0)
-            self.grid.addWidget(self.flatOuterRings, 5, 1)
-        else:
-            self.innerFlatringsLabel = QtWidgets.QLabel("Inner Flat Rings")
-            self.innerFlatrings = QtWidgets.QLineEdit()
-            self.grid.addWidget(self.innerFlatringsLabel, 5, 0)
-            self.grid.addWidget(self.innerFlatrings, 5, 1)
-
-        self.btnOK = IconButton(icons_location/'OK.png', self)       
-        self.btnCancel = IconButton(icons_location/'cancel.png', self)   
-
-        self.hbox = QtWidgets.QHBoxLayout()
-        #self.hbox.addStretch(1)
-        self.hbox.addWidget(self.btnOK)
-        self.hbox.addWidget(self.btnCancel)
-
-        self.grid.addLayout(self.hbox, 6, 0,1,2)
-
-        if self.par.split('_')[0] in ['INCL','PA']:
-            self.warped = QtWidgets.QCheckBox(text="Fit Angular Momentum Vector?")
-            self.grid.addWidget(self.warped, 7, 0)
-       
-
-
-        self.setLayout(self.grid)
-
-        self.setWindowTitle("Polynomial Fit Specification")
-        self.setGeometry(300, 300, 300, 150)
-
-        _center(self)
-        self.setFocus()
-
-
-class ParamSpec(QtWidgets.QWidget):
-
-    def __init__(self, par, windowTitle,plotted_parameters = None, addLocation=False):
-        super(ParamSpec, self).__init__()
-        self.setProperty("popupBg", True)
-        # Enable stylesheet background (needed for border-image on top-level QWidget)
-        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
-        self.par = par
-
-        self.parameterLabel = QtWidgets.QLabel("Parameter")
-        self.parameter = QtWidgets.QComboBox()
-        self.parameter.setEditable(True)
-        self.parameter.addItem("Select Parameter")
-        for i in self.par:
-            self.parameter.addItem(i)
-
-        self.parameter.setStyleSheet("QComboBox { combobox-popup: 0; }")
-        self.parameter.setMaxVisibleItems(6)
-        index = self.parameter.findText("Select Parameter", QtCore.Qt.MatchFlag.MatchFixedString)
-        self.parameter.setCurrentIndex(index)
-        self.uMeasLabel = QtWidgets.QLabel("Unit Measurement")
-        self.unitMeasurement = QtWidgets.QLineEdit()
-        # self.unitMeasurement.setPlaceholderText("Unit Measurement")
-      
-        self.grid = QtWidgets.QGridLayout()
-        self.grid.setSpacing(10)
-        self.grid.addWidget(self.parameterLabel, 1, 0)
-        self.grid.addWidget(self.parameter, 1, 1)
-        self.grid.addWidget(self.uMeasLabel, 2, 0)
-        self.grid.addWidget(self.unitMeasurement, 2, 1)
-        if addLocation:
-            self.afterLabel = QtWidgets.QLabel("Add After")
-            self.afterParameter = QtWidgets.QComboBox()
-            self.afterParameter.setEditable(True)
-            self.afterParameter.addItem("End")
-            for i in plotted_parameters:
-                self.afterParameter.addItem(i)
-            self.afterParameter.setStyleSheet("QComboBox { combobox-popup: 0; }")
-            self.afterParameter.setMaxVisibleItems(6)
-            index = self.afterParameter.findText("End", QtCore.Qt.MatchFlag.MatchFixedString)
-            self.afterParameter.setCurrentIndex(index)
-   
-            self.grid.addWidget(self.afterLabel, 3, 0)
-            self.grid.addWidget(self.afterParameter, 3, 1)
-        
-        self.btnOK = IconButton(icons_location/'OK.png', self)       
-        self.btnCancel = IconButton(icons_location/'cancel.png', self)   
-
-        self.hbox = QtWidgets.QHBoxLayout()
-        #self.hbox.addStretch(1)
-        self.hbox.addWidget(self.btnOK)
-        self.hbox.addWidget(self.btnCancel)
-
-        self.grid.addLayout(self.hbox, 4 if addLocation else 3, 0,1,2)
-        self.setLayout(self.grid)
-
-        self.setWindowTitle(windowTitle)
-        self.setGeometry(300, 300, 300, 150)
-
-        _center(self)
-        self.setFocus()
-class _FittingFillDialog(QtWidgets.QDialog):
-   
-
-    def __init__(self, parameter,fitting_parameters,fitting_settings):
-        super(_FittingFillDialog, self).__init__()
-        self.setProperty("popupBg", True)
-        # Enable stylesheet background (needed for border-image on top-level QWidget)
-        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground, True)
-        self.parameter = parameter
-        self.infoLabel = QtWidgets.QLabel(
-            f"Specify fitting settings for parameter {self.parameter}"
-        )
-       
-        count=0
-        self.grid = QtWidgets.QGridLayout()
-        self.grid.setSpacing(10)
-        self.grid.addWidget(self.infoLabel,count,0,1,2)
-        count+=1
-        for key in fitting_parameters:
-            if key not in ['VARY','VARINDX']:
-                setattr(self, f'{key}Label', QtWidgets.QLabel(f"{key}"))
-                setattr(self, f'{key}', QtWidgets.QLineEdit())
-              
-                if fitting_settings[key] is not None:
-                    tmp = getattr(self, f'{key}')
-                    tmp.setPlaceholderText(f"{fitting_settings[key]}")
-                self.grid.addWidget(getattr(self, f'{key}Label'),count,0)
-                self.grid.addWidget(getattr(self, f'{key}'),count,1)
-                count+=1
-        #self.hbox.addStretch(1)
-        self.hbox = QtWidgets.QHBoxLayout()
-        self.btnOK = IconButton(icons_location/'OK.png', self)       
-        self.btnCancel = IconButton(icons_location/'cancel.png', self)   
-        self.hbox.addWidget(self.btnOK)
-        self.hbox.addWidget(self.btnCancel)
-        self.grid.addLayout(self.hbox,count,0,1,2)
-       
-        self.setLayout(self.grid)
-
-        self.setWindowTitle("Fitting Parameter Specification")
-        self.setGeometry(300, 300, 300, 150)
-
-        _center(self)
-        self.setFocus()
-
-class MainWindow(QtWidgets.QMainWindow):
-    runNo = 0
-    key = "Yes"
-    ncols = 5; nrows = 5
-    par = ['VROT', 'SBR', 'INCL', 'PA']
-    tmpDeffile = os.getcwd() + "/tmpDeffile.def"
-    progressPath = ''
-    fileName = ""
-    openedfileName = ""
-    gwObjects = []
-    t = 0
-    scrollWidth = 0; scrollHeight = 0
-    before = 0
-    numPrecisionY = {}
-    numPrecisionX = []
-    NUR = 0
-    data = []
-    parVals = {}
-    parValsErr = {}
-    historyList = {}
-    pyFAT_conf_file = None
-    noise = 0.0
-    beam = [0.0, 0.0, 0.0]
-    channel_width = 0.0
-    xScale = [0, 0]
-    yScale = {'VROT':[0, 0]}
-    mPress = [-5]
-    mRelease = ['None']
-    mMotion = [-5]
-    initial_size = 0.75
-    #Fitting keys
-    fitting_parameters= ['VARY','VARINDX','PARMAX','PARMIN'
-            ,'MODERATE','DELEND','DELSTART',
-            'MINDELTA','SATDELT','ITESTART','ITEEND']
-
-    def __init__(self):
-        super(MainWindow, self).__init__()
-        self.initUI()
-        
-        # monitor-based sizing was commented out; default to fixed initial dimensions
-        monitor = QtWidgets.QApplication.primaryScreen()
-        monitor_size = monitor.size()
-        self.initial_height = monitor_size.height() * self.initial_size
-        self.initial_width = monitor_size.width() * self.initial_size
-        #self.initial_height = 1024
-        #self.initial_width = 1536
-        
-        self.resize(int(self.initial_width), int(self.initial_height))
-        _center(self)
-        QtCore.QTimer.singleShot(100, self.openDef)
-    
-    def initUI(self):
-        #self.showMaximized()
-        
-        self.setWindowTitle('TiRiFiG')
-        # define a widget sitting in the main window where all other widgets will live
-        central_widget = QtWidgets.QWidget()
-        central_widget.setObjectName("centralWidget")
-        self.setCentralWidget(central_widget)
-        # make this new widget have a vertical layout
-        vertical_layout = QtWidgets.QVBoxLayout()
-        vertical_layout.setContentsMargins(0, 0, 0, 0)
-        vertical_layout.setSpacing(0)
-        central_widget.setLayout(vertical_layout)
-        # add the buttons and the scroll area which will have the graph widgets
-        # open button
-        #btnOpen = QtWidgets.QPushButton('&Open File')
-        #btnOpen.setFixedSize(80, 30)
-        #btnOpen.setToolTip('Open .def file')
-        #btnOpen.clicked.connect(self.openDef)
-        #vertical_layout.addWidget(btnOpen)
-        # scroll area
-        scroll_area = QtWidgets.QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
-        scroll_area.viewport().setAutoFillBackground(False)
-        scroll_area.setViewportMargins(0, 0, 0, 0)
-        # the scroll area needs a widget to be placed inside of it which will hold the content
-        # create one and let it have a grid layout
-        self.scroll_area_content = QtWidgets.QWidget()
-        self.scroll_area_content.setContentsMargins(0, 0, 0, 0)
-        self.scroll_area_content.setAutoFillBackground(False)
-        self.scroll_grid_layout = QtWidgets.QGridLayout()
-        self.scroll_grid_layout.setContentsMargins(0, 0, 0, 0)
-        #vertical_layout.setContentsMargins(0, 0, 0, 0)
-        self.scroll_grid_layout.setSpacing(0)
-        self.scroll_grid_layout.setHorizontalSpacing(0)
-        self.scroll_grid_layout.setVerticalSpacing(0)
-        
-        self.scroll_area_content.setLayout(self.scroll_grid_layout)
-        scroll_area.setWidget(self.scroll_area_content)
-        vertical_layout.addWidget(scroll_area)
-        self.createActions()
-        self.createMenus()
-
-    def createActions(self):
-        self.exitAction = QtGui.QAction("&Exit", self)
-        self.exitAction.setShortcut("Ctrl+Q")
-        self.exitAction.setStatusTip('Leave the app')
-        self.exitAction.triggered.connect(self.quitApp)
-
-        self.openFile = QtGui.QAction("&Open File", self)
-        self.openFile.setShortcut("Ctrl+O")
-        self.openFile.setStatusTip('Load .def file to be plotted')
-        self.openFile.triggered.connect(self.openDef)
-
-        self.saveChanges = QtGui.QAction("&Save", self)
-        self.saveChanges.setStatusTip('Save changes to .def file')
-        self.saveChanges.triggered.connect(self.saveAll)
-
-        self.saveAsFile = QtGui.QAction("&Save as...", self)
-        self.saveAsFile.setStatusTip('Create another .def file with current '
-                                     'paramater values')
-        self.saveAsFile.triggered.connect(self.saveAsAll)
-
-        self.undoAction = QtGui.QAction("&Undo", self)
-        self.undoAction.setShortcut("Ctrl+Z")
-        self.undoAction.setStatusTip('Undo last action')
-        self.undoAction.triggered.connect(self.undoCommand)
-
-        self.redoAction = QtGui.QAction("&Redo", self)
-        self.redoAction.setShortcut("Ctrl+Y")
-        self.redoAction.setStatusTip('Redo last action')
-        self.redoAction.triggered.connect(self.redoCommand)
-
-        self.openTextEditor = QtGui.QAction("&Open Text Editor...", self)
-        self.openTextEditor.setStatusTip('View the current open .def file in '
-                                         'preferred text editor')
-        self.openTextEditor.triggered.connect(self.openEditor)
-
-        self.startTF = QtGui.QAction("&Start TiriFiC", self)
-        self.startTF.setStatusTip('Starts TiRiFiC from terminal')
-        self.startTF.triggered.connect(self.startTiriFiC)
-
-        self.winSpec = QtGui.QAction("&Window Specification", self)
-        self.winSpec.setStatusTip('Determines the number of rows and columns in a plot')
-        self.winSpec.triggered.connect(self.setRowCol)
-
-        self.scaleMan = QtGui.QAction("&Scale Manager", self)
-        self.scaleMan.setStatusTip('Manages behaviour of scale and min and max values')
-        self.scaleMan.triggered.connect(self.SMobj)
-
-        self.paraDef = QtGui.QAction("&Add Parameter", self)
-        # self.paraDef.setStatusTip('Determines which parameter is plotted')
-        self.paraDef.triggered.connect(self.add_parameter_dialog)
-
-    def createMenus(self):
-        mainMenu = self.menuBar()
-
-        self.fileMenu = mainMenu.addMenu('&File')
-        self.fileMenu.addAction(self.openFile)
-        self.fileMenu.addAction(self.undoAction)
-        self.fileMenu.addAction(self.redoAction)
-        self.fileMenu.addAction(self.saveChanges)
-        self.fileMenu.addAction(self.saveAsFile)
-        self.fileMenu.addAction(self.exitAction)
-
-        # editMenu = mainMenu.addMenu('&Edit')
-
-        self.runMenu = mainMenu.addMenu('&Run')
-        self.runMenu.addAction(self.openTextEditor)
-        self.runMenu.addAction(self.startTF)
-
-        self.paramMenu = mainMenu.addMenu('&Parameters')
-        self.paramMenu.addAction(self.paraDef)
-        
-        self.prefMenu = mainMenu.addMenu('&Preferences')
-        self.prefMenu.addAction(self.scaleMan)
-        #self.prefMenu.addAction(self.paraDef)
-        self.prefMenu.addAction(self.winSpec)
-
-    def quitApp(self):
-        if self.t != 0:
-            self.t.cancel()
-        QtWidgets.qApp.quit()
-    def setPFConfig(self):
-        
-        try:
-            self.pyFAT_Configuration = pickle.load(self.pyFAT_config_file)    
-        except Exception as e:
-          
-            self.pyFAT_Configuration = {'DEBUG': True,
-                         'DEBUG_FUNCTION':'ALL',
-                         'VERBOSE_LOG': False,
-                         'VERBOSE_SCREEN': False,
-                         'OUTPUTLOG': None,
-                         'TIMING': False,
-                         'NOISE': float(self.Tirific_Template['RMS']),
-                         'BEAM': [float(self.Tirific_Template['BMAJ']), 
-                                  float(self.Tirific_Template['BMIN']), 
-                                  float(self.Tirific_Template['BPA'])],
-                         'CHANNEL_WIDTH': 0.,
-                         'NO_RINGS': self.NUR,
-                         'LIMIT_MODIFIER': [1.0],
-                         'LAST_RELIABLE_RINGS': [self.NUR,self.NUR],
-                         'RC_UNRELIABLE': self.NUR,
-                        }
-          
-
-
-    def getData(self):
-        """Loads data from specified .def file in open dialog box
-
-        Keyword arguments:
-        self-- this is the main window being displayed
-            i.e. the current instance of the mainWindow class
-
-        Returns:
-        data:list
-        The text found in each line of the opened file
-
-        data will be a none type variable if the fileName is invalid or no file is chosen
-        """
-
-        # stores file path of .def to fileName variable after user selects file in open
-        # dialog box
-        # TODO (Samuel 28-11-2018): If cancel is selected then suppress the message in try/except below
-        self.fileName, _filter = QtWidgets.QFileDialog.getOpenFileName(self, "Open .def File", "~/",
-                                                                       ".def Files (*.def)")
-        self.openedfileName = copy.deepcopy(self.fileName)  
-        # assign texts of read lines to data variable if fileName is exists, else assign
-        # None
-       
-        try:
-            with open(self.fileName) as f:
-                data = f.readlines()
-        except:
-            if self.fileName == '':
-                pass
-            else:
-                QtWidgets.QMessageBox.information(self, "Information",
-                                                  "Empty/Invalid file specified")
-            return None
-        else:
-            return data
-
-  
-
-    def numPrecision(self, string_value_line):
-        """Determines and sets floating point precision
-
-        Keyword arguments:
-        self-- main window being displayed i.e. the current instance of the mainWindow
-               class
-        data (list)--  list of scientific values of type string
-                       e.g. x = ["20.00E4","55.0003E-4",...]
-
-        Returns:
-        int
-
-        Determines the highest floating point precision of data points
-        """
-
-        decPoints = []
-        # ensure values from list to are converted string
-        # FIX ME: Consider using enumerate instead of iterating with range and len
-        #for i in range(len(data)):
-        #    data[i] = str(data[i])
-        values = string_value_line.split()
-        for value in values:
-            val = value.split(".")
-            # check val has decimal & fractional part and append length of numbers of
-            # fractional part
-           
-            if len(val) == 2:
-                decPoints.append(len(val[1].split('E')[0]))
-        if 'E' in value.upper():
-            tpe = 'E'
-        else:
-            tpe = 'f'
-        # assign greatest precision in decPoints to class variables handling precision
-        if len(decPoints) == 0:
-            return [0, tpe]
-        else:
-            return [max(decPoints), tpe]
-
-    def getParameter(self):
-        """Fetches data points of specified parameter
-
-        Keyword arguments:
-        self-- main window being displayed i.e. the current instance of the
-               mainWindow class
-        data (list)--  list containing texts of each line loaded from .def file
-
-        Returns:
-        parVal:list
-        The values appearing after the '=' symbol of the parameter specified in sKey.
-        If search key isnt found, zero values are returned
-
-        The data points for the specific parameter value are located and converted
-        from string to float data types for plotting and other data manipulation
-        """
-        # search through fetched data for values of "PAR =" or "PAR = " or "PAR=" or
-        # "PAR= "
-        self.NUR = int(float(self.Tirific_Template['NUR']))
-      
-        for key in self.Tirific_Template:
-            if len(self.Tirific_Template[key].split()) == self.NUR and\
-                key not in self.fitting_parameters:
-                if not '_ERR' in key:
-                    if key == 'RADI':
-                        self.parValsRADI = np.array([float(x) for x in self.Tirific_Template[key].split()], dtype=np.float64)
-                        self.numPrecisionX = self.numPrecision(self.Tirific_Template[key])
-                      
-                    else:
-                        print(f"Loading parameter values for {key}")
-                        #print(self.Tirific_Template[key])
-                        self.parVals[key] = np.array([float(x) for x in self.Tirific_Template[key].split()], dtype=np.float64)
-                        self.numPrecisionY[key] = self.numPrecision(self.Tirific_Template[key])
-
-                else:
-                    param_name = key[1:].replace('_ERR', '').strip()
-                    self.parValsErr[param_name] = np.array([float(x) for x in self.Tirific_Template[key].split()], dtype=np.float64)
-
-      
-       
-            
-       
-        for key in self.parVals:
-            if key not in self.parValsErr:
-                self.parValsErr[key] = np.array([float('NaN')]*len(self.parVals[key]), dtype=np.float64)
-    def getFittingSettings(self):
-        """Fetches fitting settings from .def file
-
-        Keyword arguments:
-        self-- main window being displayed i.e. the current instance of the
-               mainWindow class
-        data (list)--  list containing texts of each line loaded from .def file
-
-        Returns:
-        None
-
-        The fitting settings such as number of loops and inset type are retrieved
-        from the .def file
-        """
-      
-        # Read what is in the current template and set up fitting groups   
-   
-        fit_groups= fit_functions.get_fitted_groups(self.Tirific_Template,log=True,verbose=True)  
-        varindex = self.obtain_varindx()
-        self.setRingFittingValues(fit_groups, varindex)
-
-        #print(f"Fitting settings obtained. {self.parameterFittingSettings} parameters found.")
-      
-      
-    def setEmptyFittingValues(self, parameter):
-        self.parameterFittingSettings[parameter] = {'TO_FIT': False}
-        for key in self.fitting_parameters:
-            if key not in ['VARY', 'VARINDX']:
-                self.parameterFittingSettings[parameter][key] = None
-        for i in range(self.NUR):
-            self.parameterFittingSettings[parameter][f"RING_{i+1}"] ={ 
-                    'TO_FIT': False,
-                    'INTERPOLATION': False,
-                    'GROUP': [i+1,i+1],
-                    'BLOCK_FIT': False,
-                   }
-            for key in self.fitting_parameters:
-                if key not in ['VARY', 'VARINDX']:
-                    self.parameterFittingSettings[parameter][f"RING_{i+1}"][key] = None
-
-    def setRingFittingValues(self, fit_groups, varindex):
-        self.parameterFittingSettings = {}
-        template_values = {}
-        for key in self.fitting_parameters:
-                if key not in ['VARY', 'VARINDX']:
-                    template_values[key] = self.Tirific_Template[key].split()
-       
-        for group in fit_groups:
-            basename_group = group.split('_')[0]
-            disk = fit_groups[group]['DISKS']
-            for i in disk:
-                if i ==  1:
-                    basename= basename_group
-                else:
-                    basename = f"{basename_group}_{i}"
-                if basename not in self.parameterFittingSettings:
-                    self.setEmptyFittingValues(basename)
-                self.parameterFittingSettings[f"{basename}"]["TO_FIT"] = True
-                range_of_rings = fit_groups[group]['RINGS'][f'{i}']
-                for ring in range(range_of_rings[0], range_of_rings[1]+1):
-                    self.parameterFittingSettings[f"{basename}"][f"RING_{ring}"]["TO_FIT"] = True
-                    self.parameterFittingSettings[f"{basename}"][f"RING_{ring}"]["GROUP"] = range_of_rings
-                    self.parameterFittingSettings[f"{basename}"][f"RING_{ring}"]["BLOCK_FIT"] = fit_groups[group]['BLOCK']
-                    if basename in varindex:
-                        if ring in varindex[basename]:
-                            self.parameterFittingSettings[f"{basename}"][f"RING_{ring}"]["INTERPOLATION"] = True
-                    for key in self.fitting_parameters:
-                        if key not in ['VARY', 'VARINDX']:
-                            template_value = template_values[key]
-                            if len(template_value) == len(fit_groups):
-                                if key in ['ITESTART','ITEEND','MODERATE']:
-                                    put_value = int(float(template_value[fit_groups[group]['COLUMN_ID']]))
-                                else:
-                                    put_value = float(template_value[fit_groups[group]['COLUMN_ID']])
-                                self.parameterFittingSettings[f"{basename}"][
-                                    f"RING_{ring}"][key] = put_value
-                                if self.parameterFittingSettings[f"{basename}"][
-                                    key] is None:
-                                    self.parameterFittingSettings[f"{basename}"][
-                                        key] = put_value
-                      
-
-
-    def obtain_varindx(self):
-        varindex = {}
-        varindx_line = self.Tirific_Template['VARINDX'].split()
-        for i in range(len(varindx_line)):
-            try:
-                value = int(float(varindx_line[i]))
-            except:
-                if ':' in varindx_line[i]:
-                    parts = varindx_line[i].split(':')
-                  
-                    rings = [int(float(parts[0])), int(float(parts[1]))]
-                    if rings[0] > rings[1]:
-                        rings[1] -= 1
-                        step = -1
-                    else:
-                        rings[1] += 1
-                        step =1
-                    for j in range(rings[0],rings[1],step):
-                        varindex[current_parameter].append(j)
-                else:   
-                    current_parameter = varindx_line[i]
-                    if current_parameter not in varindex:
-                        varindex[current_parameter] = []
-            else:
-                varindex[current_parameter].append(value)
-        return varindex
-       
-    def openDef(self):
-        """Opens data, gets parameter values, sets precision and sets scale
-
-        Keyword arguments:
-        self -- main window being displayed i.e. the current instance of the
-                mainWindow class
-
-        Returns:
-        None
-
-        Makes function calls to getData and getParameter functions, assigns
-        values to dictionaries parVals and firstPlot historyList and defines
-        the x-scale and y-scale for plotting on viewgraph
-        """
-       
-        self.data = self.getData()
-        self.Tirific_Template = FAT_sup.tirific_template(self.fileName)
-      
-        #self.getParameter(data)
-        #try:
-        self.getParameter()
-        self.setPFConfig()
-        print(f'Obtained the Parameters from {self.fileName}')
-        self.getFittingSettings()
-        print(f'Obtained the Fitting Settings from {self.fileName}')
-        '''   
-        except Exception as e:
-            if self.data is None:
-                pass
-            else:
-                print(e)
-                QtWidgets.QMessageBox.information(self, "Information",
-                                                  "Tilted-ring fitting parameters not retrieved")
-                logging.info("The tilted-ring parameters could not be retrieved from the {}"
-                             .format(self.fileName))
-        else:
-        '''   
-        if self.runNo > 0:
-            # FIXME reloading another file on already opened not properly working
-            # user has to close open window and reopen file for such a case
-            QtWidgets.QMessageBox.information(self, "Information",
-                                                "Close app and reopen to load file. Bug "
-                                                "being fixed")
-            # self.cleanUp()
-            # FIXME (Samuel 11-06-2018): Find a better way to do this
-            # self.data = data
-            # self.getParameter(self.data)
-        else:
-            # defining the x scale for plotting
-            # this is the min/max + 10% of the difference between the min and max
-            self.xScale = set_plotScale(self.parValsRADI)
-            
-            self.scrollWidth = self.scroll_area_content.width()
-            self.scrollHeight = self.scroll_area_content.height()
-
-            # Show a modal progress dialog while building graphs
-            total_params = len(self.parVals)
-            progress = QtWidgets.QProgressDialog("Building graph widgets…", None, 0, total_params, self)
-            progress.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
-            progress.setAutoClose(True)
-            progress.setAutoReset(False)
-            progress.setCancelButton(None)
-            progress.setMinimumDuration(0)
-            progress.show()
-            QtWidgets.QApplication.processEvents()
-
-            # make a dict to save the graph widgets to be plotted
-            # note that this approach will require another loop.
-            # Not ideal but it gets the job done for now.
-            g_w_to_plot = {}
-            # ensure there are the same points for parameters as there are for RADI as
-            # specified in NUR parameter
-            for param_idx, (key, val) in enumerate(self.parVals.items()):
-                progress.setValue(param_idx)
-                progress.setLabelText(f"Processing parameter {key}…")
-                QtWidgets.QApplication.processEvents()
-                
-                diff = self.NUR - len(val)
-                if key == 'RADI': #use this implementation in other diff checkers
-                    if diff == self.NUR:
-                        for j in np.arange(0.0, (int(diff) * 40.0), 40):
-                            self.parVals[key].append(j)
-                    elif diff > 0 and diff < self.NUR:
-                        for j in range(int(diff)):
-                            self.parVals[key].append(self.parVals[key][-1] + 40.0)
-                    continue
-                else:
-                    if diff == self.NUR:
-                        for j in range(int(diff)):
-                            self.parVals[key].append(0.0)
-                    elif diff > 0 and diff < self.NUR:
-                        for j in range(int(diff)):
-                            self.parVals[key].append(val[-1])
-
-                self.yScale[key] = set_plotScale(self.parVals[key])
-                
-                unit = fit_par[key] if key in fit_par.keys() else ""
-                # Do we really need to create all graph widgets here?
-                if key in self.par:
-                    new_widget = self.create_new_widget(key,unit)
-                    self.gwObjects.append(new_widget)
-                    g_w_to_plot[key] = new_widget
-                    del new_widget
-            
-            progress.setValue(total_params)
-
-            # retrieve the values in order and build a list of ordered key-value pairs
-            ordered_dict_items = [(key, g_w_to_plot[key]) for key in self.par]
-            for idx, items in enumerate(ordered_dict_items):
-                graph_widget = items[1] # what does 1 represent
-                self.scroll_grid_layout.addWidget(graph_widget, idx, 0)
-            del g_w_to_plot, ordered_dict_items
-            
-            # Close the busy dialog
-            progress.close()
-            self.runNo+=1
-        
-
-    def undoCommand(self):
-        global currPar
-        for i in range(len(self.gwObjects)):
-            if self.gwObjects[i].par == currPar:
-                self.gwObjects[i].undoKey()
-                break
-
-    def redoCommand(self):
-        global currPar
-        for i in range(len(self.gwObjects)):
-            if self.gwObjects[i].par == currPar:
-                self.gwObjects[i].redoKey()
-                break
-
-    def setRowCol(self):
-        text, ok = QtWidgets.QInputDialog.getText(self, "Window number Input Dialog",
-                                                  "Specify the number of rows and columns (rows,columns):")
-        if ok:
-            if text:
-                text = str(text)
-                text = text.split(",")
-                self.nrows = int(float(text[0]))
-                self.ncols = int(float(text[1]))
-                if (self.nrows * self.ncols) >= len(self.par):
-                    # clear the existing graph objects
-                    item_count = self.scroll_grid_layout.count()
-                    for i in range(item_count):
-                        widget_to_remove = self.scroll_grid_layout.itemAt(0).widget()
-                        self.scroll_grid_layout.removeWidget(widget_to_remove)
-                        widget_to_remove.close()
-
-                    # get only the plot widgets for the we want to plot: defined in par
-                    g_w_to_plot = [gwObject for gwObject in self.gwObjects
-                                   if gwObject.par in self.par]
-                    # retrieve the parameter for each graph widget in the g_w_to_plot list
-                    # self.par for instance contains [VROT, SBR, PA and INCL]
-                    # g_w_pars will also contain a list of parameters but in the order
-                    # of self.gwObjects e.g. new_par = [PA, SBR, VROT, INCL].
-                    # Create a new sorted list of graph widgets based as below:
-                    # loop through self.par [VROT, SBR, PA, INCL]grab the index of the 
-                    # parameter in the new_par list [PA, SBR, VROT, INCL] i.e. 
-                    # index(VROT) in new_par list: 2
-                    # index(SBR) in new_par list: 1
-                    # index(PA) in new_par list: 0
-                    # index(INCL) in new_par list: 3
-                    # Use these indexes to get a sorted list of graph widgets
-                    # from g_w_to_plot for the plotting
-                    g_w_pars = [g_w.par for g_w in g_w_to_plot]
-                    sorted_g_w_to_plot = []
-                    for par in self.par:
-                        idx = g_w_pars.index(par)
-                        sorted_g_w_to_plot.append(g_w_to_plot[idx])
-                    # delete the unordered list of graph widgets
-                    del g_w_to_plot
-
-                    counter = 0
-                    for j in range(self.ncols):
-                        for i in range(self.nrows): 
-                            self.scroll_grid_layout.addWidget(
-                                sorted_g_w_to_plot[counter], i, j)
-                            # call the show method on the graphWidget object in order to
-                            # display it
-                            sorted_g_w_to_plot[counter].show()
-                            # don't bother iterating to plot if all the parameters have been
-                            # plotted else you'll get an error
-                            if counter == len(sorted_g_w_to_plot) -1 :
-                                break
-                            counter += 1
-                    for j in range(self.ncols):
-                        self.scroll_grid_layout.setColumnStretch(j, 1)
-                        self.scroll_grid_layout.setColumnMinimumWidth(j, 0)
-                    for i in range(self.nrows):
-                        self.scroll_grid_layout.setRowStretch(i, 1)
-                    del sorted_g_w_to_plot
-                else:
-                    QtWidgets.QMessageBox.information(self, "Information",
-                                                      "Product of rows and columns should"
-                                                      " be at least the same as the current number of parameters"
-                                                      " on viewgraph")
-
-    def saveParameter(self, newVals, newValsErr, sKey,
-                 numPrecision):
-        """Save changes made to data points to .def file per specified parameter
-
-        Keyword arguments:
-        self--  main window being displayed i.e. the current instance of the
-        mainWindow class
-        newVals (list)-- list containing new values
-        sKey (str)-- parameter search key
-
-        Returns:
-        None
-
-        The .def file would be re-opened and updated per the new values that
-        are contained in the parVal* variable
-        """
-
-        # get the new values and format it as e.g. [0 20 30 40 50...]
-        precision = f'.{numPrecision[0]}{numPrecision[1].lower()}'
-        self.Tirific_Template[sKey] = ' '.join([f'{val:{precision}}' for val in newVals])
-        if np.all(np.isnan(newValsErr)):
-            pass
-        else:
-            self.Tirific_Template[f'# {sKey}_ERR'] = ' '.join([f'{val:{precision}}' for val in newValsErr])
-        # update fitting settings in the template
-
-    def check_fitting(self):
-        for parameter in self.parameterFittingSettings:
-            parValsFitSetting = self.parameterFittingSettings[parameter]
-            if parValsFitSetting['TO_FIT'] == False:
-                continue
-            ask = False
-            for key in self.fitting_parameters:
-                if key not in ['VARY', 'VARINDX']:
-                    if parValsFitSetting[key] is None:
-                        for ring_num in range(1, self.NUR):
-                            ring_key = f"RING_{ring_num}"
-                            ring_setting = parValsFitSetting[ring_key]
-                            ring_values = []
-                            if  parValsFitSetting[ring_key][key] is not None:
-                                ring_values.append(parValsFitSetting[ring_key][key])
-                        if len(ring_values) > 0:
-                            self.parameterFittingSettings[parameter][key] =\
-                                np.mean(np.array(ring_values,dtype=float))  
-                        elif key in ['ITESTART','ITEEND','MODERATE']:
-                            for parch in self.parameterFittingSettings:
-                                found = []
-                                if self.parameterFittingSettings[parch][key] is not None:
-                                    found.append(self.parameterFittingSettings[parch][key])
-                            if len(found) > 0:
-                                self.parameterFittingSettings[parameter][key] =\
-                                    int(np.mean(np.array(found,dtype=int)))
-                            else:
-                                ask = True
-                        else:
-                            ask = True
-            if ask:
-                self.dialog = _FittingFillDialog(parameter, self.fitting_parameters,
-                                                 parValsFitSetting)
-                self.dialog.btnOK.clicked.connect(self.dialog.accept)
-                self.dialog.btnCancel.clicked.connect(self.dialog.reject)
-                result = self.dialog.exec()
-                if result == QtWidgets.QDialog.DialogCode.Accepted:
-                    self.fill_fitting_values()
-                else:
-                    return
-               
-              
-              
-    def fill_fitting_values(self):
-        parameter = self.dialog.parameter
-        for key in self.fitting_parameters:
-            if key not in ['VARY', 'VARINDX']:
-                
-                value_text = getattr(self.dialog, key).text()
-                if value_text != '':
-                    try:
-                        if key in ['ITESTART','ITEEND','MODERATE']:
-                            value = int(float(value_text))
-                        else:
-                            value = float(value_text)
-                    except:
-                        QtWidgets.QMessageBox.information(self, "Information",
-                                                  f"Invalid value for {key}. Must be a number.")
-                        return
-                    self.parameterFittingSettings[parameter][key] = value
-        self.dialog.close()
-        # Now fill in the TO_FIT rings in between
-       
-
-    def updateFitSettings(self):
-
-        self.check_fitting()
-        for parameter in self.parameterFittingSettings:
-            numPrecision = self.numPrecisionY[parameter]
-            parValsFitSetting = self.parameterFittingSettings[parameter]
-            precision = f'.{numPrecision[0]}{numPrecision[1].lower()}'
-            if not parValsFitSetting['TO_FIT']:
-                continue
-            else:
-                fitting_blocks = []
-                interpolation_rings =[]
-                processed = []
-                for ring_num in range(1, self.NUR):
-                    ring_key = f"RING_{ring_num}"
-                    ring_setting = parValsFitSetting[ring_key]
-                    #print(f"Processing ring {ring_num} for parameter {parameter} with setting {ring_setting}")
-                    if ring_setting['INTERPOLATION'] and ring_setting['TO_FIT']:
-                        interpolation_rings.append(ring_num)
-                        #print(f"Ring {ring_num} set for interpolation for parameter {parameter}")
-                    if ring_num in processed:                    
-                        continue 
-                    if ring_setting['TO_FIT']:
-                        fit_block = {'Parameter': parameter}
-                        if ring_setting['GROUP'][0] == ring_setting['GROUP'][1]:
-                            fit_block['RINGS'] = f'{int(ring_setting["GROUP"][0])}'
-                        else:   
-                            fit_block['RINGS'] = f'{int(ring_setting["GROUP"][1])}:{int(ring_setting["GROUP"][0])}'
-                        for i in range(ring_setting['GROUP'][0], ring_setting['GROUP'][1]+1):
-                                processed.append(i)
-                        print(processed, ring_num, ring_setting['GROUP'])        
-                        if not ring_setting['BLOCK_FIT'] and ring_setting['GROUP'][0] != ring_setting['GROUP'][1]:
-                           fit_block['Parameter'] = f'!{parameter}'
-                        for keys in self.fitting_parameters:
-                            if keys in ['VARY','VARINDX']:
-                                pass
-                            else:
-                                if ring_setting[keys] is not None:
-                                    fit_block[keys] = ring_setting[keys]
-                                else:
-                                    fit_block[keys] = parValsFitSetting[keys]
-                        fitting_blocks.append(fit_block) 
-                    else:
-                        processed.append(ring_num)
-                for block in fitting_blocks:
-                    self.Tirific_Template['VARY'] += f' {block["Parameter"]} {block["RINGS"]},'
-                    for keys in self.fitting_parameters:
-                            if keys in ['VARY','VARINDX']:
-                                pass
-                            else:
-                                if block[keys] is None:
-                                    self.Tirific_Template[keys] += ' '
-                                else:
-                                    if isinstance(block[keys], int):
-                                        self.Tirific_Template[keys] += f'{int(block[keys])} '
-                                    else:
-                                        self.Tirific_Template[keys] += f'{block[keys]:{precision}} '
-               
-                # Now set the VARINDX in      
-                if len(interpolation_rings) > 0:         
-                    self.Tirific_Template['VARINDX'] += f' {parameter} {" ".join([f"{x}" for x in interpolation_rings])}' 
-        if self.Tirific_Template['VARY'].endswith(','):
-            self.Tirific_Template['VARY'] = self.Tirific_Template['VARY'][:-1]           
-        for key in self.fitting_parameters:
-            print(self.Tirific_Template[key])    
-        print(f"Fitting settings updated in template. Superweird")
-
-    def saveAll(self):
-        """Save changes made to data point to .def file for all parameters
-
-        Keyword arguments:
-        self -- main window being displayed i.e. the current instance of
-        the mainWindow class
-
-        Returns:
-        None
-
-        The saveFile function is called and updated with the current values being
-        held by parameters.
-        """
-        self.saveParameter(self.parValsRADI,np.array([float('NaN')]*len(self.parValsRADI))
-                ,'RADI', self.numPrecisionX)
-       
-        # Reset the fitting parameters
-        for fit_key in self.fitting_parameters:
-            self.Tirific_Template[fit_key]= ''      
-        for i in self.gwObjects:
-            self.saveParameter(i.parVals,i.parValsErr,
-                i.par, i.numPrecisionY)
-            if i.parameterFitSetting['TO_FIT']:
-                if i.parameterFitSetting['PARMAX'] is None:
-                    i.parameterFitSetting['PARMAX'] = i.yScale[1]
-                if i.parameterFitSetting['PARMIN'] is None:
-                    i.parameterFitSetting['PARMIN'] = i.yScale[0]
-                self.parameterFittingSettings[i.par] = i.parameterFitSetting
-            
-        self.updateFitSettings()
-        self.write_tirific()
-        self.saveMessage()
-
-    def write_tirific(self):
-        angles = ['PA', 'INCL', 'PA_2', 'INCL_2']
-        
-        update_angle = True
-        for angle in angles:
-            if angle not in self.Tirific_Template:
-                update_angle = False
-                break
-        if update_angle:
-            update_disk_angles(self.pyFAT_Configuration,self.Tirific_Template)
-        with open(self.fileName, 'w') as file:
-            for key in self.Tirific_Template:
-                if key[0:5] == 'EMPTY':
-                    file.write('\n')
-                else:
-                    file.write((f"{key}= {self.Tirific_Template[key]} \n"))
-    def saveMessage(self):
-        """Displays the information about save action
-
-        Keyword arguments:
-        self--  main window being displayed i.e. the current instance of the mainWindow class
-
-        Returns:
-        None
-
-        Displays a messagebox that informs user that changes have been successfully
-        written to the .def file
-        """
-        QtWidgets.QMessageBox.information(self, "Information",
-                                          "Changes successfully written to file")
-
-  
-
-   
-
-    def saveAsAll(self,name=None):
-        """Creates a new .def file for all parameters in current .def file opened
-
-        Keyword arguments:
-        self--  main window being displayed i.e. the current instance of
-        the mainWindow class
-
-        Returns:
-        None
-
-        The saveAs function is called and updated with the current values being
-        held by parameters.
-        """
-        if name is None:
-            self.fileName,_filter = QtWidgets.QFileDialog.getSaveFileName(self, "Save .def file as ",
-                                                         os.getcwd(),
-                                                         ".def Files (*.def)")
-        else:
-            self.fileName = name
-        self.saveAll()
-
-    def slotChangeData(self, fileName):
-        global fit_par
-        with open(fileName) as f:
-            self.data = f.readlines()
-
-        self.getParameter(self.data)
-
-        # counter = 0
-        for i in fit_par.keys():
-            for j in self.gwObjects:
-                if j.par == i:
-                    j.parVals = self.parVals[i][:]
-                    j.parValRADI = self.parValsRADI[i][:]
-
-        # FIXME(Samuel 11-06-2018):
-        # the comments below will probably be important to keep/implement
-        # it's possible that the user will delete some points in the .def file
-
-        # ensure there are the same points for parameter as there are for RADI as
-        # specified in NUR parameter
-        # diff = self.NUR-len(self.parVals[self.par])
-        # lastItemIndex = len(self.parVals[self.par])-1
-        # if diff == self.NUR:
-        #    for i in range(int(diff)):
-        #        self.parVals[self.par].append(0.0)
-        # elif diff > 0 and diff < self.NUR:
-        #    for i in range(int(diff)):
-        #        self.parVals[self.par].append(self.parVals[self.par][lastItemIndex])
-
-        # defining the x and y scale for plotting
-        self.xScale = set_plotScale(self.gwObjects[0].parValRADI)
-        ''''
-        if (np.subtract(max(self.gwObjects[0].parValRADI),
-                        min(self.gwObjects[0].parValRADI)) == 0):
-            self.xScale = set_plotScale(self.gwObjects[0].parValRADI)
-        elif ((max(self.gwObjects[0].parValRADI) -
-               min(self.gwObjects[0].parValRADI)) <= 100):
-            self.xScale = [int(ceil(-2 * max(self.gwObjects[0].parValRADI))),
-                           int(ceil(2 * max(self.gwObjects[0].parValRADI)))]
-        else:
-            self.xScale = [int(ceil(min(self.gwObjects[0].parValRADI) -
-                                    0.1 * (max(self.gwObjects[0].parValRADI) -
-                                           min(self.gwObjects[0].parValRADI)))),
-                           int(ceil(max(self.gwObjects[0].parValRADI) +
-                                    0.1 * (max(self.gwObjects[0].parValRADI) -
-                                           min(self.gwObjects[0].parValRADI))))]
-        '''
-        for i in self.gwObjects:
-            if not i.historyList[len(i.historyList)-1] == i.parVals[:]:
-                i.historyList.append(i.parVals[:])
-
-            i.xScale = self.xScale
-            if np.subtract(max(i.parVals), min(i.parVals)) == 0:
-                i.yScale = [-100, 100]
-            elif (max(i.parVals)-min(i.parVals)) <= 100:
-                i.yScale = [int(ceil(-2 * max(i.parVals))),
-                            int(ceil(2 * max(i.parVals)))]
-            else:
-                i.yScale = [int(ceil(min(i.parVals) -
-                                     0.1 * (max(i.parVals) - min(i.parVals)))),
-                            int(ceil(max(i.parVals) + 0.1 * (max(i.parVals) -
-                                                             min(i.parVals))))]
-            i.firstPlot()
-
-    def animate(self):
-        if os.path.isfile(self.tmpDeffile):
-            after = os.stat(self.tmpDeffile).st_mtime
-            if self.before != after:
-                self.before = after
-                self.slotChangeData(self.tmpDeffile)
-
-    def openEditor(self):
-        text, ok = QtWidgets.QInputDialog.getText(self, "Text Editor Input Dialog",
-                                                  "Enter text editor:")
-        if ok:
-            path, name = os.path.split(self.fileName)
-            self.tmpDeffile = os.path.join(path, "TiRiFiG_temp.def")
-            self.saveAsAll(self.tmpDeffile)
-           
-
-            if text:
-                programName = str(text)
-                try:
-                    run([programName, self.tmpDeffile])
-                except OSError:
-                    QtWidgets.QMessageBox.information(self, "Information",
-                                                      "{} is not installed or configured"
-                                                      "properly on this system.".format(programName))
-            else:
-                # assign current modified time of temporary def file to before
-                self.before = os.stat(self.tmpDeffile).st_mtime
-                self.t = TimerThread(1, self.animate)
-                self.t.start()
-
-    def inProgress(self):
-        """Displays the information about feature under development
-        """
-        QtWidgets.QMessageBox.information(self, "Information",
-                                          "This feature is under development")
-
-    def SMobj(self):
-        self.sm = SMWindow(self.par, self.xScale, self.gwObjects)
-        self.sm.show()
-  
-    def paramDef(self):
-        global currPar, fit_par, selected_option
-        user_input = self.ps.parameter.currentText().upper()
-        unitMeas = str(self.ps.unitMeasurement.text())
-        after_parameter = self.ps.afterParameter.currentText().upper()
-        text_loc = ""
-        if self.parameter_in_plot(user_input) or not self.parameter_in_data(user_input):
-            return
-        if after_parameter == "End":
-            text_loc = "at the end of the current graph" 
-        else:
-            text_loc = f"after the parameter {after_parameter}"   
-       
-      
-        # check if the inputted parameter value has its plot displayed
-       
-        print(f"We will add the parameter {user_input} {text_loc}")
-
-        # the graph for the new tilted ring parameter will be inserted after the last plot
-        # We could change this by adding a plot after option in the dialog box
-        new_widget = self.obtain_widget_to_plot(user_input, unitMeas)
-
-        #get the currently displayed widgets and their positions
-        rows = []
-        columns = [] 
-        after_row = -1
-        after_column = -1
-        for i in range(self.scroll_grid_layout.count()):
-            displayed = self.scroll_grid_layout.itemAt(i).widget()
-            row_number, column_number = self.get_widget_location(displayed)
-            if after_parameter != "End":
-                if displayed.par == after_parameter:
-                    after_row = row_number+1
-                    after_column = column_number
-            rows.append(row_number)
-            columns.append(column_number)
-        if after_row == -1:
-            if after_parameter != "End":
-                print(f"We could not find the parameter you specified to insert after. Adding at the end instead.")
-            after_column = max(columns)
-            column_index = [i for i,x in enumerate(columns) if x == after_column]
-            after_row = max([rows[i] for i in column_index])+1
-        if after_row >= self.nrows:
-            after_column += 1
-            if after_column == self.ncols:
-                self.ncols += 1
-            after_row = 0
-        widgets_to_add = [{'widget': new_widget,
-                          'row': after_row,
-                          'column': after_column}]
-        remove_start_index = -1
-        for i in range(self.scroll_grid_layout.count()):
-            displayed = self.scroll_grid_layout.itemAt(i).widget()
-            row_number, column_number = self.get_widget_location(displayed)
-            if column_number < after_column or (column_number == after_column and
-                                     row_number < after_row):
-                continue
-            else:
-                if remove_start_index == -1:
-                    remove_start_index = i
-                if row_number +1 < self.nrows:
-                    row_number +=1                    
-                else:
-                    row_number = 0
-                    column_number +=1
-                    if column_number > self.ncols:
-                        self.ncols += 1
-                widgets_to_add.append({'widget': displayed,
-                                       'row': row_number,
-                                       'column': column_number})
-        if remove_start_index  > -1:        
-            for i in range(self.scroll_grid_layout.count()-1, remove_start_index-1, -1):
-                widget_to_remove = self.scroll_grid_layout.itemAt(i).widget()
-                self.scroll_grid_layout.removeWidget(widget_to_remove)
-                widget_to_remove.hide()
-                self.par.remove(widget_to_remove.par)
-        for item in widgets_to_add:
-            self.scroll_grid_layout.addWidget(item['widget'],
-                                              item['row'],
-                                              item['column'])
-            item['widget'].show() 
-            self.par.append(item['widget'].par)
-        del widgets_to_add
-        self.ps.close()
-
-        return                  
-      
-
-    def create_new_widget(self, parameter,unit):
-        if parameter not in self.parameterFittingSettings:
-            self.setEmptyFittingValues(parameter)
-        new_gwObject = GraphWidget(self.xScale,
-            self.yScale[parameter],
-            unit,
-            parameter,
-            self.parVals[parameter],
-            self.parValsErr[parameter],
-            self.parValsRADI,
-            "Yes",
-            self.numPrecisionX,
-            self.numPrecisionY[parameter],
-            self.pyFAT_Configuration,
-            self.Tirific_Template,
-            self.parameterFittingSettings[parameter],
-
-            )
-        
-        #new_gwObject.setMinimumSize(int(self.scrollWidth*3./4.),
-        #    int(self.scrollHeight/2.))
-        new_gwObject.setMinimumSize(750,500)
-        #new_gwObject.setFixedSize(1050,500)
-        #self.gwObjects[parIndex].btnAddParam.clicked.connect(
-        #    self.gwObjects[parIndex].changeGlobal)
-        #self.gwObjects[parIndex].btnAddParam.clicked.connect(
-        #    self.insert_parameter_dialog)
-        new_gwObject.btnEditParam.clicked.connect(
-            new_gwObject.changeGlobal)
-        new_gwObject.btnEditParam.clicked.connect(
-            self.editParaObj)
-        new_gwObject.btnCloseParam.clicked.connect(
-            new_gwObject.changeGlobal)
-        new_gwObject.btnCloseParam.clicked.connect(
-            self.closeParaObj)         
-                
-
-        return new_gwObject
-    
-    def get_widget_location(self, widget):
-        """Get the row and column of a widget in the grid layout.
-
-        Keyword arguments:
-        self -- main window being displayed i.e. the current instance of the
-                mainWindow class
-        widget -- the widget whose location is to be found
-
-        Returns:
-        row_number -- the row number of the widget
-        column_number -- the column number of the widget
-        """
-        idx_in_layout = self.scroll_grid_layout.indexOf(widget)
-        row_number, column_number, _rowSpan, _colSpan = self.scroll_grid_layout.getItemPosition(idx_in_layout)
-        return row_number, column_number
-        
-    def parameter_in_plot(self,parameter):
-       
-        if parameter in self.par:
-            QtWidgets.QMessageBox.information(self, "Information",
-                f"The parameter {parameter} is already displayed")
-            return True
-        return False
-
-    def parameter_in_data(self,parameter):       
-        try:
-            self.parVals[parameter]
-        except KeyError:
-            QtWidgets.QMessageBox.information(self, "Information",
-                "This parameter is not defined in the .def file")
-            return False
-        return True
-    
-    def obtain_widget_to_plot(self, parameter, unitMeas): 
-        list_of_t_r_p = [gwObject.par for gwObject in self.gwObjects]
-        if unitMeas == "":
-            #if the unit measure is blank, we attempt the default
-            base_parameter = parameter.split('_')[0]
-            if base_parameter in fit_par.keys():
-                unitMeas = fit_par[base_parameter]
-        else:
-            #If the unit is not blank we want to update it in any existing graphs
-            if parameter in list_of_t_r_p:
-                for graph_widget in self.gwObjects:
-                    if graph_widget.par == parameter:
-                        graph_widget.unitMeas = unitMeas
-                        break
-        #If we do not have an existing graph we add one for the new parameter                         
-        if parameter not in list_of_t_r_p:
-            new_widget = self.create_new_widget(parameter,unitMeas)
-            self.gwObjects.append(new_widget)
-        else:
-            new_widget = None
-            for gw in self.gwObjects:
-                if gw.par == parameter:
-                    new_widget = gw
-                    break
-        return new_widget
-  
-                
-    def editParamDef(self):
-        global currPar, fit_par
-          
-        user_input = self.ps.parameter.currentText().upper()
-        unitMeas = str(self.ps.unitMeasurement.text())
-        
-        if self.parameter_in_plot(user_input) or not self.parameter_in_data(user_input):
-            return
-        print(f'We will replace the parameter {currPar} with {user_input}')
-        #select or create the widget to plot        
-        new_widget = self.obtain_widget_to_plot(user_input, unitMeas)  
-                             
-        # Find the actual widget object for the current parameter in the layout
-        old_widget = None
-        for i,gw in enumerate(self.gwObjects):
-            if gw.par == currPar:
-                old_widget = gw
-                break
-        
-
-        if old_widget is None:
-            print("Could not find existing widget for currPar; aborting edit swap")
-            return
-
-        # Determine the position of the old widget in the grid
-        row_number,column_number = self.get_widget_location(old_widget)
-
-        # Remove old widget from layout and replace gwObjects entry
-        self.scroll_grid_layout.removeWidget(old_widget)
-        # Can't say I understand it but these seem to be required for 
-        # a repetative add/remove to work properly
-        old_widget.hide()
-        new_widget.show()
-
-        self.scroll_grid_layout.addWidget(new_widget, row_number, column_number)
-        self.scroll_grid_layout.update()
-
-        # Update current parameter to the new one       
-        # update the parameter list
-        self.par[self.par.index(currPar)] = user_input 
-        currPar = user_input
-        self.ps.close()
-    
-    def create_parameter_dialog(self, opt, title,add=False):
-        global selected_option
-        selected_option = opt
-        val = []
-        for i in self.parVals:
-            if i in self.par:
-                continue
-            else:
-                val.append(i)    
-        self.ps = ParamSpec(val, title,plotted_parameters=self.par,addLocation=add)
-        self.ps.show()
-        self.ps.btnOK.clicked.connect(self.paramDef)
-        self.ps.btnCancel.clicked.connect(self.ps.close)
-
-    def add_parameter_dialog(self):
-        selected_option = 'add'
-        title = 'Add Parameter'
-        self.create_parameter_dialog(selected_option, title,add=True)
-
-    def insert_parameter_dialog(self):
-        selected_option = 'insert'
-        title = 'Insert Parameter'
-        self.create_parameter_dialog(selected_option, title)
-
-    def editParaObj(self):
-        val = []
-        for i in self.parVals:
-            if i in self.par:
-                continue
-            else:
-                val.append(i)
-
-        self.ps = ParamSpec(val, "Edit Parameter")
-        self.ps.show()
-        self.ps.btnOK.clicked.connect(self.editParamDef)
-        self.ps.btnCancel.clicked.connect(self.ps.close)
-
-    def closeParaObj(self):
-        #updated in changeGlobal
-        global currPar
-        print(f'Removing the Graph of parameter {currPar}')
-        parIndex = [self.scroll_grid_layout.itemAt(i).widget().par 
-            for i in range(self.scroll_grid_layout.count())].index(currPar)  
-        widget_to_remove = self.scroll_grid_layout.itemAt(parIndex).widget()
-        self.scroll_grid_layout.removeWidget(widget_to_remove)
-        self.scroll_grid_layout.update()
-        self.par.remove(currPar)
-        widget_to_remove.close()
-        
-       
-    def tirificMessage(self,message):
-        """Displays the information about input data cube not available
-
-        Keyword arguments:
-        self--  main window being displayed i.e. the current instance of the
-                mainWindow class
-
-        Returns:
-        None
-
-        Displays a messagebox that informs user that changes have been successfully
-        written to the .def file
-        """
-        reply = QtWidgets.QMessageBox.warning(
-                self,'Run TiRiFiC Message',
-                message,
-                QtWidgets.QMessageBox.StandardButton.Ok | QtWidgets.QMessageBox.StandardButton.Cancel,
-                QtWidgets.QMessageBox.StandardButton.Cancel,
-            )
-        if reply == QtWidgets.QMessageBox.StandardButton.Cancel:
-                return False
-        return
-        QtWidgets.QMessageBox.information(self, "Information",
-                                         message)
-
-    def progressBar(self, cmd):
-        progress = QtWidgets.QProgressDialog("Operation in progress...",
-                                             "Cancel", 0, 100)
-        progress.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
-        progress.setMaximum(int(float(self.Tirific_Template['LOOPS'])*1e6))
-        progress.resize(500, 100)
-        prev = 1
-        message = "Stopped"
-        completed = int(prev * 1e6) / 2
-        status = 'running'
-        progress.show()
-        time.sleep(10)
-        while cmd.poll() is None and status == 'running':
-            with open(self.progressPath, 'r') as f:
-                data = f.readlines()
-                for i in data:
-                    lin = i.split(" ")
-                    if 'L:' in lin[0].upper():
-                        count = lin[0].split(":")
-                        count = count[1].split("/")
-                        if int(float(count[0])) > prev:
-                            if int(float(count[0])) == int(float(self.Tirific_Template['LOOPS'])):
-                                completed += 0.0001
-                            else:
-                                prev = int(float(count[0]))
-                                completed = prev * 1e6
-                        else:
-                            completed += 0.0001
-                    elif "finish" in lin[0].lower():
-                        status = 'finished'
-                        progress.setValue(int(float(self.Tirific_Template['LOOPS'])) * 1e6)
-                        message = i
-                        break
-            progress.setValue(completed)
-            if progress.wasCanceled():
-                cmd.kill()
-                break
-        progress.setValue(int(float(self.Tirific_Template['LOOPS'])) * 1e6)
-        QtWidgets.QMessageBox.information(self, "Information", message)
-
-    def startTiriFiC(self):
-        """Start TiRiFiC
-
-        Keyword arguments:
-        self--  main window being displayed i.e. the current instance of
-        the mainWindow class
-
-        Returns:
-        None
-
-        Calls the os.system and opens terminal to start TiRiFiC
-        """
-        fileNamePath, fileName = os.path.split(self.fileName)
-        tirifigRunPath = os.getcwd()
-        if self.Tirific_Template['TIRDEF'] == fileName:
-            if not self.tirificMessage( 
-                f"This TiRiFiC run will overwrite the current .def file ({self.Tirific_Template['TIRDEF']}). Continue?"):
-                return
-        if self.fileName == self.openedfileName:
-            if not self.tirificMessage(
-                f"The current setting will overwrite the original .def file ({self.openedfileName}). Continue?"):
-                return
-              
-
-       
-        fitsfilePath = fileNamePath + "/" + self.Tirific_Template['INSET']
-        if os.path.isfile(fitsfilePath):
-            self.saveAll()
-            try:
-                cmd = run(["tirific", f"deffile={self.fileName}"], cwd=fileNamePath)
-            except OSError:
-                QtWidgets.QMessageBox.information(self, "Information",
-                                                  "TiRiFiC is not installed or configured"
-                                                  " properly on system.")
-            else:
-                pass
-                '''
-                self.progressPath = str(self.fileName)
-                self.progressPath = self.progressPath.split('/')
-                self.progressPath[-1] = 'progress'
-                self.progressPath = '/'.join(self.progressPath)
-                self.progressBar(cmd)
-                '''
-        else:
-            self.tirificMessage("The input data cube specified in INSET (" + self.Tirific_Template['INSET'] + ") parameter is not available.")
-
-def logWarnings():
-    # logging.captureWarnings(True)
-    # logging.basicConfig(filename='test.log', format='%(asctime)s %(name)s %(levelname)s %(message)s',
-    #                     datefmt='%m/%d/%Y %I:%M:%S %p', level=logging.INFO)
-    logger = logging.getLogger(__name__)
-    # warnings_logger = logging.getLogger("py.warnings")
-
-    formatter = logging.Formatter('%(asctime)s %(message)s', datefmt='%m/%d/%Y %I:%M:%S %p')
-    logger_file_handler = logging.FileHandler('TiRiFiG.log', mode='a')
-    logger_file_handler.setFormatter(formatter)
-
-    logger.addHandler(logger_file_handler)
-    # warnings_logger.addHandler(logger_file_handler)
-    # logger.setLevel(logging.DEBUG)
-    # warnings_logger.setLevel(logging.DEBUG)
+import os
 
-def set_plotScale(values):
-    min_max_diff = max(values) - min(values)
-    percentage_of_min_max_diff = 0.1 * min_max_diff
-    lower_bound = min(values) - percentage_of_min_max_diff
-    upper_bound = max(values) + percentage_of_min_max_diff
-    # are the min/max values the same
-    if np.subtract(max(values), min(values)) == 0:
-        scale = [lower_bound/2, upper_bound*1.5]
-    else:
-        scale = [lower_bound, upper_bound]
-    return scale
 
 def main():
-    logWarnings()
-    if os.path.isfile(os.getcwd() + "/tmpDeffile.def"):
-        os.remove(os.getcwd() + "/tmpDeffile.def")
+    os.environ['QT_API'] = 'pyqt6'
+    from TiRiFiG.gui import main as gui_main
+    gui_main()
 
-    app = QtWidgets.QApplication(sys.argv)
-    # Apply modern style (set a background image path if desired)
-    background_image_path =  str(import_pack_files('TiRiFiG.utilities.background')/'Background.png')  # e.g., "path/to/your/image.png"
-    try:
-        apply_modern_style(app,background_image_path=background_image_path)
-    except Exception as _e:
-        # Non-fatal if styling fails
-        pass
-    GUI = MainWindow()
-    GUI.show()
-    sys.exit(app.exec())
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,34 @@
+# -*- coding: UTF-8 -*-
+"""The Qt binding used by the GUI.
+
+The GUI (TiRiFiG.gui) is written once and imports Qt only from here. The
+binding is the one named by the QT_API environment variable ('pyqt6' or
+'pyqt5', as for matplotlib), otherwise the first one that is installed.
+Bindings are looked up with Support.binding.find_binding, so only the
+selected one is imported. QT_API is set to the selected binding so that
+matplotlib draws with the same one.
+
+variables:
+    binding:       the binding in use.
+    QtCore, QtGui, QtWidgets:  the modules of the binding.
+    QAction:       QtGui.QAction in Qt6, QtWidgets.QAction in Qt5.
+"""
+
+import importlib
+import os
+
+from TiRiFiG.Support.binding import bindings, find_binding
+
+binding = find_binding()
+if binding is None:
+    raise ImportError(f"No supported Qt binding found, install one of {', '.join(bindings)}.")
+os.environ['QT_API'] = binding.lower()
+
+QtCore = importlib.import_module(f'{binding}.QtCore')
+QtGui = importlib.import_module(f'{binding}.QtGui')
+QtWidgets = importlib.import_module(f'{binding}.QtWidgets')
+
+if binding == 'PyQt6':
+    QAction = QtGui.QAction
+else:
+    QAction = QtWidgets.QAction
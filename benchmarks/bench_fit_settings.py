@@ -0,0 +1,68 @@
+# -*- coding: UTF-8 -*-
+"""Timing of the fit-setting serialisation for large templates.
+
+Builds the fitting settings for a number of parameters of a 10,000 ring
+template with a mix of block groups, individually fitted rings and
+interpolated rings, and times format_fit_settings and parse_varindx.
+
+Usage:
+    python benchmarks/bench_fit_settings.py [no_rings] [repeats]
+
+with TiRiFiG installed (or the repository root on the PYTHONPATH).
+"""
+import sys
+import time
+
+import numpy as np
+
+from TiRiFiG.Support.fit_settings import ParameterFitSettings, fit_columns,\
+    format_fit_settings, parse_varindx
+
+
+def build_settings(no_rings):
+    settings = {}
+    precisions = {}
+    for i, parameter in enumerate(['VROT', 'SBR', 'INCL', 'PA', 'SDIS', 'Z0']):
+        current = ParameterFitSettings(parameter, no_rings)
+        current.fitted = True
+        current.to_fit[:] = True
+        if i % 3 == 0:
+            # blocks of 10 rings
+            for first in range(1, no_rings+1, 10):
+                current.set_group(first, min(first+9, no_rings), True)
+        elif i % 3 == 1:
+            # everything individual with a varying PARMAX every 7 rings
+            current.columns['PARMAX'][:] = np.repeat(np.arange(no_rings//7+1), 7)[:no_rings]
+        else:
+            # one individually fitted range with every other ring interpolated
+            current.set_group(1, no_rings, False)
+            current.interpolation[1::2] = True
+        for key in fit_columns:
+            current.defaults[key] = 1.
+        settings[parameter] = current
+        precisions[parameter] = [2, 'f']
+    return settings, precisions
+
+
+def main():
+    no_rings = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    settings, precisions = build_settings(no_rings)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        lines = format_fit_settings(settings, precisions)
+        timings.append(time.perf_counter() - start)
+    print(f'format_fit_settings, {no_rings} rings: best {min(timings)*1e3:.1f} ms '
+          f'({len(lines["VARY"].split(","))} VARY blocks)')
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        varindex = parse_varindx(lines['VARINDX'])
+        timings.append(time.perf_counter() - start)
+    print(f'parse_varindx, {no_rings} rings: best {min(timings)*1e3:.1f} ms '
+          f'({sum(len(x) for x in varindex.values())} interpolated rings)')
+
+
+if __name__ == '__main__':
+    main()